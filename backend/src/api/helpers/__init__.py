@@ -1,10 +1,12 @@
 """API helper utilities."""
+from api.helpers.bulk_create import bulk_create
 from api.helpers.conflict_check import check_optimistic_lock, check_optimistic_lock_by_name
 from api.helpers.filter_utils import ResolvedFilter, resolve_filter_and_sorting
 from api.helpers.view_utils import validate_view
 
 __all__ = [
     "ResolvedFilter",
+    "bulk_create",
     "check_optimistic_lock",
     "check_optimistic_lock_by_name",
     "resolve_filter_and_sorting",
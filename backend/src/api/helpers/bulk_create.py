@@ -0,0 +1,86 @@
+"""Shared request handling for the bulk create endpoints."""
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.request_context import RequestContext
+from core.tier_limits import TierLimits
+from schemas.bulk import BulkCreateItemResult, BulkCreateRequest, BulkCreateResponse
+from services.base_entity_service import BaseEntityService
+from services.bookmark_service import ArchivedUrlExistsError, DuplicateUrlError
+from services.exceptions import FieldLimitExceededError, QuotaExceededError
+from services.prompt_service import NameConflictError
+
+# error_code per service exception, matching the single-item endpoints.
+# Anything else create_many reports (ValueError) is a VALIDATION_ERROR.
+_ERROR_CODES: dict[type[Exception], str] = {
+    FieldLimitExceededError: "FIELD_LIMIT_EXCEEDED",
+    QuotaExceededError: "QUOTA_EXCEEDED",
+    DuplicateUrlError: "ACTIVE_URL_EXISTS",
+    ArchivedUrlExistsError: "ARCHIVED_URL_EXISTS",
+    NameConflictError: "NAME_CONFLICT",
+}
+
+
+def _validation_message(error: ValidationError) -> str:
+    """Flatten a pydantic ValidationError into one line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'item'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+async def bulk_create(
+    service: BaseEntityService[Any],
+    schema: type[BaseModel],
+    data: BulkCreateRequest,
+    *,
+    db: AsyncSession,
+    user_id: UUID,
+    limits: TierLimits,
+    context: RequestContext,
+) -> BulkCreateResponse:
+    """
+    Validate each raw item against the create schema, then create the valid ones.
+
+    Args:
+        service: Entity service whose create_many performs the writes.
+        schema: Single-item create schema (e.g., BookmarkCreate).
+        data: The bulk request.
+        db: Database session.
+        user_id: User to create the items for.
+        limits: User's tier limits.
+        context: Request context for history recording.
+
+    Returns:
+        One result per requested item, in request order.
+    """
+    results: dict[int, BulkCreateItemResult] = {}
+    indexes: list[int] = []
+    items: list[BaseModel] = []
+    for i, raw in enumerate(data.items):
+        try:
+            items.append(schema.model_validate(raw))
+        except ValidationError as e:
+            results[i] = BulkCreateItemResult(
+                index=i, error_code="VALIDATION_ERROR", message=_validation_message(e),
+            )
+        else:
+            indexes.append(i)
+
+    outcomes = await service.create_many(db, user_id, items, limits, context)
+    for i, outcome in zip(indexes, outcomes, strict=True):
+        if isinstance(outcome, Exception):
+            results[i] = BulkCreateItemResult(
+                index=i,
+                error_code=_ERROR_CODES.get(type(outcome), "VALIDATION_ERROR"),
+                message=str(outcome),
+            )
+        else:
+            results[i] = BulkCreateItemResult(index=i, id=outcome)
+
+    ordered = [results[i] for i in range(len(data.items))]
+    created = sum(result.id is not None for result in ordered)
+    return BulkCreateResponse(created=created, failed=len(ordered) - created, results=ordered)
@@ -3,10 +3,11 @@ import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from api.routers import (
     ai,
@@ -17,6 +18,7 @@ from api.routers import (
     health,
     history,
     mcp,
+    metrics,
     notes,
     prompts,
     public,
@@ -38,20 +40,33 @@ from litellm.exceptions import (
 
 from core.auth import DeletedIdentityError
 from core.auth_cache import AuthCache, set_auth_cache
+from core.compression import CompressionMiddleware
 from core.config import get_settings
 from core.http_cache import ETagMiddleware
+from core.metrics import MetricsExporter, MetricsMiddleware, set_metrics_exporter
 from core.rate_limit_config import RateLimitExceededError
 from core.redis import RedisClient, set_redis_client
-from db.session import engine
+from db.session import async_session_factory, engine
+from services.diff_worker import DiffWorkerPool, set_diff_pool
 from services.exceptions import FieldLimitExceededError, QuotaExceededError
+from services.extraction_worker import ExtractionWorkerPool, set_extraction_pool
+from services.line_index_cache import LineIndexCache, set_line_index_cache
+from services.public_share_cache import PublicShareCache, set_public_share_cache
 from services.llm_service import LLMService, set_llm_service
+from services.relationship_graph_cache import (
+    RelationshipGraphCache,
+    set_relationship_graph_cache,
+)
+from services.scrape_cache import ScrapeCache, set_scrape_cache
 from services.suggestion_service import LLMParseFailedError
+from services.token_usage import TokenUsageBuffer, set_token_usage_buffer
+from services.url_scraper import create_scrape_client, set_scrape_client
 
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
+async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:  # noqa: PLR0915
     """Manage application lifespan - startup and shutdown."""
     app_settings = get_settings()
 
@@ -64,63 +79,147 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
     await redis_client.connect()
     set_redis_client(redis_client)
 
+    # Startup: Aggregate request/DB/Redis metrics across workers
+    metrics_exporter = MetricsExporter(redis_client)
+    await metrics_exporter.start()
+    set_metrics_exporter(metrics_exporter)
+
     # Startup: Initialize auth cache
     auth_cache = AuthCache(redis_client)
+    await auth_cache.start()
     set_auth_cache(auth_cache)
 
+    # Startup: Cache relationship topology for multi-hop graph queries
+    set_relationship_graph_cache(RelationshipGraphCache(redis_client))
+
+    # Startup: Index content lines for partial reads and in-content search
+    set_line_index_cache(LineIndexCache())
+
+    # Startup: Share scrape results across users and requests
+    scrape_cache = ScrapeCache(redis_client)
+    set_scrape_cache(scrape_cache)
+
+    # Startup: Cache rendered public share reads
+    public_share_cache = PublicShareCache(redis_client)
+    await public_share_cache.start()
+    set_public_share_cache(public_share_cache)
+
+    # Startup: Buffer PAT last_used_at writes
+    token_usage_buffer = TokenUsageBuffer(async_session_factory)
+    await token_usage_buffer.start()
+    set_token_usage_buffer(token_usage_buffer)
+
+    # Startup: Move large history diffs off the event loop
+    diff_pool = DiffWorkerPool(
+        kind=app_settings.history_diff_pool,
+        max_workers=app_settings.history_diff_workers,
+        offload_threshold=app_settings.history_diff_offload_chars,
+        timeout=app_settings.history_diff_timeout,
+    )
+    set_diff_pool(diff_pool)
+
+    # Startup: Pooled HTTP client and extraction workers for URL scraping
+    scrape_client = create_scrape_client()
+    set_scrape_client(scrape_client)
+    extraction_pool = ExtractionWorkerPool(
+        max_workers=app_settings.scrape_extract_workers,
+        cpu_seconds=app_settings.scrape_extract_cpu_seconds,
+        timeout=app_settings.scrape_extract_timeout,
+    )
+    set_extraction_pool(extraction_pool)
+
     # Startup: Initialize LLM service
     llm_service = LLMService(app_settings)
     set_llm_service(llm_service)
 
     yield
 
+    # Shutdown: Flush buffered token usage while the pool is still open
+    set_token_usage_buffer(None)
+    await token_usage_buffer.stop()
+
     # Shutdown: Dispose database connection pool
     await engine.dispose()
 
-    # Shutdown: Clean up LLM service, auth cache, and Redis
+    # Shutdown: Clean up LLM service, worker pools, scrape client, caches, and Redis
     set_llm_service(None)
+    set_diff_pool(None)
+    diff_pool.shutdown()
+    set_extraction_pool(None)
+    extraction_pool.shutdown()
+    set_scrape_client(None)
+    await scrape_client.aclose()
+    set_scrape_cache(None)
+    scrape_cache.clear()
+    set_line_index_cache(None)
+    set_relationship_graph_cache(None)
+    set_public_share_cache(None)
+    await public_share_cache.stop()
     set_auth_cache(None)
+    await auth_cache.stop()
+    set_metrics_exporter(None)
+    await metrics_exporter.stop()
     await redis_client.close()
     set_redis_client(None)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+# HSTS: enforce HTTPS for 1 year, including subdomains; prevent MIME type
+# sniffing; prevent clickjacking - API shouldn't be framed
+_SECURITY_HEADERS = {
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+}
+
+
+class SecurityHeadersMiddleware:
     """Add security headers to all responses."""
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint,
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and add security headers to response."""
-        response = await call_next(request)
-        # HSTS: enforce HTTPS for 1 year, including subdomains
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains"
-        )
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        # Prevent clickjacking - API shouldn't be framed
-        response.headers["X-Frame-Options"] = "DENY"
-        return response
-
-
-class RateLimitHeadersMiddleware(BaseHTTPMiddleware):
-    """Add rate limit headers to successful responses."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint,
-    ) -> Response:
-        """Process request and add rate limit headers to response."""
-        response = await call_next(request)
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in _SECURITY_HEADERS.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
-        # Add headers if rate limit info was stored by dependency
-        # Note: 429 responses are handled by exception handler, not middleware
-        info = getattr(request.state, "rate_limit_info", None)
-        if info:
-            response.headers["X-RateLimit-Limit"] = str(info["limit"])
-            response.headers["X-RateLimit-Remaining"] = str(info["remaining"])
-            response.headers["X-RateLimit-Reset"] = str(info["reset"])
 
-        return response
+class RateLimitHeadersMiddleware:
+    """Add rate limit headers to successful responses."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process request and add rate limit headers to response."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            # Add headers if rate limit info was stored by dependency
+            # (request.state is backed by scope["state"]).
+            # Note: 429 responses are handled by exception handler, not middleware
+            if message["type"] == "http.response.start" and (
+                info := scope.get("state", {}).get("rate_limit_info")
+            ):
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(info["limit"])
+                headers["X-RateLimit-Remaining"] = str(info["remaining"])
+                headers["X-RateLimit-Reset"] = str(info["reset"])
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 app_settings = get_settings()
@@ -220,8 +319,11 @@ intentionally do **not** bump `updated_at`, because they are not content edits
 (it keeps the displayed "last updated" date honest). Consequently a
 `Last-Modified`-only conditional request can return `304 Not Modified` even
 though `is_public` / `public_token` (or `archived_at` / `deleted_at`) changed.
-The `ETag` is computed from the full response body and always reflects these
-changes, so an `If-None-Match` revalidation is correct in every case.
+The `ETag` always reflects these changes, so an `If-None-Match` revalidation is
+correct in every case. On full item reads (`GET /{type}/{id}` and
+`GET /prompts/name/{name}`) it is a strong ETag derived from the item's state,
+tags, and relationships, and a match is answered before the item is loaded;
+on other reads it is a weak ETag computed from the response body.
 
 Note: this only affects how a *client caches its own reads*. Public-link access
 control is always enforced live server-side — unpublishing or rotating a token
@@ -415,6 +517,10 @@ app.add_middleware(RateLimitHeadersMiddleware)
 # Added before SecurityHeadersMiddleware so 304 responses get security headers
 app.add_middleware(ETagMiddleware)
 
+# Compression middleware (gzip/br/zstd by Accept-Encoding). Wraps ETagMiddleware
+# so ETags and 304s are computed on the uncompressed body, once per request
+app.add_middleware(CompressionMiddleware, minimum_size=app_settings.compression_min_bytes)
+
 # Security headers middleware (adds HSTS, X-Frame-Options, etc. to all responses)
 app.add_middleware(SecurityHeadersMiddleware)
 
@@ -427,6 +533,9 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Metrics middleware (outermost, so request latency covers every other layer)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(ai.router)
 app.include_router(health.router)
 app.include_router(users.router)
@@ -443,4 +552,5 @@ app.include_router(settings.router)
 app.include_router(history.router)
 app.include_router(relationships.router)
 app.include_router(mcp.router)
+app.include_router(metrics.router)
 app.include_router(webhooks.router)
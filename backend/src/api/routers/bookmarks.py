@@ -1,4 +1,5 @@
 """Bookmark CRUD endpoints."""
+from functools import partial
 from typing import Literal
 from uuid import UUID
 
@@ -13,10 +14,23 @@ from api.dependencies import (
     get_current_limits,
     get_current_user,
     get_current_user_session_only,
+    get_settings,
+)
+from api.helpers import (
+    bulk_create,
+    check_optimistic_lock,
+    resolve_filter_and_sorting,
+    validate_view,
 )
-from api.helpers import check_optimistic_lock, resolve_filter_and_sorting, validate_view
 from core.auth import get_request_context
-from core.http_cache import check_not_modified, format_http_date
+from core.config import Settings
+from core.http_cache import (
+    check_etag_not_modified,
+    check_not_modified,
+    format_http_date,
+    resource_etag,
+)
+from core.query_budget import query_budget
 from core.tier_limits import TierLimits
 from models.user import User
 from services.exceptions import FieldLimitExceededError
@@ -29,6 +43,7 @@ from schemas.bookmark import (
     BookmarkUpdate,
     MetadataPreviewResponse,
 )
+from schemas.bulk import BulkCreateRequest, BulkCreateResponse
 from schemas.history import HistoryListResponse, HistoryResponse
 from schemas.content_search import ContentSearchMatch, ContentSearchResponse
 from schemas.errors import (
@@ -46,7 +61,7 @@ from services.bookmark_service import (
     BookmarkService,
     DuplicateUrlError,
 )
-from services.content_service import search_all_content
+from services.content_service import search_content_page
 from services.history_service import history_service
 from models.content_history import ActionType, EntityType
 from services.content_edit_service import (
@@ -56,8 +71,10 @@ from services.content_edit_service import (
 )
 from services.content_lines import apply_partial_read
 from services.content_search_service import search_in_content
-from services.exceptions import InvalidStateError
+from services.exceptions import InvalidCursorError, InvalidStateError
 from services.relationship_service import embed_relationships
+from services.public_share_cache import invalidate_public_share
+from services.scrape_cache import get_scrape_cache
 from services.url_scraper import scrape_url
 
 router = APIRouter(prefix="/bookmarks", tags=["bookmarks"])
@@ -70,6 +87,7 @@ async def fetch_metadata(
     url: HttpUrl = Query(..., description="URL to fetch metadata from"),
     include_content: bool = Query(default=False, description="Also extract page content"),
     _current_user: User = Depends(get_current_user_session_only),
+    settings: Settings = Depends(get_settings),
 ) -> MetadataPreviewResponse:
     """
     Fetch metadata from a URL without saving a bookmark.
@@ -83,10 +101,22 @@ async def fetch_metadata(
     Set include_content=true to also extract the main page content (useful for
     previewing before save).
 
+    Results are shared across users and cached per URL (one hour, failures one
+    minute), so repeated previews of a page don't fetch it again.
+
     Rate limited: 30 requests per minute (session), 250 per day (sensitive operation).
     """
     url_str = str(url)
-    scraped = await scrape_url(url_str)
+    scrape = partial(
+        scrape_url,
+        url_str,
+        max_html_bytes=settings.scrape_max_html_bytes,
+        max_pdf_bytes=settings.scrape_max_pdf_bytes,
+    )
+    scrape_cache = get_scrape_cache()
+    scraped = await (
+        scrape() if scrape_cache is None else scrape_cache.get_or_scrape(url_str, scrape)
+    )
 
     if scraped.error:
         return MetadataPreviewResponse(
@@ -142,6 +172,31 @@ async def create_bookmark(
     return response_data
 
 
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def bulk_create_bookmarks(
+    request: Request,
+    data: BulkCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session),
+    limits: TierLimits = Depends(get_current_limits),
+) -> BulkCreateResponse:
+    """
+    Create up to 1000 bookmarks in one request (e.g., an import).
+
+    Items take the same fields as `POST /bookmarks/` (except `relationships`) and get
+    the same checks. Each item is reported in `results` by position, with its new
+    ID or the error it hit; failed items do not affect the rest. URLs
+    repeated within the request are created once.
+    """
+    return await bulk_create(
+        bookmark_service, BookmarkCreate, data,
+        db=db,
+        user_id=current_user.id,
+        limits=limits,
+        context=get_request_context(request),
+    )
+
+
 def _content_to_bookmark_list_item(item: ContentListItem) -> BookmarkListItem:
     """Map unified ContentListItem to BookmarkListItem."""
     return BookmarkListItem(
@@ -162,7 +217,11 @@ def _content_to_bookmark_list_item(item: ContentListItem) -> BookmarkListItem:
     )
 
 
-@router.get("/", response_model=BookmarkListResponse)
+@router.get(
+    "/",
+    response_model=BookmarkListResponse,
+    dependencies=[Depends(query_budget(12))],
+)
 async def list_bookmarks(
     q: str | None = Query(
         default=None,
@@ -182,6 +241,14 @@ async def list_bookmarks(
     ),
     offset: int = Query(default=0, ge=0, description="Pagination offset"),
     limit: int = Query(default=50, ge=1, le=100, description="Pagination limit"),
+    cursor: str | None = Query(
+        default=None,
+        description="Keyset cursor from a previous page's next_cursor. Replaces offset.",
+    ),
+    include_total: bool = Query(
+        default=True,
+        description="Compute the exact total. Pass false to skip the count query (total=null).",
+    ),
     view: list[ViewOption] = Query(default=["active"], description="Views to include. Pass multiple for combined results, e.g. view=active&view=archived"),  # noqa: E501
     filter_id: UUID | None = Query(default=None, description="Filter by content filter ID"),
     current_user: User = Depends(get_current_user),
@@ -200,6 +267,9 @@ async def list_bookmarks(
     - **sort_order**: Sort direction. Takes precedence over filter_id's default.
     - **view**: Views to include - 'active' (default), 'archived', 'deleted'. Supports multiple.
     - **filter_id**: Filter by content filter (can be combined with tags for additional filtering)
+    - **cursor**: Pass the previous page's `next_cursor` to seek directly to the next
+      page (constant cost regardless of depth). Cannot be combined with `offset`.
+    - **include_total**: Pass false to skip the total count (e.g. infinite scroll).
     """
     view_set = validate_view(view)
 
@@ -208,7 +278,7 @@ async def list_bookmarks(
     )
 
     try:
-        content_items, total = await search_all_content(
+        page = await search_content_page(
             db=db,
             user_id=current_user.id,
             query=q,
@@ -221,21 +291,27 @@ async def list_bookmarks(
             view=view_set,
             filter_expression=resolved.filter_expression,
             content_types=["bookmark"],
+            cursor=cursor,
+            include_total=include_total,
         )
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
-    items = [_content_to_bookmark_list_item(item) for item in content_items]
-    has_more = offset + len(items) < total
+    items = [_content_to_bookmark_list_item(item) for item in page.items]
     return BookmarkListResponse(
         items=items,
-        total=total,
+        total=page.total,
         offset=offset,
         limit=limit,
-        has_more=has_more,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
-@router.get("/{bookmark_id}", response_model=BookmarkResponse)
+@router.get(
+    "/{bookmark_id}",
+    response_model=BookmarkResponse,
+    dependencies=[Depends(query_budget(15))],
+)
 async def get_bookmark(
     bookmark_id: UUID,
     request: Request,
@@ -266,26 +342,35 @@ async def get_bookmark(
     `updated_at`, so a `Last-Modified`-only request can wrongly get `304`. See
     "Caching & conditional requests" in the API overview.
     """
-    # Quick check: can we return 304?
-    updated_at = await bookmark_service.get_updated_at(
-        db, current_user.id, bookmark_id, include_deleted=True,
+    # Quick check: can we return 304? (one query; no content, tags, or relationships)
+    validator = await bookmark_service.get_cache_validator(
+        db, current_user.id, bookmark_id,
     )
-    if updated_at is None:
+    if validator is None:
         raise HTTPException(status_code=404, detail="Bookmark not found")
+    updated_at = validator.updated_at
+    etag = resource_etag(request, validator.version)
 
-    not_modified = check_not_modified(request, updated_at)
+    not_modified = (
+        check_etag_not_modified(request, etag) or check_not_modified(request, updated_at)
+    )
     if not_modified:
         return not_modified  # type: ignore[return-value]
 
-    # Full fetch
-    bookmark = await bookmark_service.get(
-        db, current_user.id, bookmark_id, include_archived=True, include_deleted=True,
-    )
+    # Full fetch (only the requested lines of content for partial reads)
+    try:
+        bookmark = await bookmark_service.get_with_line_range(
+            db, current_user.id, bookmark_id, start_line, end_line,
+            include_archived=True, include_deleted=True,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if bookmark is None:
         raise HTTPException(status_code=404, detail="Bookmark not found")
 
-    # Set Last-Modified header
+    # Set Last-Modified header, and the ETag so the middleware needn't hash the body
     response.headers["Last-Modified"] = format_http_date(updated_at)
+    response.headers["ETag"] = etag
 
     response_data = BookmarkResponse.model_validate(bookmark)
     apply_partial_read(response_data, start_line, end_line)
@@ -410,7 +495,8 @@ async def search_in_bookmark(
             "Valid fields: content, title, description",
         )
 
-    # Perform search
+    # Perform search (content lines are located via the cached line index)
+    index = bookmark_service.line_index(bookmark) if "content" in field_list else None
     matches = search_in_content(
         content=bookmark.content,
         title=bookmark.title,
@@ -419,6 +505,7 @@ async def search_in_bookmark(
         fields=field_list,
         case_sensitive=case_sensitive,
         context_lines=context_lines,
+        offsets=index.offsets if index is not None else None,
     )
 
     return ContentSearchResponse(
@@ -573,6 +660,7 @@ async def str_replace_bookmark(
     bookmark.updated_at = func.clock_timestamp()
     await db.flush()
     await db.refresh(bookmark)
+    await invalidate_public_share(db, EntityType.BOOKMARK, bookmark.public_token)
 
     # Record history for str-replace (content changed)
     await db.refresh(bookmark, attribute_names=["tag_objects"])
@@ -793,6 +881,14 @@ async def get_bookmark_history(
     bookmark_id: UUID,
     limit: int = Query(default=50, ge=1, le=100, description="Number of records to return"),
     offset: int = Query(default=0, ge=0, description="Number of records to skip"),
+    cursor: str | None = Query(
+        default=None,
+        description="Keyset cursor from a previous page's next_cursor. Replaces offset.",
+    ),
+    include_total: bool = Query(
+        default=True,
+        description="Compute the exact total. Pass false to skip the count query (total=null).",
+    ),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_session),
 ) -> HistoryListResponse:
@@ -806,13 +902,18 @@ async def get_bookmark_history(
     - Bookmark was hard-deleted (history cascade-deleted)
     - No history exists for this bookmark_id
     """
-    items, total = await history_service.get_entity_history(
-        db, current_user.id, EntityType.BOOKMARK, bookmark_id, limit, offset,
-    )
+    try:
+        page = await history_service.get_entity_history_page(
+            db, current_user.id, EntityType.BOOKMARK, bookmark_id,
+            limit=limit, offset=offset, cursor=cursor, include_total=include_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     return HistoryListResponse(
-        items=[HistoryResponse.model_validate(item) for item in items],
-        total=total,
+        items=[HistoryResponse.model_validate(item) for item in page.items],
+        total=page.total,
         offset=offset,
         limit=limit,
-        has_more=offset + len(items) < total,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
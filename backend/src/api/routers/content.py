@@ -8,19 +8,24 @@ from datetime import datetime
 from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.dependencies import get_async_session, get_current_user
 from api.helpers import resolve_filter_and_sorting, validate_view
+from core.query_budget import query_budget
 from models.user import User
 from schemas.content import ContentListResponse, ViewOption
-from services.content_service import search_all_content
+from services.content_service import search_content_page
 
 router = APIRouter(prefix="/content", tags=["content"])
 
 
-@router.get("/", response_model=ContentListResponse)
+@router.get(
+    "/",
+    response_model=ContentListResponse,
+    dependencies=[Depends(query_budget(12))],
+)
 async def list_all_content(
     q: str | None = Query(
         default=None, description="Search query for title, description, content",
@@ -44,6 +49,14 @@ async def list_all_content(
     ),
     offset: int = Query(default=0, ge=0, description="Pagination offset"),
     limit: int = Query(default=50, ge=1, le=100, description="Pagination limit"),
+    cursor: str | None = Query(
+        default=None,
+        description="Keyset cursor from a previous page's next_cursor. Replaces offset.",
+    ),
+    include_total: bool = Query(
+        default=True,
+        description="Compute the exact total. Pass false to skip the count query (total=null).",
+    ),
     view: list[ViewOption] = Query(
         default=["active"],
         description="Views to include. Pass multiple, e.g. view=active&view=archived",
@@ -80,6 +93,9 @@ async def list_all_content(
       Partial words and code symbols also match via substring.
     - **sort_by**: Sort field. Defaults to relevance when searching.
       Takes precedence over filter_id's default.
+    - **cursor**: Pass the previous page's `next_cursor` to seek directly to the next
+      page (constant cost regardless of depth). Cannot be combined with `offset`.
+    - **include_total**: Pass false to skip the total count (e.g. infinite scroll).
 
     Use this endpoint for:
     - Shared "All", "Archived", and "Trash" views (no filter_id)
@@ -105,28 +121,34 @@ async def list_all_content(
     else:
         effective_content_types = [ct for ct in content_types if ct in resolved.content_types]
 
-    items, total = await search_all_content(
-        db=db,
-        user_id=current_user.id,
-        query=q,
-        tags=tags,
-        tag_match=tag_match,
-        sort_by=resolved.sort_by,
-        sort_order=resolved.sort_order,
-        offset=offset,
-        limit=limit,
-        view=view_set,
-        filter_expression=resolved.filter_expression,
-        content_types=effective_content_types,
-        is_public=is_public,
-        shared_after=shared_after,
-        shared_before=shared_before,
-    )
+    try:
+        page = await search_content_page(
+            db=db,
+            user_id=current_user.id,
+            query=q,
+            tags=tags,
+            tag_match=tag_match,
+            sort_by=resolved.sort_by,
+            sort_order=resolved.sort_order,
+            offset=offset,
+            limit=limit,
+            view=view_set,
+            filter_expression=resolved.filter_expression,
+            content_types=effective_content_types,
+            is_public=is_public,
+            shared_after=shared_after,
+            shared_before=shared_before,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
     return ContentListResponse(
-        items=items,
-        total=total,
+        items=page.items,
+        total=page.total,
         offset=offset,
         limit=limit,
-        has_more=(offset + len(items)) < total,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
@@ -23,6 +23,7 @@ from schemas.note import NoteUpdate
 from schemas.prompt import PromptArgument, PromptUpdate
 from schemas.relationship import RelationshipInput
 from services.bookmark_service import BookmarkService, DuplicateUrlError
+from services.exceptions import InvalidCursorError
 from services.history_service import HistoryService, history_service
 from services.note_service import NoteService
 from services.prompt_service import NameConflictError, PromptService
@@ -190,6 +191,14 @@ async def get_user_history(
     ),
     limit: int = Query(default=50, ge=1, le=100, description="Number of records to return"),
     offset: int = Query(default=0, ge=0, description="Number of records to skip"),
+    cursor: str | None = Query(
+        default=None,
+        description="Keyset cursor from a previous page's next_cursor. Replaces offset.",
+    ),
+    include_total: bool = Query(
+        default=True,
+        description="Compute the exact total. Pass false to skip the count query (total=null).",
+    ),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_session),
 ) -> HistoryListResponse:
@@ -206,6 +215,11 @@ async def get_user_history(
     - start_date/end_date: Filter by date range (inclusive)
 
     All filters combine with AND logic between categories.
+
+    Pagination:
+    - cursor: Pass the previous page's `next_cursor` to seek directly to the next
+      page (constant cost regardless of depth). Cannot be combined with `offset`.
+    - include_total: Pass false to skip the total count (e.g. infinite scroll).
     """
     # Validate date range - require timezone-aware datetimes
     if start_date and start_date.tzinfo is None:
@@ -224,23 +238,29 @@ async def get_user_history(
             detail="start_date must be before or equal to end_date",
         )
 
-    items, total = await history_service.get_user_history(
-        db,
-        current_user.id,
-        entity_types=content_type,
-        actions=action,
-        sources=source,
-        start_date=start_date,
-        end_date=end_date,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        page = await history_service.get_user_history_page(
+            db,
+            current_user.id,
+            entity_types=content_type,
+            actions=action,
+            sources=source,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     return HistoryListResponse(
-        items=[HistoryResponse.model_validate(item) for item in items],
-        total=total,
+        items=[HistoryResponse.model_validate(item) for item in page.items],
+        total=page.total,
         offset=offset,
         limit=limit,
-        has_more=offset + len(items) < total,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -250,6 +270,14 @@ async def get_entity_history(
     content_id: UUID,
     limit: int = Query(default=50, ge=1, le=100, description="Number of records to return"),
     offset: int = Query(default=0, ge=0, description="Number of records to skip"),
+    cursor: str | None = Query(
+        default=None,
+        description="Keyset cursor from a previous page's next_cursor. Replaces offset.",
+    ),
+    include_total: bool = Query(
+        default=True,
+        description="Compute the exact total. Pass false to skip the count query (total=null).",
+    ),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_session),
 ) -> HistoryListResponse:
@@ -264,15 +292,20 @@ async def get_entity_history(
     - Content never existed
     - No history exists for this content_id
     """
-    items, total = await history_service.get_entity_history(
-        db, current_user.id, content_type, content_id, limit, offset,
-    )
+    try:
+        page = await history_service.get_entity_history_page(
+            db, current_user.id, content_type, content_id,
+            limit=limit, offset=offset, cursor=cursor, include_total=include_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     return HistoryListResponse(
-        items=[HistoryResponse.model_validate(item) for item in items],
-        total=total,
+        items=[HistoryResponse.model_validate(item) for item in page.items],
+        total=page.total,
         offset=offset,
         limit=limit,
-        has_more=offset + len(items) < total,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
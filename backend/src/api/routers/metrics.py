@@ -0,0 +1,42 @@
+"""Prometheus metrics endpoint."""
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from core.config import Settings, get_settings
+from core.metrics import REGISTRY, get_metrics_exporter
+
+router = APIRouter(tags=["metrics"], include_in_schema=False)
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(
+    authorization: str | None = Header(default=None),
+    settings: Settings = Depends(get_settings),
+) -> PlainTextResponse:
+    """
+    Request, DB, Redis, history and scrape metrics, summed over all workers.
+
+    Scrapers authenticate with `Authorization: Bearer $METRICS_TOKEN`. Empty
+    METRICS_TOKEN means metrics are not exposed: the endpoint returns 404.
+    """
+    token = settings.metrics_token
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, credentials = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        credentials.encode(), token.encode(),
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    exporter = get_metrics_exporter()
+    body = await exporter.collect() if exporter is not None else REGISTRY.render_local()
+    return PlainTextResponse(body, media_type=CONTENT_TYPE)
@@ -12,9 +12,20 @@ from api.dependencies import (
     get_current_limits,
     get_current_user,
 )
-from api.helpers import check_optimistic_lock, resolve_filter_and_sorting, validate_view
+from api.helpers import (
+    bulk_create,
+    check_optimistic_lock,
+    resolve_filter_and_sorting,
+    validate_view,
+)
 from core.auth import get_request_context
-from core.http_cache import check_not_modified, format_http_date
+from core.http_cache import (
+    check_etag_not_modified,
+    check_not_modified,
+    format_http_date,
+    resource_etag,
+)
+from core.query_budget import query_budget
 from core.tier_limits import TierLimits
 from models.user import User
 from services.exceptions import FieldLimitExceededError
@@ -28,6 +39,7 @@ from schemas.errors import (
     StrReplaceSuccess,
     StrReplaceSuccessMinimal,
 )
+from schemas.bulk import BulkCreateRequest, BulkCreateResponse
 from schemas.history import HistoryListResponse, HistoryResponse
 from schemas.note import (
     NoteCreate,
@@ -43,12 +55,13 @@ from services.content_edit_service import (
 )
 from services.content_lines import apply_partial_read
 from services.content_search_service import search_in_content
-from services.exceptions import InvalidStateError
+from services.exceptions import InvalidCursorError, InvalidStateError
 from services.relationship_service import embed_relationships
 from services.history_service import history_service
 from schemas.content import ContentListItem, ViewOption
-from services.content_service import search_all_content
+from services.content_service import search_content_page
 from services.note_service import NoteService
+from services.public_share_cache import invalidate_public_share
 from models.content_history import ActionType, EntityType
 
 router = APIRouter(prefix="/notes", tags=["notes"])
@@ -72,6 +85,30 @@ async def create_note(
     return response_data
 
 
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def bulk_create_notes(
+    request: Request,
+    data: BulkCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session),
+    limits: TierLimits = Depends(get_current_limits),
+) -> BulkCreateResponse:
+    """
+    Create up to 1000 notes in one request (e.g., an import).
+
+    Items take the same fields as `POST /notes/` (except `relationships`) and get
+    the same checks. Each item is reported in `results` by position, with its new
+    ID or the error it hit; failed items do not affect the rest.
+    """
+    return await bulk_create(
+        note_service, NoteCreate, data,
+        db=db,
+        user_id=current_user.id,
+        limits=limits,
+        context=get_request_context(request),
+    )
+
+
 def _content_to_note_list_item(item: ContentListItem) -> NoteListItem:
     """Map unified ContentListItem to NoteListItem."""
     return NoteListItem(
@@ -90,7 +127,11 @@ def _content_to_note_list_item(item: ContentListItem) -> NoteListItem:
     )
 
 
-@router.get("/", response_model=NoteListResponse)
+@router.get(
+    "/",
+    response_model=NoteListResponse,
+    dependencies=[Depends(query_budget(12))],
+)
 async def list_notes(
     q: str | None = Query(
         default=None,
@@ -113,6 +154,14 @@ async def list_notes(
     ),
     offset: int = Query(default=0, ge=0, description="Pagination offset"),
     limit: int = Query(default=50, ge=1, le=100, description="Pagination limit"),
+    cursor: str | None = Query(
+        default=None,
+        description="Keyset cursor from a previous page's next_cursor. Replaces offset.",
+    ),
+    include_total: bool = Query(
+        default=True,
+        description="Compute the exact total. Pass false to skip the count query (total=null).",
+    ),
     view: list[ViewOption] = Query(
         default=["active"],
         description="Views to include. Pass multiple, e.g. view=active&view=archived",
@@ -134,6 +183,9 @@ async def list_notes(
     - **sort_order**: Sort direction. Takes precedence over filter_id's default.
     - **view**: Which notes to show - 'active' (not deleted/archived), 'archived', or 'deleted'
     - **filter_id**: Filter by content filter (can be combined with tags for additional filtering)
+    - **cursor**: Pass the previous page's `next_cursor` to seek directly to the next
+      page (constant cost regardless of depth). Cannot be combined with `offset`.
+    - **include_total**: Pass false to skip the total count (e.g. infinite scroll).
     """
     view_set = validate_view(view)
 
@@ -142,7 +194,7 @@ async def list_notes(
     )
 
     try:
-        content_items, total = await search_all_content(
+        page = await search_content_page(
             db=db,
             user_id=current_user.id,
             query=q,
@@ -155,22 +207,28 @@ async def list_notes(
             view=view_set,
             filter_expression=resolved.filter_expression,
             content_types=["note"],
+            cursor=cursor,
+            include_total=include_total,
         )
     except ValueError as e:
         # Tag validation errors from validate_and_normalize_tags
         raise HTTPException(status_code=422, detail=str(e))
-    items = [_content_to_note_list_item(item) for item in content_items]
-    has_more = offset + len(items) < total
+    items = [_content_to_note_list_item(item) for item in page.items]
     return NoteListResponse(
         items=items,
-        total=total,
+        total=page.total,
         offset=offset,
         limit=limit,
-        has_more=has_more,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
-@router.get("/{note_id}", response_model=NoteResponse)
+@router.get(
+    "/{note_id}",
+    response_model=NoteResponse,
+    dependencies=[Depends(query_budget(15))],
+)
 async def get_note(
     note_id: UUID,
     request: Request,
@@ -201,26 +259,33 @@ async def get_note(
     `updated_at`, so a `Last-Modified`-only request can wrongly get `304`. See
     "Caching & conditional requests" in the API overview.
     """
-    # Quick check: can we return 304?
-    updated_at = await note_service.get_updated_at(
-        db, current_user.id, note_id, include_deleted=True,
-    )
-    if updated_at is None:
+    # Quick check: can we return 304? (one query; no content, tags, or relationships)
+    validator = await note_service.get_cache_validator(db, current_user.id, note_id)
+    if validator is None:
         raise HTTPException(status_code=404, detail="Note not found")
+    updated_at = validator.updated_at
+    etag = resource_etag(request, validator.version)
 
-    not_modified = check_not_modified(request, updated_at)
+    not_modified = (
+        check_etag_not_modified(request, etag) or check_not_modified(request, updated_at)
+    )
     if not_modified:
         return not_modified  # type: ignore[return-value]
 
-    # Full fetch
-    note = await note_service.get(
-        db, current_user.id, note_id, include_archived=True, include_deleted=True,
-    )
+    # Full fetch (only the requested lines of content for partial reads)
+    try:
+        note = await note_service.get_with_line_range(
+            db, current_user.id, note_id, start_line, end_line,
+            include_archived=True, include_deleted=True,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if note is None:
         raise HTTPException(status_code=404, detail="Note not found")
 
-    # Set Last-Modified header
+    # Set Last-Modified header, and the ETag so the middleware needn't hash the body
     response.headers["Last-Modified"] = format_http_date(updated_at)
+    response.headers["ETag"] = etag
 
     response_data = NoteResponse.model_validate(note)
     apply_partial_read(response_data, start_line, end_line)
@@ -343,7 +408,8 @@ async def search_in_note(
             "Valid fields: content, title, description",
         )
 
-    # Perform search
+    # Perform search (content lines are located via the cached line index)
+    index = note_service.line_index(note) if "content" in field_list else None
     matches = search_in_content(
         content=note.content,
         title=note.title,
@@ -352,6 +418,7 @@ async def search_in_note(
         fields=field_list,
         case_sensitive=case_sensitive,
         context_lines=context_lines,
+        offsets=index.offsets if index is not None else None,
     )
 
     return ContentSearchResponse(
@@ -496,6 +563,7 @@ async def str_replace_note(
     note.updated_at = func.clock_timestamp()
     await db.flush()
     await db.refresh(note)
+    await invalidate_public_share(db, EntityType.NOTE, note.public_token)
 
     # Record history for str-replace (content changed)
     await db.refresh(note, attribute_names=["tag_objects"])
@@ -713,6 +781,14 @@ async def get_note_history(
     note_id: UUID,
     limit: int = Query(default=50, ge=1, le=100, description="Number of records to return"),
     offset: int = Query(default=0, ge=0, description="Number of records to skip"),
+    cursor: str | None = Query(
+        default=None,
+        description="Keyset cursor from a previous page's next_cursor. Replaces offset.",
+    ),
+    include_total: bool = Query(
+        default=True,
+        description="Compute the exact total. Pass false to skip the count query (total=null).",
+    ),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_session),
 ) -> HistoryListResponse:
@@ -726,13 +802,18 @@ async def get_note_history(
     - Note was hard-deleted (history cascade-deleted)
     - No history exists for this note_id
     """
-    items, total = await history_service.get_entity_history(
-        db, current_user.id, EntityType.NOTE, note_id, limit, offset,
-    )
+    try:
+        page = await history_service.get_entity_history_page(
+            db, current_user.id, EntityType.NOTE, note_id,
+            limit=limit, offset=offset, cursor=cursor, include_total=include_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     return HistoryListResponse(
-        items=[HistoryResponse.model_validate(item) for item in items],
-        total=total,
+        items=[HistoryResponse.model_validate(item) for item in page.items],
+        total=page.total,
         offset=offset,
         limit=limit,
-        has_more=offset + len(items) < total,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
@@ -4,6 +4,7 @@ import io
 import tarfile
 import time
 import zipfile
+from collections.abc import AsyncIterator
 from typing import TYPE_CHECKING, Literal
 from uuid import UUID
 
@@ -22,17 +23,26 @@ from api.dependencies import (
     get_current_user,
 )
 from api.helpers import (
+    bulk_create,
     check_optimistic_lock,
     check_optimistic_lock_by_name,
     resolve_filter_and_sorting,
     validate_view,
 )
 from core.auth import get_request_context
-from core.http_cache import check_not_modified, format_http_date
+from core.compression import skip_compression
+from core.http_cache import (
+    check_etag_not_modified,
+    check_not_modified,
+    format_http_date,
+    resource_etag,
+)
+from core.query_budget import query_budget
 from core.tier_limits import TierLimits
 from models.user import User
 from services.exceptions import FieldLimitExceededError
 from schemas.content_search import ContentSearchMatch, ContentSearchResponse
+from schemas.bulk import BulkCreateRequest, BulkCreateResponse
 from schemas.history import HistoryListResponse, HistoryResponse
 from schemas.errors import (
     ContentEmptyError,
@@ -58,16 +68,17 @@ from services.content_edit_service import (
     NoMatchError,
     str_replace,
 )
-from services.content_service import search_all_content
+from services.content_service import search_content_page
 from services.content_lines import apply_partial_read
 from services.content_search_service import search_in_content
-from services.exceptions import InvalidStateError
+from services.exceptions import InvalidCursorError, InvalidStateError
 from services.relationship_service import embed_relationships
 from services.history_service import history_service
 from services.prompt_service import NameConflictError, PromptService, validate_template
+from services.public_share_cache import invalidate_public_share
 from models.content_history import ActionType, EntityType
 from core.request_context import RequestContext
-from services.skill_converter import ClientType, prompt_to_skill_md
+from services.skill_converter import ClientType, SkillExport, prompt_to_skill_md
 from services.template_renderer import TemplateError, render_template
 
 router = APIRouter(prefix="/prompts", tags=["prompts"])
@@ -199,6 +210,7 @@ async def _perform_str_replace(
     prompt.updated_at = func.clock_timestamp()
     await db.flush()
     await db.refresh(prompt)
+    await invalidate_public_share(db, EntityType.PROMPT, prompt.public_token)
 
     # changed_fields = the fields whose values actually differ from the prior
     # version (used by the frontend version-diff UI). Non-empty by construction:
@@ -269,6 +281,31 @@ async def create_prompt(
     return response_data
 
 
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def bulk_create_prompts(
+    request: Request,
+    data: BulkCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session),
+    limits: TierLimits = Depends(get_current_limits),
+) -> BulkCreateResponse:
+    """
+    Create up to 1000 prompts in one request (e.g., an import).
+
+    Items take the same fields as `POST /prompts/` (except `relationships`) and get
+    the same checks. Each item is reported in `results` by position, with its new
+    ID or the error it hit; failed items do not affect the rest. Names
+    repeated within the request are created once.
+    """
+    return await bulk_create(
+        prompt_service, PromptCreate, data,
+        db=db,
+        user_id=current_user.id,
+        limits=limits,
+        context=get_request_context(request),
+    )
+
+
 def _content_to_prompt_list_item(item: ContentListItem) -> PromptListItem:
     """Map unified ContentListItem to PromptListItem."""
     return PromptListItem(
@@ -289,7 +326,11 @@ def _content_to_prompt_list_item(item: ContentListItem) -> PromptListItem:
     )
 
 
-@router.get("/", response_model=PromptListResponse)
+@router.get(
+    "/",
+    response_model=PromptListResponse,
+    dependencies=[Depends(query_budget(12))],
+)
 async def list_prompts(
     q: str | None = Query(
         default=None,
@@ -312,6 +353,14 @@ async def list_prompts(
     ),
     offset: int = Query(default=0, ge=0, description="Pagination offset"),
     limit: int = Query(default=50, ge=1, le=100, description="Pagination limit"),
+    cursor: str | None = Query(
+        default=None,
+        description="Keyset cursor from a previous page's next_cursor. Replaces offset.",
+    ),
+    include_total: bool = Query(
+        default=True,
+        description="Compute the exact total. Pass false to skip the count query (total=null).",
+    ),
     view: list[ViewOption] = Query(
         default=["active"],
         description="Views to include. Pass multiple, e.g. view=active&view=archived",
@@ -333,6 +382,9 @@ async def list_prompts(
     - **sort_order**: Sort direction. Takes precedence over filter_id's default.
     - **view**: Views to include - 'active' (default), 'archived', 'deleted'. Supports multiple.
     - **filter_id**: Filter by content filter (can be combined with tags for additional filtering)
+    - **cursor**: Pass the previous page's `next_cursor` to seek directly to the next
+      page (constant cost regardless of depth). Cannot be combined with `offset`.
+    - **include_total**: Pass false to skip the total count (e.g. infinite scroll).
     """
     view_set = validate_view(view)
 
@@ -341,7 +393,7 @@ async def list_prompts(
     )
 
     try:
-        content_items, total = await search_all_content(
+        page = await search_content_page(
             db=db,
             user_id=current_user.id,
             query=q,
@@ -354,18 +406,20 @@ async def list_prompts(
             view=view_set,
             filter_expression=resolved.filter_expression,
             content_types=["prompt"],
+            cursor=cursor,
+            include_total=include_total,
         )
     except ValueError as e:
         # Tag validation errors from validate_and_normalize_tags
         raise HTTPException(status_code=400, detail=str(e))
-    items = [_content_to_prompt_list_item(item) for item in content_items]
-    has_more = offset + len(items) < total
+    items = [_content_to_prompt_list_item(item) for item in page.items]
     return PromptListResponse(
         items=items,
-        total=total,
+        total=page.total,
         offset=offset,
         limit=limit,
-        has_more=has_more,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -403,22 +457,32 @@ async def get_prompt_by_name(
     `updated_at`, so a `Last-Modified`-only request can wrongly get `304`. See
     "Caching & conditional requests" in the API overview.
     """
-    # Quick check: can we return 304?
-    updated_at = await prompt_service.get_updated_at_by_name(db, current_user.id, name)
-    if updated_at is None:
+    # Quick check: can we return 304? (one query; no content, tags, or relationships)
+    validator = await prompt_service.get_cache_validator_by_name(db, current_user.id, name)
+    if validator is None:
         raise HTTPException(status_code=404, detail="Prompt not found")
+    updated_at = validator.updated_at
+    etag = resource_etag(request, validator.version)
 
-    not_modified = check_not_modified(request, updated_at)
+    not_modified = (
+        check_etag_not_modified(request, etag) or check_not_modified(request, updated_at)
+    )
     if not_modified:
         return not_modified  # type: ignore[return-value]
 
-    # Full fetch
-    prompt = await prompt_service.get_by_name(db, current_user.id, name)
+    # Full fetch (only the requested lines of content for partial reads)
+    try:
+        prompt = await prompt_service.get_by_name_with_line_range(
+            db, current_user.id, name, start_line, end_line,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if prompt is None:
         raise HTTPException(status_code=404, detail="Prompt not found")
 
-    # Set Last-Modified header
+    # Set Last-Modified header, and the ETag so the middleware needn't hash the body
     response.headers["Last-Modified"] = format_http_date(updated_at)
+    response.headers["ETag"] = etag
 
     response_data = PromptResponse.model_validate(prompt)
     apply_partial_read(response_data, start_line, end_line)
@@ -573,53 +637,98 @@ async def str_replace_prompt_by_name(
     return await _perform_str_replace(db, prompt, data, include_updated_entity, limits, context)
 
 
-def _build_skills_dict(
-    prompts: list["Prompt"],
+async def _iter_skills(  # noqa: PLR0917
+    db: AsyncSession,
+    user_id: UUID,
     client: ClientType,
-) -> dict[str, str]:
+    tags: list[str],
+    tag_match: Literal["all", "any"],
+    view: ViewOption,
+) -> AsyncIterator[SkillExport]:
     """
-    Convert prompts to skills and deduplicate by directory name.
+    Yield one skill per directory name, reading prompts a page at a time.
 
-    If multiple prompts truncate to the same directory name, the last one wins.
-    This ensures deterministic archive contents regardless of extraction tool.
-
-    Returns:
-        Dict mapping directory_name to SKILL.md content.
+    If multiple prompts truncate to the same directory name, the last one
+    (in name, id order) wins. This ensures deterministic archive contents
+    regardless of extraction tool. Such prompts arrive consecutively (see
+    list_for_export), so only the pending skill is held back.
     """
-    skills: dict[str, str] = {}
-    for prompt in prompts:
-        skill = prompt_to_skill_md(prompt, client)
-        skills[skill.directory_name] = skill.content
-    return skills
-
-
-def _create_tar_gz(prompts: list["Prompt"], client: ClientType) -> io.BytesIO:
-    """Create a tar.gz archive containing SKILL.md files for each prompt."""
-    skills = _build_skills_dict(prompts, client)
-    buffer = io.BytesIO()
-    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
-        for directory_name, content in skills.items():
-            content_bytes = content.encode("utf-8")
-            info = tarfile.TarInfo(name=f"{directory_name}/SKILL.md")
+    pending: SkillExport | None = None
+    after: tuple[str, UUID] | None = None
+    while True:
+        prompts = await prompt_service.list_for_export(
+            db=db,
+            user_id=user_id,
+            tags=tags if tags else None,  # None = no tag filter
+            tag_match=tag_match,
+            view=view,
+            after=after,
+            limit=EXPORT_PAGE_SIZE,
+        )
+        for prompt in prompts:
+            skill = prompt_to_skill_md(prompt, client)
+            if pending is not None and pending.directory_name != skill.directory_name:
+                yield pending
+            pending = skill
+        if len(prompts) < EXPORT_PAGE_SIZE:
+            break
+        after = (prompts[-1].name, prompts[-1].id)
+    if pending is not None:
+        yield pending
+
+
+class _ArchiveBuffer:
+    """Write-only file object collecting archive output between response chunks."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        """Collect data written by the archive writer."""
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        """Nothing to flush; data is handed out by drain()."""
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _stream_tar_gz(skills: AsyncIterator[SkillExport]) -> AsyncIterator[bytes]:
+    """Stream a tar.gz archive containing SKILL.md files for each skill."""
+    buffer = _ArchiveBuffer()
+    mtime = int(time.time())
+    # "w|gz" writes a non-seekable stream, member by member
+    with tarfile.open(fileobj=buffer, mode="w|gz") as tar:
+        async for skill in skills:
+            content_bytes = skill.content.encode("utf-8")
+            info = tarfile.TarInfo(name=f"{skill.directory_name}/SKILL.md")
             info.size = len(content_bytes)
-            info.mtime = int(time.time())
+            info.mtime = mtime
             tar.addfile(info, io.BytesIO(content_bytes))
-    buffer.seek(0)
-    return buffer
+            if chunk := buffer.drain():
+                yield chunk
+    yield buffer.drain()
 
 
-def _create_zip(prompts: list["Prompt"], client: ClientType) -> io.BytesIO:
-    """Create a zip archive containing flat .md skill files for each prompt."""
-    skills = _build_skills_dict(prompts, client)
-    buffer = io.BytesIO()
+async def _stream_zip(skills: AsyncIterator[SkillExport]) -> AsyncIterator[bytes]:
+    """Stream a zip archive containing flat .md skill files for each skill."""
+    buffer = _ArchiveBuffer()
+    # The buffer has no tell()/seek(), so zipfile writes sizes in data
+    # descriptors after each member instead of seeking back to the header
     with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-        for skill_name, content in skills.items():
-            zf.writestr(f"{skill_name}.md", content)
-    buffer.seek(0)
-    return buffer
+        async for skill in skills:
+            zf.writestr(f"{skill.directory_name}.md", skill.content)
+            if chunk := buffer.drain():
+                yield chunk
+    yield buffer.drain()
 
 
-@router.get("/export/skills")
+@router.get("/export/skills", dependencies=[Depends(skip_compression)])
 async def export_skills(
     client: ClientType = Query(..., description="Target client for export"),
     tags: list[str] = Query(
@@ -655,44 +764,33 @@ async def export_skills(
     Client-specific constraints:
     - claude-code/claude-desktop: name max 64 chars, desc max 1024 chars
     - codex: name max 100 chars, desc max 500 chars (single-line only)
-    """
-    # Collect all matching prompts (handle pagination internally)
-    all_prompts: list["Prompt"] = []  # noqa: UP037
-    offset = 0
 
-    while True:
-        prompts, total = await prompt_service.list_for_export(
-            db=db,
-            user_id=current_user.id,
-            tags=tags if tags else None,  # None = no tag filter
-            tag_match=tag_match,
-            view=view,
-            offset=offset,
-            limit=EXPORT_PAGE_SIZE,
-        )
-        all_prompts.extend(prompts)
-        if len(all_prompts) >= total:
-            break
-        offset += EXPORT_PAGE_SIZE
+    The archive is streamed as prompts are read, so the download starts
+    immediately and memory use doesn't grow with the number of prompts. It
+    is already compressed, so response compression is skipped.
+    """
+    skills = _iter_skills(db, current_user.id, client, tags, tag_match, view)
 
     # Determine archive format based on client
     if client == "claude-desktop":
-        archive = _create_zip(all_prompts, client)
         return StreamingResponse(
-            archive,
+            _stream_zip(skills),
             media_type="application/zip",
             headers={"Content-Disposition": "attachment; filename=skills.zip"},
         )
 
-    archive = _create_tar_gz(all_prompts, client)
     return StreamingResponse(
-        archive,
+        _stream_tar_gz(skills),
         media_type="application/gzip",
         headers={"Content-Disposition": "attachment; filename=skills.tar.gz"},
     )
 
 
-@router.get("/{prompt_id}", response_model=PromptResponse)
+@router.get(
+    "/{prompt_id}",
+    response_model=PromptResponse,
+    dependencies=[Depends(query_budget(15))],
+)
 async def get_prompt(
     prompt_id: UUID,
     request: Request,
@@ -723,26 +821,33 @@ async def get_prompt(
     `updated_at`, so a `Last-Modified`-only request can wrongly get `304`. See
     "Caching & conditional requests" in the API overview.
     """
-    # Quick check: can we return 304?
-    updated_at = await prompt_service.get_updated_at(
-        db, current_user.id, prompt_id, include_deleted=True,
-    )
-    if updated_at is None:
+    # Quick check: can we return 304? (one query; no content, tags, or relationships)
+    validator = await prompt_service.get_cache_validator(db, current_user.id, prompt_id)
+    if validator is None:
         raise HTTPException(status_code=404, detail="Prompt not found")
+    updated_at = validator.updated_at
+    etag = resource_etag(request, validator.version)
 
-    not_modified = check_not_modified(request, updated_at)
+    not_modified = (
+        check_etag_not_modified(request, etag) or check_not_modified(request, updated_at)
+    )
     if not_modified:
         return not_modified  # type: ignore[return-value]
 
-    # Full fetch
-    prompt = await prompt_service.get(
-        db, current_user.id, prompt_id, include_archived=True, include_deleted=True,
-    )
+    # Full fetch (only the requested lines of content for partial reads)
+    try:
+        prompt = await prompt_service.get_with_line_range(
+            db, current_user.id, prompt_id, start_line, end_line,
+            include_archived=True, include_deleted=True,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if prompt is None:
         raise HTTPException(status_code=404, detail="Prompt not found")
 
-    # Set Last-Modified header
+    # Set Last-Modified header, and the ETag so the middleware needn't hash the body
     response.headers["Last-Modified"] = format_http_date(updated_at)
+    response.headers["ETag"] = etag
 
     response_data = PromptResponse.model_validate(prompt)
     apply_partial_read(response_data, start_line, end_line)
@@ -867,7 +972,8 @@ async def search_in_prompt(
             "Valid fields: content, title, description",
         )
 
-    # Perform search
+    # Perform search (content lines are located via the cached line index)
+    index = prompt_service.line_index(prompt) if "content" in field_list else None
     matches = search_in_content(
         content=prompt.content,
         title=prompt.title,
@@ -876,6 +982,7 @@ async def search_in_prompt(
         fields=field_list,
         case_sensitive=case_sensitive,
         context_lines=context_lines,
+        offsets=index.offsets if index is not None else None,
     )
 
     return ContentSearchResponse(
@@ -1225,6 +1332,14 @@ async def get_prompt_history(
     prompt_id: UUID,
     limit: int = Query(default=50, ge=1, le=100, description="Number of records to return"),
     offset: int = Query(default=0, ge=0, description="Number of records to skip"),
+    cursor: str | None = Query(
+        default=None,
+        description="Keyset cursor from a previous page's next_cursor. Replaces offset.",
+    ),
+    include_total: bool = Query(
+        default=True,
+        description="Compute the exact total. Pass false to skip the count query (total=null).",
+    ),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_session),
 ) -> HistoryListResponse:
@@ -1238,13 +1353,18 @@ async def get_prompt_history(
     - Prompt was hard-deleted (history cascade-deleted)
     - No history exists for this prompt_id
     """
-    items, total = await history_service.get_entity_history(
-        db, current_user.id, EntityType.PROMPT, prompt_id, limit, offset,
-    )
+    try:
+        page = await history_service.get_entity_history_page(
+            db, current_user.id, EntityType.PROMPT, prompt_id,
+            limit=limit, offset=offset, cursor=cursor, include_total=include_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     return HistoryListResponse(
-        items=[HistoryResponse.model_validate(item) for item in items],
-        total=total,
+        items=[HistoryResponse.model_validate(item) for item in page.items],
+        total=page.total,
         offset=offset,
         limit=limit,
-        has_more=offset + len(items) < total,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
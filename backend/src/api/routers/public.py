@@ -6,21 +6,28 @@ Items are served by share token (``public_token``) with no authentication. The
 user identity, sharing/lifecycle internals). Soft-deleted items return 404;
 archived items return 200 with ``is_archived = true``.
 
-Caching is handled by ``ETagMiddleware``, which applies the public cache headers
-to ``/public/*`` paths. Each read is rate-limited per client IP (these endpoints
+Rendered responses are cached by share token in ``PublicShareCache`` (see
+services/public_share_cache.py); every owner-side write that changes what a
+token serves invalidates its entry, so revocation stays immediate. The GET
+reads set their own ETag (the cached body's hash) and answer revalidation
+themselves; ``ETagMiddleware`` applies the public cache headers to
+``/public/*`` paths. Each read is rate-limited per client IP (these endpoints
 have no user context for the tier-based limits).
 """
 import logging
+from collections.abc import Awaitable, Callable
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.dependencies import get_async_session, get_current_limits, get_current_user
 from core.auth import get_request_context
+from core.http_cache import check_etag_not_modified
 from core.rate_limiter import check_ip_rate_limit
 from core.request_utils import resolve_client_ip
 from core.tier_limits import TierLimits
+from models.content_history import EntityType
 from models.user import User
 from schemas.bookmark import BookmarkCreate, BookmarkResponse, PublicBookmarkResponse
 from schemas.note import NoteCreate, NoteResponse, PublicNoteResponse
@@ -34,6 +41,7 @@ from services.bookmark_service import (
 from services.content_lines import apply_partial_read
 from services.note_service import NoteService
 from services.prompt_service import NameConflictError, PromptService
+from services.public_share_cache import CachedPublicItem, get_public_share_cache
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +84,32 @@ async def enforce_public_ip_rate_limit(request: Request) -> None:
         )
 
 
+async def _public_response(
+    request: Request,
+    content_type: str,
+    token: str,
+    render: Callable[[], Awaitable[CachedPublicItem | None]],
+) -> Response:
+    """
+    Serve a public read from the share cache, rendering it on a miss.
+
+    `render` loads the item and returns its rendered response, or None if
+    the token serves nothing (404). Without a cache (no app lifespan, e.g.
+    some tests) every read renders.
+    """
+    cache = get_public_share_cache()
+    if cache is not None:
+        item = await cache.get_or_load(content_type, token, render)
+    else:
+        item = await render()
+    if item is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    not_modified = check_etag_not_modified(request, item.etag)
+    if not_modified:
+        return not_modified
+    return Response(item.body, media_type="application/json", headers={"ETag": item.etag})
+
+
 @router.get(
     "/bookmarks/{token}",
     response_model=PublicBookmarkResponse,
@@ -83,15 +117,21 @@ async def enforce_public_ip_rate_limit(request: Request) -> None:
 )
 async def read_public_bookmark(
     token: str,
+    request: Request,
     db: AsyncSession = Depends(get_async_session),
-) -> PublicBookmarkResponse:
+) -> Response:
     """Return a published bookmark by share token (404 if not found/unpublished/deleted)."""
-    bookmark = await public_item_service.get_public_bookmark(db, token)
-    if bookmark is None:
-        raise HTTPException(status_code=404, detail="Not found")
-    response = PublicBookmarkResponse.model_validate(bookmark)
-    apply_partial_read(response, None, None)
-    return response
+    async def render() -> CachedPublicItem | None:
+        bookmark = await public_item_service.get_public_bookmark(db, token)
+        if bookmark is None:
+            return None
+        response = PublicBookmarkResponse.model_validate(bookmark)
+        apply_partial_read(response, None, None)
+        return CachedPublicItem.from_body(
+            response.model_dump_json().encode(), bookmark.archived_at,
+        )
+
+    return await _public_response(request, EntityType.BOOKMARK, token, render)
 
 
 @router.get(
@@ -101,15 +141,21 @@ async def read_public_bookmark(
 )
 async def read_public_note(
     token: str,
+    request: Request,
     db: AsyncSession = Depends(get_async_session),
-) -> PublicNoteResponse:
+) -> Response:
     """Return a published note by share token (404 if not found/unpublished/deleted)."""
-    note = await public_item_service.get_public_note(db, token)
-    if note is None:
-        raise HTTPException(status_code=404, detail="Not found")
-    response = PublicNoteResponse.model_validate(note)
-    apply_partial_read(response, None, None)
-    return response
+    async def render() -> CachedPublicItem | None:
+        note = await public_item_service.get_public_note(db, token)
+        if note is None:
+            return None
+        response = PublicNoteResponse.model_validate(note)
+        apply_partial_read(response, None, None)
+        return CachedPublicItem.from_body(
+            response.model_dump_json().encode(), note.archived_at,
+        )
+
+    return await _public_response(request, EntityType.NOTE, token, render)
 
 
 @router.get(
@@ -119,15 +165,21 @@ async def read_public_note(
 )
 async def read_public_prompt(
     token: str,
+    request: Request,
     db: AsyncSession = Depends(get_async_session),
-) -> PublicPromptResponse:
+) -> Response:
     """Return a published prompt by share token (404 if not found/unpublished/deleted)."""
-    prompt = await public_item_service.get_public_prompt(db, token)
-    if prompt is None:
-        raise HTTPException(status_code=404, detail="Not found")
-    response = PublicPromptResponse.model_validate(prompt)
-    apply_partial_read(response, None, None)
-    return response
+    async def render() -> CachedPublicItem | None:
+        prompt = await public_item_service.get_public_prompt(db, token)
+        if prompt is None:
+            return None
+        response = PublicPromptResponse.model_validate(prompt)
+        apply_partial_read(response, None, None)
+        return CachedPublicItem.from_body(
+            response.model_dump_json().encode(), prompt.archived_at,
+        )
+
+    return await _public_response(request, EntityType.PROMPT, token, render)
 
 
 # --- Clone ("Save a copy") endpoints -----------------------------------------
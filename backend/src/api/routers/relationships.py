@@ -13,6 +13,8 @@ from models.content_history import ActionType, EntityType
 from models.user import User
 from schemas.relationship import (
     RelationshipCreate,
+    RelationshipGraphNode,
+    RelationshipGraphResponse,
     RelationshipListResponse,
     RelationshipResponse,
     RelationshipUpdate,
@@ -27,6 +29,7 @@ from services.exceptions import (
 from services.history_service import history_service
 from services.note_service import NoteService
 from services.prompt_service import PromptService
+from services.public_share_cache import invalidate_public_share
 from services import relationship_service
 
 router = APIRouter(prefix="/relationships", tags=["relationships"])
@@ -51,9 +54,8 @@ async def _record_relationship_history(
     Bump entity updated_at and record a metadata-only history entry for a relationship change.
 
     NOTE: _notify_affected_targets in relationship_service.py implements the same
-    logic for the inline sync path. If changing the record_action call signature,
-    changed_fields value, or content passthrough (current=previous=entity.content),
-    update both.
+    logic, batched, for the inline sync path. If changing the action, changed_fields
+    value, or content passthrough (current=previous=entity.content), update both.
     """
     et = EntityType(entity_type)
     service = _entity_services[et]
@@ -61,6 +63,8 @@ async def _record_relationship_history(
     if entity is None:
         return
     entity.updated_at = func.clock_timestamp()
+    # updated_at is part of the public share payload
+    await invalidate_public_share(db, et, entity.public_token)
     context = get_request_context(request)
     current_metadata = await service.get_metadata_snapshot(db, user_id, entity)
     await history_service.record_action(
@@ -123,7 +127,7 @@ async def create_relationship(
     return RelationshipResponse.model_validate(rel)
 
 
-# Fixed-prefix route declared before wildcard /{relationship_id} routes
+# Fixed-prefix routes declared before wildcard /{relationship_id} routes
 # to prevent path parameter matching conflicts.
 @router.get(
     "/content/{content_type}/{content_id}",
@@ -170,6 +174,75 @@ async def get_content_relationships(
     )
 
 
+@router.get(
+    "/graph/{content_type}/{content_id}",
+    response_model=RelationshipGraphResponse,
+)
+async def get_relationship_graph(
+    content_type: Literal['bookmark', 'note', 'prompt'],
+    content_id: UUID,
+    depth: int = Query(
+        default=2, ge=1, le=relationship_service.GRAPH_MAX_DEPTH,
+        description="Maximum hops from the item",
+    ),
+    fan_out: int = Query(
+        default=25, ge=1, le=relationship_service.GRAPH_MAX_FAN_OUT,
+        description="Maximum relationships followed from each item (newest first)",
+    ),
+    max_nodes: int = Query(
+        default=100, ge=1, le=relationship_service.GRAPH_MAX_NODES,
+        description="Maximum items returned (closest first)",
+    ),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session),
+) -> RelationshipGraphResponse:
+    """
+    Get the items within `depth` hops of a content item and the relationships between them.
+
+    Relationships are followed in both directions. `truncated` is true when
+    items or relationships were left out because of `max_nodes` or the
+    relationship cap.
+    """
+    graph = await relationship_service.get_relationship_graph(
+        db, current_user.id, content_type, content_id,
+        depth=depth, fan_out=fan_out, max_nodes=max_nodes,
+    )
+    edges = await relationship_service.enrich_with_content_info(
+        db, current_user.id, graph.relationships,
+    ) if graph.relationships else []
+
+    # Content info comes from the enriched edges; every item except an
+    # unrelated root appears in at least one of them.
+    info: dict[tuple[str, UUID], RelationshipGraphNode] = {}
+    for edge in edges:
+        for side in ('source', 'target'):
+            key = (getattr(edge, f'{side}_type'), getattr(edge, f'{side}_id'))
+            info.setdefault(key, RelationshipGraphNode(
+                content_type=key[0],
+                content_id=key[1],
+                depth=0,
+                title=getattr(edge, f'{side}_title'),
+                url=getattr(edge, f'{side}_url'),
+                prompt_name=getattr(edge, f'{side}_prompt_name'),
+                deleted=getattr(edge, f'{side}_deleted'),
+                archived=getattr(edge, f'{side}_archived'),
+            ))
+    nodes = [
+        info.get(key, RelationshipGraphNode(content_type=key[0], content_id=key[1], depth=0))
+        .model_copy(update={'depth': node_depth})
+        for key, node_depth in graph.nodes.items()
+    ]
+
+    return RelationshipGraphResponse(
+        root_type=content_type,
+        root_id=content_id,
+        depth=depth,
+        nodes=nodes,
+        edges=edges,
+        truncated=graph.truncated,
+    )
+
+
 @router.get("/{relationship_id}", response_model=RelationshipResponse)
 async def get_relationship(
     relationship_id: UUID,
@@ -249,6 +322,7 @@ async def delete_relationship(
     # Delete directly — we already have the object, no need to re-fetch
     await db.delete(rel)
     await db.flush()
+    await relationship_service.invalidate_graph_cache(db, current_user.id)
 
     # Record history on both source and target entities
     await _record_relationship_history(
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.dependencies import get_async_session, get_current_user
+from core.query_budget import query_budget
 from models.user import User
 from schemas.tag import TagListResponse, TagRenameRequest, TagResponse
 from services.tag_service import (
@@ -19,7 +20,11 @@ from services.tag_service import (
 router = APIRouter(prefix="/tags", tags=["tags"])
 
 
-@router.get("/", response_model=TagListResponse)
+@router.get(
+    "/",
+    response_model=TagListResponse,
+    dependencies=[Depends(query_budget(10))],
+)
 async def list_tags(
     include_inactive: bool = False,
     content_types: list[Literal["bookmark", "note", "prompt"]] | None = Query(
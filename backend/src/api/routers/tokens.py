@@ -1,4 +1,5 @@
 """API Token (PAT) management endpoints."""
+import logging
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -9,11 +10,14 @@ from api.dependencies import (
     get_current_limits_session_only,
     get_current_user_session_only,
 )
+from core.auth_cache import get_auth_cache
 from core.tier_limits import TierLimits
 from models.user import User
 from schemas.token import TokenCreate, TokenCreateResponse, TokenRenameRequest, TokenResponse
 from services import token_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/tokens", tags=["tokens"])
 
 
@@ -89,6 +93,21 @@ async def delete_token(
 
     **Authentication: session only (PATs not accepted - returns 403)**
     """
-    deleted = await token_service.delete_token(db, current_user.id, token_id)
-    if not deleted:
+    token_hash = await token_service.revoke_token(db, current_user.id, token_id)
+    if token_hash is None:
         raise HTTPException(status_code=404, detail="Token not found")
+
+    # Commit BEFORE invalidating the cached token (the consent router's
+    # established pattern): invalidating first lets a concurrent request
+    # re-read the still-visible row and re-cache the token being revoked.
+    await db.commit()
+
+    auth_cache = get_auth_cache()
+    if auth_cache and not await auth_cache.invalidate_token(token_hash):
+        # Redis fail-open: the row is gone, so cache misses already reject the
+        # token, but a cached entry may keep it usable for up to one TTL.
+        logger.error(
+            "token_revoke_cache_invalidation_failed token_id=%s: revoked token "
+            "may stay cached for up to one TTL",
+            token_id,
+        )
@@ -15,6 +15,7 @@ The Auth0 path is removed at decommission (M6b).
 """
 import logging
 from typing import Annotated
+from uuid import UUID
 
 import jwt
 from fastapi import Depends, Header, HTTPException, Request, status
@@ -40,6 +41,7 @@ from db.session import get_async_session
 from models.content_history import SOURCE_MAX_LENGTH
 from models.deleted_identity import DeletedIdentity
 from models.user import User
+from schemas.cached_token import CachedToken
 from schemas.cached_user import CachedUser
 from services import token_service, user_service
 
@@ -631,47 +633,121 @@ async def get_or_create_dev_user(db: AsyncSession) -> User:
     )
 
 
-async def validate_pat(db: AsyncSession, token: str) -> User:
+async def validate_pat(db: AsyncSession, token: str) -> User | CachedUser:
     """
     Validate a Personal Access Token (PAT) and return the associated user.
 
+    Both lookups go through the auth cache: the token by its hash (token id,
+    owner, expiry) and the owner by user ID, so a warm PAT request touches the
+    database not at all. The last_used_at write is buffered (see
+    services/token_usage.py). After populating either cache entry from the
+    database, the token's existence is rechecked — see
+    _recheck_token_after_cache_populate.
+
     Args:
         db: Database session.
         token: The plaintext PAT (starts with 'bm_').
 
     Returns:
-        User associated with the token.
+        User associated with the token (User ORM on cache miss, CachedUser on hit).
 
     Raises:
         HTTPException: If token is invalid, expired, or revoked.
     """
-    api_token = await token_service.validate_token(db, token)
-
-    if api_token is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
+    token_hash = token_service.hash_token(token)
+    auth_cache = get_auth_cache()
+    populated_cache = False
+
+    cached_token = await auth_cache.get_by_token_hash(token_hash) if auth_cache else None
+    if cached_token is None:
+        api_token = await token_service.get_token_by_hash(db, token_hash)
+        if api_token is None:
+            raise _invalid_pat()
+        cached_token = CachedToken(
+            id=api_token.id,
+            user_id=api_token.user_id,
+            expires_at=api_token.expires_at,
         )
+        if auth_cache:
+            await auth_cache.set_token(token_hash, cached_token)
+            populated_cache = True
 
-    # Load the user associated with this token (with consent for enforcement check)
-    result = await db.execute(
-        select(User)
-        .options(joinedload(User.consent))
-        .where(User.id == api_token.user_id),
-    )
-    user = result.scalar_one_or_none()
+    if cached_token.is_expired():
+        raise _invalid_pat()
+
+    await token_service.record_token_use(db, cached_token.id)
 
+    user: User | CachedUser | None = (
+        await auth_cache.get_by_user_id(cached_token.user_id) if auth_cache else None
+    )
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
+        # Load the user associated with this token (with consent for enforcement check)
+        result = await db.execute(
+            select(User)
+            .options(joinedload(User.consent))
+            .where(User.id == cached_token.user_id),
         )
+        user = result.scalar_one_or_none()
+
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if auth_cache:
+            await auth_cache.set(user)
+            populated_cache = True
+
+    if populated_cache:
+        await _recheck_token_after_cache_populate(db, token_hash, cached_token.id, user)
 
     return user
 
 
+def _invalid_pat() -> HTTPException:
+    """Build the generic 401 for an unknown, expired, or revoked PAT."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def _recheck_token_after_cache_populate(
+    db: AsyncSession,
+    token_hash: str,
+    token_id: UUID,
+    user: User | CachedUser,
+) -> None:
+    """
+    Post-population token recheck — the PAT analogue of
+    _recheck_tombstone_after_cache_populate. If the token was revoked (or its
+    owner deleted, which cascades to tokens) between our read and the cache
+    write, this fresh statement no longer sees the row and we evict what we
+    just cached; if that commit lands after this check instead, its own
+    post-commit invalidation (api/routers/tokens.py, api/routers/webhooks.py)
+    removes the entries. Cache hits skip this, as on the JWT path.
+    """
+    if await token_service.token_exists(db, token_id):
+        return
+    auth_cache = get_auth_cache()
+    if auth_cache:
+        evicted = await auth_cache.invalidate_token(token_hash)
+        evicted = await auth_cache.invalidate(
+            user.id,
+            auth0_id=user.auth0_id,
+            external_auth_id=user.external_auth_id,
+        ) and evicted
+        if not evicted:
+            logger.error(
+                "token_recheck_eviction_failed token_id=%s: stale cache entry "
+                "may persist for up to one TTL",
+                token_id,
+            )
+    raise _invalid_pat()
+
+
 def _check_consent(user: User | CachedUser, settings: Settings) -> None:
     """
     Verify user has valid consent.
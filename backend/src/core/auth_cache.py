@@ -1,9 +1,19 @@
 """Authentication caching for reduced database load."""
+import asyncio
+import contextlib
 import json
 import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import UUID
 
+from redis.exceptions import RedisError
+
+from schemas.cached_token import CachedToken
 from schemas.cached_user import CachedUser
 
 if TYPE_CHECKING:
@@ -31,6 +41,19 @@ logger = logging.getLogger(__name__)
 #   v6: Added external_auth_id; auth0_id became optional (Clerk dual-accept)
 CACHE_SCHEMA_VERSION = 6
 
+# Pub/sub channel carrying invalidated cache keys (JSON list) to every worker.
+INVALIDATION_CHANNEL = f"auth:v{CACHE_SCHEMA_VERSION}:invalidate"
+
+
+@dataclass
+class AuthCacheStats:
+    """Hit/miss counters per cache tier (L1 = in-process, L2 = Redis)."""
+
+    l1_hits: int = 0
+    l1_misses: int = 0
+    l2_hits: int = 0
+    l2_misses: int = 0
+
 
 class AuthCache:
     """
@@ -45,13 +68,58 @@ class AuthCache:
 
     Invalidation must cover every segment the user may be cached under —
     see invalidate().
+
+    Validated PATs are cached separately under `token:{token_hash}` (see
+    set_token()); revoking a token must call invalidate_token().
+
+    Two tiers sit behind the same keys: a bounded, TTL'd in-process LRU (L1)
+    in front of Redis (L2). L1 is only consulted while this worker is
+    subscribed to INVALIDATION_CHANNEL (see start()), so an invalidation on
+    any worker evicts every worker's copy. Whenever the subscription is
+    (re)established L1 is cleared, because messages published while it was
+    down are lost; with no subscription every lookup goes to Redis exactly as
+    before.
     """
 
     CACHE_TTL = 300  # 5 minutes
+    L1_TTL = 30  # Upper bound on L1 staleness if an invalidation is ever missed
+    L1_MAX_ENTRIES = 10_000
+    L1_RESUBSCRIBE_DELAY = 1.0  # Seconds between subscription attempts
 
     def __init__(self, redis_client: "RedisClient") -> None:
         """Initialize auth cache with Redis client."""
         self._redis = redis_client
+        self._l1: OrderedDict[str, tuple[float, CachedUser | CachedToken]] = OrderedDict()
+        self._l1_active = False
+        # Bumped on every local eviction. A Redis read only populates L1 if no
+        # eviction happened while it was in flight, so a value read just before
+        # an invalidation cannot be re-cached after it.
+        self._generation = 0
+        self._listener: asyncio.Task[None] | None = None
+        self._stats = AuthCacheStats()
+
+    async def start(self) -> None:
+        """Start listening for invalidations; enables L1 once subscribed."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the invalidation listener and drop L1."""
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        self._disable_l1()
+
+    @property
+    def l1_active(self) -> bool:
+        """Whether lookups are currently served from the in-process tier."""
+        return self._l1_active
+
+    def stats(self) -> AuthCacheStats:
+        """Return a snapshot of the per-tier hit/miss counters."""
+        return replace(self._stats)
 
     def _cache_key_auth0(self, auth0_id: str) -> str:
         """Generate cache key for Auth0 ID lookup (transitional; removed in M6b)."""
@@ -65,6 +133,10 @@ class AuthCache:
         """Generate cache key for user ID lookup."""
         return f"auth:v{CACHE_SCHEMA_VERSION}:user:id:{user_id}"
 
+    def _cache_key_token(self, token_hash: str) -> str:
+        """Generate cache key for API token (PAT) lookup by SHA-256 hash."""
+        return f"auth:v{CACHE_SCHEMA_VERSION}:token:{token_hash}"
+
     async def get_by_auth0_id(self, auth0_id: str) -> CachedUser | None:
         """
         Get cached user by Auth0 ID.
@@ -75,13 +147,12 @@ class AuthCache:
         Returns:
             CachedUser if found in cache, None on cache miss.
         """
-        key = self._cache_key_auth0(auth0_id)
-        data = await self._redis.get(key)
-        if data:
+        cached = await self._get(self._cache_key_auth0(auth0_id))
+        if cached:
             logger.debug("auth_cache_hit auth0_id=%s", auth0_id)
-            return self._deserialize(data)
-        logger.debug("auth_cache_miss auth0_id=%s", auth0_id)
-        return None
+        else:
+            logger.debug("auth_cache_miss auth0_id=%s", auth0_id)
+        return cached
 
     async def get_by_external_auth_id(self, external_auth_id: str) -> CachedUser | None:
         """
@@ -93,13 +164,12 @@ class AuthCache:
         Returns:
             CachedUser if found in cache, None on cache miss.
         """
-        key = self._cache_key_external(external_auth_id)
-        data = await self._redis.get(key)
-        if data:
+        cached = await self._get(self._cache_key_external(external_auth_id))
+        if cached:
             logger.debug("auth_cache_hit external_auth_id=%s", external_auth_id)
-            return self._deserialize(data)
-        logger.debug("auth_cache_miss external_auth_id=%s", external_auth_id)
-        return None
+        else:
+            logger.debug("auth_cache_miss external_auth_id=%s", external_auth_id)
+        return cached
 
     async def get_by_user_id(self, user_id: UUID) -> CachedUser | None:
         """
@@ -111,13 +181,52 @@ class AuthCache:
         Returns:
             CachedUser if found in cache, None on cache miss.
         """
-        key = self._cache_key_user_id(user_id)
-        data = await self._redis.get(key)
-        if data:
+        cached = await self._get(self._cache_key_user_id(user_id))
+        if cached:
             logger.debug("auth_cache_hit user_id=%s", user_id)
-            return self._deserialize(data)
-        logger.debug("auth_cache_miss user_id=%s", user_id)
-        return None
+        else:
+            logger.debug("auth_cache_miss user_id=%s", user_id)
+        return cached
+
+    async def get_by_token_hash(self, token_hash: str) -> CachedToken | None:
+        """
+        Get a cached API token by its SHA-256 hash.
+
+        Args:
+            token_hash: hash_token() of the presented plaintext token.
+
+        Returns:
+            CachedToken if found in cache, None on cache miss. Expiry is not
+            checked here; callers must check CachedToken.is_expired().
+        """
+        cached = await self._get(self._cache_key_token(token_hash), self._deserialize_token)
+        if cached:
+            logger.debug("auth_cache_hit token_id=%s", cached.id)
+        else:
+            logger.debug("auth_cache_miss token")
+        return cached
+
+    async def _get(
+        self,
+        key: str,
+        deserialize: Callable[[bytes], CachedUser | CachedToken] | None = None,
+    ) -> CachedUser | CachedToken | None:
+        """Look up `key` in L1, then Redis, populating L1 on a Redis hit."""
+        cached = self._l1_get(key)
+        if cached:
+            self._stats.l1_hits += 1
+            return cached
+        self._stats.l1_misses += 1
+
+        generation = self._generation
+        data = await self._redis.get(key)
+        if not data:
+            self._stats.l2_misses += 1
+            return None
+        self._stats.l2_hits += 1
+        cached = (deserialize or self._deserialize)(data)
+        self._l1_put(key, cached, generation)
+        return cached
 
     async def set(self, user: "User") -> None:
         """
@@ -149,6 +258,15 @@ class AuthCache:
         cache_dict["id"] = str(cached.id)
         data = json.dumps(cache_dict)
 
+        # The data changed (e.g. email), so drop this worker's copies; L1 is
+        # repopulated from Redis on the next lookup.
+        keys = [self._cache_key_user_id(user.id)]
+        if user.auth0_id:
+            keys.append(self._cache_key_auth0(user.auth0_id))
+        if user.external_auth_id:
+            keys.append(self._cache_key_external(user.external_auth_id))
+        self._evict_local(keys)
+
         # Cache by user ID (for PAT lookups after token validation)
         await self._redis.setex(
             self._cache_key_user_id(user.id),
@@ -177,6 +295,44 @@ class AuthCache:
             user.external_auth_id,
         )
 
+    async def set_token(self, token_hash: str, token: CachedToken) -> None:
+        """
+        Cache a validated API token under its hash.
+
+        Only cache tokens read from committed rows; see
+        core/auth.validate_pat for the revocation recheck that follows.
+
+        Args:
+            token_hash: hash_token() of the plaintext token.
+            token: The token's id, owner and expiry.
+        """
+        key = self._cache_key_token(token_hash)
+        self._evict_local([key])
+        data = json.dumps({
+            "id": str(token.id),
+            "user_id": str(token.user_id),
+            "expires_at": token.expires_at.isoformat() if token.expires_at else None,
+        })
+        await self._redis.setex(key, self.CACHE_TTL, data)
+        logger.debug("auth_cache_set token_id=%s", token.id)
+
+    async def invalidate_token(self, token_hash: str) -> bool:
+        """
+        Invalidate a cached API token (on revocation) on every worker.
+
+        Call after the revoking transaction commits, for the same reason as
+        invalidate().
+
+        Returns:
+            False if Redis was unavailable and the token may still be cached.
+        """
+        keys = [self._cache_key_token(token_hash)]
+        self._evict_local(keys)
+        deleted = await self._redis.delete(*keys)
+        published = await self._redis.publish(INVALIDATION_CHANNEL, json.dumps(keys))
+        logger.debug("auth_cache_invalidate token ok=%s", deleted and published)
+        return deleted and published
+
     async def invalidate(
         self,
         user_id: UUID,
@@ -197,6 +353,9 @@ class AuthCache:
             auth0_id: Auth0 ID to also invalidate, if the user has one.
             external_auth_id: External auth ID to also invalidate, if the user has one.
 
+        The keys are evicted from this worker's L1 immediately and published on
+        INVALIDATION_CHANNEL so every other worker evicts its copy as well.
+
         Returns:
             False if Redis was unavailable and the keys may still be cached —
             the underlying client fails open, so callers for whom staleness is
@@ -209,15 +368,85 @@ class AuthCache:
             keys.append(self._cache_key_auth0(auth0_id))
         if external_auth_id:
             keys.append(self._cache_key_external(external_auth_id))
+        self._evict_local(keys)
         deleted = await self._redis.delete(*keys)
+        # A failed publish leaves other workers' L1 copies in place, so it
+        # counts as a failed invalidation just like a failed delete.
+        published = await self._redis.publish(INVALIDATION_CHANNEL, json.dumps(keys))
         logger.debug(
             "auth_cache_invalidate user_id=%s auth0_id=%s external_auth_id=%s ok=%s",
             user_id,
             auth0_id,
             external_auth_id,
-            deleted,
+            deleted and published,
         )
-        return deleted
+        return deleted and published
+
+    def _l1_get(self, key: str) -> CachedUser | CachedToken | None:
+        """Return the live L1 entry for `key`, dropping it if expired."""
+        if not self._l1_active:
+            return None
+        entry = self._l1.get(key)
+        if entry is None:
+            return None
+        expires_at, cached = entry
+        if expires_at <= time.monotonic():
+            del self._l1[key]
+            return None
+        self._l1.move_to_end(key)
+        return cached
+
+    def _l1_put(
+        self, key: str, cached: CachedUser | CachedToken, generation: int,
+    ) -> None:
+        """Store `cached` in L1 unless an eviction happened since `generation`."""
+        if not self._l1_active or generation != self._generation:
+            return
+        self._l1[key] = (time.monotonic() + self.L1_TTL, cached)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.L1_MAX_ENTRIES:
+            self._l1.popitem(last=False)
+
+    def _evict_local(self, keys: list[str]) -> None:
+        """Evict `keys` from L1 and invalidate in-flight Redis reads."""
+        self._generation += 1
+        for key in keys:
+            self._l1.pop(key, None)
+
+    def _disable_l1(self) -> None:
+        """Stop serving from L1 and drop its contents."""
+        self._l1_active = False
+        self._generation += 1
+        self._l1.clear()
+
+    async def _listen(self) -> None:
+        """
+        Apply invalidations published by any worker to this worker's L1.
+
+        Runs until cancelled. If Redis is unavailable L1 simply stays disabled;
+        on a connection error it is disabled and the subscription retried.
+        """
+        while True:
+            pubsub = self._redis.pubsub()
+            if pubsub is None:
+                return
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        # Initial subscribe or a transparent reconnect: anything
+                        # published in between was missed, so start from empty.
+                        self._disable_l1()
+                        self._l1_active = True
+                        logger.info("auth_cache_l1_enabled")
+                    elif message["type"] == "message":
+                        self._evict_local(json.loads(message["data"]))
+            except RedisError as e:
+                logger.warning("auth_cache_l1_disabled: subscription failed: %s", e)
+            finally:
+                self._disable_l1()
+                await pubsub.aclose()
+            await asyncio.sleep(self.L1_RESUBSCRIBE_DELAY)
 
     def _deserialize(self, data: bytes) -> CachedUser:
         """Deserialize cached data to CachedUser."""
@@ -226,6 +455,15 @@ class AuthCache:
         d["id"] = UUID(d["id"])
         return CachedUser(**d)
 
+    def _deserialize_token(self, data: bytes) -> CachedToken:
+        """Deserialize cached data to CachedToken."""
+        d = json.loads(data)
+        return CachedToken(
+            id=UUID(d["id"]),
+            user_id=UUID(d["user_id"]),
+            expires_at=datetime.fromisoformat(d["expires_at"]) if d["expires_at"] else None,
+        )
+
 
 # Global auth cache instance (set during app startup)
 _auth_cache: AuthCache | None = None
@@ -0,0 +1,335 @@
+"""
+Negotiated response compression (zstd, brotli or gzip).
+
+CompressionMiddleware wraps ETagMiddleware, so ETags are always computed over
+the uncompressed body and a response is compressed at most once, after the
+304 check - a revalidation that matches never touches a compressor. Each
+encoding is a separate representation and gets its own ETag: the identity
+ETag with the coding appended inside the quotes (`W/"abc"` -> `W/"abc-gzip"`).
+On the way in, that suffix is stripped from If-None-Match for the negotiated
+coding, so ETagMiddleware and route-level checks (check_etag_not_modified)
+compare identity ETags as before; on a 304 the client's own tag is restored.
+"""
+import zlib
+from dataclasses import dataclass, replace
+from typing import Protocol
+
+import brotli
+import zstandard
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Bodies smaller than this are sent uncompressed (framing overhead and CPU
+# outweigh the savings).
+DEFAULT_MINIMUM_SIZE = 1024
+
+# Levels favour speed: responses are compressed per request, not cached.
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+# Server preference when the client accepts several codings with equal q.
+_PREFERENCE = ("zstd", "br", "gzip")
+
+# scope["state"] key set by skip_compression()
+_SKIP_STATE_KEY = "skip_compression"
+
+
+class _Compressor(Protocol):
+    """Streaming compressor interface shared by the supported codings."""
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk, returning whatever output is ready."""
+        ...
+
+    def flush(self) -> bytes:
+        """Finish the stream, returning the remaining output."""
+        ...
+
+
+class _BrotliCompressor:
+    """Adapt brotli.Compressor to the compress/flush interface."""
+
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk."""
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        """Finish the stream."""
+        return self._compressor.finish()
+
+
+def _new_compressor(encoding: str) -> _Compressor:
+    """Create a streaming compressor for a negotiated coding."""
+    if encoding == "br":
+        return _BrotliCompressor()
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Pick a content coding from an Accept-Encoding header (RFC 9110 §12.5.3).
+
+    Returns the supported coding with the highest q-value (ties broken by
+    server preference), or None for identity. `*` matches any coding not
+    listed explicitly; q=0 refuses a coding.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    best: str | None = None
+    best_q = 0.0
+    for coding in _PREFERENCE:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def _is_compressible(content_type: str) -> bool:
+    """Whether a media type is text-like and worth compressing."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False  # Buffering in the compressor would stall the event stream
+    return (
+        media_type.startswith("text/")
+        or media_type in ("application/json", "application/javascript", "application/xml")
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the `encoding` representation of a response with identity ETag `etag`."""
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def skip_compression(request: Request) -> None:
+    """
+    Route dependency that opts a response out of compression.
+
+    For streaming endpoints whose chunks must reach the client as they are
+    produced, or whose body is already compressed.
+    """
+    setattr(request.state, _SKIP_STATE_KEY, True)
+
+
+@dataclass
+class CompressionStats:
+    """Counters for negotiated response compression."""
+
+    compressed: int = 0  # Responses sent with a content coding
+    skipped_small: int = 0  # Compressible responses under the size threshold
+    bytes_in: int = 0  # Uncompressed bytes of compressed responses
+    bytes_out: int = 0  # Bytes those responses put on the wire
+
+
+_compression_stats = CompressionStats()
+
+
+def get_compression_stats() -> CompressionStats:
+    """Return a snapshot of the compression counters."""
+    return replace(_compression_stats)
+
+
+class CompressionMiddleware:
+    """
+    Compress text and JSON responses with the coding the client prefers.
+
+    Responses are left alone when the client accepts no supported coding,
+    the body is under `minimum_size`, the media type is not text-like, the
+    route set its own Content-Encoding, or the route opted out with the
+    skip_compression dependency. Streamed bodies are compressed chunk by
+    chunk; a single-message body is sent uncompressed if compression would
+    not make it smaller.
+
+    Must wrap ETagMiddleware (be added after it) so ETags are computed on
+    the identity body - see the module docstring.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = DEFAULT_MINIMUM_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Negotiate a coding and compress the response if it qualifies."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        client_etags = _strip_encoding_from_if_none_match(scope, encoding)
+        responder = _CompressionResponder(send, scope, encoding, self.minimum_size, client_etags)
+        await self.app(scope, receive, responder.send)
+
+
+def _strip_encoding_from_if_none_match(scope: Scope, encoding: str) -> dict[str, str]:
+    """
+    Rewrite If-None-Match so inner layers see identity ETags.
+
+    The scope is updated in place, so outer middlewares still see what the
+    router adds to it (MetricsMiddleware reads the matched route). Returns
+    a map from each stripped ETag to the tag the client actually sent, for
+    restoring it on a 304.
+    """
+    suffix = f'-{encoding}"'
+    client_etags: dict[str, str] = {}
+    headers = []
+    for name, value in scope["headers"]:
+        if name != b"if-none-match":
+            headers.append((name, value))
+            continue
+        tags = []
+        for raw_tag in value.decode("latin-1").split(","):
+            tag = raw_tag.strip()
+            if tag.endswith(suffix):
+                identity = f'{tag[:-len(suffix)]}"'
+                client_etags.setdefault(identity, tag)
+                tag = identity
+            tags.append(tag)
+        headers.append((name, ", ".join(tags).encode("latin-1")))
+    if client_etags:
+        scope["headers"] = headers
+    return client_etags
+
+
+class _CompressionResponder:
+    """Per-response state for CompressionMiddleware."""
+
+    def __init__(
+        self,
+        send: Send,
+        scope: Scope,
+        encoding: str,
+        minimum_size: int,
+        client_etags: dict[str, str],
+    ) -> None:
+        self._send = send
+        self._scope = scope
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._client_etags = client_etags
+        self._start: Message | None = None
+        self._compressor: _Compressor | None = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        """Intercept response messages."""
+        if message["type"] == "http.response.start":
+            await self._on_start(message)
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+        if self._compressor is None:
+            await self._on_first_body(message)
+            return
+        await self._send_compressed(message)
+
+    async def _on_start(self, message: Message) -> None:
+        """Hold the start message of a compressible response until its size is known."""
+        headers = Headers(raw=message["headers"])
+        if message["status"] == 304:
+            self._restore_client_etag(message)
+        if (
+            message["status"] < 200
+            or message["status"] in (204, 304)
+            or "content-encoding" in headers
+            or not _is_compressible(headers.get("content-type", ""))
+            or self._scope.get("state", {}).get(_SKIP_STATE_KEY)
+        ):
+            self._passthrough = True
+            await self._send(message)
+            return
+        content_length = headers.get("content-length")
+        if content_length is not None and int(content_length) < self._minimum_size:
+            _compression_stats.skipped_small += 1
+            self._passthrough = True
+            await self._send(message)
+            return
+        self._start = message
+
+    async def _on_first_body(self, message: Message) -> None:
+        """Decide on the first body message whether to compress, and start the stream."""
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not more_body and len(body) < self._minimum_size:
+            _compression_stats.skipped_small += 1
+            await self._send_identity(message)
+            return
+
+        compressor = _new_compressor(self._encoding)
+        compressed = compressor.compress(body)
+        if not more_body:
+            compressed += compressor.flush()
+            if len(compressed) >= len(body):
+                await self._send_identity(message)
+                return
+
+        self._compressor = compressor
+        headers = MutableHeaders(scope=self._start)
+        headers["Content-Encoding"] = self._encoding
+        headers.add_vary_header("Accept-Encoding")
+        if "etag" in headers:
+            headers["ETag"] = encoded_etag(headers["etag"], self._encoding)
+        if more_body:
+            del headers["content-length"]
+        else:
+            headers["Content-Length"] = str(len(compressed))
+        _compression_stats.compressed += 1
+        _compression_stats.bytes_in += len(body)
+        _compression_stats.bytes_out += len(compressed)
+        await self._send(self._start)
+        await self._send(
+            {"type": "http.response.body", "body": compressed, "more_body": more_body},
+        )
+
+    async def _send_compressed(self, message: Message) -> None:
+        """Compress a subsequent chunk of a streamed body."""
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        compressed = self._compressor.compress(body)
+        if not more_body:
+            compressed += self._compressor.flush()
+        _compression_stats.bytes_in += len(body)
+        _compression_stats.bytes_out += len(compressed)
+        if compressed or not more_body:
+            await self._send(
+                {"type": "http.response.body", "body": compressed, "more_body": more_body},
+            )
+
+    async def _send_identity(self, message: Message) -> None:
+        """Send the held start message and a body unchanged."""
+        self._passthrough = True
+        await self._send(self._start)
+        await self._send(message)
+
+    def _restore_client_etag(self, message: Message) -> None:
+        """On a 304, answer with the encoded ETag the client sent, if it sent one."""
+        headers = MutableHeaders(scope=message)
+        etag = headers.get("etag")
+        if etag is not None and etag in self._client_etags:
+            headers["ETag"] = self._client_etags[etag]
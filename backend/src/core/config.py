@@ -1,6 +1,7 @@
 """Application configuration using pydantic-settings."""
 import socket
 from functools import lru_cache
+from typing import Literal
 from urllib.parse import urlparse
 
 from pydantic import Field, model_validator
@@ -93,6 +94,45 @@ class Settings(BaseSettings):
     redis_enabled: bool = Field(default=True, validation_alias="REDIS_ENABLED")
     redis_pool_size: int = Field(default=5, validation_alias="REDIS_POOL_SIZE")
 
+    # History diff worker pool - offloads large diff-match-patch work (services/diff_worker.py)
+    history_diff_pool: Literal["thread", "process"] = Field(
+        default="thread", validation_alias="HISTORY_DIFF_POOL",
+    )
+    history_diff_workers: int = Field(default=2, validation_alias="HISTORY_DIFF_WORKERS")
+    history_diff_offload_chars: int = Field(
+        default=32_768, validation_alias="HISTORY_DIFF_OFFLOAD_CHARS",
+    )
+    history_diff_timeout: float = Field(default=2.0, validation_alias="HISTORY_DIFF_TIMEOUT")
+
+    # URL scraping - page extraction process pool (services/extraction_worker.py)
+    scrape_extract_workers: int = Field(default=2, validation_alias="SCRAPE_EXTRACT_WORKERS")
+    scrape_extract_cpu_seconds: int = Field(
+        default=5, validation_alias="SCRAPE_EXTRACT_CPU_SECONDS",
+    )
+    scrape_extract_timeout: float = Field(
+        default=10.0, validation_alias="SCRAPE_EXTRACT_TIMEOUT",
+    )
+    # URL scraping - response body limits (HTML is truncated, larger PDFs rejected)
+    scrape_max_html_bytes: int = Field(
+        default=5 * 1024 * 1024, validation_alias="SCRAPE_MAX_HTML_BYTES",
+    )
+    scrape_max_pdf_bytes: int = Field(
+        default=25 * 1024 * 1024, validation_alias="SCRAPE_MAX_PDF_BYTES",
+    )
+
+    # Bearer token for GET /metrics (core/metrics.py). Empty means metrics
+    # are not exposed: the endpoint returns 404.
+    metrics_token: str = Field(default="", validation_alias="METRICS_TOKEN")
+
+    # Response compression (core/compression.py) - smaller bodies are sent uncompressed
+    compression_min_bytes: int = Field(default=1024, validation_alias="COMPRESSION_MIN_BYTES")
+
+    # Per-request SQL statement budgets (core/query_budget.py): "log" warns
+    # when a route exceeds its budget (staging), "raise" fails the request (tests)
+    query_budget_mode: Literal["off", "log", "raise"] = Field(
+        default="off", validation_alias="QUERY_BUDGET_MODE",
+    )
+
     # LLM models per use case
     llm_model_suggestions: str = Field(
         default="openai/gpt-5.4-nano",
@@ -4,7 +4,8 @@ from datetime import datetime, UTC
 from email.utils import formatdate, parsedate_to_datetime
 
 from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 # Headers for cacheable responses.
@@ -42,7 +43,9 @@ CACHE_HEADERS = {
 # `max-age=0, must-revalidate` forces every request to revalidate against the
 # ETag, so unpublish/rotate revoke access immediately while the ETag 304
 # path still saves bandwidth (a 304 carries no body). Do not relax to a positive
-# max-age without accepting a stale-serve window after revocation.
+# max-age without accepting a stale-serve window after revocation. The same
+# guarantee binds the server-side payload cache (services/public_share_cache.py):
+# writes that change what a token serves must call invalidate_public_share().
 PUBLIC_CACHE_HEADERS = {
     "Cache-Control": "public, max-age=0, must-revalidate",
 }
@@ -62,8 +65,44 @@ def generate_etag(content: bytes) -> str:
     Uses MD5 for speed - this is content fingerprinting, not cryptographic security.
     Weak ETags (W/ prefix) indicate semantic equivalence, not byte-for-byte identity.
     """
-    hash_value = hashlib.md5(content).hexdigest()[:16]
-    return f'W/"{hash_value}"'
+    return _format_etag(hashlib.md5(content).hexdigest())
+
+
+def _format_etag(hex_digest: str) -> str:
+    """Format an MD5 hex digest as a weak ETag."""
+    return f'W/"{hex_digest[:16]}"'
+
+
+# Part of every resource_etag(). Bump when a single-item response schema changes,
+# so strong ETags issued for the old representation stop matching.
+RESOURCE_ETAG_VERSION = 1
+
+
+def resource_etag(request: Request, validator: str) -> str:
+    """
+    Generate a strong ETag for a single-item GET from the entity's cache validator.
+
+    The request path and query string are included because they select the
+    representation (e.g. partial reads via start_line/end_line).
+    """
+    parts = f"{RESOURCE_ETAG_VERSION}|{request.url.path}|{request.url.query}|{validator}"
+    return f'"{hashlib.md5(parts.encode()).hexdigest()}"'
+
+
+def check_etag_not_modified(request: Request, etag: str) -> Response | None:
+    """
+    Return a 304 response if If-None-Match matches a route-computed ETag.
+
+    Lets single-item routes answer revalidation before loading the entity.
+    Returns None if the request should proceed with a full response.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match or not _etag_matches(etag, _parse_if_none_match(if_none_match)):
+        return None
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, **headers_for(request.url.path)},
+    )
 
 
 def _parse_if_none_match(header_value: str) -> list[str]:
@@ -97,7 +136,13 @@ def _etag_matches(etag: str, if_none_match_values: list[str]) -> bool:
     return etag in if_none_match_values
 
 
-class ETagMiddleware(BaseHTTPMiddleware):
+def _add_cache_headers(headers: MutableHeaders, path: str) -> None:
+    """Set the cache headers for a path, replacing any the route set."""
+    for name, value in headers_for(path).items():
+        headers[name] = value
+
+
+class ETagMiddleware:
     """
     Middleware that adds ETag headers to GET JSON responses.
 
@@ -106,55 +151,87 @@ class ETagMiddleware(BaseHTTPMiddleware):
 
     This saves bandwidth on unchanged responses, though the server still performs
     the full database query and JSON serialization to compute the ETag hash.
+    Routes that can validate cheaply set their own (strong) ETag and answer 304
+    themselves (see resource_etag); such responses only get the cache headers.
+
+    Pure ASGI (not BaseHTTPMiddleware): the hash is updated as each
+    `http.response.body` message passes through, and the messages are replayed
+    unchanged once the ETag is known, instead of re-buffering the body into a
+    new Response. The ETag header has to precede the body, so body messages
+    are still held until the last one arrives.
     """
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint,
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and add ETag header to response."""
         # Skip non-GET requests
-        if request.method != "GET":
-            return await call_next(request)
-
-        response = await call_next(request)
-
-        # Skip non-JSON or error responses
-        content_type = response.headers.get("content-type", "")
-        if "application/json" not in content_type or response.status_code >= 400:
-            return response
-
-        # Read response body and generate ETag
-        body = b"".join([chunk async for chunk in response.body_iterator])
-        etag = generate_etag(body)
-
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        held: list[Message] = []
+        hasher = hashlib.md5()
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Skip non-JSON or error responses
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if "application/json" in content_type and message["status"] < 400:
+                    if "etag" in headers:
+                        # ETag set by the route: no need to hash the body
+                        _add_cache_headers(MutableHeaders(scope=message), scope["path"])
+                        await send(message)
+                        return
+                    start = message
+                    return
+                await send(message)
+                return
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            hasher.update(message.get("body", b""))
+            held.append(message)
+            if message.get("more_body", False):
+                return
+            await self._send_tagged(scope, start, held, _format_etag(hasher.hexdigest()), send)
+
+        await self.app(scope, receive, send_with_etag)
+
+    @staticmethod
+    async def _send_tagged(
+        scope: Scope, start: Message, held: list[Message], etag: str, send: Send,
+    ) -> None:
+        """Send the held response with its ETag, or a 304 if the client has it."""
         # Public paths get public/no-Vary cache headers; everything else stays
         # private. Applied to BOTH the 304 and 200 branches so a public path's
         # revalidation response can't fall back to the private header set.
-        cache_headers = headers_for(request.url.path)
+        cache_headers = headers_for(scope["path"])
 
         # Check If-None-Match header (supports comma-separated lists and wildcard *)
-        if_none_match = request.headers.get("if-none-match")
-        if if_none_match:
-            if_none_match_values = _parse_if_none_match(if_none_match)
-            if _etag_matches(etag, if_none_match_values):
-                # Return 304 with caching headers (security headers added by outer middleware)
-                return Response(
-                    status_code=304,
-                    headers={"ETag": etag, **cache_headers},
-                )
-
-        # Build new response with ETag and caching headers
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and _etag_matches(etag, _parse_if_none_match(if_none_match)):
+            # Return 304 with caching headers (security headers added by outer middleware)
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": MutableHeaders({"ETag": etag, **cache_headers}).raw,
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
         # Preserve original headers (rate limit, etc.) and add our caching headers
-        headers = dict(response.headers)
+        headers = MutableHeaders(scope=start)
         headers["ETag"] = etag
-        headers.update(cache_headers)
-
-        return Response(
-            content=body,
-            status_code=response.status_code,
-            headers=headers,
-            media_type=response.media_type,
-        )
+        _add_cache_headers(headers, scope["path"])
+        await send(start)
+        for message in held:
+            await send(message)
 
 
 def format_http_date(dt: datetime) -> str:
@@ -0,0 +1,524 @@
+"""
+Prometheus-style runtime metrics, aggregated across workers through Redis.
+
+Each worker records into an in-process registry: counters and histograms
+accumulate deltas that MetricsExporter adds to one shared Redis hash every
+FLUSH_INTERVAL seconds (HINCRBYFLOAT, so totals survive worker restarts),
+and gauges - live per-worker values such as in-flight requests - are written
+to a per-worker hash that expires if the worker dies. GET /metrics flushes
+the serving worker and renders the sum over all workers in the Prometheus
+text format. Without Redis, it renders this worker's own totals.
+
+Samples are stored under their exposition-format key
+(`name{label="value",...}`), so a Redis hash field is already a line of
+output minus the value.
+
+MetricsMiddleware times each request by route template and status and, via
+a context variable, counts the DB statements and Redis commands it issued
+(record_db_statement() / record_redis_command(), called from db/session.py
+and core/redis.py).
+"""
+import asyncio
+import contextlib
+import logging
+import math
+import os
+import socket
+import time
+from bisect import bisect_left
+from collections.abc import Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from redis.exceptions import RedisError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+if TYPE_CHECKING:
+    from core.redis import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# Schema version - included in Redis keys. Bump when sample keys change
+# meaning so old totals are not mixed into new ones.
+METRICS_SCHEMA_VERSION = 1
+TOTALS_KEY = f"metrics:v{METRICS_SCHEMA_VERSION}:totals"
+GAUGES_KEY_PREFIX = f"metrics:v{METRICS_SCHEMA_VERSION}:gauges:"
+
+# Latency buckets (seconds), from cache hits to slow LLM calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Buckets for per-request call counts (DB statements, Redis commands)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Route label for requests that matched no API route (404s, CORS preflights,
+# the OpenAPI docs), so unknown paths cannot create unbounded label values.
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _sample_key(name: str, labelnames: Sequence[str], values: Sequence[str]) -> str:
+    """Exposition-format sample name with labels, e.g. `x_total{route="/a"}`."""
+    if not labelnames:
+        return name
+    labels = ",".join(
+        f'{label}="{_escape(value)}"' for label, value in zip(labelnames, values, strict=True)
+    )
+    return f"{name}{{{labels}}}"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value (integers without a trailing .0)."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    """Base class: a named metric family with fixed label names."""
+
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: "MetricsRegistry | None" = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._registry = registry if registry is not None else REGISTRY
+        self._registry.register(self)
+
+    def sample_names(self) -> tuple[str, ...]:
+        """Sample names (before labels) this family emits."""
+        return (self.name,)
+
+
+class Counter(_Metric):
+    """Monotonically increasing total, summed across workers."""
+
+    kind = "counter"
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        """Add `amount` to the counter for a label set."""
+        self._registry.add(_sample_key(self.name, self.labelnames, labelvalues), amount)
+
+
+class Gauge(_Metric):
+    """Current value held by this worker; /metrics reports the sum over workers."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: "MetricsRegistry | None" = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames, registry)
+        self.values: dict[str, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        """Increase the gauge for a label set."""
+        key = _sample_key(self.name, self.labelnames, labelvalues)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        """Decrease the gauge for a label set."""
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        """Set the gauge for a label set."""
+        self.values[_sample_key(self.name, self.labelnames, labelvalues)] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets, summed across workers."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        registry: "MetricsRegistry | None" = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(buckets)
+        # label values -> (bucket keys incl. +Inf, sum key, count key)
+        self._keys: dict[tuple[str, ...], tuple[list[str], str, str]] = {}
+
+    def sample_names(self) -> tuple[str, ...]:
+        """Sample names (before labels) this family emits."""
+        return (f"{self.name}_bucket", f"{self.name}_sum", f"{self.name}_count")
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Record one observation for a label set."""
+        registry = self._registry
+        keys = self._keys.get(labelvalues)
+        if keys is None:
+            keys = self._keys[labelvalues] = self._build_keys(labelvalues)
+            # Every bucket must be exported, including empty ones
+            for key in keys[0]:
+                registry.add(key, 0.0)
+        bucket_keys, sum_key, count_key = keys
+        # Buckets are cumulative: the observation counts in every bucket >= value
+        for key in bucket_keys[bisect_left(self.buckets, value):]:
+            registry.add(key, 1.0)
+        registry.add(sum_key, value)
+        registry.add(count_key, 1.0)
+
+    def _build_keys(self, labelvalues: tuple[str, ...]) -> tuple[list[str], str, str]:
+        """Sample keys for one label set."""
+        bucket_labels = (*self.labelnames, "le")
+        bucket_keys = [
+            _sample_key(f"{self.name}_bucket", bucket_labels, (*labelvalues, _format_value(b)))
+            for b in (*self.buckets, math.inf)
+        ]
+        return (
+            bucket_keys,
+            _sample_key(f"{self.name}_sum", self.labelnames, labelvalues),
+            _sample_key(f"{self.name}_count", self.labelnames, labelvalues),
+        )
+
+
+def _sort_key(sample: str) -> tuple[str, float]:
+    """Order samples by name and labels, with histogram buckets in `le` order."""
+    le_at = sample.rfind('le="')
+    if le_at == -1:
+        return sample, 0.0
+    raw = sample[le_at + 4:sample.index('"', le_at + 4)]
+    return sample[:le_at], math.inf if raw == "+Inf" else float(raw)
+
+
+class MetricsRegistry:
+    """The metric families of this process and their unflushed deltas."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        self._pending: dict[str, float] = {}  # Deltas not yet added to Redis
+        self._totals: dict[str, float] = {}  # This worker's totals since start
+
+    def register(self, metric: _Metric) -> None:
+        """Add a metric family (called by the metric constructors)."""
+        if any(m.name == metric.name for m in self._metrics):
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics.append(metric)
+
+    def add(self, key: str, amount: float) -> None:
+        """Add to a counter or histogram sample."""
+        self._pending[key] = self._pending.get(key, 0.0) + amount
+        self._totals[key] = self._totals.get(key, 0.0) + amount
+
+    def take_pending(self) -> dict[str, float]:
+        """Remove and return the deltas recorded since the last call."""
+        batch, self._pending = self._pending, {}
+        return batch
+
+    def restore_pending(self, batch: dict[str, float]) -> None:
+        """Merge deltas back after a failed flush."""
+        for key, amount in batch.items():
+            self._pending[key] = self._pending.get(key, 0.0) + amount
+
+    def local_totals(self) -> dict[str, float]:
+        """Counter and histogram totals recorded by this worker."""
+        return dict(self._totals)
+
+    def gauge_values(self) -> dict[str, float]:
+        """Current gauge samples of this worker."""
+        values: dict[str, float] = {}
+        for metric in self._metrics:
+            if isinstance(metric, Gauge):
+                values.update(metric.values)
+        return values
+
+    def render(self, totals: dict[str, float], gauges: dict[str, float]) -> str:
+        """Render samples in the Prometheus text exposition format (0.0.4)."""
+        samples = {**totals, **gauges}
+        by_name: dict[str, list[str]] = {}
+        for key in samples:
+            by_name.setdefault(key.split("{", 1)[0], []).append(key)
+
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            family = [key for name in metric.sample_names() for key in by_name.get(name, ())]
+            lines.extend(
+                f"{key} {_format_value(samples[key])}" for key in sorted(family, key=_sort_key)
+            )
+        return "\n".join(lines) + "\n"
+
+    def render_local(self) -> str:
+        """Render this worker's own samples."""
+        return self.render(self._totals, self.gauge_values())
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template and status.",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled.",
+    ("method",),
+)
+HTTP_REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed per request.",
+    ("route",),
+    buckets=COUNT_BUCKETS,
+)
+HTTP_REQUEST_REDIS_COMMANDS = Histogram(
+    "http_request_redis_commands",
+    "Redis round trips (commands or pipelines) per request.",
+    ("route",),
+    buckets=COUNT_BUCKETS,
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to get a connection from the SQLAlchemy pool (including opening one).",
+)
+HISTORY_RECORD_ACTION_DURATION = Histogram(
+    "history_record_action_duration_seconds",
+    "HistoryService.record_action duration, including diffing and pruning.",
+    ("action",),
+)
+HISTORY_DIFF_QUEUE_SECONDS = Histogram(
+    "history_diff_queue_seconds",
+    "Time diff work waited for a diff pool worker (0 when run inline).",
+    ("mode",),
+)
+HISTORY_DIFF_RUN_SECONDS = Histogram(
+    "history_diff_run_seconds",
+    "Diff/patch compute time, inline on the event loop or offloaded to the diff pool.",
+    ("mode",),
+)
+HISTORY_DIFF_TIMEOUTS = Counter(
+    "history_diff_timeouts_total",
+    "Offloaded reverse diffs abandoned for exceeding the diff pool timeout.",
+)
+SCRAPE_FETCH_DURATION = Histogram(
+    "scrape_fetch_duration_seconds",
+    "url_scraper fetch_url duration (validation, request and body read).",
+    ("outcome",),
+)
+SCRAPE_FETCH_BODIES = Counter(
+    "scrape_fetch_bodies_total",
+    "Response bodies handled by fetch_url, by type and result (complete, truncated, too_large).",
+    ("kind", "result"),
+)
+SCRAPE_FETCH_BODY_BYTES = Counter(
+    "scrape_fetch_body_bytes_total",
+    "Response body bytes received by fetch_url.",
+    ("kind",),
+)
+SCRAPE_FETCH_BUFFERED_BYTES_PEAK = Gauge(
+    "scrape_fetch_buffered_bytes_peak",
+    "Most body bytes one fetch_url call held in memory, per worker since start "
+    "(summed over workers: an upper bound for sizing).",
+)
+SCRAPE_EXTRACTION_RUN_SECONDS = Histogram(
+    "scrape_extraction_run_seconds",
+    "Page extraction compute time in the extraction pool (completed jobs).",
+)
+SCRAPE_EXTRACTION_FAILURES = Counter(
+    "scrape_extraction_failures_total",
+    "Extraction jobs aborted, by reason (timeout, cpu_limit, broken_pool).",
+    ("reason",),
+)
+
+
+@dataclass
+class RequestCounts:
+    """Calls made while handling the current request."""
+
+    db_statements: int = 0
+    redis_commands: int = 0
+
+
+_request_counts: ContextVar[RequestCounts | None] = ContextVar(
+    "request_counts", default=None,
+)
+
+
+def current_request_counts() -> RequestCounts | None:
+    """Counts for the request being handled, or None outside a request."""
+    return _request_counts.get()
+
+
+def record_db_statement() -> None:
+    """Count a SQL statement against the current request."""
+    counts = _request_counts.get()
+    if counts is not None:
+        counts.db_statements += 1
+
+
+def record_redis_command() -> None:
+    """Count a Redis round trip against the current request."""
+    counts = _request_counts.get()
+    if counts is not None:
+        counts.redis_commands += 1
+
+
+class MetricsMiddleware:
+    """
+    Record latency, in-flight requests and DB/Redis calls per request.
+
+    Added last (outermost) so latency covers the other middlewares too. The
+    route label is the matched route's path template (FastAPI stores the
+    route in the scope), never the raw path.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Time the request and record its metrics."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500  # If the app raises before responding
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        counts = RequestCounts()
+        token = _request_counts.set(counts)
+        HTTP_REQUESTS_IN_PROGRESS.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_PROGRESS.dec(method)
+            _request_counts.reset(token)
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            HTTP_REQUEST_DURATION.observe(elapsed, method, template, str(status))
+            HTTP_REQUEST_DB_STATEMENTS.observe(counts.db_statements, template)
+            HTTP_REQUEST_REDIS_COMMANDS.observe(counts.redis_commands, template)
+
+
+class MetricsExporter:
+    """
+    Flushes this worker's metrics to Redis and renders the cross-worker view.
+
+    Counter and histogram deltas are added to TOTALS_KEY every
+    FLUSH_INTERVAL seconds (and on stop()); a failed flush keeps them for the
+    next one. Gauges are rewritten to a per-worker hash that expires after
+    GAUGE_TTL, so a worker that dies drops out of the sums.
+    """
+
+    FLUSH_INTERVAL = 5  # seconds
+    GAUGE_TTL = 3 * FLUSH_INTERVAL
+
+    def __init__(
+        self,
+        redis_client: "RedisClient",
+        registry: MetricsRegistry | None = None,
+        worker_id: str | None = None,
+    ) -> None:
+        """Initialize the exporter with the Redis client used for aggregation."""
+        self._redis = redis_client
+        self._registry = registry if registry is not None else REGISTRY
+        self._worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._task: asyncio.Task[None] | None = None
+
+    async def flush(self) -> bool:
+        """
+        Add pending deltas to Redis and publish this worker's gauges.
+
+        Returns:
+            True if Redis took the update, False if it is unavailable (the
+            deltas are kept for the next flush).
+        """
+        batch = self._registry.take_pending()
+        pipe = await self._redis.pipeline()
+        if pipe is None:
+            self._registry.restore_pending(batch)
+            return False
+        gauges_key = f"{GAUGES_KEY_PREFIX}{self._worker_id}"
+        for key, amount in batch.items():
+            pipe.hincrbyfloat(TOTALS_KEY, key, amount)
+        gauges = self._registry.gauge_values()
+        pipe.delete(gauges_key)
+        if gauges:
+            pipe.hset(gauges_key, mapping=gauges)
+            pipe.expire(gauges_key, self.GAUGE_TTL)
+        try:
+            await pipe.execute()
+        except RedisError as e:
+            logger.warning("metrics_flush_failed samples=%d error=%s", len(batch), e)
+            self._registry.restore_pending(batch)
+            return False
+        return True
+
+    async def collect(self) -> str:
+        """Render metrics summed over all workers (this worker's alone without Redis)."""
+        if not await self.flush():
+            return self._registry.render_local()
+        raw_totals = await self._redis.hgetall(TOTALS_KEY)
+        if raw_totals is None:
+            return self._registry.render_local()
+        gauges: dict[str, float] = {}
+        for key in await self._redis.scan_keys(f"{GAUGES_KEY_PREFIX}*"):
+            for sample, value in (await self._redis.hgetall(key) or {}).items():
+                gauges[sample] = gauges.get(sample, 0.0) + float(value)
+        totals = {sample: float(value) for sample, value in raw_totals.items()}
+        return self._registry.render(totals, gauges)
+
+    async def start(self) -> None:
+        """Start the periodic flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush task and flush what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        """Flush every FLUSH_INTERVAL seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            await self.flush()
+
+
+# Global exporter instance (set during app startup). When unset, /metrics
+# renders this worker's own samples.
+_metrics_exporter: MetricsExporter | None = None
+
+
+def get_metrics_exporter() -> MetricsExporter | None:
+    """Get the global metrics exporter instance."""
+    return _metrics_exporter
+
+
+def set_metrics_exporter(exporter: MetricsExporter | None) -> None:
+    """Set the global metrics exporter instance."""
+    global _metrics_exporter  # noqa: PLW0603
+    _metrics_exporter = exporter
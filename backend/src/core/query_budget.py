@@ -0,0 +1,211 @@
+"""
+Per-request SQL statement tracking, query budgets and N+1 detection.
+
+While a QueryTracker is active (see track_queries), every statement executed
+on any engine is recorded with its normalized SQL and duration. Routes
+declare how many statements a request may run with the query_budget
+dependency; QUERY_BUDGET_MODE decides what happens when one goes over:
+
+- off: nothing is tracked (the default, for production)
+- log: a warning listing the most repeated statements (staging)
+- raise: QueryBudgetExceededError, which fails the test that made the request
+
+Repeated statements are how N+1 patterns show up: the same normalized SELECT
+run once per item instead of once per page. get_async_session logs them for
+every request when tracking is on.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import AsyncGenerator, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Depends, Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+# The same normalized statement this many times in one request is reported as
+# a likely N+1 query.
+N_PLUS_ONE_THRESHOLD = 5
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s")
+_NUMBER = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUE_LISTS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    """
+    Reduce a statement to its shape: literals and bind parameters become `?`.
+
+    Parameter lists (`IN ($1, $2, $3)`) and multi-row VALUES collapse to
+    `(...)`, so the same query with a different number of ids normalizes to
+    the same string.
+    """
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _VALUE_LIST.sub("(...)", sql)
+    return _VALUE_LISTS.sub("(...)", sql)
+
+
+@dataclass(frozen=True)
+class QueryRecord:
+    """One executed statement."""
+
+    sql: str
+    duration: float
+
+
+@dataclass
+class QueryTracker:
+    """
+    Statements executed while this tracker was active.
+
+    Trackers nest: a statement recorded here is also recorded in the tracker
+    that was active when this one started, so a test can count the queries
+    of a request whose route also tracks them.
+    """
+
+    parent: "QueryTracker | None" = None
+    statements: list[QueryRecord] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        """Number of statements executed."""
+        return len(self.statements)
+
+    @property
+    def total_seconds(self) -> float:
+        """Time spent executing statements."""
+        return sum(record.duration for record in self.statements)
+
+    def record(self, sql: str, duration: float) -> None:
+        """Record a statement here and in every enclosing tracker."""
+        tracker: QueryTracker | None = self
+        while tracker is not None:
+            tracker.statements.append(QueryRecord(sql, duration))
+            tracker = tracker.parent
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> dict[str, int]:
+        """Statements executed at least `threshold` times, most repeated first."""
+        counts = Counter(record.sql for record in self.statements)
+        return {sql: n for sql, n in counts.most_common() if n >= threshold}
+
+    def summary(self, limit: int = 5) -> str:
+        """The `limit` most executed statements, one per line with count and total time."""
+        counts = Counter(record.sql for record in self.statements)
+        seconds: Counter[str] = Counter()
+        for record in self.statements:
+            seconds[record.sql] += record.duration
+        return "\n".join(
+            f"  {n}x {seconds[sql] * 1000:.1f}ms {sql}"
+            for sql, n in counts.most_common(limit)
+        )
+
+
+_query_tracker: ContextVar[QueryTracker | None] = ContextVar("query_tracker", default=None)
+
+
+def current_query_tracker() -> QueryTracker | None:
+    """The innermost active tracker, or None when queries are not being tracked."""
+    return _query_tracker.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryTracker]:
+    """Record the statements executed in this block (and in tasks it starts)."""
+    tracker = QueryTracker(parent=_query_tracker.get())
+    token = _query_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _query_tracker.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(
+    _conn: Any, _cursor: Any, _statement: str, _parameters: Any, context: Any, _executemany: bool,
+) -> None:
+    """Note when a tracked statement starts."""
+    if _query_tracker.get() is not None:
+        context.query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _finish_statement(
+    _conn: Any, _cursor: Any, statement: str, _parameters: Any, context: Any, _executemany: bool,
+) -> None:
+    """Record a tracked statement with its duration."""
+    tracker = _query_tracker.get()
+    started = getattr(context, "query_started_at", None)
+    if tracker is None or started is None:
+        return
+    tracker.record(normalize_sql(statement), time.perf_counter() - started)
+
+
+class QueryBudgetExceededError(Exception):
+    """A request ran more SQL statements than its route allows."""
+
+
+def check_query_budget(
+    tracker: QueryTracker, max_statements: int, mode: str, label: str,
+) -> None:
+    """Log or raise (per `mode`) if `tracker` ran more than `max_statements`."""
+    if mode == "off" or tracker.count <= max_statements:
+        return
+    message = (
+        f"{label} ran {tracker.count} SQL statements (budget {max_statements}):\n"
+        f"{tracker.summary()}"
+    )
+    if mode == "raise":
+        raise QueryBudgetExceededError(message)
+    logger.warning("Query budget exceeded: %s", message)
+
+
+def report_repeated_queries(tracker: QueryTracker) -> None:
+    """Log statements repeated often enough to look like an N+1 pattern."""
+    repeated = tracker.repeated()
+    if repeated:
+        logger.warning(
+            "Possible N+1 queries (%d statements in request):\n%s",
+            tracker.count,
+            "\n".join(f"  {n}x {sql}" for sql, n in repeated.items()),
+        )
+
+
+def query_budget(max_statements: int) -> Callable[..., AsyncGenerator[None]]:
+    """
+    Route dependency declaring how many SQL statements one request may run.
+
+    Usage: `@router.get(..., dependencies=[Depends(query_budget(8))])`. The
+    count covers everything the request does, including authentication and
+    the final commit. Declared in the route decorator, it is resolved before
+    (and torn down after) the route's other dependencies.
+    """
+    async def dependency(
+        request: Request, settings: Settings = Depends(get_settings),
+    ) -> AsyncGenerator[None]:
+        if settings.query_budget_mode == "off":
+            yield
+            return
+        with track_queries() as tracker:
+            yield
+        route = request.scope.get("route")
+        label = f"{request.method} {getattr(route, 'path', request.url.path)}"
+        check_query_budget(tracker, max_statements, settings.query_budget_mode, label)
+
+    return dependency
@@ -5,8 +5,8 @@ This module contains the enforcement logic - the "how" of rate limiting.
 For configuration (limits, sensitive endpoints), see rate_limit_config.py.
 """
 import logging
+import math
 import time
-import uuid
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
@@ -46,6 +46,9 @@ class AIRateLimitStatus:
 
 logger = logging.getLogger(__name__)
 
+MINUTE_WINDOW_SECONDS = 60
+DAY_WINDOW_SECONDS = 86400
+
 # Maps operation types to their daily Redis key pool name.
 # Shared between check_rate_limit and get_ai_rate_limit_status.
 _DAILY_POOL_MAP: dict[OperationType, str] = {
@@ -107,45 +110,24 @@ async def check_rate_limit(
             retry_after=0,
         )
 
-    now = int(time.time())
-
-    # Check minute limit (sliding window for precision)
-    minute_key = f"rate:{user_id}:{operation_type.value}:min"
-    minute_result = await _check_sliding_window(
-        minute_key, config.requests_per_minute, 60, now,
-    )
-    if not minute_result.allowed:
-        logger.warning(
-            "rate_limit_exceeded",
-            extra={
-                "user_id": user_id,
-                "operation": operation_type.value,
-                "tier": tier.value,
-                "limit_type": "per_minute",
-            },
-        )
-        return minute_result
-
-    # Check daily limit (fixed window - simpler, lower memory)
     daily_pool = _DAILY_POOL_MAP[operation_type]
-    day_key = f"rate:{user_id}:daily:{daily_pool}"
-    day_result = await _check_fixed_window(
-        day_key, config.requests_per_day, 86400, now,
+    result, limited_by = await _check_windows(
+        minute_key=f"rate:{user_id}:{operation_type.value}:gcra",
+        day_key=f"rate:{user_id}:daily:{daily_pool}",
+        minute_limit=config.requests_per_minute,
+        day_limit=config.requests_per_day,
     )
-    if not day_result.allowed:
+    if not result.allowed:
         logger.warning(
             "rate_limit_exceeded",
             extra={
                 "user_id": user_id,
                 "operation": operation_type.value,
                 "tier": tier.value,
-                "limit_type": "daily",
+                "limit_type": limited_by,
             },
         )
-        return day_result
-
-    # Both passed - return the per-minute result (more relevant for headers)
-    return minute_result
+    return result
 
 
 async def check_ip_rate_limit(ip: str) -> RateLimitResult:
@@ -153,9 +135,9 @@ async def check_ip_rate_limit(ip: str) -> RateLimitResult:
     Rate-limit an unauthenticated request by client IP.
 
     Used by the public /public/* share endpoints, which have no user context and
-    therefore can't use the tier-based per-user limits. Keyed on IP with a
-    per-minute sliding window and a per-day fixed window, mirroring the structure
-    of check_rate_limit but without a tier or operation type.
+    therefore can't use the tier-based per-user limits. Keyed on IP with the
+    same combined per-minute + per-day check as check_rate_limit, but without a
+    tier or operation type.
 
     Falls back to allowing the request if Redis is unavailable, consistent with
     the rest of this module.
@@ -171,31 +153,17 @@ async def check_ip_rate_limit(ip: str) -> RateLimitResult:
             retry_after=0,
         )
 
-    now = int(time.time())
-
-    # Per-minute sliding window (precision matters for burst control).
-    minute_key = f"rate:ip:{ip}:public:min"
-    minute_result = await _check_sliding_window(
-        minute_key, PUBLIC_IP_RATE_LIMIT_PER_MINUTE, 60, now,
+    result, limited_by = await _check_windows(
+        minute_key=f"rate:ip:{ip}:public:gcra",
+        day_key=f"rate:ip:{ip}:public:daily",
+        minute_limit=PUBLIC_IP_RATE_LIMIT_PER_MINUTE,
+        day_limit=PUBLIC_IP_RATE_LIMIT_PER_DAY,
     )
-    if not minute_result.allowed:
+    if not result.allowed:
         logger.warning(
-            "ip_rate_limit_exceeded", extra={"ip": ip, "limit_type": "per_minute"},
+            "ip_rate_limit_exceeded", extra={"ip": ip, "limit_type": limited_by},
         )
-        return minute_result
-
-    # Per-day fixed window (cheaper; slight boundary imprecision is fine).
-    day_key = f"rate:ip:{ip}:public:daily"
-    day_result = await _check_fixed_window(
-        day_key, PUBLIC_IP_RATE_LIMIT_PER_DAY, 86400, now,
-    )
-    if not day_result.allowed:
-        logger.warning(
-            "ip_rate_limit_exceeded", extra={"ip": ip, "limit_type": "daily"},
-        )
-        return day_result
-
-    return minute_result
+    return result
 
 
 async def get_ai_rate_limit_status(
@@ -208,14 +176,14 @@ async def get_ai_rate_limit_status(
 
     Returns both windows for AI_PLATFORM or AI_BYOK, used by /ai/health so the
     client can surface both short-term and daily headroom. Does not mutate the
-    underlying Redis structures — the minute window is peeked via ZCOUNT and
-    the daily counter via GET.
+    underlying Redis structures — the minute window's GCRA state and the daily
+    counter are both peeked via GET.
 
     **Fail-open invariant.** Every Redis failure mode resolves to "full quota
     remaining" — this is a health-check endpoint, so we prefer false-optimism
     over false-pessimism. If Redis is fully unavailable, both windows report
     full. If a single call within the function fails (daily GET or minute
-    ZCOUNT), just that window falls open — the other is trusted. Because
+    GET), just that window falls open — the other is trusted. Because
     Redis's `GET` returns `None` both for missing keys AND for transient
     errors, the daily path is implicitly fail-open either way.
     """
@@ -261,18 +229,13 @@ async def get_ai_rate_limit_status(
         else None
     )
 
-    # Per-minute — sliding window (sorted set of timestamps). ZCOUNT entries
-    # whose score is within the last 60 seconds gives the used count without
-    # mutating the set. Use exclusive lower bound to mirror the writer's
-    # ZREMRANGEBYSCORE(0, now-window) semantics, which removes entries at
-    # score == now - window.
-    now = int(time.time())
-    minute_key = f"rate:{user_id}:{operation_type.value}:min"
-    used_minute = await redis_client.zcount(minute_key, f"({now - 60}", "+inf")
-    if used_minute is None:
-        # Redis hiccup — fail open for this window only
-        used_minute = 0
-    remaining_minute = max(0, minute_limit - used_minute)
+    # Per-minute — GCRA state (theoretical arrival time, ms). A missing key or
+    # a Redis hiccup both read as None, i.e. a full bucket (fail open).
+    minute_key = f"rate:{user_id}:{operation_type.value}:gcra"
+    tat = await redis_client.get(minute_key)
+    remaining_minute = _gcra_remaining(
+        float(tat) if tat else None, minute_limit, int(time.time() * 1000),
+    )
 
     return AIRateLimitStatus(
         limit_per_minute=minute_limit,
@@ -283,95 +246,80 @@ async def get_ai_rate_limit_status(
     )
 
 
-async def _check_sliding_window(
-    key: str, max_requests: int, window_seconds: int, now: int,
-) -> RateLimitResult:
+def _gcra_remaining(tat: float | None, limit: int, now_ms: int) -> int:
     """
-    Sliding window check using Redis sorted set.
+    Requests a GCRA bucket admits right now, given its stored TAT.
 
-    More accurate than fixed window - prevents gaming at window boundaries.
-    Used for per-minute limits where precision matters.
+    Mirrors the arithmetic of RATE_LIMIT_SCRIPT in core/redis.py.
     """
-    redis_client = get_redis_client()
-    if redis_client is None:
-        # Redis unavailable - fail open
-        return RateLimitResult(
-            allowed=True,
-            limit=max_requests,
-            remaining=max_requests,
-            reset=0,
-            retry_after=0,
-        )
-
-    result = await redis_client.eval_sliding_window(
-        key=key,
-        now=now,
-        window_seconds=window_seconds,
-        max_requests=max_requests,
-        request_id=str(uuid.uuid4()),
-    )
-
-    if result is None:
-        # Redis unavailable - fail open
-        return RateLimitResult(
-            allowed=True,
-            limit=max_requests,
-            remaining=max_requests,
-            reset=0,
-            retry_after=0,
-        )
-
-    allowed, remaining, retry_after = result
-    return RateLimitResult(
-        allowed=bool(allowed),
-        limit=max_requests,
-        remaining=max(0, remaining),
-        reset=now + window_seconds,
-        retry_after=max(0, retry_after) if not allowed else 0,
-    )
-
-
-async def _check_fixed_window(
-    key: str, max_requests: int, window_seconds: int, now: int,
-) -> RateLimitResult:
+    if limit <= 0:
+        return 0
+    if tat is None:
+        return limit
+    window_ms = MINUTE_WINDOW_SECONDS * 1000
+    interval = window_ms / limit
+    backlog = max(0.0, tat - now_ms)
+    return max(0, min(limit, math.floor((window_ms - backlog) / interval)))
+
+
+async def _check_windows(
+    *,
+    minute_key: str,
+    day_key: str,
+    minute_limit: int,
+    day_limit: int,
+) -> tuple[RateLimitResult, str | None]:
     """
-    Fixed window check using Lua script for atomicity.
+    Check and consume the per-minute and daily windows in one Redis call.
 
-    Simpler and lower memory than sliding window.
-    Used for daily limits where slight boundary imprecision is acceptable.
+    The per-minute window is a GCRA bucket (smooth refill, O(1) memory) and
+    the daily window a fixed counter; see RATE_LIMIT_SCRIPT for details.
+
+    Returns:
+        The result for headers - the per-minute view when allowed or limited
+        per minute, the daily view when the day is exhausted - and which window
+        denied the request ("per_minute", "daily", or None when allowed).
     """
+    fail_open = RateLimitResult(
+        allowed=True,
+        limit=minute_limit,
+        remaining=minute_limit,
+        reset=0,
+        retry_after=0,
+    )
     redis_client = get_redis_client()
     if redis_client is None:
         # Redis unavailable - fail open
-        return RateLimitResult(
-            allowed=True,
-            limit=max_requests,
-            remaining=max_requests,
-            reset=0,
-            retry_after=0,
-        )
-
-    result = await redis_client.eval_fixed_window(
-        key=key,
-        max_requests=max_requests,
-        window_seconds=window_seconds,
+        return fail_open, None
+
+    now_ms = int(time.time() * 1000)
+    result = await redis_client.eval_rate_limit(
+        minute_key=minute_key,
+        day_key=day_key,
+        now_ms=now_ms,
+        minute_limit=minute_limit,
+        minute_window_ms=MINUTE_WINDOW_SECONDS * 1000,
+        day_limit=day_limit,
+        day_window_seconds=DAY_WINDOW_SECONDS,
     )
-
     if result is None:
         # Redis unavailable - fail open
-        return RateLimitResult(
-            allowed=True,
-            limit=max_requests,
-            remaining=max_requests,
-            reset=0,
-            retry_after=0,
-        )
+        return fail_open, None
 
-    allowed, remaining, ttl, retry_after = result
+    allowed, limited_by, remaining, retry_after, reset_after = result
+    now = now_ms // 1000
+    if limited_by == 2:
+        return RateLimitResult(
+            allowed=False,
+            limit=day_limit,
+            remaining=0,
+            reset=now + reset_after,
+            retry_after=max(0, retry_after),
+        ), "daily"
     return RateLimitResult(
         allowed=bool(allowed),
-        limit=max_requests,
+        limit=minute_limit,
         remaining=max(0, remaining),
-        reset=now + ttl if ttl > 0 else now + window_seconds,
+        reset=now + reset_after,
         retry_after=max(0, retry_after) if not allowed else 0,
-    )
+    ), (None if allowed else "per_minute")
@@ -3,63 +3,77 @@ import logging
 from typing import Any
 
 from redis.asyncio import ConnectionPool, Redis
-from redis.asyncio.client import Pipeline
+from redis.asyncio.client import Pipeline, PubSub
 from redis.exceptions import NoScriptError, RedisError
 
+from core.metrics import record_redis_command
+
 logger = logging.getLogger(__name__)
 
-# Lua script for sliding window rate limiting (per-minute limits)
-# More accurate than fixed window - prevents gaming at window boundaries
-SLIDING_WINDOW_SCRIPT = """
-local key = KEYS[1]
+# Lua script for combined rate limiting: per-minute GCRA + daily fixed window.
+#
+# Both windows are checked and updated atomically in a single call, with O(1)
+# memory per key:
+# - Per-minute: GCRA (generic cell rate algorithm). The key holds one number,
+#   the "theoretical arrival time" (TAT, ms) of the next request. Each request
+#   advances it by window/limit; a request is allowed if the advanced TAT is no
+#   more than one window ahead of now. This admits a burst of `limit` and then
+#   refills smoothly at limit-per-window - no per-request members to store.
+# - Daily: a plain counter that expires `day_window` seconds after the first
+#   request.
+# A request denied by either window consumes neither.
+#
+# Returns {allowed, limited_by, remaining, retry_after, reset_after} where
+# limited_by is 0 (allowed), 1 (per-minute) or 2 (daily), remaining is the
+# per-minute headroom after this request, and retry_after / reset_after are
+# seconds from now.
+RATE_LIMIT_SCRIPT = """
+local minute_key = KEYS[1]
+local day_key = KEYS[2]
 local now = tonumber(ARGV[1])
-local window = tonumber(ARGV[2])
-local limit = tonumber(ARGV[3])
-local request_id = ARGV[4]
-
--- Remove old entries outside the window
-redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
-
--- Count current entries
-local count = redis.call('ZCARD', key)
-
-if count < limit then
-    -- Add new entry with UUID suffix to prevent collisions
-    redis.call('ZADD', key, now, now .. ':' .. request_id)
-    redis.call('EXPIRE', key, window)
-    return {1, limit - count - 1, 0}  -- allowed, remaining, no retry needed
-else
-    -- Get oldest entry for retry-after calculation
-    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
-    local retry_after = 0
-    if oldest and oldest[2] then
-        retry_after = math.ceil((oldest[2] + window) - now)
-    end
-    return {0, 0, retry_after}  -- denied, 0 remaining, retry after
+local minute_limit = tonumber(ARGV[2])
+local minute_window = tonumber(ARGV[3])
+local day_limit = tonumber(ARGV[4])
+local day_window = tonumber(ARGV[5])
+
+local interval = minute_window / minute_limit
+local tat = tonumber(redis.call('GET', minute_key)) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - minute_window
+if allow_at > now then
+    return {0, 1, 0, math.ceil((allow_at - now) / 1000), math.ceil((tat - now) / 1000)}
 end
-"""
-
-# Lua script for fixed window rate limiting (daily limits)
-# Atomic: increments counter and sets expiry only on first request
-FIXED_WINDOW_SCRIPT = """
-local key = KEYS[1]
-local limit = tonumber(ARGV[1])
-local window = tonumber(ARGV[2])
 
-local count = redis.call('INCR', key)
-if count == 1 then
-    redis.call('EXPIRE', key, window)
+local used = tonumber(redis.call('GET', day_key)) or 0
+if used >= day_limit then
+    local ttl = redis.call('TTL', day_key)
+    if ttl < 0 then
+        ttl = day_window
+    end
+    return {0, 2, 0, ttl, ttl}
 end
-local ttl = redis.call('TTL', key)
 
-if count <= limit then
-    return {1, limit - count, ttl, 0}  -- allowed, remaining, ttl, no retry
-else
-    return {0, 0, ttl, ttl}  -- denied, 0 remaining, ttl, retry_after=ttl
+if redis.call('INCR', day_key) == 1 then
+    redis.call('EXPIRE', day_key, day_window)
 end
+redis.call('SET', minute_key, new_tat, 'PX', math.ceil(new_tat - now))
+local remaining = math.floor((now + minute_window - new_tat) / interval)
+return {1, 0, remaining, 0, math.ceil((new_tat - now) / 1000)}
 """
 
 
+class _CountingRedis(Redis):
+    """Redis client that counts each command against the current request."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        """Execute a command, counting it (see core/metrics.py)."""
+        record_redis_command()
+        return await super().execute_command(*args, **options)
+
+
 class RedisClient:
     """Async Redis client with connection pooling and graceful fallback."""
 
@@ -69,8 +83,7 @@ class RedisClient:
         self._pool_size = pool_size
         self._pool: ConnectionPool | None = None
         self._client: Redis | None = None
-        self._sliding_window_sha: str | None = None
-        self._fixed_window_sha: str | None = None
+        self._rate_limit_sha: str | None = None
 
     async def connect(self) -> None:
         """Initialize connection pool and load Lua scripts."""
@@ -79,7 +92,7 @@ class RedisClient:
             return
         try:
             self._pool = ConnectionPool.from_url(self._url, max_connections=self._pool_size)
-            self._client = Redis(connection_pool=self._pool)
+            self._client = _CountingRedis(connection_pool=self._pool)
             # Verify connection
             await self._client.ping()
             # Load Lua scripts
@@ -95,8 +108,7 @@ class RedisClient:
         if not self._client:
             return
         try:
-            self._sliding_window_sha = await self._client.script_load(SLIDING_WINDOW_SCRIPT)
-            self._fixed_window_sha = await self._client.script_load(FIXED_WINDOW_SCRIPT)
+            self._rate_limit_sha = await self._client.script_load(RATE_LIMIT_SCRIPT)
             logger.info("Redis Lua scripts loaded")
         except RedisError as e:
             logger.warning("Failed to load Lua scripts: %s", e)
@@ -115,14 +127,9 @@ class RedisClient:
         return self._client is not None
 
     @property
-    def sliding_window_sha(self) -> str | None:
-        """Get SHA for sliding window script."""
-        return self._sliding_window_sha
-
-    @property
-    def fixed_window_sha(self) -> str | None:
-        """Get SHA for fixed window script."""
-        return self._fixed_window_sha
+    def rate_limit_sha(self) -> str | None:
+        """Get SHA for the combined rate limit script."""
+        return self._rate_limit_sha
 
     async def ping(self) -> bool:
         """Check Redis connectivity."""
@@ -154,6 +161,21 @@ class RedisClient:
             logger.warning("Redis SETEX failed: %s", e)
             return False
 
+    async def set_nx(self, key: str, value: str, milliseconds: int) -> bool | None:
+        """
+        Set value with expiry only if the key does not exist.
+
+        Returns True if set, False if the key already existed, None if Redis
+        unavailable.
+        """
+        if not self._client:
+            return None
+        try:
+            return bool(await self._client.set(key, value, px=milliseconds, nx=True))
+        except RedisError as e:
+            logger.warning("Redis SET NX failed: %s", e)
+            return None
+
     async def delete(self, *keys: str) -> bool:
         """Delete key(s), returns False if Redis unavailable."""
         if not self._client:
@@ -254,8 +276,26 @@ class RedisClient:
         """Get pipeline for batched operations, returns None if unavailable."""
         if not self._client:
             return None
+        record_redis_command()  # One round trip when executed
         return self._client.pipeline()
 
+    def pubsub(self) -> PubSub | None:
+        """Get a dedicated pub/sub connection, returns None if unavailable."""
+        if not self._client:
+            return None
+        return self._client.pubsub()
+
+    async def publish(self, channel: str, message: str) -> bool:
+        """Publish message to channel, returns False if Redis unavailable."""
+        if not self._client:
+            return False
+        try:
+            await self._client.publish(channel, message)
+            return True
+        except RedisError as e:
+            logger.warning("Redis PUBLISH failed: %s", e)
+            return False
+
     async def evalsha(self, sha: str, numkeys: int, *args: Any) -> Any:
         """Execute Lua script by SHA, returns None if Redis unavailable."""
         if not self._client:
@@ -266,6 +306,16 @@ class RedisClient:
             logger.warning("Redis EVALSHA failed: %s", e)
             return None
 
+    async def eval(self, script: str, numkeys: int, *args: Any) -> Any:
+        """Execute Lua script (sent in full), returns None if Redis unavailable."""
+        if not self._client:
+            return None
+        try:
+            return await self._client.eval(script, numkeys, *args)
+        except RedisError as e:
+            logger.warning("Redis EVAL failed: %s", e)
+            return None
+
     async def script_load(self, script: str) -> str | None:
         """Load Lua script and return SHA, returns None if Redis unavailable."""
         if not self._client:
@@ -287,122 +337,62 @@ class RedisClient:
             logger.warning("Redis FLUSHDB failed: %s", e)
             return False
 
-    async def eval_sliding_window(
-        self,
-        key: str,
-        now: int,
-        window_seconds: int,
-        max_requests: int,
-        request_id: str,
-    ) -> list[int] | None:
-        """
-        Execute sliding window rate limit script with automatic script reload.
-
-        Handles NOSCRIPT errors by reloading scripts and retrying once.
-
-        Args:
-            key: Redis key for this rate limit bucket
-            now: Current Unix timestamp
-            window_seconds: Window size in seconds
-            max_requests: Maximum requests allowed in window
-            request_id: Unique ID for this request (prevents collisions)
-
-        Returns:
-            [allowed, remaining, retry_after] or None if Redis unavailable
-        """
-        # Check for SHA being None: this can happen if Redis was unavailable at startup
-        # (scripts couldn't be loaded) or if _load_scripts() failed during a NOSCRIPT retry.
-        # In either case, we fail open by returning None.
-        if not self._client or self._sliding_window_sha is None:
-            return None
-
-        try:
-            return await self._client.evalsha(
-                self._sliding_window_sha,
-                1,
-                key,
-                now,
-                window_seconds,
-                max_requests,
-                request_id,
-            )
-        except NoScriptError:
-            # Redis restarted, scripts need reloading
-            logger.warning("redis_script_reload", extra={"script": "sliding_window"})
-            await self._load_scripts()
-            if self._sliding_window_sha is None:
-                return None
-            # Retry once with fresh SHA
-            try:
-                return await self._client.evalsha(
-                    self._sliding_window_sha,
-                    1,
-                    key,
-                    now,
-                    window_seconds,
-                    max_requests,
-                    request_id,
-                )
-            except RedisError as e:
-                logger.warning("Redis sliding window retry failed: %s", e)
-                return None
-        except RedisError as e:
-            logger.warning("Redis sliding window failed: %s", e)
-            return None
-
-    async def eval_fixed_window(
+    async def eval_rate_limit(
         self,
-        key: str,
-        max_requests: int,
-        window_seconds: int,
+        *,
+        minute_key: str,
+        day_key: str,
+        now_ms: int,
+        minute_limit: int,
+        minute_window_ms: int,
+        day_limit: int,
+        day_window_seconds: int,
     ) -> list[int] | None:
         """
-        Execute fixed window rate limit script with automatic script reload.
+        Execute the combined rate limit script with automatic script reload.
 
         Handles NOSCRIPT errors by reloading scripts and retrying once.
 
         Args:
-            key: Redis key for this rate limit bucket
-            max_requests: Maximum requests allowed in window
-            window_seconds: Window size in seconds
+            minute_key: Redis key holding the per-minute GCRA state
+            day_key: Redis key holding the daily counter
+            now_ms: Current Unix time in milliseconds
+            minute_limit: Maximum requests per minute window (must be > 0)
+            minute_window_ms: Minute window size in milliseconds
+            day_limit: Maximum requests per day window
+            day_window_seconds: Day window size in seconds
 
         Returns:
-            [allowed, remaining, ttl, retry_after] or None if Redis unavailable
+            [allowed, limited_by, remaining, retry_after, reset_after] (see
+            RATE_LIMIT_SCRIPT) or None if Redis unavailable
         """
         # Check for SHA being None: this can happen if Redis was unavailable at startup
         # (scripts couldn't be loaded) or if _load_scripts() failed during a NOSCRIPT retry.
         # In either case, we fail open by returning None.
-        if not self._client or self._fixed_window_sha is None:
+        if not self._client or self._rate_limit_sha is None:
             return None
 
+        args = (minute_limit, minute_window_ms, day_limit, day_window_seconds)
         try:
             return await self._client.evalsha(
-                self._fixed_window_sha,
-                1,
-                key,
-                max_requests,
-                window_seconds,
+                self._rate_limit_sha, 2, minute_key, day_key, now_ms, *args,
             )
         except NoScriptError:
             # Redis restarted, scripts need reloading
-            logger.warning("redis_script_reload", extra={"script": "fixed_window"})
+            logger.warning("redis_script_reload", extra={"script": "rate_limit"})
             await self._load_scripts()
-            if self._fixed_window_sha is None:
+            if self._rate_limit_sha is None:
                 return None
             # Retry once with fresh SHA
             try:
                 return await self._client.evalsha(
-                    self._fixed_window_sha,
-                    1,
-                    key,
-                    max_requests,
-                    window_seconds,
+                    self._rate_limit_sha, 2, minute_key, day_key, now_ms, *args,
                 )
             except RedisError as e:
-                logger.warning("Redis fixed window retry failed: %s", e)
+                logger.warning("Redis rate limit retry failed: %s", e)
                 return None
         except RedisError as e:
-            logger.warning("Redis fixed window failed: %s", e)
+            logger.warning("Redis rate limit failed: %s", e)
             return None
 
 
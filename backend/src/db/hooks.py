@@ -0,0 +1,24 @@
+"""Callbacks tied to a session's transaction."""
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# session.info key holding callbacks to run once the request's transaction commits
+_AFTER_COMMIT = "after_commit"
+
+
+def run_after_commit(db: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Run `callback` once the request's transaction has committed.
+
+    For cache invalidations that must not race the commit. Callbacks run only
+    for sessions from get_async_session; other sessions (scripts, tests with
+    their own session) drop them.
+    """
+    db.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+async def run_after_commit_callbacks(db: AsyncSession) -> None:
+    """Run and clear the callbacks registered with run_after_commit()."""
+    for callback in db.info.pop(_AFTER_COMMIT, []):
+        await callback()
@@ -0,0 +1,68 @@
+"""add content_history timeline indexes for keyset pagination and filters
+
+Revision ID: 7c41d2e9a8b3
+Revises: f3a9c1d7e2b4
+Create Date: 2026-10-16 23:40:12.518304
+
+History lists order by (created_at, id) descending and page with a keyset
+seek on that pair. ix_content_history_user_created is rebuilt with id as a
+trailing column so the seek, the sort and the LIMIT all come from the index.
+
+GET /history/ filters by content type, action and source. Each filter gets a
+(user_id, <column>, created_at, id) index, so a single-value filter is an
+ordered index scan that stops after one page instead of sorting every
+matching row of the user's history.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c41d2e9a8b3'
+down_revision: Union[str, Sequence[str], None] = 'f3a9c1d7e2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_content_history_user_created', table_name='content_history')
+    op.create_index(
+        'ix_content_history_user_created',
+        'content_history',
+        ['user_id', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_content_history_user_type_created',
+        'content_history',
+        ['user_id', 'entity_type', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_content_history_user_action_created',
+        'content_history',
+        ['user_id', 'action', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_content_history_user_source_created',
+        'content_history',
+        ['user_id', 'source', 'created_at', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_content_history_user_source_created', table_name='content_history')
+    op.drop_index('ix_content_history_user_action_created', table_name='content_history')
+    op.drop_index('ix_content_history_user_type_created', table_name='content_history')
+    op.drop_index('ix_content_history_user_created', table_name='content_history')
+    op.create_index(
+        'ix_content_history_user_created',
+        'content_history',
+        ['user_id', 'created_at'],
+        unique=False,
+    )
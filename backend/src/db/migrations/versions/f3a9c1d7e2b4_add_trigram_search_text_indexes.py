@@ -0,0 +1,72 @@
+"""add pg_trgm GIN indexes for substring (ILIKE) search
+
+Revision ID: f3a9c1d7e2b4
+Revises: 64e3641d3441
+Create Date: 2026-10-16 10:12:41.337204
+
+The ILIKE half of content search (`_apply_entity_filters` in
+services/content_service.py) matches `%query%` against one concatenated
+expression per table:
+
+    coalesce(f1, '') || E'\\x1f' || coalesce(f2, '') || ...
+
+These trigram GIN indexes cover exactly that expression, so the planner can
+BitmapOr them with the tsvector GIN indexes instead of sequentially scanning
+every row's title/description/content. The expressions MUST stay identical to
+`build_search_text_expr()` (same columns, same order, literals inlined) or the
+index silently stops being used.
+
+Field order matches the *_SEARCH_FIELDS config:
+  - Bookmarks: title, description, summary, content, url
+  - Notes: title, description, content
+  - Prompts: name, title, description, content
+
+Like the search_vector GIN indexes, these are expression indexes created in raw
+SQL and are invisible to Alembic metadata — drop any spurious autogenerated
+drops of them in future migrations.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c1d7e2b4'
+down_revision: Union[str, Sequence[str], None] = '64e3641d3441'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.execute(r"""
+        CREATE INDEX ix_bookmarks_search_text_trgm ON bookmarks USING GIN ((
+            coalesce(title, '') || E'\x1f' || coalesce(description, '') || E'\x1f' ||
+            coalesce(summary, '') || E'\x1f' || coalesce(content, '') || E'\x1f' ||
+            coalesce(url, '')
+        ) gin_trgm_ops)
+    """)
+
+    op.execute(r"""
+        CREATE INDEX ix_notes_search_text_trgm ON notes USING GIN ((
+            coalesce(title, '') || E'\x1f' || coalesce(description, '') || E'\x1f' ||
+            coalesce(content, '')
+        ) gin_trgm_ops)
+    """)
+
+    op.execute(r"""
+        CREATE INDEX ix_prompts_search_text_trgm ON prompts USING GIN ((
+            coalesce(name, '') || E'\x1f' || coalesce(title, '') || E'\x1f' ||
+            coalesce(description, '') || E'\x1f' || coalesce(content, '')
+        ) gin_trgm_ops)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_prompts_search_text_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_notes_search_text_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_bookmarks_search_text_trgm")
+    # pg_trgm is left installed: other objects may depend on it and it is harmless.
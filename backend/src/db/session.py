@@ -1,16 +1,44 @@
 """Async SQLAlchemy session factory."""
+import time
 from collections.abc import AsyncGenerator
+from contextlib import nullcontext
+from typing import Any
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
 from core.config import get_settings
+from core.metrics import DB_POOL_CHECKOUT_WAIT, record_db_statement
+from core.query_budget import report_repeated_queries, track_queries
+from db.hooks import run_after_commit_callbacks
 
 
 settings = get_settings()
 
+
+class _TimedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waits."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(*_args: Any) -> None:
+    """Count every statement (on any engine) against the current request."""
+    record_db_statement()
+
+
 engine = create_async_engine(
     settings.database_url,
     echo=False,
+    poolclass=_TimedQueuePool,
     pool_pre_ping=True,
     pool_size=settings.db_pool_size,
     max_overflow=settings.db_max_overflow,
@@ -35,12 +63,21 @@ async def get_async_session() -> AsyncGenerator[AsyncSession]:
 
     Uses unit-of-work pattern: services use flush() for refreshing objects,
     commit happens once here at request end. This ensures atomic transactions
-    per request - if anything fails, all changes are rolled back.
+    per request - if anything fails, all changes are rolled back. Callbacks
+    registered with run_after_commit() (db/hooks.py) run after the commit.
+
+    With QUERY_BUDGET_MODE set, the request's statements are tracked and
+    repeated ones are logged as possible N+1 queries (core/query_budget.py).
     """
-    async with async_session_factory() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+    tracking = track_queries() if settings.query_budget_mode != "off" else nullcontext()
+    with tracking as tracker:
+        async with async_session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            await run_after_commit_callbacks(session)
+    if tracker is not None:
+        report_repeated_queries(tracker)
@@ -671,6 +671,48 @@ async def create_relationship(
         raise ToolError(f"API unavailable: {e}")
 
 
+@mcp.tool(
+    description=_TOOLS["get_relationship_graph"]["description"],
+    annotations={"readOnlyHint": True},
+)
+async def get_relationship_graph(
+    id: Annotated[  # noqa: A002
+        str,
+        Field(description=_TOOLS["get_relationship_graph"]["parameters"]["id"]),
+    ],
+    type: Annotated[  # noqa: A002
+        Literal["bookmark", "note"],
+        Field(description=_TOOLS["get_relationship_graph"]["parameters"]["type"]),
+    ],
+    depth: Annotated[
+        int,
+        Field(
+            ge=1,
+            le=3,
+            description=_TOOLS["get_relationship_graph"]["parameters"]["depth"],
+        ),
+    ] = 2,
+) -> dict[str, Any]:
+    """
+    Get the multi-hop neighbourhood of a bookmark or note.
+
+    Examples:
+    - Direct links only: get_relationship_graph(id="...", type="note", depth=1)
+    - Links of links: get_relationship_graph(id="...", type="bookmark")
+    """
+    client = await _get_http_client()
+    token = _get_token()
+
+    try:
+        return await api_get(
+            client, f"/relationships/graph/{type}/{id}", token, {"depth": depth},
+        )
+    except httpx.HTTPStatusError as e:
+        _raise_tool_error(parse_http_error(e, entity_type=type, entity_name=id))
+    except httpx.RequestError as e:
+        raise ToolError(f"API unavailable: {e}")
+
+
 @mcp.tool(
     description=_TOOLS["get_context"]["description"],
     annotations={"readOnlyHint": True},
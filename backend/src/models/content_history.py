@@ -129,8 +129,31 @@ class ContentHistory(Base, UUIDv7Mixin):
             "entity_id",
             "version",
         ),
-        # All user's recent activity (for activity feed)
-        Index("ix_content_history_user_created", "user_id", "created_at"),
+        # All user's recent activity (for activity feed). Ends in id so the
+        # (created_at, id) keyset seek and sort are both served by the index.
+        Index("ix_content_history_user_created", "user_id", "created_at", "id"),
+        # Activity feed filtered by content type / action / source (GET /history/)
+        Index(
+            "ix_content_history_user_type_created",
+            "user_id",
+            "entity_type",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_content_history_user_action_created",
+            "user_id",
+            "action",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_content_history_user_source_created",
+            "user_id",
+            "source",
+            "created_at",
+            "id",
+        ),
         # Retention cleanup (delete old records)
         Index("ix_content_history_created", "created_at"),
         # Snapshot lookup index (partial index, low storage cost)
@@ -154,32 +154,29 @@ async def handle_list_prompts(
     List available prompts for the authenticated user.
 
     Queries the REST API each time (dynamic, no cache).
-    Supports cursor-based pagination per MCP spec.
-    Cursor is the offset value as a string.
+    Supports cursor-based pagination per MCP spec. The cursor is the API's
+    opaque keyset cursor (next_cursor), passed through unchanged, so every
+    page costs the same regardless of how deep the client pages. The total
+    count is skipped since MCP pagination never exposes it.
     """
     client = get_http_client()
     token = _get_token()
 
-    # Parse cursor as offset (cursor is opaque to client, we use offset)
     cursor = request.params.cursor if request.params else None
-    try:
-        offset = int(cursor) if cursor else 0
-    except ValueError:
-        raise McpError(
-            types.ErrorData(
-                code=types.INVALID_PARAMS,
-                message=f"Invalid cursor: {cursor}",
-            ),
-        ) from None
+    params: dict[str, Any] = {"limit": _LIST_PROMPTS_PAGE_SIZE, "include_total": "false"}
+    if cursor:
+        params["cursor"] = cursor
 
     try:
-        result = await api_get(
-            client,
-            "/prompts/",
-            token,
-            params={"limit": _LIST_PROMPTS_PAGE_SIZE, "offset": offset},
-        )
+        result = await api_get(client, "/prompts/", token, params=params)
     except httpx.HTTPStatusError as e:
+        if e.response.status_code in (400, 422) and cursor:
+            raise McpError(
+                types.ErrorData(
+                    code=types.INVALID_PARAMS,
+                    message=f"Invalid cursor: {cursor}",
+                ),
+            ) from None
         _raise_mcp_error(parse_http_error(e))
     except httpx.RequestError as e:
         raise McpError(
@@ -211,9 +208,8 @@ async def handle_list_prompts(
             ),
         )
 
-    # Calculate next cursor if more results exist
-    has_more = result.get("has_more", False)
-    next_cursor = str(offset + _LIST_PROMPTS_PAGE_SIZE) if has_more else None
+    # Forward the API's keyset cursor if more results exist
+    next_cursor = result.get("next_cursor") if result.get("has_more", False) else None
 
     return types.ListPromptsResult(
         prompts=prompts,
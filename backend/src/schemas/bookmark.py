@@ -189,10 +189,11 @@ class BookmarkListResponse(BaseModel):
     """Schema for paginated bookmark list responses with search/filter metadata."""
 
     items: list[BookmarkListItem]
-    total: int  # Total count of bookmarks matching the query (before pagination)
+    total: int | None  # Total count of bookmarks matching the query (None if include_total=false)
     offset: int  # Current pagination offset
     limit: int  # Current pagination limit
     has_more: bool  # True if there are more results beyond this page
+    next_cursor: str | None = None  # Keyset cursor for the next page (None on the last page)
 
 
 class MetadataPreviewResponse(BaseModel):
@@ -0,0 +1,42 @@
+"""Pydantic schemas for bulk create endpoints."""
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+# Maximum items per bulk create request
+BULK_CREATE_MAX_ITEMS = 1000
+
+
+class BulkCreateRequest(BaseModel):
+    """Schema for bulk creating items of one type (e.g., a browser bookmark export)."""
+
+    items: list[dict[str, Any]] = Field(
+        min_length=1,
+        max_length=BULK_CREATE_MAX_ITEMS,
+        description="Items in the same shape as the single-item create endpoint. "
+                    "Each item is validated on its own, so an invalid item is reported "
+                    "in the results without failing the request. "
+                    "`relationships` are not supported here.",
+    )
+
+
+class BulkCreateItemResult(BaseModel):
+    """Outcome of one bulk create item."""
+
+    index: int = Field(description="Position of the item in the request.")
+    id: UUID | None = Field(default=None, description="ID of the created item, if created.")
+    error_code: str | None = Field(
+        default=None,
+        description="Why the item was not created: VALIDATION_ERROR, FIELD_LIMIT_EXCEEDED, "
+                    "QUOTA_EXCEEDED, ACTIVE_URL_EXISTS, ARCHIVED_URL_EXISTS, or NAME_CONFLICT.",
+    )
+    message: str | None = None
+
+
+class BulkCreateResponse(BaseModel):
+    """Schema for bulk create responses."""
+
+    created: int
+    failed: int
+    results: list[BulkCreateItemResult]
@@ -0,0 +1,25 @@
+"""Cached API token representation for auth caching."""
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from uuid import UUID
+
+
+@dataclass
+class CachedToken:
+    """
+    Lightweight API token (PAT) representation for auth caching.
+
+    Holds only what PAT validation needs, keyed in the cache by the token's
+    SHA-256 hash (never the plaintext).
+
+    IMPORTANT: When adding, removing, or renaming fields in this class, you MUST bump
+    CACHE_SCHEMA_VERSION in core/auth_cache.py (same rule as CachedUser).
+    """
+
+    id: UUID
+    user_id: UUID
+    expires_at: datetime | None
+
+    def is_expired(self) -> bool:
+        """Whether the token's expiry (if any) has passed."""
+        return self.expires_at is not None and datetime.now(UTC) > self.expires_at
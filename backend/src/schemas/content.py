@@ -66,7 +66,8 @@ class ContentListResponse(BaseModel):
     """Schema for paginated unified content list responses."""
 
     items: list[ContentListItem]
-    total: int  # Total count of items matching the query (before pagination)
+    total: int | None  # Total count of items matching the query (None if include_total=false)
     offset: int  # Current pagination offset
     limit: int  # Current pagination limit
     has_more: bool  # True if there are more results beyond this page
+    next_cursor: str | None = None  # Keyset cursor for the next page (None on the last page)
@@ -29,10 +29,11 @@ class HistoryListResponse(BaseModel):
     """Schema for paginated history list responses."""
 
     items: list[HistoryResponse]
-    total: int  # Total count of history records matching the query (before pagination)
+    total: int | None  # Total count of matching history records (None if include_total=false)
     offset: int  # Current pagination offset
     limit: int  # Current pagination limit
     has_more: bool  # True if there are more results beyond this page
+    next_cursor: str | None = None  # Keyset cursor for the next page (None on the last page)
 
 
 class ContentAtVersionResponse(BaseModel):
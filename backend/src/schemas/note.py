@@ -195,7 +195,8 @@ class NoteListResponse(BaseModel):
     """Schema for paginated note list responses with search/filter metadata."""
 
     items: list[NoteListItem]
-    total: int  # Total count of notes matching the query (before pagination)
+    total: int | None  # Total count of notes matching the query (None if include_total=false)
     offset: int  # Current pagination offset
     limit: int  # Current pagination limit
     has_more: bool  # True if there are more results beyond this page
+    next_cursor: str | None = None  # Keyset cursor for the next page (None on the last page)
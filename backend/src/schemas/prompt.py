@@ -235,10 +235,11 @@ class PromptListResponse(BaseModel):
     """Schema for paginated prompt list responses with search/filter metadata."""
 
     items: list[PromptListItem]
-    total: int  # Total count of prompts matching the query (before pagination)
+    total: int | None  # Total count of prompts matching the query (None if include_total=false)
     offset: int  # Current pagination offset
     limit: int  # Current pagination limit
     has_more: bool  # True if there are more results beyond this page
+    next_cursor: str | None = None  # Keyset cursor for the next page (None on the last page)
 
 
 class PromptRenderRequest(BaseModel):
@@ -96,3 +96,27 @@ class RelationshipListResponse(BaseModel):
     offset: int
     limit: int
     has_more: bool
+
+
+class RelationshipGraphNode(BaseModel):
+    """A content item in a relationship graph, with basic content info for display."""
+
+    content_type: Literal['bookmark', 'note', 'prompt']
+    content_id: UUID
+    depth: int
+    title: str | None = None
+    url: str | None = None
+    prompt_name: str | None = None
+    deleted: bool = False
+    archived: bool = False
+
+
+class RelationshipGraphResponse(BaseModel):
+    """Schema for the multi-hop neighbourhood of a content item."""
+
+    root_type: Literal['bookmark', 'note', 'prompt']
+    root_id: UUID
+    depth: int
+    nodes: list[RelationshipGraphNode]
+    edges: list[RelationshipWithContentResponse]
+    truncated: bool
@@ -15,6 +15,7 @@ from models.content_history import ActionType, EntityType
 from models.tag import bookmark_tags
 from schemas.bookmark import BookmarkCreate, BookmarkUpdate
 from services.base_entity_service import BaseEntityService
+from services.public_share_cache import invalidate_public_share
 from services.exceptions import FieldLimitExceededError, InvalidStateError, QuotaExceededError
 from services import relationship_service
 from services.tag_service import get_or_create_tags, update_bookmark_tags
@@ -52,6 +53,8 @@ class BookmarkService(BaseEntityService[Bookmark]):
     model = Bookmark
     junction_table = bookmark_tags
     entity_name = "Bookmark"
+    quota_limit_field = "max_bookmarks"
+    unique_active_column = "url"
 
     @property
     def entity_type(self) -> EntityType:
@@ -128,6 +131,31 @@ class BookmarkService(BaseEntityService[Bookmark]):
                         "tag", len(tag), limits.max_tag_name_length,
                     )
 
+    def _bulk_row(self, data: BookmarkCreate, limits: TierLimits) -> dict[str, Any]:
+        """Validate a create_many item and return its column values."""
+        url_str = str(data.url)
+        self._validate_field_limits(
+            limits,
+            url=url_str,
+            title=data.title,
+            description=data.description,
+            content=data.content,
+            tags=data.tags,
+        )
+        return {
+            "url": url_str,
+            "title": data.title,
+            "description": data.description,
+            "content": data.content,
+            "archived_at": data.archived_at,
+        }
+
+    def _duplicate_error(self, value: str, archived_id: UUID | None) -> Exception:
+        """URL taken: ArchivedUrlExistsError if the existing bookmark is archived."""
+        if archived_id is not None:
+            return ArchivedUrlExistsError(value, archived_id)
+        return DuplicateUrlError(value)
+
     async def check_quota(
         self,
         db: AsyncSession,
@@ -341,6 +369,7 @@ class BookmarkService(BaseEntityService[Bookmark]):
                 raise DuplicateUrlError(str(update_data.get("url", ""))) from e
             raise
         await self._refresh_with_tags(db, bookmark)
+        await invalidate_public_share(db, self.entity_type, bookmark.public_token)
 
         # Only record history if something actually changed.
         # Reuse the previous relationship snapshot when relationships weren't in the
@@ -444,5 +473,6 @@ class BookmarkService(BaseEntityService[Bookmark]):
         bookmark.archived_at = None
         await db.flush()
         await self._refresh_with_tags(db, bookmark)
+        await invalidate_public_share(db, self.entity_type, bookmark.public_token)
         return bookmark
 
@@ -11,6 +11,8 @@ Line counting convention matches editor behavior (VS Code, Sublime):
 - "hello\nworld\n" = 3 lines
 - "" (empty string) = 1 line (splits to [''])
 """
+from array import array
+from collections.abc import Sequence
 from typing import Protocol
 
 from fastapi import HTTPException
@@ -37,7 +39,50 @@ def count_lines(content: str) -> int:
     Returns:
         Number of lines (minimum 1 for empty string).
     """
-    return len(content.split("\n"))
+    return content.count("\n") + 1
+
+
+def line_offsets(content: str) -> array:
+    """
+    Compute the character offset at which each line starts.
+
+    Args:
+        content: The text content to index.
+
+    Returns:
+        Array with one entry per line (so len() equals count_lines(content)).
+    """
+    offsets = array("I", [0])
+    pos = content.find("\n")
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = content.find("\n", pos + 1)
+    return offsets
+
+
+def line_span(
+    offsets: Sequence[int],
+    content_length: int,
+    start_line: int,
+    end_line: int,
+) -> tuple[int, int]:
+    """
+    Get the character range covering a range of lines.
+
+    Args:
+        offsets: Line start offsets from line_offsets().
+        content_length: Length of the indexed content in characters.
+        start_line: First line to include (1-indexed).
+        end_line: Last line to include (1-indexed, inclusive, <= total lines).
+
+    Returns:
+        (start, end) such that content[start:end] equals
+        extract_lines(content, start_line, end_line).
+    """
+    start = offsets[start_line - 1]
+    # Stop before the newline that ends end_line (if it isn't the last line)
+    end = offsets[end_line] - 1 if end_line < len(offsets) else content_length
+    return start, end
 
 
 def extract_lines(content: str, start_line: int, end_line: int) -> str:
@@ -92,8 +137,36 @@ def build_content_metadata(
     Raises:
         ValueError: If start_line > total_lines or start_line > end_line.
     """
-    total_lines = count_lines(content)
+    metadata = resolve_line_range(count_lines(content), start_line, end_line)
+
+    if metadata.start_line == 1 and metadata.end_line == metadata.total_lines:
+        return content, metadata
+
+    start, end = line_span(
+        line_offsets(content), len(content), metadata.start_line, metadata.end_line,
+    )
+    return content[start:end], metadata
 
+
+def resolve_line_range(
+    total_lines: int,
+    start_line: int | None,
+    end_line: int | None,
+) -> ContentMetadata:
+    """
+    Apply partial read defaults and validation to a requested line range.
+
+    Args:
+        total_lines: Number of lines in the full content.
+        start_line: Requested start line (1-indexed), or None for default (1).
+        end_line: Requested end line (1-indexed), or None for default (total_lines).
+
+    Returns:
+        Metadata describing the resolved range.
+
+    Raises:
+        ValueError: If start_line > total_lines or start_line > end_line.
+    """
     # Determine if this is a partial read request
     is_partial = start_line is not None or end_line is not None
 
@@ -116,18 +189,13 @@ def build_content_metadata(
     # Clamp end_line to total_lines (no error)
     actual_end = min(actual_end, total_lines)
 
-    # Extract content
-    result_content = extract_lines(content, actual_start, actual_end)
-
-    metadata = ContentMetadata(
+    return ContentMetadata(
         total_lines=total_lines,
         start_line=actual_start,
         end_line=actual_end,
         is_partial=is_partial,
     )
 
-    return result_content, metadata
-
 
 def apply_partial_read(
     response: HasContentMetadata,
@@ -141,6 +209,9 @@ def apply_partial_read(
     1. Processing content with build_content_metadata if content exists
     2. Raising HTTPException if line params provided but content is null
 
+    A response that already has content_metadata (content read as a line
+    range by `get_with_line_range`) is left unchanged.
+
     Args:
         response: A response object with content and content_metadata fields.
         start_line: Requested start line (1-indexed), or None.
@@ -150,6 +221,8 @@ def apply_partial_read(
         HTTPException: 400 if content is null but line params provided,
                        or if line range is invalid.
     """
+    if response.content_metadata is not None:
+        return
     if response.content is not None:
         try:
             processed_content, metadata = build_content_metadata(
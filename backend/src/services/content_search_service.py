@@ -10,7 +10,11 @@ Use cases:
 3. Content discovery - Find where text appears without reading entire content
 4. General search - Locate information within a specific content item
 """
+from bisect import bisect_right
+from collections.abc import Sequence
+
 from schemas.content_search import ContentSearchMatch
+from services.content_lines import line_offsets, line_span
 
 
 def search_in_content(
@@ -21,6 +25,8 @@ def search_in_content(
     fields: list[str],
     case_sensitive: bool = False,
     context_lines: int = 2,
+    *,
+    offsets: Sequence[int] | None = None,
 ) -> list[ContentSearchMatch]:
     """
     Search for a literal string within specified fields of a content item.
@@ -37,6 +43,8 @@ def search_in_content(
         fields: List of fields to search (content, title, description).
         case_sensitive: If True, perform case-sensitive search. Default False.
         context_lines: Number of lines before/after match for content field context.
+        offsets: Line start offsets of content (see `line_offsets`), e.g. from
+            the line index cache. Computed if omitted.
 
     Returns:
         List of ContentSearchMatch objects, one per match found.
@@ -50,7 +58,7 @@ def search_in_content(
     # Search content field
     if "content" in fields and content is not None:
         matches.extend(
-            _search_content_field(content, query, case_sensitive, context_lines),
+            _search_content_field(content, query, case_sensitive, context_lines, offsets),
         )
 
     # Search title field (return full value as context)
@@ -75,6 +83,7 @@ def _search_content_field(
     query: str,
     case_sensitive: bool,
     context_lines: int,
+    offsets: Sequence[int] | None,
 ) -> list[ContentSearchMatch]:
     """
     Search within the content field, returning matches with line numbers and context.
@@ -87,6 +96,7 @@ def _search_content_field(
         query: The query string to find (can be multiline).
         case_sensitive: Whether the search is case-sensitive.
         context_lines: Number of lines before/after match to include.
+        offsets: Line start offsets of content, or None to compute them.
 
     Returns:
         List of ContentSearchMatch objects for content field matches.
@@ -97,14 +107,13 @@ def _search_content_field(
     search_content = content if case_sensitive else content.lower()
     search_query = query if case_sensitive else query.lower()
 
-    # Pre-compute values used in the loop
-    lines = content.split("\n")
+    # Line numbers and context come from the offsets, so the content is never
+    # split into lines
+    if offsets is None:
+        offsets = line_offsets(content)
+    total_lines = len(offsets)
     query_newlines = query.count("\n")
 
-    # Track line number incrementally to avoid O(n) scan from start each time
-    current_line = 1
-    last_pos = 0
-
     # Find all non-overlapping occurrences in the content
     start_pos = 0
     while True:
@@ -112,20 +121,18 @@ def _search_content_field(
         if pos == -1:
             break
 
-        # Incremental line counting - only count newlines since last match
-        current_line += content[last_pos:pos].count("\n")
-        last_pos = pos
-
-        line_idx = current_line - 1  # Convert to 0-indexed
-        end_line_idx = line_idx + query_newlines
+        current_line = bisect_right(offsets, pos)  # 1-indexed line containing pos
+        end_line = current_line + query_newlines
 
         # Context window: context_lines before start, context_lines after end
-        context_start = max(0, line_idx - context_lines)
-        context_end = min(len(lines), end_line_idx + context_lines + 1)
-        context = "\n".join(lines[context_start:context_end])
+        context_start = max(1, current_line - context_lines)
+        context_end = min(total_lines, end_line + context_lines)
+        span_start, span_end = line_span(offsets, len(content), context_start, context_end)
 
         matches.append(
-            ContentSearchMatch(field="content", line=current_line, context=context),
+            ContentSearchMatch(
+                field="content", line=current_line, context=content[span_start:span_end],
+            ),
         )
 
         # Move past this match (non-overlapping)
@@ -1,10 +1,12 @@
 """Service layer for unified content operations across bookmarks, notes, and prompts."""
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Literal
 from uuid import UUID
 
 from sqlalchemy import (
-    Row, String, Table, and_, case, cast, exists, func, literal, or_, select, union_all,
+    Row, Table, and_, case, cast, exists, func, literal, literal_column, or_, select,
+    union_all,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,7 +19,11 @@ from models.tag import Tag, bookmark_tags, note_tags, prompt_tags
 from schemas.validators import validate_and_normalize_tags
 from schemas.content import ContentListItem, ViewOption
 from services.base_entity_service import CONTENT_PREVIEW_LENGTH
-from services.utils import build_tag_filter_from_expression, escape_ilike
+from services.exceptions import InvalidCursorError
+from services.utils import (
+    build_tag_filter_from_expression, decode_cursor, encode_cursor, escape_ilike,
+    parse_cursor_timestamp,
+)
 
 
 # Per-entity search field configuration — single source of truth for ILIKE filter + scoring.
@@ -45,6 +51,66 @@ PROMPT_SEARCH_FIELDS: list[tuple[InstrumentedAttribute, float]] = [
     (Prompt.content, 0.1),      # weight C
 ]
 
+# Separator between fields in the trigram-indexed search text (ASCII unit separator).
+# Queries never contain it in practice; if one does, the ILIKE side falls back to
+# per-field matching so a match can never straddle two fields.
+SEARCH_TEXT_SEPARATOR = "\x1f"
+
+
+def build_search_text_expr(columns: list[InstrumentedAttribute]) -> Any:
+    r"""
+    Build the concatenated search text that the pg_trgm GIN indexes cover.
+
+    Renders ``coalesce(a, '') || E'\x1f' || coalesce(b, '') || ...``. The SQL must
+    stay equivalent to the index expressions in migration
+    f3a9c1d7e2b4 (same columns, same order, separator and empty-string inlined
+    as literals rather than bind parameters) — otherwise the planner cannot
+    match the predicate to the index and falls back to a sequential scan.
+
+    Column order comes from the *_SEARCH_FIELDS config (plus Bookmark.url last).
+    """
+    separator = literal_column("E'\\x1f'")
+    empty = literal_column("''")
+    expr = func.coalesce(columns[0], empty)
+    for column in columns[1:]:
+        expr = expr.op("||")(separator).op("||")(func.coalesce(column, empty))
+    return expr
+
+
+# Sort fields whose cursor value is a timestamp (everything except title/relevance).
+_TIMESTAMP_SORT_FIELDS = frozenset({
+    "created_at", "updated_at", "last_used_at", "archived_at", "deleted_at", "shared_at",
+})
+
+# Tag junction table and its entity foreign key, per content type.
+_TAG_JUNCTIONS: dict[str, tuple[Table, Any]] = {
+    "bookmark": (bookmark_tags, bookmark_tags.c.bookmark_id),
+    "note": (note_tags, note_tags.c.note_id),
+    "prompt": (prompt_tags, prompt_tags.c.prompt_id),
+}
+
+
+@dataclass
+class ContentPage:
+    """One page of unified content results."""
+
+    items: list[ContentListItem]
+    total: int | None  # None when the caller opted out of the count query
+    has_more: bool  # True if there are more results beyond this page
+    next_cursor: str | None  # Opaque keyset token for the next page (None on the last page)
+
+
+@dataclass
+class _CursorPosition:
+    """Decoded keyset cursor: the sort key and tiebreakers of the last row of a page."""
+
+    sort_by: str
+    sort_order: Literal["asc", "desc"]
+    sort_value: Any
+    type: str
+    created_at: datetime
+    id: UUID
+
 
 def _build_tag_filter(
     tags: list[str],
@@ -217,6 +283,68 @@ async def search_all_content(
     """
     Search all content (bookmarks, notes, and prompts) with unified pagination.
 
+    Offset-paginated convenience wrapper around search_content_page() that
+    always computes the exact total. See search_content_page() for arguments.
+
+    Returns:
+        Tuple of (list of ContentListItems, total count).
+    """
+    page = await search_content_page(
+        db,
+        user_id,
+        query=query,
+        tags=tags,
+        tag_match=tag_match,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        offset=offset,
+        limit=limit,
+        view=view,
+        filter_expression=filter_expression,
+        content_types=content_types,
+        is_public=is_public,
+        shared_after=shared_after,
+        shared_before=shared_before,
+    )
+    return page.items, page.total or 0
+
+
+async def search_content_page(
+    db: AsyncSession,
+    user_id: UUID,
+    query: str | None = None,
+    tags: list[str] | None = None,
+    tag_match: Literal["all", "any"] = "all",
+    sort_by: Literal[
+        "created_at", "updated_at", "last_used_at", "title",
+        "archived_at", "deleted_at", "shared_at", "relevance",
+    ] = "created_at",
+    sort_order: Literal["asc", "desc"] = "desc",
+    offset: int = 0,
+    limit: int = 50,
+    view: set[ViewOption] = frozenset({"active"}),
+    filter_expression: dict[str, Any] | None = None,
+    content_types: list[str] | None = None,
+    is_public: bool | None = None,
+    shared_after: datetime | None = None,
+    shared_before: datetime | None = None,
+    *,
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> ContentPage:
+    """
+    Search all content (bookmarks, notes, and prompts) and return one page.
+
+    Supports two pagination modes:
+    - Offset: pass `offset` (default). Cost grows with the offset because
+      Postgres must produce and discard every earlier row.
+    - Keyset: pass the `next_cursor` of the previous page as `cursor`. The query
+      seeks directly past the last row using the sort key plus the
+      (type, created_at, id) tiebreakers, so every page costs the same.
+
+    Every page carries a `next_cursor` when more results exist, so a client can
+    load the first page by offset and follow cursors from there.
+
     Args:
         db: Database session.
         user_id: User ID to scope content.
@@ -227,7 +355,7 @@ async def search_all_content(
         sort_by: Field to sort by. "relevance" sorts by combined FTS + ILIKE score
             (falls back to created_at when no query present).
         sort_order: Sort direction.
-        offset: Pagination offset.
+        offset: Pagination offset. Must be 0 when `cursor` is provided.
         limit: Pagination limit.
         view: Set of views to include. e.g. {"active"}, {"active", "archived"}.
             - "active": Not deleted and not archived.
@@ -240,9 +368,16 @@ async def search_all_content(
             publicly shared, False = only private). None includes all.
         shared_after: If set, only items with shared_at at or after this time.
         shared_before: If set, only items with shared_at at or before this time.
+        cursor: Opaque keyset token from a previous page's `next_cursor`.
+        include_total: If False, skip the count(*) query and return total=None.
+            `has_more` is still exact (the page query fetches one extra row).
 
     Returns:
-        Tuple of (list of ContentListItems, total count).
+        ContentPage with items, total, has_more, and next_cursor.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed, was issued for a different
+            sort, or is combined with a non-zero offset.
     """
     if not view:
         raise ValueError("view must contain at least one option")
@@ -257,26 +392,22 @@ async def search_all_content(
 
     # If no content types to include, return empty
     if not include_bookmarks and not include_notes and not include_prompts:
-        return [], 0
-
-    # Empty tsquery guard: stop-word-only queries (e.g. "the", "and or") produce
-    # an empty tsquery. Without this guard the ILIKE side of the OR would match
-    # everything. Return zero results immediately for these queries.
-    search_pattern: str | None = None
-    if query:
-        tsquery_text = await db.scalar(select(func.cast(
-            func.websearch_to_tsquery('english', query), String,
-        )))
-        if not (tsquery_text and tsquery_text.strip()):
-            return [], 0
-        escaped_query = escape_ilike(query)
-        search_pattern = f"%{escaped_query}%"
+        return ContentPage(items=[], total=0, has_more=False, next_cursor=None)
 
     # Resolve relevance sort: fall back to created_at when no query
     effective_sort_by = sort_by
     if sort_by == "relevance" and not query:
         effective_sort_by = "created_at"
 
+    position = (
+        _resolve_cursor(cursor, offset, effective_sort_by, sort_order) if cursor else None
+    )
+
+    search_pattern: str | None = None
+    if query:
+        escaped_query = escape_ilike(query)
+        search_pattern = f"%{escaped_query}%"
+
     # Pre-compute tsquery expression for reuse across subqueries
     tsquery = func.websearch_to_tsquery('english', query) if query else None
 
@@ -291,7 +422,73 @@ async def search_all_content(
         'shared_before': shared_before,
     }
 
-    subqueries: list[Any] = []
+    subqueries, count_subqueries = _build_type_subqueries(
+        include_bookmarks=include_bookmarks,
+        include_notes=include_notes,
+        include_prompts=include_prompts,
+        search_ctx=search_ctx,
+    )
+
+    combined = _union_or_single([subquery for _, subquery in subqueries])
+    count_query = select(func.count()).select_from(_union_or_single(count_subqueries))
+
+    # Build final query with sorting, tiebreakers, and pagination. One extra row
+    # is fetched so has_more is exact even when the count is skipped.
+    final_query = _build_sorted_query(
+        combined, effective_sort_by, sort_order,
+        is_single_type=len(subqueries) == 1,
+        offset=offset, limit=limit + 1,
+        position=position,
+    )
+    # Fold tags and the total into the page query so a search is one round trip.
+    # The tag subqueries are correlated to the page rows and evaluated after
+    # ORDER BY/LIMIT; the count is uncorrelated, so Postgres runs it once as an
+    # InitPlan and repeats it on every row.
+    final_query = final_query.add_columns(
+        _build_tags_column(combined, user_id, [type_ for type_, _ in subqueries]),
+    )
+    if include_total:
+        final_query = final_query.add_columns(
+            count_query.scalar_subquery().label("total_count"),
+        )
+
+    result = await db.execute(final_query)
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    total: int | None = None
+    if include_total:
+        if rows:
+            total = rows[0].total_count
+        elif offset or position is not None:
+            # Page past the end: no row to carry the count, so ask separately.
+            total = await db.scalar(count_query) or 0
+        else:
+            total = 0
+
+    items = [_row_to_content_item(row, row.tags or []) for row in rows]
+
+    next_cursor = (
+        _encode_cursor(rows[-1], effective_sort_by, sort_order)
+        if has_more and rows else None
+    )
+    return ContentPage(items=items, total=total, has_more=has_more, next_cursor=next_cursor)
+
+
+def _build_type_subqueries(
+    *,
+    include_bookmarks: bool,
+    include_notes: bool,
+    include_prompts: bool,
+    search_ctx: dict[str, Any],
+) -> tuple[list[tuple[str, Any]], list[Any]]:
+    """
+    Build the main and count subquery lists for the requested content types.
+
+    Main subqueries are returned as (type, subquery) pairs.
+    """
+    subqueries: list[tuple[str, Any]] = []
     count_subqueries: list[Any] = []
 
     if include_bookmarks:
@@ -309,7 +506,7 @@ async def search_all_content(
             ).label("sort_title"),
             **search_ctx,
         )
-        subqueries.append(main)
+        subqueries.append(("bookmark", main))
         count_subqueries.append(count)
 
     if include_notes:
@@ -325,7 +522,7 @@ async def search_all_content(
             sort_title_expr=func.lower(Note.title).label("sort_title"),
             **search_ctx,
         )
-        subqueries.append(main)
+        subqueries.append(("note", main))
         count_subqueries.append(count)
 
     if include_prompts:
@@ -343,40 +540,84 @@ async def search_all_content(
             ).label("sort_title"),
             **search_ctx,
         )
-        subqueries.append(main)
+        subqueries.append(("prompt", main))
         count_subqueries.append(count)
 
-    # Combine subqueries and get total count
-    combined = _union_or_single(subqueries)
-    count_combined = _union_or_single(count_subqueries)
-    count_result = await db.execute(select(func.count()).select_from(count_combined))
-    total = count_result.scalar() or 0
+    return subqueries, count_subqueries
 
-    # Build final query with sorting, tiebreakers, and pagination
-    final_query = _build_sorted_query(
-        combined, effective_sort_by, sort_order,
-        is_single_type=len(subqueries) == 1,
-        offset=offset, limit=limit,
-    )
-
-    result = await db.execute(final_query)
-    rows = result.all()
-
-    # Collect IDs for tag fetching
-    bookmark_ids = [row.id for row in rows if row.type == "bookmark"]
-    note_ids = [row.id for row in rows if row.type == "note"]
-    prompt_ids = [row.id for row in rows if row.type == "prompt"]
-
-    # Fetch tags for all items
-    tags_map = await get_tags_for_items(db, user_id, bookmark_ids, note_ids, prompt_ids)
 
-    # Convert rows to ContentListItems
-    items = [
-        _row_to_content_item(row, tags_map[(row.type, row.id)])
-        for row in rows
-    ]
-
-    return items, total
+def _resolve_cursor(
+    cursor: str,
+    offset: int,
+    sort_by: str,
+    sort_order: Literal["asc", "desc"],
+) -> _CursorPosition:
+    """Decode a cursor and check it can be applied to this request."""
+    if offset:
+        raise InvalidCursorError("offset cannot be combined with cursor")
+    position = _decode_cursor(cursor)
+    if (position.sort_by, position.sort_order) != (sort_by, sort_order):
+        raise InvalidCursorError("Cursor does not match the requested sort")
+    return position
+
+
+def _cursor_sort_value(row: Row, sort_by: str) -> Any:
+    """Return the value of the primary sort key for a result row."""
+    if sort_by == "relevance":
+        return row.search_rank
+    if sort_by == "title":
+        return row.sort_title
+    return getattr(row, sort_by)
+
+
+def _encode_cursor(row: Row, sort_by: str, sort_order: Literal["asc", "desc"]) -> str:
+    """Encode the keyset position of `row` as an opaque URL-safe token."""
+    sort_value = _cursor_sort_value(row, sort_by)
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    elif sort_value is not None and sort_by == "relevance":
+        sort_value = float(sort_value)
+    payload = {
+        "s": sort_by,
+        "o": sort_order,
+        "v": sort_value,
+        "t": row.type,
+        "c": row.created_at.isoformat(),
+        "i": str(row.id),
+    }
+    return encode_cursor(payload)
+
+
+def _decode_cursor(cursor: str) -> _CursorPosition:
+    """Decode a token produced by _encode_cursor, validating every field."""
+    payload = decode_cursor(cursor)
+    try:
+        sort_by = payload["s"]
+        raw_value = payload["v"]
+        if sort_by in _TIMESTAMP_SORT_FIELDS:
+            sort_value = parse_cursor_timestamp(raw_value) if raw_value is not None else None
+        elif sort_by == "title":
+            if raw_value is not None and not isinstance(raw_value, str):
+                raise TypeError("title cursor value must be a string")
+            sort_value = raw_value
+        elif sort_by == "relevance":
+            sort_value = float(raw_value)
+        else:
+            raise ValueError(f"unknown sort field: {sort_by}")
+        if payload["o"] not in ("asc", "desc"):
+            raise ValueError("invalid sort order")
+        if payload["t"] not in ("bookmark", "note", "prompt"):
+            raise ValueError("invalid content type")
+        return _CursorPosition(
+            sort_by=sort_by,
+            sort_order=payload["o"],
+            sort_value=sort_value,
+            type=payload["t"],
+            created_at=parse_cursor_timestamp(payload["c"]),
+            id=UUID(payload["i"]),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
 
 
 def _build_search_rank(
@@ -512,6 +753,27 @@ def _union_or_single(subqueries: list[Any]) -> Any:
     return union_all(*subqueries).subquery()
 
 
+def _build_tags_column(combined: Any, user_id: UUID, content_types: list[str]) -> Any:
+    """
+    Build a column aggregating each row's tag names (NULL when it has none).
+
+    Correlated to `combined`, with one array_agg subquery per included type.
+    """
+    tag_subqueries = {}
+    for content_type in content_types:
+        junction_table, entity_id_column = _TAG_JUNCTIONS[content_type]
+        tag_subqueries[content_type] = (
+            select(func.array_agg(Tag.name))
+            .select_from(junction_table.join(Tag, junction_table.c.tag_id == Tag.id))
+            .where(entity_id_column == combined.c.id, Tag.user_id == user_id)
+            .scalar_subquery()
+        )
+    if len(tag_subqueries) == 1:
+        return next(iter(tag_subqueries.values())).label("tags")
+    whens = [(combined.c.type == type_, subq) for type_, subq in tag_subqueries.items()]
+    return case(*whens).label("tags")
+
+
 def _build_sorted_query(
     combined: Any,
     sort_by: str,
@@ -520,44 +782,114 @@ def _build_sorted_query(
     is_single_type: bool,
     offset: int,
     limit: int,
+    position: _CursorPosition | None = None,
 ) -> Any:
-    """Build final SELECT with sorting, tiebreakers, and pagination."""
-    sort_column = _resolve_sort_column(combined, sort_by, sort_order)
+    """
+    Build final SELECT with sorting, tiebreakers, and pagination.
 
-    # Tiebreakers: multi-type includes type for deterministic grouping (direction
-    # doesn't matter — it's just for stability); single-type omits it.
-    created_at_tiebreak = (
-        combined.c.created_at.desc() if sort_order == "desc"
-        else combined.c.created_at.asc()
-    )
-    id_tiebreak = (
-        combined.c.id.desc() if sort_order == "desc" else combined.c.id.asc()
-    )
-    tiebreakers = (
-        [created_at_tiebreak, id_tiebreak] if is_single_type
-        else [combined.c.type, created_at_tiebreak, id_tiebreak]
-    )
+    When `position` is given, rows up to and including it are excluded with a
+    keyset predicate instead of being skipped by OFFSET.
+    """
+    sort_keys = _build_sort_keys(combined, sort_by, sort_order, is_single_type=is_single_type)
+    order_by = [col.desc() if descending else col.asc() for col, descending in sort_keys]
 
-    return (
-        select(combined)
-        .order_by(sort_column, *tiebreakers)
-        .offset(offset)
-        .limit(limit)
-    )
+    stmt = select(combined).order_by(*order_by)
+    if position is not None:
+        values = [position.sort_value]
+        if not is_single_type:
+            values.append(position.type)
+        values.extend([position.created_at, position.id])
+        stmt = stmt.where(_build_seek_condition(sort_keys, values))
+    return stmt.offset(offset).limit(limit)
 
 
-def _resolve_sort_column(
+def _build_sort_keys(
     combined: Any,
     sort_by: str,
     sort_order: Literal["asc", "desc"],
-) -> Any:
-    """Resolve sort_by string to a SQLAlchemy order clause."""
+    *,
+    is_single_type: bool,
+) -> list[tuple[Any, bool]]:
+    """
+    Resolve the full ordering as (column, descending) pairs.
+
+    The same list drives ORDER BY and the keyset seek predicate, so the two
+    can never disagree.
+    """
+    descending = sort_order == "desc"
     if sort_by == "relevance":
         # Always DESC — ascending relevance (least-relevant-first) is nonsensical.
         # sort_order is intentionally ignored here.
-        return combined.c.search_rank.desc()
-    col = combined.c.sort_title if sort_by == "title" else getattr(combined.c, sort_by)
-    return col.desc() if sort_order == "desc" else col.asc()
+        primary = (combined.c.search_rank, True)
+    else:
+        col = combined.c.sort_title if sort_by == "title" else getattr(combined.c, sort_by)
+        primary = (col, descending)
+
+    # Tiebreakers: multi-type includes type for deterministic grouping (direction
+    # doesn't matter — it's just for stability); single-type omits it.
+    tiebreakers = [(combined.c.created_at, descending), (combined.c.id, descending)]
+    if not is_single_type:
+        tiebreakers.insert(0, (combined.c.type, False))
+    return [primary, *tiebreakers]
+
+
+def _build_seek_condition(sort_keys: list[tuple[Any, bool]], values: list[Any]) -> Any:
+    """
+    Build a predicate matching rows that sort strictly after `values`.
+
+    Expands the lexicographic comparison into
+    ``(k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...`` because the keys can mix
+    directions, which a single row-value comparison cannot express. NULLs follow
+    Postgres defaults: last for ASC, first for DESC.
+    """
+    clauses = []
+    for i, (col, descending) in enumerate(sort_keys):
+        value = values[i]
+        if value is None:
+            if not descending:
+                continue  # nothing sorts after NULL in ascending order
+            after = col.is_not(None)
+        elif descending:
+            after = col < value
+        else:
+            after = or_(col > value, col.is_(None))
+        equal_prefix = [
+            prev_col.is_(None) if prev_value is None else prev_col == prev_value
+            for (prev_col, _), prev_value in zip(sort_keys[:i], values[:i], strict=True)
+        ]
+        clauses.append(and_(*equal_prefix, after))
+
+    condition = or_(*clauses) if clauses else literal(False)
+    # Redundant leading bound on the primary key so the planner can use a range
+    # scan instead of evaluating the OR expansion for every row.
+    primary_col, primary_desc = sort_keys[0]
+    if values[0] is not None and primary_desc:
+        condition = and_(primary_col <= values[0], condition)
+    return condition
+
+
+def _build_ilike_filter(
+    query: str,
+    search_pattern: str,
+    search_fields: list[tuple[InstrumentedAttribute, float]],
+    url_column: InstrumentedAttribute | None,
+) -> Any:
+    """
+    Build the substring (ILIKE) side of the search filter.
+
+    Normally a single ILIKE over the concatenated fields: one trigram GIN bitmap
+    scan per table (BitmapOr'd with the tsvector GIN scan) instead of a
+    sequential scan evaluating one ILIKE per field. This is equivalent to the
+    per-field OR because the escaped pattern has no wildcards in the middle and
+    so cannot span the separator — unless the query itself contains the
+    separator, in which case the per-field OR is used.
+    """
+    ilike_columns = [field for field, _ in search_fields]
+    if url_column is not None:
+        ilike_columns.append(url_column)
+    if SEARCH_TEXT_SEPARATOR in query:
+        return or_(*[column.ilike(search_pattern) for column in ilike_columns])
+    return build_search_text_expr(ilike_columns).ilike(search_pattern)
 
 
 def _apply_entity_filters(
@@ -583,8 +915,12 @@ def _apply_entity_filters(
     Apply view, search, tag, and filter expression filters for any entity type.
 
     Uses combined FTS + ILIKE: items matching either FTS (stemmed, ranked) or
-    ILIKE (substring) are included. The empty tsquery guard is handled by the
-    caller (search_all_content returns early for stop-word-only queries).
+    ILIKE (substring) are included. Both sides are index-backed: the tsvector GIN
+    index for FTS and a pg_trgm GIN index over build_search_text_expr() for ILIKE.
+    Stop-word-only queries (e.g. "the", "and or") produce an empty tsquery; the
+    search filter then requires numnode(tsquery) > 0 so the ILIKE side cannot
+    match everything. Postgres evaluates that guard once per statement as a
+    one-time filter, so it costs no extra round trip.
 
     Args:
         filters: Base filter list to extend.
@@ -639,12 +975,10 @@ def _apply_entity_filters(
         # ILIKE uses the raw query intentionally — websearch operators (-, "...", OR)
         # become inert literal characters that rarely match via ILIKE. FTS handles
         # structured query syntax correctly. Do not strip operators from the ILIKE pattern.
-        ilike_conditions = [field.ilike(search_pattern) for field, _ in search_fields]
-        if url_column is not None:
-            ilike_conditions.append(url_column.ilike(search_pattern))
-        ilike_filter = or_(*ilike_conditions)
+        ilike_filter = _build_ilike_filter(query, search_pattern, search_fields, url_column)
 
-        # Combined: match if either FTS or ILIKE hits
+        # Combined: match if either FTS or ILIKE hits, and only for non-empty tsqueries
+        filters.append(func.numnode(tsquery) > 0)
         filters.append(or_(fts_filter, ilike_filter))
 
     # Tag filter from query params
@@ -0,0 +1,228 @@
+"""
+Worker pool for CPU-bound diff-match-patch operations.
+
+diff-match-patch is pure Python, so a 50% rewrite of a large note can hold the
+event loop for tens to hundreds of milliseconds (see performance/diff/README.md).
+HistoryService routes its diff work through here: small inputs run inline (the
+pool round trip would cost more than the diff), larger ones run in a
+thread or process pool.
+
+The diff/patch functions are module-level so they can be pickled into a
+process pool.
+"""
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from diff_match_patch import diff_match_patch
+
+from core.metrics import (
+    HISTORY_DIFF_QUEUE_SECONDS,
+    HISTORY_DIFF_RUN_SECONDS,
+    HISTORY_DIFF_TIMEOUTS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Combined input size (characters) below which diff work runs inline
+DEFAULT_OFFLOAD_THRESHOLD = 32 * 1024
+
+# Seconds an offloaded reverse diff may take (queue + compute) before falling back
+DEFAULT_DIFF_TIMEOUT = 2.0
+
+
+@dataclass
+class PatchIssue:
+    """A reverse diff that did not apply cleanly."""
+
+    version: int
+    results: list[bool] | None = None  # Per-patch results for a partial failure
+    error: str | None = None  # Parse error for a corrupted diff
+
+
+def make_reverse_diff(current: str, previous: str, timeout: float = 1.0) -> str:
+    """
+    Build the patch text that turns `current` back into `previous`.
+
+    `timeout` is diff-match-patch's own Diff_Timeout: past it, the diff
+    degrades to a coarser (still correct) result instead of running on.
+    """
+    dmp = diff_match_patch()
+    dmp.Diff_Timeout = timeout
+    return dmp.patch_toText(dmp.patch_make(current, previous))
+
+
+def make_replacement_diff(current: str, previous: str) -> str:
+    """
+    Build a reverse diff that replaces `current` wholesale with `previous`.
+
+    Linear in the input size; used when a real diff is too expensive.
+    """
+    dmp = diff_match_patch()
+    diffs = [(dmp.DIFF_DELETE, current), (dmp.DIFF_INSERT, previous)]
+    return dmp.patch_toText(dmp.patch_make(current, diffs))
+
+
+def apply_reverse_diffs(
+    content: str | None, diffs: list[tuple[int, str]],
+) -> tuple[str | None, list[PatchIssue]]:
+    """
+    Apply reverse diffs in order, newest version first.
+
+    Args:
+        content: Starting content.
+        diffs: (version, patch text) pairs; each takes version N's content to N-1's.
+
+    Returns:
+        The resulting content and any diffs that failed to apply fully. A
+        corrupted diff is skipped (content passes through unchanged).
+    """
+    dmp = diff_match_patch()
+    issues: list[PatchIssue] = []
+    for version, diff_text in diffs:
+        try:
+            patches = dmp.patch_fromText(diff_text)
+            new_content, results = dmp.patch_apply(patches, content or "")
+        except ValueError as e:
+            issues.append(PatchIssue(version=version, error=str(e)))
+            continue
+        if not all(results):
+            issues.append(PatchIssue(version=version, results=results))
+        content = new_content
+    return content, issues
+
+
+def _timed(fn: Callable[..., Any], *args: Any) -> tuple[Any, float, float]:
+    """Run fn in the worker, returning its result with start/finish monotonic times."""
+    started = time.monotonic()
+    result = fn(*args)
+    return result, started, time.monotonic()
+
+
+def _run_inline(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run fn on the event loop, recording its compute time."""
+    started = time.monotonic()
+    result = fn(*args)
+    HISTORY_DIFF_QUEUE_SECONDS.observe(0.0, "inline")
+    HISTORY_DIFF_RUN_SECONDS.observe(time.monotonic() - started, "inline")
+    return result
+
+
+class DiffWorkerPool:
+    """
+    Size-aware scheduler for diff work.
+
+    Inputs under `offload_threshold` characters run inline; larger ones are
+    submitted to a thread pool (default) or process pool. A thread pool keeps
+    the loop responsive between GIL switches; a process pool isolates the work
+    completely at the cost of pickling both texts.
+
+    Reverse diffs computed in the pool are bounded by `timeout`, covering both
+    queue and compute time; on expiry make_reverse_diff returns None and the
+    caller stores a snapshot instead. Patch application (reads) has no
+    fallback and is never cut short.
+
+    Queue and compute time of every job, inline or offloaded, and the
+    timeouts are exported through core/metrics.py.
+    """
+
+    def __init__(
+        self,
+        *,
+        kind: Literal["thread", "process"] = "thread",
+        max_workers: int = 2,
+        offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+        timeout: float = DEFAULT_DIFF_TIMEOUT,
+    ) -> None:
+        """Initialize the pool; the executor is created on first offloaded job."""
+        self.kind = kind
+        self.max_workers = max_workers
+        self.offload_threshold = offload_threshold
+        self.timeout = timeout
+        self._executor: Executor | None = None
+
+    def shutdown(self) -> None:
+        """Shut down the executor without waiting for in-flight jobs."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def make_reverse_diff(self, current: str, previous: str) -> str | None:
+        """
+        Compute a reverse diff (current → previous).
+
+        Returns:
+            The patch text, or None if an offloaded diff exceeded the timeout.
+        """
+        if len(current) + len(previous) < self.offload_threshold:
+            return _run_inline(make_reverse_diff, current, previous)
+        try:
+            return await asyncio.wait_for(
+                self._offload(make_reverse_diff, current, previous, self.timeout),
+                self.timeout,
+            )
+        except TimeoutError:
+            HISTORY_DIFF_TIMEOUTS.inc()
+            logger.warning(
+                "diff_timeout chars=%d timeout=%.1fs",
+                len(current) + len(previous),
+                self.timeout,
+            )
+            return None
+
+    async def apply_reverse_diffs(
+        self, content: str | None, diffs: list[tuple[int, str]],
+    ) -> tuple[str | None, list[PatchIssue]]:
+        """Apply reverse diffs in order (see apply_reverse_diffs), offloading large chains."""
+        size = len(content or "") + sum(len(diff_text) for _, diff_text in diffs)
+        if size < self.offload_threshold:
+            return _run_inline(apply_reverse_diffs, content, diffs)
+        return await self._offload(apply_reverse_diffs, content, diffs)
+
+    async def _offload(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn in the executor, recording queue and compute time."""
+        if self._executor is None:
+            if self.kind == "process":
+                # spawn, not fork: forking a process that runs threads can deadlock
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        submitted = time.monotonic()
+        result, started, finished = await asyncio.get_running_loop().run_in_executor(
+            self._executor, _timed, fn, *args,
+        )
+        queue_seconds = max(0.0, started - submitted)
+        run_seconds = finished - started
+        HISTORY_DIFF_QUEUE_SECONDS.observe(queue_seconds, "offloaded")
+        HISTORY_DIFF_RUN_SECONDS.observe(run_seconds, "offloaded")
+        logger.debug(
+            "diff_offloaded fn=%s queue_ms=%.1f run_ms=%.1f",
+            fn.__name__,
+            queue_seconds * 1000,
+            run_seconds * 1000,
+        )
+        return result
+
+
+# Global pool instance (set during app startup). When unset, diff work runs
+# inline on the event loop.
+_diff_pool: DiffWorkerPool | None = None
+
+
+def get_diff_pool() -> DiffWorkerPool | None:
+    """Get the global diff worker pool instance."""
+    return _diff_pool
+
+
+def set_diff_pool(pool: DiffWorkerPool | None) -> None:
+    """Set the global diff worker pool instance."""
+    global _diff_pool  # noqa: PLW0603
+    _diff_pool = pool
@@ -47,6 +47,19 @@ class FieldLimitExceededError(Exception):
         super().__init__(f"{field.capitalize()} exceeds limit of {limit} characters")
 
 
+class InvalidCursorError(ValueError):
+    """
+    Raised when a keyset pagination cursor cannot be used.
+
+    Covers malformed tokens, cursors issued for a different sort, and cursors
+    combined with a non-zero offset. Subclasses ValueError so list endpoints
+    that already map ValueError to a client error handle it unchanged.
+    """
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+
+
 class RelationshipError(Exception):
     """Base class for relationship errors."""
 
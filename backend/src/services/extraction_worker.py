@@ -0,0 +1,173 @@
+"""
+Process pool for CPU-bound page extraction (HTML readability, PDF text).
+
+trafilatura and pypdf are pure Python, so extracting a large page or PDF
+inline holds the event loop for the whole parse. scrape_url routes
+extraction through here instead. Each job runs under a CPU-time budget in
+the worker (RLIMIT_CPU, enforced with SIGXCPU) as well as a wall-clock
+timeout in the caller, so one pathological document can neither stall the
+API worker nor pin a pool process indefinitely.
+
+Jobs are module-level functions so they can be pickled into the pool.
+"""
+import asyncio
+import logging
+import math
+import multiprocessing
+import resource
+import signal
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import FrameType
+from typing import Any
+
+from core.metrics import SCRAPE_EXTRACTION_FAILURES, SCRAPE_EXTRACTION_RUN_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# CPU seconds one extraction job may use in its worker
+DEFAULT_CPU_SECONDS = 5
+
+# Seconds an extraction may take (queue + compute) before the caller gives up
+DEFAULT_EXTRACTION_TIMEOUT = 10.0
+
+
+class ExtractionLimitError(Exception):
+    """Raised when an extraction job exceeds its CPU or wall-clock budget."""
+
+    pass
+
+
+class _CpuLimitExceededError(BaseException):
+    """
+    Raised inside a worker by the SIGXCPU handler.
+
+    A BaseException so that the `except Exception` fallbacks in the
+    extractors (and inside pypdf's lenient parser) cannot swallow it.
+    """
+
+    pass
+
+
+def _raise_cpu_limit(_signum: int, _frame: FrameType | None) -> None:
+    """SIGXCPU handler: abort the running job."""
+    raise _CpuLimitExceededError
+
+
+def _init_worker() -> None:
+    """Pool initializer: turn SIGXCPU into an exception instead of killing the worker."""
+    signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+
+
+def _run_limited(
+    cpu_seconds: int, fn: Callable[..., Any], *args: Any,
+) -> tuple[Any, float]:
+    """
+    Run fn in the worker with a CPU-time budget, returning its result and run time.
+
+    RLIMIT_CPU counts the whole process, so the soft limit is set to the CPU
+    time used so far plus the budget, and lifted again afterwards. The hard
+    limit is left alone (an unprivileged process could not raise it back).
+    """
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = usage.ru_utime + usage.ru_stime
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = math.ceil(used + cpu_seconds)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    started = time.monotonic()
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    try:
+        return fn(*args), time.monotonic() - started
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+class ExtractionWorkerPool:
+    """
+    Process pool for page extraction with per-job CPU and wall-clock limits.
+
+    A job that exceeds `cpu_seconds` of CPU is aborted in its worker; one
+    that exceeds `timeout` (queue + compute) is abandoned by the caller and
+    left to the CPU limit. Either way run() raises ExtractionLimitError. A
+    worker that dies takes the executor with it; the next job starts a new
+    one. Run times of completed jobs and aborts by reason are recorded in
+    core/metrics.py.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 2,
+        cpu_seconds: int = DEFAULT_CPU_SECONDS,
+        timeout: float = DEFAULT_EXTRACTION_TIMEOUT,
+    ) -> None:
+        """Initialize the pool; the executor is created on the first job."""
+        self.max_workers = max_workers
+        self.cpu_seconds = cpu_seconds
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+
+    def shutdown(self) -> None:
+        """Shut down the executor without waiting for in-flight jobs."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) in a worker process.
+
+        Raises:
+            ExtractionLimitError: If the job ran out of CPU or wall-clock time,
+                or its worker died.
+        """
+        if self._executor is None:
+            # spawn, not fork: forking a process that runs threads can deadlock
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        try:
+            result, run_seconds = await asyncio.wait_for(
+                asyncio.get_running_loop().run_in_executor(
+                    self._executor, _run_limited, self.cpu_seconds, fn, *args,
+                ),
+                self.timeout,
+            )
+        except TimeoutError:
+            SCRAPE_EXTRACTION_FAILURES.inc("timeout")
+            logger.warning("extraction_timeout fn=%s timeout=%.1fs", fn.__name__, self.timeout)
+            raise ExtractionLimitError("Content extraction timed out") from None
+        except _CpuLimitExceededError:
+            SCRAPE_EXTRACTION_FAILURES.inc("cpu_limit")
+            logger.warning(
+                "extraction_cpu_limit fn=%s cpu_seconds=%d", fn.__name__, self.cpu_seconds,
+            )
+            raise ExtractionLimitError("Content extraction exceeded its CPU limit") from None
+        except BrokenProcessPool:
+            SCRAPE_EXTRACTION_FAILURES.inc("broken_pool")
+            logger.warning("extraction_pool_broken fn=%s", fn.__name__)
+            self.shutdown()
+            raise ExtractionLimitError("Content extraction failed") from None
+        SCRAPE_EXTRACTION_RUN_SECONDS.observe(run_seconds)
+        return result
+
+
+# Global pool instance (set during app startup). When unset, extraction runs
+# inline on the event loop.
+_extraction_pool: ExtractionWorkerPool | None = None
+
+
+def get_extraction_pool() -> ExtractionWorkerPool | None:
+    """Get the global extraction worker pool instance."""
+    return _extraction_pool
+
+
+def set_extraction_pool(pool: ExtractionWorkerPool | None) -> None:
+    """Set the global extraction worker pool instance."""
+    global _extraction_pool  # noqa: PLW0603
+    _extraction_pool = pool
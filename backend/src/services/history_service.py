@@ -1,29 +1,109 @@
 """Service layer for content history recording and reconstruction."""
 import logging
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from uuid import UUID
 
 from diff_match_patch import diff_match_patch
-from sqlalchemy import delete, func, select
+from sqlalchemy import ColumnElement, delete, func, insert, select, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from uuid6 import uuid7
 
+from core.metrics import HISTORY_RECORD_ACTION_DURATION
 from core.request_context import RequestContext
 from core.tier_limits import TierLimits
 from models.bookmark import Bookmark
 from models.content_history import ActionType, ContentHistory, EntityType
 from models.note import Note
 from models.prompt import Prompt
+from services.diff_worker import (
+    PatchIssue,
+    apply_reverse_diffs,
+    get_diff_pool,
+    make_replacement_diff,
+    make_reverse_diff,
+)
+from services.exceptions import InvalidCursorError
+from services.utils import decode_cursor, encode_cursor, parse_cursor_timestamp
+from services.version_cache import CachedVersion, VersionCache
 
 logger = logging.getLogger(__name__)
 
-# Full snapshot every N versions (enables reconstruction optimization)
-SNAPSHOT_INTERVAL = 10
+# Snapshot policy defaults (see SnapshotPolicy). A version stores a full
+# content snapshot once the diffs since the last snapshot add up to about the
+# content size - replaying them would cost as much as reading a snapshot...
+SNAPSHOT_DIFF_RATIO = 1.0
+# ...but not before this many diff bytes accumulate (small content is
+# cheap to replay, so snapshots there would mostly waste space)...
+SNAPSHOT_MIN_DIFF_BYTES = 4096
+# ...and on every Nth version regardless, bounding how many diffs reconstruction replays
+MAX_SNAPSHOT_INTERVAL = 20
 
 # Check count-based pruning every N writes to avoid per-write COUNT overhead
 PRUNE_CHECK_INTERVAL = 10
 
+# Rows per INSERT in record_creates and record_metadata_updates (13 bind parameters each)
+CREATE_BATCH_SIZE = 1000
+
+# Entity tables by EntityType value, for reading current content
+_ENTITY_MODELS: dict[str, type[Bookmark] | type[Note] | type[Prompt]] = {
+    "bookmark": Bookmark,
+    "note": Note,
+    "prompt": Prompt,
+}
+
+# Columns a history list returns (HistoryResponse). The content_snapshot and
+# content_diff columns can be megabytes per row and are only needed to
+# reconstruct content, so list queries leave them unread.
+_TIMELINE_COLUMNS = (
+    ContentHistory.entity_type,
+    ContentHistory.entity_id,
+    ContentHistory.action,
+    ContentHistory.version,
+    ContentHistory.metadata_snapshot,
+    ContentHistory.changed_fields,
+    ContentHistory.source,
+    ContentHistory.auth_type,
+    ContentHistory.token_prefix,
+    ContentHistory.created_at,
+)
+
+
+@dataclass(frozen=True)
+class SnapshotPolicy:
+    """
+    Decides per write whether a version stores a full content snapshot.
+
+    Snapshots bound reconstruction cost: replay starts at the nearest snapshot
+    above the target. Rather than a fixed interval, the decision weighs the
+    diff bytes written since the last snapshot against the content size,
+    so large notes with big diffs snapshot often and small notes rarely.
+    """
+
+    diff_ratio: float = SNAPSHOT_DIFF_RATIO
+    min_diff_bytes: int = SNAPSHOT_MIN_DIFF_BYTES
+    max_interval: int = MAX_SNAPSHOT_INTERVAL
+
+    def should_snapshot(
+        self, *, version: int, content_size: int, diff_bytes_since: int,
+    ) -> bool:
+        """
+        Whether the version being written should store a snapshot.
+
+        Args:
+            version: Version number being written.
+            content_size: Size of the version's content in bytes (UTF-8).
+            diff_bytes_since: Total diff size in bytes since the last snapshot,
+                including this version's diff.
+        """
+        if version % self.max_interval == 0:
+            return True
+        threshold = max(self.min_diff_bytes, self.diff_ratio * content_size)
+        return diff_bytes_since >= threshold
+
 
 @dataclass
 class ReconstructionResult:
@@ -34,6 +114,16 @@ class ReconstructionResult:
     warnings: list[str] | None = None  # Warnings if reconstruction had issues
 
 
+@dataclass
+class HistoryPage:
+    """One page of history records."""
+
+    items: list[ContentHistory]  # Timeline columns only; content columns raise on access
+    total: int | None  # None when the caller opted out of the count query
+    has_more: bool  # True if there are more results beyond this page
+    next_cursor: str | None  # Opaque keyset token for the next page (None on the last page)
+
+
 @dataclass
 class DiffResult:
     """Result of version diff computation."""
@@ -49,9 +139,11 @@ class DiffResult:
 class HistoryService:
     """Service for recording and retrieving content history."""
 
-    def __init__(self) -> None:
-        """Initialize the history service with diff-match-patch."""
+    def __init__(self, snapshot_policy: SnapshotPolicy | None = None) -> None:
+        """Initialize the history service with diff-match-patch and a version cache."""
         self.dmp = diff_match_patch()
+        self.version_cache = VersionCache()
+        self.snapshot_policy = snapshot_policy or SnapshotPolicy()
 
     async def record_action(
         self,
@@ -96,6 +188,7 @@ class HistoryService:
         Raises:
             IntegrityError: If max retries exceeded on version collision.
         """
+        started = time.perf_counter()
         max_retries = 3
         last_error: IntegrityError | None = None
         history: ContentHistory | None = None
@@ -132,24 +225,13 @@ class HistoryService:
                 raise last_error
             raise RuntimeError("Unexpected state in record_action")
 
-        # Count-based pruning: check every 10th write (only for versioned records)
-        if (
-            limits is not None
-            and history.version is not None
-            and history.version % PRUNE_CHECK_INTERVAL == 0
-        ):
-            entity_type_value = (
-                entity_type.value if isinstance(entity_type, EntityType) else entity_type
-            )
-            count = await self._get_entity_history_count(
-                db, user_id, entity_type_value, entity_id,
+        if limits is not None and history.version is not None:
+            # Count-based pruning (only for versioned records)
+            await self._prune_if_due(
+                db, user_id, history.entity_type, entity_id, history.version, limits,
             )
-            if count > limits.max_history_per_entity:
-                await self._prune_to_limit(
-                    db, user_id, entity_type_value, entity_id,
-                    target=limits.max_history_per_entity,
-                )
 
+        HISTORY_RECORD_ACTION_DURATION.observe(time.perf_counter() - started, history.action)
         return history
 
     # Audit actions: lifecycle state transitions that don't affect content
@@ -199,15 +281,29 @@ class HistoryService:
         elif previous_content == current_content:
             # Content unchanged - metadata-only change (tags, title, etc.)
             version = await self._get_next_version(db, user_id, entity_type_value, entity_id)
-            if version % SNAPSHOT_INTERVAL == 0:
+            if await self._should_snapshot(
+                db, user_id, entity_type_value, entity_id, version, current_content,
+                diff_bytes=0,
+            ):
                 content_snapshot = current_content  # Guarantee bounded reconstruction
         else:
             # UPDATE/RESTORE with content change
             version = await self._get_next_version(db, user_id, entity_type_value, entity_id)
-            patches = self.dmp.patch_make(current_content or "", previous_content or "")
-            content_diff = self.dmp.patch_toText(patches)
-            if version % SNAPSHOT_INTERVAL == 0:
-                content_snapshot = current_content  # Periodic snapshot
+            content_diff = await self._make_reverse_diff(
+                current_content or "", previous_content or "",
+            )
+            if content_diff is None:
+                # Diff too expensive: store a wholesale replacement diff plus a
+                # snapshot, so reconstruction anchors here instead of replaying it
+                content_diff = make_replacement_diff(
+                    current_content or "", previous_content or "",
+                )
+                content_snapshot = current_content
+            elif await self._should_snapshot(
+                db, user_id, entity_type_value, entity_id, version, current_content,
+                diff_bytes=len(content_diff.encode()),
+            ):
+                content_snapshot = current_content  # Policy snapshot
 
         history = ContentHistory(
             user_id=user_id,
@@ -227,6 +323,170 @@ class HistoryService:
         await db.flush()
         return history
 
+    async def record_creates(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        entity_type: EntityType | str,
+        entries: list[tuple[UUID, str | None, dict, list[str]]],
+        context: RequestContext,
+    ) -> None:
+        """
+        Record CREATE history for many new entities with multi-row inserts (bulk create).
+
+        Every entity is new, so each record is version 1 with a content snapshot:
+        no version lookup, savepoint retry, or pruning check is needed.
+
+        Args:
+            db: Database session.
+            user_id: ID of the user.
+            entity_type: Type of entity (bookmark, note, prompt).
+            entries: (entity_id, content, metadata, changed_fields) per created entity.
+            context: Request context with source/auth info.
+        """
+        entity_type_value = (
+            entity_type.value if isinstance(entity_type, EntityType) else entity_type
+        )
+        rows = [
+            {
+                "id": uuid7(),
+                "user_id": user_id,
+                "entity_type": entity_type_value,
+                "entity_id": entity_id,
+                "action": ActionType.CREATE.value,
+                "version": 1,
+                "content_snapshot": content,
+                "content_diff": None,
+                "metadata_snapshot": metadata,
+                "changed_fields": changed_fields,
+                "source": context.source,
+                "auth_type": context.auth_type.value,
+                "token_prefix": context.token_prefix,
+            }
+            for entity_id, content, metadata, changed_fields in entries
+        ]
+        for start in range(0, len(rows), CREATE_BATCH_SIZE):
+            await db.execute(insert(ContentHistory).values(rows[start:start + CREATE_BATCH_SIZE]))
+
+    async def record_metadata_updates(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        entity_type: EntityType | str,
+        entries: list[tuple[UUID, dict]],
+        context: RequestContext,
+        *,
+        limits: TierLimits | None = None,
+        changed_fields: list[str] | None = None,
+    ) -> None:
+        """
+        Record metadata-only UPDATE history for many entities at once.
+
+        Equivalent to record_action with current_content == previous_content for
+        each entity, but versions come from one grouped query and the records
+        are written with one multi-row insert. Content is only read for the
+        entities whose version falls on the periodic snapshot interval.
+
+        Args:
+            db: Database session.
+            user_id: ID of the user.
+            entity_type: Type of the entities (bookmark, note, prompt).
+            entries: (entity_id, metadata) per entity.
+            context: Request context with source/auth info.
+            limits: User's tier limits for count-based pruning. If None, pruning is skipped.
+            changed_fields: List of field names that changed (e.g. ["relationships"]).
+
+        Raises:
+            IntegrityError: If max retries exceeded on version collision.
+        """
+        if not entries:
+            return
+        entity_type_value = (
+            entity_type.value if isinstance(entity_type, EntityType) else entity_type
+        )
+
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                async with db.begin_nested():  # Same savepoint retry as record_action
+                    versions = await self._record_metadata_updates_impl(
+                        db, user_id, entity_type_value, entries, context, changed_fields,
+                    )
+                    break
+            except IntegrityError as e:
+                if "uq_content_history_version" not in str(e) or attempt == max_retries - 1:
+                    raise
+
+        if limits is not None:
+            for entity_id, version in versions.items():
+                await self._prune_if_due(
+                    db, user_id, entity_type_value, entity_id, version, limits,
+                )
+
+    async def _record_metadata_updates_impl(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        entity_type: str,
+        entries: list[tuple[UUID, dict]],
+        context: RequestContext,
+        changed_fields: list[str] | None,
+    ) -> dict[UUID, int]:
+        """Internal implementation of record_metadata_updates. Returns versions written."""
+        entity_ids = [entity_id for entity_id, _ in entries]
+        latest = await db.execute(
+            select(ContentHistory.entity_id, func.max(ContentHistory.version))
+            .where(
+                ContentHistory.user_id == user_id,
+                ContentHistory.entity_type == entity_type,
+                ContentHistory.entity_id.in_(entity_ids),
+                ContentHistory.version.isnot(None),
+            )
+            .group_by(ContentHistory.entity_id),
+        )
+        latest_versions = dict(latest.tuples().all())
+        versions = {
+            entity_id: (latest_versions.get(entity_id) or 0) + 1 for entity_id in entity_ids
+        }
+
+        # Content is unchanged, so the diff-volume rule never fires (see
+        # _should_snapshot); only the periodic interval needs a snapshot.
+        snapshot_ids = [
+            entity_id for entity_id, version in versions.items()
+            if version % self.snapshot_policy.max_interval == 0
+        ]
+        snapshots: dict[UUID, str | None] = {}
+        if snapshot_ids:
+            model = _ENTITY_MODELS[entity_type]
+            result = await db.execute(
+                select(model.id, model.content).where(
+                    model.user_id == user_id, model.id.in_(snapshot_ids),
+                ),
+            )
+            snapshots = dict(result.tuples().all())
+
+        rows = [
+            {
+                "id": uuid7(),
+                "user_id": user_id,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "action": ActionType.UPDATE.value,
+                "version": versions[entity_id],
+                "content_snapshot": snapshots.get(entity_id),
+                "content_diff": None,
+                "metadata_snapshot": metadata,
+                "changed_fields": changed_fields,
+                "source": context.source,
+                "auth_type": context.auth_type.value,
+                "token_prefix": context.token_prefix,
+            }
+            for entity_id, metadata in entries
+        ]
+        for start in range(0, len(rows), CREATE_BATCH_SIZE):
+            await db.execute(insert(ContentHistory).values(rows[start:start + CREATE_BATCH_SIZE]))
+        return versions
+
     async def get_entity_history(
         self,
         db: AsyncSession,
@@ -239,6 +499,8 @@ class HistoryService:
         """
         Get history for a specific entity.
 
+        Thin wrapper over get_entity_history_page() for offset callers.
+
         Args:
             db: Database session.
             user_id: ID of the user.
@@ -248,38 +510,58 @@ class HistoryService:
             offset: Number of records to skip.
 
         Returns:
-            Tuple of (history records, total count).
+            Tuple of (history records, total count). Records carry the timeline
+            columns only (see get_entity_history_page).
         """
-        entity_type_value = (
-            entity_type.value if isinstance(entity_type, EntityType) else entity_type
+        page = await self.get_entity_history_page(
+            db, user_id, entity_type, entity_id, limit=limit, offset=offset,
         )
+        return page.items, page.total or 0
 
-        # Count query
-        count_stmt = (
-            select(func.count())
-            .select_from(ContentHistory)
-            .where(
-                ContentHistory.user_id == user_id,
-                ContentHistory.entity_type == entity_type_value,
-                ContentHistory.entity_id == entity_id,
-            )
-        )
-        total = (await db.execute(count_stmt)).scalar_one()
+    async def get_entity_history_page(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        entity_type: EntityType | str,
+        entity_id: UUID,
+        *,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: str | None = None,
+        include_total: bool = True,
+    ) -> HistoryPage:
+        """
+        Get one page of history for a specific entity, most recent first.
 
-        # Data query (order by created_at since audit events have NULL version)
-        stmt = (
-            select(ContentHistory)
-            .where(
-                ContentHistory.user_id == user_id,
-                ContentHistory.entity_type == entity_type_value,
-                ContentHistory.entity_id == entity_id,
-            )
-            .order_by(ContentHistory.created_at.desc(), ContentHistory.id.desc())
-            .offset(offset)
-            .limit(limit)
+        Args:
+            db: Database session.
+            user_id: ID of the user.
+            entity_type: Type of entity.
+            entity_id: ID of the entity.
+            limit: Maximum records to return.
+            offset: Number of records to skip. Must be 0 when `cursor` is provided.
+            cursor: Opaque keyset token from a previous page's `next_cursor`.
+            include_total: If False, skip the count and return total=None.
+
+        Returns:
+            HistoryPage whose records have only the timeline columns loaded.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or combined with a
+                non-zero offset.
+        """
+        entity_type_value = (
+            entity_type.value if isinstance(entity_type, EntityType) else entity_type
+        )
+        conditions = [
+            ContentHistory.user_id == user_id,
+            ContentHistory.entity_type == entity_type_value,
+            ContentHistory.entity_id == entity_id,
+        ]
+        return await self._get_history_page(
+            db, conditions,
+            limit=limit, offset=offset, cursor=cursor, include_total=include_total,
         )
-        result = await db.execute(stmt)
-        return list(result.scalars().all()), total
 
     async def get_user_history(
         self,
@@ -296,6 +578,8 @@ class HistoryService:
         """
         Get all history for a user.
 
+        Thin wrapper over get_user_history_page() for offset callers.
+
         Args:
             db: Database session.
             user_id: ID of the user.
@@ -308,7 +592,59 @@ class HistoryService:
             offset: Number of records to skip.
 
         Returns:
-            Tuple of (history records, total count).
+            Tuple of (history records, total count). Records carry the timeline
+            columns only (see get_user_history_page).
+        """
+        page = await self.get_user_history_page(
+            db,
+            user_id,
+            entity_types=entity_types,
+            actions=actions,
+            sources=sources,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            offset=offset,
+        )
+        return page.items, page.total or 0
+
+    async def get_user_history_page(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        entity_types: list[EntityType | str] | None = None,
+        actions: list[ActionType | str] | None = None,
+        sources: list[str] | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        *,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: str | None = None,
+        include_total: bool = True,
+    ) -> HistoryPage:
+        """
+        Get one page of a user's history across all entities, most recent first.
+
+        Args:
+            db: Database session.
+            user_id: ID of the user.
+            entity_types: Optional filter by entity types (OR logic within).
+            actions: Optional filter by action types (OR logic within).
+            sources: Optional filter by sources (OR logic within).
+            start_date: Optional filter for records on or after this datetime.
+            end_date: Optional filter for records on or before this datetime.
+            limit: Maximum records to return.
+            offset: Number of records to skip. Must be 0 when `cursor` is provided.
+            cursor: Opaque keyset token from a previous page's `next_cursor`.
+            include_total: If False, skip the count and return total=None.
+
+        Returns:
+            HistoryPage whose records have only the timeline columns loaded.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or combined with a
+                non-zero offset.
 
         Note:
             Empty lists are treated as "no filter" (show all) since bool([]) is False.
@@ -337,22 +673,74 @@ class HistoryService:
         if end_date:
             conditions.append(ContentHistory.created_at <= end_date)
 
-        # Count query
-        count_stmt = select(func.count()).select_from(ContentHistory).where(*conditions)
-        total = (await db.execute(count_stmt)).scalar_one()
+        return await self._get_history_page(
+            db, conditions,
+            limit=limit, offset=offset, cursor=cursor, include_total=include_total,
+        )
+
+    async def _get_history_page(
+        self,
+        db: AsyncSession,
+        conditions: list[ColumnElement[bool]],
+        *,
+        limit: int,
+        offset: int,
+        cursor: str | None,
+        include_total: bool,
+    ) -> HistoryPage:
+        """
+        Fetch one page of history rows matching `conditions`.
+
+        Rows are ordered by (created_at, id) descending - created_at rather than
+        version because audit events have NULL version. Only the timeline
+        columns are selected, so content_snapshot and content_diff are never
+        read out of TOAST. A cursor seeks past the last row of the previous
+        page instead of OFFSET-scanning; one extra row is fetched so has_more
+        is exact without the count, and the count (when wanted) rides along
+        in the page query.
+        """
+        count_query = select(func.count()).select_from(ContentHistory).where(*conditions)
+        page_conditions = list(conditions)
+        if cursor:
+            if offset:
+                raise InvalidCursorError("offset cannot be combined with cursor")
+            after = _decode_history_cursor(cursor)
+            page_conditions.append(tuple_(ContentHistory.created_at, ContentHistory.id) < after)
 
-        # Data query
         stmt = (
             select(ContentHistory)
-            .where(*conditions)
+            .options(load_only(*_TIMELINE_COLUMNS, raiseload=True))
+            .where(*page_conditions)
             .order_by(ContentHistory.created_at.desc(), ContentHistory.id.desc())
             .offset(offset)
-            .limit(limit)
+            .limit(limit + 1)
         )
-        result = await db.execute(stmt)
-        return list(result.scalars().all()), total
+        if include_total:
+            # Without correlate(None) the subquery would be correlated to the
+            # outer content_history and lose its FROM clause.
+            stmt = stmt.add_columns(
+                count_query.correlate(None).scalar_subquery().label("total_count"),
+            )
 
-    async def reconstruct_content_at_version(  # noqa: PLR0911, PLR0912
+        rows = (await db.execute(stmt)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        total: int | None = None
+        if include_total:
+            if rows:
+                total = rows[0].total_count
+            elif offset or cursor:
+                # Page past the end: no row to carry the count, so ask separately.
+                total = await db.scalar(count_query) or 0
+            else:
+                total = 0
+
+        items = [row[0] for row in rows]
+        next_cursor = _encode_history_cursor(items[-1]) if has_more and items else None
+        return HistoryPage(items=items, total=total, has_more=has_more, next_cursor=next_cursor)
+
+    async def reconstruct_content_at_version(  # noqa: PLR0911, PLR0912, PLR0915
         self,
         db: AsyncSession,
         user_id: UUID,
@@ -376,6 +764,11 @@ class HistoryService:
         - Start from any snapshot (using content_snapshot)
         - Traverse through snapshots (using content_diff)
 
+        Replayed results are kept in `version_cache`. A cached target is returned
+        after a single id lookup confirming its history row still exists, and
+        the nearest cached version above the target serves as an anchor like a
+        snapshot, so scrubbing through history replays one diff per step.
+
         Args:
             db: Database session.
             user_id: ID of the user.
@@ -391,6 +784,17 @@ class HistoryService:
         entity_type_value = (
             entity_type.value if isinstance(entity_type, EntityType) else entity_type
         )
+        cache_entity = (user_id, entity_type_value, entity_id)
+
+        # Step 0: Cached reconstruction - valid while its history row still exists
+        cached = self.version_cache.get(cache_entity, target_version)
+        if cached is not None:
+            record_id = await self._get_version_record_id(
+                db, user_id, entity_type_value, entity_id, target_version,
+            )
+            if record_id == cached.record_id:
+                return ReconstructionResult(found=True, content=cached.content)
+            self.version_cache.mark_stale(cache_entity, target_version)
 
         # Step 1: Get current content from the entity as fallback anchor
         entity = await self._get_entity(
@@ -423,8 +827,14 @@ class HistoryService:
             # DIFF or METADATA record - entity.content is current
             return ReconstructionResult(found=True, content=entity.content)
 
-        # Step 4: Fetch all history records from latest down to AND INCLUDING target
-        # Including target allows us to check if target is a SNAPSHOT (optimization)
+        # Step 4: Fetch history records from latest down to AND INCLUDING target
+        # Including target allows us to check if target is a SNAPSHOT (optimization).
+        # A cached version between target and latest is an anchor just like a
+        # snapshot, so the fetch stops there instead of at latest.
+        cached_anchor = self.version_cache.nearest_above(cache_entity, target_version)
+        if cached_anchor is not None and cached_anchor.version >= latest_version:
+            cached_anchor = None
+        upper_version = cached_anchor.version if cached_anchor else latest_version
         records_stmt = (
             select(ContentHistory)
             .where(
@@ -432,7 +842,7 @@ class HistoryService:
                 ContentHistory.entity_type == entity_type_value,
                 ContentHistory.entity_id == entity_id,
                 ContentHistory.version >= target_version,  # Include target
-                ContentHistory.version <= latest_version,
+                ContentHistory.version <= upper_version,
             )
             .order_by(ContentHistory.version.desc())  # Descending: latest first
         )
@@ -472,6 +882,18 @@ class HistoryService:
             content = records_to_traverse[last_snapshot_idx].content_snapshot
             # Only process records FROM the snapshot onwards (it and lower versions)
             records_to_process = records_to_traverse[last_snapshot_idx:]
+        elif cached_anchor is not None:
+            # Fetch stopped at the cached version, so it is the first record
+            anchor_record = records_to_traverse[0] if records_to_traverse else None
+            if anchor_record is None or anchor_record.id != cached_anchor.record_id:
+                # Its row was pruned or replaced - retry anchored on latest
+                self.version_cache.mark_stale(cache_entity, cached_anchor.version)
+                return await self.reconstruct_content_at_version(
+                    db, user_id, entity_type_value, entity_id, target_version,
+                )
+            self.version_cache.mark_anchor_used()
+            content = cached_anchor.content
+            records_to_process = records_to_traverse
         else:
             # No snapshot found - start from entity.content
             content = entity.content
@@ -480,38 +902,42 @@ class HistoryService:
         # Step 8: Apply reverse diffs to reach target version
         warnings: list[str] = []
 
-        for record in records_to_process:
-            # Apply content_diff to traverse backwards
-            # content_diff transforms version N content → version N-1 content
-            if record.content_diff:
-                try:
-                    patches = self.dmp.patch_fromText(record.content_diff)
-                    new_content, results = self.dmp.patch_apply(patches, content or "")
-                    if not all(results):
-                        warning_msg = f"Partial patch failure at v{record.version}"
-                        warnings.append(warning_msg)
-                        logger.warning(
-                            "Diff application partial failure for %s/%s v%d: %s",
-                            entity_type_value,
-                            entity_id,
-                            record.version,
-                            results,
-                        )
-                    content = new_content
-                except ValueError as e:
-                    # Corrupted diff text - log warning and continue with current content
-                    warning_msg = f"Corrupted diff at v{record.version}: {e}"
-                    warnings.append(warning_msg)
-                    logger.warning(
-                        "Corrupted diff for %s/%s v%d: %s",
-                        entity_type_value,
-                        entity_id,
-                        record.version,
-                        e,
-                    )
-                    # Content passes through unchanged when diff is corrupted
-            # If content_diff is None (CREATE, DELETE, METADATA), no transformation needed
-            # Content passes through unchanged
+        # content_diff transforms version N content → version N-1 content.
+        # Records without a diff (CREATE, DELETE, METADATA) pass content through.
+        diffs = [
+            (record.version, record.content_diff)
+            for record in records_to_process
+            if record.content_diff
+        ]
+        content, issues = await self._apply_reverse_diffs(content, diffs)
+        for issue in issues:
+            if issue.error is not None:
+                # Corrupted diff text - content passed through unchanged
+                warnings.append(f"Corrupted diff at v{issue.version}: {issue.error}")
+                logger.warning(
+                    "Corrupted diff for %s/%s v%d: %s",
+                    entity_type_value,
+                    entity_id,
+                    issue.version,
+                    issue.error,
+                )
+            else:
+                warnings.append(f"Partial patch failure at v{issue.version}")
+                logger.warning(
+                    "Diff application partial failure for %s/%s v%d: %s",
+                    entity_type_value,
+                    entity_id,
+                    issue.version,
+                    issue.results,
+                )
+
+        if not warnings:
+            self.version_cache.put(
+                cache_entity,
+                CachedVersion(
+                    version=target_version, record_id=target_record.id, content=content,
+                ),
+            )
 
         return ReconstructionResult(
             found=True,
@@ -578,27 +1004,15 @@ class HistoryService:
             # 3. Derive "before" content from version N's reverse diff
             #    (only when content actually changed — not for CREATE)
             if content_diff_exists and version > 1:
-                try:
-                    patches = self.dmp.patch_fromText(after_history.content_diff)
-                    patched_content, results = self.dmp.patch_apply(
-                        patches, after_content or "",
-                    )
-                    if not all(results):
-                        warning_msg = (
-                            f"Partial patch failure deriving before-content at v{version}"
-                        )
-                        if warnings is None:
-                            warnings = []
-                        warnings.append(warning_msg)
-                        logger.warning(
-                            "Before-content derivation partial failure for v%d: %s",
-                            version,
-                            results,
-                        )
+                patched_content, issues = await self._apply_reverse_diffs(
+                    after_content, [(version, after_history.content_diff)],
+                )
+                if not issues:
                     before_content = patched_content
-                except ValueError as e:
+                elif issues[0].error is not None:
                     warning_msg = (
-                        f"Corrupted diff at v{version}, cannot derive before-content: {e}"
+                        f"Corrupted diff at v{version}, cannot derive before-content: "
+                        f"{issues[0].error}"
                     )
                     if warnings is None:
                         warnings = []
@@ -606,9 +1020,22 @@ class HistoryService:
                     logger.warning(
                         "Corrupted diff deriving before-content for v%d: %s",
                         version,
-                        e,
+                        issues[0].error,
                     )
                     # before_content remains None — after_content still valid
+                else:
+                    warning_msg = (
+                        f"Partial patch failure deriving before-content at v{version}"
+                    )
+                    if warnings is None:
+                        warnings = []
+                    warnings.append(warning_msg)
+                    logger.warning(
+                        "Before-content derivation partial failure for v%d: %s",
+                        version,
+                        issues[0].results,
+                    )
+                    before_content = patched_content
 
         # 4. Get "before" metadata from version N-1's record
         before_metadata: dict | None = None
@@ -627,6 +1054,28 @@ class HistoryService:
             warnings=warnings,
         )
 
+    async def _make_reverse_diff(self, current: str, previous: str) -> str | None:
+        """
+        Compute the reverse diff current → previous, via the diff pool if configured.
+
+        Returns None when the diff pool gave up on an expensive diff (timeout).
+        """
+        pool = get_diff_pool()
+        if pool is None:
+            return make_reverse_diff(current, previous)
+        return await pool.make_reverse_diff(current, previous)
+
+    async def _apply_reverse_diffs(
+        self, content: str | None, diffs: list[tuple[int, str]],
+    ) -> tuple[str | None, list[PatchIssue]]:
+        """Apply (version, reverse diff) pairs in order, via the diff pool if configured."""
+        if not diffs:
+            return content, []
+        pool = get_diff_pool()
+        if pool is None:
+            return apply_reverse_diffs(content, diffs)
+        return await pool.apply_reverse_diffs(content, diffs)
+
     async def get_history_at_version(
         self,
         db: AsyncSession,
@@ -690,6 +1139,7 @@ class HistoryService:
             ContentHistory.entity_id == entity_id,
         )
         result = await db.execute(stmt)
+        self.version_cache.invalidate_entity((user_id, entity_type_value, entity_id))
         return result.rowcount
 
     async def _get_entity(
@@ -713,12 +1163,7 @@ class HistoryService:
         Returns:
             Entity if found, None otherwise.
         """
-        model_map: dict[str, type[Bookmark] | type[Note] | type[Prompt]] = {
-            "bookmark": Bookmark,
-            "note": Note,
-            "prompt": Prompt,
-        }
-        model = model_map.get(entity_type)
+        model = _ENTITY_MODELS.get(entity_type)
         if model is None:
             return None
 
@@ -730,6 +1175,23 @@ class HistoryService:
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def _get_version_record_id(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        entity_type: str,
+        entity_id: UUID,
+        version: int,
+    ) -> UUID | None:
+        """Get the id of the history record at a version, without loading its content."""
+        stmt = select(ContentHistory.id).where(
+            ContentHistory.user_id == user_id,
+            ContentHistory.entity_type == entity_type,
+            ContentHistory.entity_id == entity_id,
+            ContentHistory.version == version,
+        )
+        return (await db.execute(stmt)).scalar_one_or_none()
+
     async def get_latest_version(
         self,
         db: AsyncSession,
@@ -764,6 +1226,60 @@ class HistoryService:
     # Keep private alias for backward compatibility with internal callers
     _get_latest_version = get_latest_version
 
+    async def _should_snapshot(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        entity_type: str,
+        entity_id: UUID,
+        version: int,
+        content: str | None,
+        diff_bytes: int,
+    ) -> bool:
+        """
+        Apply the snapshot policy to the version being written.
+
+        The periodic check and metadata-only writes need no I/O. Otherwise one
+        query sums the byte sizes of the diffs written since the last
+        snapshot (octet_length reads the stored size without detoasting the
+        diffs), whose version comes from the ix_content_history_snapshots
+        partial index.
+
+        Args:
+            db: Database session.
+            user_id: ID of the user.
+            entity_type: Type of entity (string value).
+            entity_id: ID of the entity.
+            version: Version number being written.
+            content: Content of the version being written.
+            diff_bytes: Size of the version's own diff in bytes (0 for metadata-only).
+        """
+        policy = self.snapshot_policy
+        if version % policy.max_interval == 0:
+            return True
+        if diff_bytes == 0:
+            # Same content and diffs as the previous write, which didn't snapshot
+            return False
+        entity_filter = (
+            ContentHistory.user_id == user_id,
+            ContentHistory.entity_type == entity_type,
+            ContentHistory.entity_id == entity_id,
+        )
+        last_snapshot = (
+            select(func.coalesce(func.max(ContentHistory.version), 0))
+            .where(*entity_filter, ContentHistory.content_snapshot.isnot(None))
+            .scalar_subquery()
+        )
+        stmt = select(
+            func.coalesce(func.sum(func.octet_length(ContentHistory.content_diff)), 0),
+        ).where(*entity_filter, ContentHistory.version > last_snapshot)
+        diff_bytes_since = (await db.execute(stmt)).scalar_one()
+        return policy.should_snapshot(
+            version=version,
+            content_size=len((content or "").encode()),
+            diff_bytes_since=diff_bytes_since + diff_bytes,
+        )
+
     async def _get_next_version(
         self,
         db: AsyncSession,
@@ -823,6 +1339,25 @@ class HistoryService:
         )
         return (await db.execute(stmt)).scalar_one()
 
+    async def _prune_if_due(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        entity_type: str,
+        entity_id: UUID,
+        version: int,
+        limits: TierLimits,
+    ) -> None:
+        """Prune to the tier limit; counted only every PRUNE_CHECK_INTERVAL-th version."""
+        if version % PRUNE_CHECK_INTERVAL != 0:
+            return
+        count = await self._get_entity_history_count(db, user_id, entity_type, entity_id)
+        if count > limits.max_history_per_entity:
+            await self._prune_to_limit(
+                db, user_id, entity_type, entity_id,
+                target=limits.max_history_per_entity,
+            )
+
     async def _prune_to_limit(
         self,
         db: AsyncSession,
@@ -880,8 +1415,23 @@ class HistoryService:
         )
 
         result = await db.execute(delete_stmt)
+        self.version_cache.discard_below((user_id, entity_type, entity_id), cutoff_version)
         return result.rowcount
 
 
+def _encode_history_cursor(record: ContentHistory) -> str:
+    """Encode the (created_at, id) keyset position of `record` as an opaque URL-safe token."""
+    return encode_cursor({"c": record.created_at.isoformat(), "i": str(record.id)})
+
+
+def _decode_history_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a token produced by _encode_history_cursor."""
+    payload = decode_cursor(cursor)
+    try:
+        return parse_cursor_timestamp(payload["c"]), UUID(payload["i"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
 # Singleton instance for use throughout the application
 history_service = HistoryService()
@@ -0,0 +1,129 @@
+"""In-process cache of line offset indexes for partial content reads."""
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from uuid import UUID
+
+# Upper bound on cached offsets, measured as array buffer size (4 bytes per line)
+LINE_INDEX_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# (entity_type, entity_id)
+EntityKey = tuple[str, UUID]
+
+
+@dataclass(frozen=True)
+class LineIndex:
+    """
+    Start offset of every line of one version of an entity's content.
+
+    `offsets[i]` is the character offset where line i + 1 starts, so the
+    content has len(offsets) lines. `updated_at`, `length` (characters) and
+    `byte_length` (UTF-8) identify the content version: callers use an entry
+    only while they match the stored row.
+    """
+
+    updated_at: datetime
+    length: int
+    byte_length: int
+    offsets: array
+
+    @property
+    def total_lines(self) -> int:
+        """Number of lines in the content."""
+        return len(self.offsets)
+
+
+@dataclass
+class LineIndexCacheStats:
+    """Hit/miss counters for the line index cache."""
+
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0  # Entries dropped because the content changed
+    evictions: int = 0
+
+
+class LineIndexCache:
+    """
+    LRU cache of the latest line index per entity, bounded by total index size.
+
+    Lets partial reads fetch only the requested character range of large
+    content, and content search map match positions to lines, without
+    splitting the whole document on every call.
+    """
+
+    def __init__(self, max_bytes: int = LINE_INDEX_CACHE_MAX_BYTES) -> None:
+        """Initialize an empty cache holding at most `max_bytes` of offsets."""
+        self.max_bytes = max_bytes
+        self._lru: OrderedDict[EntityKey, LineIndex] = OrderedDict()
+        self._bytes = 0
+        self._stats = LineIndexCacheStats()
+
+    def stats(self) -> LineIndexCacheStats:
+        """Return a snapshot of the counters."""
+        return replace(self._stats)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of cached offsets."""
+        return self._bytes
+
+    def get(self, entity: EntityKey) -> LineIndex | None:
+        """Return the cached index for an entity, if present."""
+        entry = self._lru.get(entity)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        self._lru.move_to_end(entity)
+        return entry
+
+    def put(self, entity: EntityKey, entry: LineIndex) -> None:
+        """Cache `entry`, evicting least recently used indexes to stay in budget."""
+        size = _size(entry)
+        if size > self.max_bytes:
+            return
+        self.discard(entity)
+        self._lru[entity] = entry
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            old_entity = next(iter(self._lru))
+            self.discard(old_entity)
+            self._stats.evictions += 1
+
+    def discard(self, entity: EntityKey) -> None:
+        """Drop an entity's index."""
+        entry = self._lru.pop(entity, None)
+        if entry is not None:
+            self._bytes -= _size(entry)
+
+    def mark_stale(self, entity: EntityKey) -> None:
+        """Drop an index whose content version no longer matches the stored row."""
+        self._stats.stale += 1
+        self.discard(entity)
+
+    def clear(self) -> None:
+        """Drop everything."""
+        self._lru.clear()
+        self._bytes = 0
+
+
+def _size(entry: LineIndex) -> int:
+    """Buffer size of an index's offsets."""
+    return entry.offsets.itemsize * len(entry.offsets)
+
+
+# Global line index cache instance (set during app startup)
+_line_index_cache: LineIndexCache | None = None
+
+
+def get_line_index_cache() -> LineIndexCache | None:
+    """Get the global line index cache instance."""
+    return _line_index_cache
+
+
+def set_line_index_cache(cache: LineIndexCache | None) -> None:
+    """Set the global line index cache instance."""
+    global _line_index_cache  # noqa: PLW0603
+    _line_index_cache = cache
@@ -1,5 +1,6 @@
 """Service layer for note CRUD operations."""
 import logging
+from typing import Any
 from uuid import UUID
 
 from sqlalchemy import func
@@ -13,6 +14,7 @@ from models.tag import note_tags
 from schemas.note import NoteCreate, NoteUpdate
 from services import relationship_service
 from services.base_entity_service import BaseEntityService
+from services.public_share_cache import invalidate_public_share
 from services.exceptions import FieldLimitExceededError, QuotaExceededError
 from services.tag_service import get_or_create_tags, update_note_tags
 
@@ -31,6 +33,7 @@ class NoteService(BaseEntityService[Note]):
     model = Note
     junction_table = note_tags
     entity_name = "Note"
+    quota_limit_field = "max_notes"
 
     @property
     def entity_type(self) -> EntityType:
@@ -75,6 +78,22 @@ class NoteService(BaseEntityService[Note]):
                         "tag", len(tag), limits.max_tag_name_length,
                     )
 
+    def _bulk_row(self, data: NoteCreate, limits: TierLimits) -> dict[str, Any]:
+        """Validate a create_many item and return its column values."""
+        self._validate_field_limits(
+            limits,
+            title=data.title,
+            description=data.description,
+            content=data.content,
+            tags=data.tags,
+        )
+        return {
+            "title": data.title,
+            "description": data.description,
+            "content": data.content,
+            "archived_at": data.archived_at,
+        }
+
     async def check_quota(
         self,
         db: AsyncSession,
@@ -254,6 +273,7 @@ class NoteService(BaseEntityService[Note]):
 
         await db.flush()
         await self._refresh_with_tags(db, note)
+        await invalidate_public_share(db, self.entity_type, note.public_token)
 
         # Only record history if something actually changed.
         # Reuse the previous relationship snapshot when relationships weren't in the
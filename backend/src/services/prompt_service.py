@@ -4,9 +4,8 @@ from datetime import datetime
 from typing import Any, Literal
 from uuid import UUID
 
-from jinja2 import TemplateSyntaxError, meta
-from jinja2.sandbox import SandboxedEnvironment
-from sqlalchemy import func, select
+from jinja2 import TemplateSyntaxError
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import defer, selectinload
@@ -19,18 +18,14 @@ from models.tag import prompt_tags
 from schemas.content import ViewOption
 from schemas.prompt import PromptCreate, PromptUpdate
 from services import relationship_service
-from services.base_entity_service import CONTENT_PREVIEW_LENGTH, BaseEntityService
+from services.base_entity_service import CONTENT_PREVIEW_LENGTH, BaseEntityService, CacheValidator
+from services.public_share_cache import invalidate_public_share
 from services.exceptions import FieldLimitExceededError, QuotaExceededError
 from services.tag_service import get_or_create_tags, update_prompt_tags
+from services.template_renderer import compile_template
 
 logger = logging.getLogger(__name__)
 
-# Jinja2 environment for template validation (parse + meta-analysis only; this
-# instance never renders). Sandboxed for consistency with the render path and to
-# prevent future misuse if someone later calls .render() on it — not load-bearing
-# for security here, since validation does not execute the template.
-_jinja_env = SandboxedEnvironment()
-
 
 class NameConflictError(Exception):
     """Raised when a prompt name conflicts with an existing active prompt."""
@@ -68,16 +63,17 @@ def validate_template(content: str | None, arguments: list[dict[str, Any]]) -> N
 
     defined_args = {arg["name"] for arg in arguments} if arguments else set()
 
-    # Validate syntax first
+    # Validate syntax first. Parsing goes through the renderer's compiled
+    # template cache, so the first render after a save reuses this parse.
     try:
-        ast = _jinja_env.parse(content)
+        compiled = compile_template(content)
     except TemplateSyntaxError as e:
         raise ValueError(f"Invalid Jinja2 syntax: {e.message}") from e
 
     # Find variables referenced in the template but not bound within it. Jinja2's
     # built-in globals (range, cycler, namespace, ...) are NOT reported here, so they
     # pass without needing to be declared as arguments.
-    template_vars = meta.find_undeclared_variables(ast)
+    template_vars = compiled.variables
 
     # Check for undefined variables (used in template but not in arguments)
     undefined = template_vars - defined_args
@@ -110,6 +106,8 @@ class PromptService(BaseEntityService[Prompt]):
     model = Prompt
     junction_table = prompt_tags
     entity_name = "Prompt"
+    quota_limit_field = "max_prompts"
+    unique_active_column = "name"
 
     @property
     def entity_type(self) -> EntityType:
@@ -187,6 +185,32 @@ class PromptService(BaseEntityService[Prompt]):
                         limits.max_argument_description_length,
                     )
 
+    def _bulk_row(self, data: PromptCreate, limits: TierLimits) -> dict[str, Any]:
+        """Validate a create_many item (field limits and template) and return its column values."""
+        arguments_list = [arg.model_dump() for arg in data.arguments]
+        self._validate_field_limits(
+            limits,
+            name=data.name,
+            title=data.title,
+            description=data.description,
+            content=data.content,
+            tags=data.tags,
+            arguments=arguments_list,
+        )
+        validate_template(data.content, arguments_list)
+        return {
+            "name": data.name,
+            "title": data.title,
+            "description": data.description,
+            "content": data.content,
+            "arguments": arguments_list,
+            "archived_at": data.archived_at,
+        }
+
+    def _duplicate_error(self, value: str, archived_id: UUID | None) -> Exception:  # noqa: ARG002
+        """Name taken by an active or archived prompt."""
+        return NameConflictError(value)
+
     async def check_quota(
         self,
         db: AsyncSession,
@@ -432,6 +456,7 @@ class PromptService(BaseEntityService[Prompt]):
             raise
 
         await self._refresh_with_tags(db, prompt)
+        await invalidate_public_share(db, self.entity_type, prompt.public_token)
 
         # Only record history if something actually changed.
         # Reuse the previous relationship snapshot when relationships weren't in the
@@ -469,52 +494,43 @@ class PromptService(BaseEntityService[Prompt]):
         tags: list[str] | None = None,
         tag_match: Literal["all", "any"] = "all",
         view: ViewOption = "active",
-        offset: int = 0,
+        after: tuple[str, UUID] | None = None,
         limit: int = 100,
-    ) -> tuple[list[Prompt], int]:
+    ) -> list[Prompt]:
         """
-        List prompts with full content for export.
+        List one page of prompts with full content for export.
 
         Unlike search_all_content() which returns ContentListItem projections,
         this returns full ORM Prompt objects needed by the export endpoint
         to build SKILL.md files.
 
+        Pages are keyset-paginated in byte order of name (COLLATE "C"), then
+        id. In byte order all names sharing a prefix are adjacent, so prompts
+        whose names truncate to the same skill directory arrive together.
+
         Args:
             db: Database session.
             user_id: User ID to scope prompts.
             tags: Filter by tags (normalized to lowercase).
             tag_match: "all" (AND) or "any" (OR) for tag matching.
             view: Single view option ("active", "archived", or "deleted").
-            offset: Pagination offset.
-            limit: Pagination limit.
+            after: (name, id) of the last prompt of the previous page.
+            limit: Page size.
 
         Returns:
-            Tuple of (list of Prompt ORM objects with content, total count).
+            Prompt ORM objects with content; fewer than `limit` on the last page.
         """
-        base_query = (
-            select(Prompt)
-            .options(selectinload(Prompt.tag_objects))
-            .where(Prompt.user_id == user_id)
-        )
-
-        base_query = self._apply_view_filter(base_query, {view})
-
+        name_key = Prompt.name.collate("C")
+        query = select(Prompt).where(Prompt.user_id == user_id)
+        query = self._apply_view_filter(query, {view})
         if tags:
-            base_query = self._apply_tag_filter(base_query, user_id, tags, tag_match)
-
-        # Count
-        count_subquery = base_query.with_only_columns(Prompt.id).subquery()
-        count_query = select(func.count()).select_from(count_subquery)
-        total = (await db.execute(count_query)).scalar() or 0
-
-        # Paginate (order by name for deterministic export)
-        base_query = (
-            base_query.order_by(Prompt.name.asc(), Prompt.id.asc())
-            .offset(offset).limit(limit)
-        )
+            query = self._apply_tag_filter(query, user_id, tags, tag_match)
+        if after is not None:
+            query = query.where(tuple_(name_key, Prompt.id) > tuple_(*after))
+        query = query.order_by(name_key, Prompt.id).limit(limit)
 
-        result = await db.execute(base_query)
-        return list(result.scalars().all()), total
+        result = await db.execute(query)
+        return list(result.scalars().all())
 
     async def get_by_name(
         self,
@@ -648,6 +664,44 @@ class PromptService(BaseEntityService[Prompt]):
         )
         return result.scalar_one_or_none()
 
+    async def get_cache_validator_by_name(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        name: str,
+    ) -> CacheValidator | None:
+        """
+        Get the validator for GET /prompts/name/{name}.
+
+        Returns only for active prompts (excludes deleted AND archived).
+        """
+        return await self._get_cache_validator(
+            db, user_id, Prompt.name == name, Prompt.deleted_at.is_(None), ~Prompt.is_archived,
+        )
+
+    async def get_by_name_with_line_range(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        name: str,
+        start_line: int | None,
+        end_line: int | None,
+    ) -> Prompt | None:
+        """
+        Get an active prompt by name with only the requested lines of its content.
+
+        Without a line range this is get_by_name(). See get_with_line_range.
+
+        Raises:
+            ValueError: If the line range is invalid for the content.
+        """
+        if start_line is None and end_line is None:
+            return await self.get_by_name(db, user_id, name)
+        return await self._get_with_line_range(
+            db, user_id, Prompt.name == name, Prompt.deleted_at.is_(None), ~Prompt.is_archived,
+            start_line=start_line, end_line=end_line,
+        )
+
     async def get_metadata_by_name(
         self,
         db: AsyncSession,
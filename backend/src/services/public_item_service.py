@@ -13,10 +13,13 @@ Token *generation* lives with the owner-side write path that uses it
 (``BaseEntityService._generate_public_token``), not here — this module only
 reads.
 """
+from uuid import UUID
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.bookmark import Bookmark
+from models.content_history import EntityType
 from models.note import Note
 from models.prompt import Prompt
 
@@ -55,3 +58,22 @@ async def get_public_prompt(db: AsyncSession, token: str) -> Prompt | None:
         ),
     )
     return result.scalar_one_or_none()
+
+
+async def get_user_public_tokens(db: AsyncSession, user_id: UUID) -> dict[EntityType, list[str]]:
+    """Return the share tokens of a user's published items, by content type."""
+    tokens: dict[EntityType, list[str]] = {}
+    for content_type, model in (
+        (EntityType.BOOKMARK, Bookmark),
+        (EntityType.NOTE, Note),
+        (EntityType.PROMPT, Prompt),
+    ):
+        result = await db.execute(
+            select(model.public_token).where(
+                model.user_id == user_id,
+                model.is_public.is_(True),
+                model.public_token.is_not(None),
+            ),
+        )
+        tokens[content_type] = list(result.scalars())
+    return tokens
@@ -0,0 +1,443 @@
+"""Cache of rendered public share payloads, keyed by share token."""
+import asyncio
+import contextlib
+import hashlib
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from redis.exceptions import RedisError
+
+from core.http_cache import generate_etag
+from db.hooks import run_after_commit
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from core.redis import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# Cache schema version - included in cache keys. Bump when a Public*Response
+# schema or the stored entry format changes so old payloads are ignored until
+# they expire. v2: entries carry the payload's expiry ahead of the body.
+CACHE_SCHEMA_VERSION = 2
+
+# Pub/sub channel carrying invalidated cache keys (newline-separated) to every worker.
+INVALIDATION_CHANNEL = f"public:v{CACHE_SCHEMA_VERSION}:invalidate"
+
+# Lua script storing a loaded payload only if its key has not been invalidated
+# since the load started: every invalidation writes a new random stamp to the
+# key's version key, so a stamp read before the load that no longer matches
+# means the payload may predate the write that changed it.
+#
+# KEYS: payload key, version key. ARGV: stamp read before the load ('' if
+# none), entry, TTL in ms. Returns 1 if stored, 0 if skipped.
+FILL_SCRIPT = """
+local stamp = redis.call('GET', KEYS[2]) or ''
+if stamp ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'PX', ARGV[3])
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class CachedPublicItem:
+    """A rendered public response: the JSON body, its ETag and when it goes stale."""
+
+    body: bytes
+    etag: str
+    # Unix time at which the body stops being current without any write (a
+    # scheduled archive taking effect flips the derived is_archived), if any
+    expires_at: float | None = None
+
+    @classmethod
+    def from_body(
+        cls, body: bytes, archived_at: datetime | None = None,
+    ) -> "CachedPublicItem":
+        """
+        Wrap a rendered body with its ETag (the one ETagMiddleware would compute).
+
+        A future `archived_at` (a scheduled archive) becomes the item's expiry.
+        """
+        expires_at = None
+        if archived_at is not None and archived_at.timestamp() > time.time():
+            expires_at = archived_at.timestamp()
+        return cls(body, generate_etag(body), expires_at)
+
+    def encode(self) -> bytes:
+        """Serialize for Redis: the expiry (empty if none), a newline, the body."""
+        expiry = b"" if self.expires_at is None else repr(self.expires_at).encode()
+        return expiry + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, data: bytes) -> "CachedPublicItem":
+        """Rebuild an item stored by encode()."""
+        expiry, _, body = data.partition(b"\n")
+        return cls(body, generate_etag(body), float(expiry) if expiry else None)
+
+    def is_stale(self) -> bool:
+        """Whether the body has expired (see `expires_at`)."""
+        return self.expires_at is not None and self.expires_at <= time.time()
+
+    def seconds_left(self) -> float | None:
+        """Seconds until the body goes stale (<= 0 once it has), None if never."""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.time()
+
+
+@dataclass
+class PublicShareCacheStats:
+    """Hit/miss counters per cache tier (L1 = in-process, L2 = Redis)."""
+
+    l1_hits: int = 0
+    l1_misses: int = 0
+    l2_hits: int = 0
+    l2_misses: int = 0
+    coalesced: int = 0  # Requests that waited on another request's load of the same item
+    evictions: int = 0
+
+
+class PublicShareCache:
+    """
+    Cache of the public (unauthenticated) view of shared items.
+
+    Entries are the rendered JSON of a Public*Response, keyed by content type
+    and a hash of the share token (tokens are bearer secrets and never appear
+    in keys). Only published items are cached; unknown tokens always go to
+    the database.
+
+    Every write that changes what a share token serves (share/unshare,
+    rotate, content edits, archive, delete, account deletion) must call
+    invalidate_public_share(), which evicts immediately and again once the
+    transaction commits - evicting only before the commit would let a
+    concurrent read re-cache the still-visible old row.
+
+    A load that overlaps an invalidation can still read the old row. Its
+    payload is served to the requests that waited on it but not cached: each
+    invalidation stamps the key's version key in Redis, and a load only
+    stores its payload (FILL_SCRIPT) if the stamp is still the one it read
+    before loading, whichever worker it runs on. Payloads of items with a
+    scheduled archive are cached no longer than until the archive takes
+    effect.
+
+    Two tiers sit behind the same keys: a byte-bounded, TTL'd in-process LRU
+    (L1) in front of Redis (L2). As in AuthCache, L1 is only consulted while
+    this worker is subscribed to INVALIDATION_CHANNEL, so an invalidation on
+    any worker evicts every worker's copy. Concurrent misses for the same
+    item in one worker wait on a single database load (see get_or_load()).
+    """
+
+    CACHE_TTL = 300  # 5 minutes
+    # Lifetime of an invalidation stamp. Must exceed the longest load: a load
+    # that outlives the stamp written during it could cache its stale payload.
+    VERSION_TTL = 300
+    L1_TTL = 30  # Upper bound on L1 staleness if an invalidation is ever missed
+    L1_MAX_BYTES = 16 * 1024 * 1024
+    L1_RESUBSCRIBE_DELAY = 1.0  # Seconds between subscription attempts
+
+    def __init__(self, redis_client: "RedisClient", l1_max_bytes: int = L1_MAX_BYTES) -> None:
+        """Initialize the cache with a Redis client."""
+        self._redis = redis_client
+        self.l1_max_bytes = l1_max_bytes
+        # key -> (expires_at, item)
+        self._l1: OrderedDict[str, tuple[float, CachedPublicItem]] = OrderedDict()
+        self._l1_bytes = 0
+        self._l1_active = False
+        # Bumped on every local eviction. A load only populates L1 if no
+        # eviction happened while it was in flight (the Redis tier has its
+        # own check, see FILL_SCRIPT).
+        self._generation = 0
+        self._in_flight: dict[str, asyncio.Future[CachedPublicItem | None]] = {}
+        self._listener: asyncio.Task[None] | None = None
+        self._stats = PublicShareCacheStats()
+
+    async def start(self) -> None:
+        """Start listening for invalidations; enables L1 once subscribed."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the invalidation listener and drop L1."""
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        self._disable_l1()
+
+    @property
+    def l1_active(self) -> bool:
+        """Whether lookups are currently served from the in-process tier."""
+        return self._l1_active
+
+    @property
+    def size_bytes(self) -> int:
+        """Total body size of L1 entries."""
+        return self._l1_bytes
+
+    def stats(self) -> PublicShareCacheStats:
+        """Return a snapshot of the per-tier hit/miss counters."""
+        return replace(self._stats)
+
+    def _cache_key(self, content_type: str, token: str) -> str:
+        """Generate the cache key for a share token (hashed: tokens are secrets)."""
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        return f"public:v{CACHE_SCHEMA_VERSION}:{content_type}:{digest}"
+
+    @staticmethod
+    def _version_key(key: str) -> str:
+        """Key holding the stamp of the last invalidation of a cache key."""
+        return f"{key}:version"
+
+    async def get_or_load(
+        self,
+        content_type: str,
+        token: str,
+        load: Callable[[], Awaitable[CachedPublicItem | None]],
+    ) -> CachedPublicItem | None:
+        """
+        Return the cached payload for a share token, or load and cache it.
+
+        `load` renders the public response, or returns None if the token
+        serves nothing (not cached). Concurrent callers for the same token in
+        this worker wait on one load instead of each querying the database;
+        if that load fails, each waiter runs its own.
+        """
+        key = self._cache_key(content_type, token)
+        item = await self._get(key)
+        if item is not None:
+            return item
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self._stats.coalesced += 1
+            await asyncio.wait([pending])
+            if not pending.cancelled():
+                return pending.result()
+
+        future: asyncio.Future[CachedPublicItem | None] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._in_flight[key] = future
+        generation = self._generation
+        try:
+            # Read before loading: any invalidation from here on changes it.
+            stamp = await self._redis.get(self._version_key(key)) or b""
+            item = await load()
+            if item is not None and generation == self._generation:
+                await self._fill(key, stamp, item, generation)
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(item)
+            return item
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    async def invalidate(self, content_type: str, *tokens: str) -> bool:
+        """
+        Drop the cached payloads for share tokens on every worker.
+
+        Returns:
+            False if Redis was unavailable and a payload may still be cached.
+        """
+        keys = [self._cache_key(content_type, token) for token in tokens]
+        if not keys:
+            return True
+        self._evict_local(keys)
+        if not self._redis.is_connected:
+            # Redis disabled: nothing is cached (L1 needs the subscription).
+            return True
+        deleted = await self._delete(keys)
+        # A failed publish leaves other workers' L1 copies in place, so it
+        # counts as a failed invalidation just like a failed delete.
+        published = await self._redis.publish(INVALIDATION_CHANNEL, "\n".join(keys))
+        return deleted and published
+
+    async def _delete(self, keys: list[str]) -> bool:
+        """Delete `keys` from Redis and stamp them so in-flight loads don't refill them."""
+        pipe = await self._redis.pipeline()
+        if pipe is None:
+            return False
+        stamp = secrets.token_hex(8)
+        for key in keys:
+            pipe.set(self._version_key(key), stamp, ex=self.VERSION_TTL)
+        pipe.delete(*keys)
+        try:
+            await pipe.execute()
+        except RedisError as e:
+            logger.warning("public_share_cache_delete_failed keys=%d error=%s", len(keys), e)
+            return False
+        return True
+
+    async def _fill(
+        self, key: str, stamp: bytes, item: CachedPublicItem, generation: int,
+    ) -> None:
+        """Cache a loaded item unless `key` was invalidated after `stamp` was read."""
+        ttl_ms = self.CACHE_TTL * 1000
+        seconds_left = item.seconds_left()
+        if seconds_left is not None:
+            ttl_ms = min(ttl_ms, int(seconds_left * 1000))
+            if ttl_ms <= 0:
+                return
+        stored = await self._redis.eval(
+            FILL_SCRIPT, 2, key, self._version_key(key), stamp, item.encode(), ttl_ms,
+        )
+        if stored == 1:
+            self._l1_put(key, item, generation)
+
+    async def _get(self, key: str) -> CachedPublicItem | None:
+        """Look a key up in L1, then Redis (populating L1 on a Redis hit)."""
+        item = self._l1_get(key)
+        if item is not None:
+            self._stats.l1_hits += 1
+            return item
+        self._stats.l1_misses += 1
+
+        generation = self._generation
+        data = await self._redis.get(key)
+        item = None if data is None else CachedPublicItem.decode(data)
+        if item is None or item.is_stale():
+            # Missing, or stale within the rounding of its Redis TTL
+            self._stats.l2_misses += 1
+            return None
+        self._stats.l2_hits += 1
+        self._l1_put(key, item, generation)
+        return item
+
+    def _l1_get(self, key: str) -> CachedPublicItem | None:
+        """Return the live L1 entry for `key`, dropping it if expired."""
+        if not self._l1_active:
+            return None
+        entry = self._l1.get(key)
+        if entry is None:
+            return None
+        expires_at, item = entry
+        if expires_at <= time.monotonic():
+            self._l1_discard(key)
+            return None
+        self._l1.move_to_end(key)
+        return item
+
+    def _l1_put(self, key: str, item: CachedPublicItem, generation: int) -> None:
+        """Store `item` in L1 unless an eviction happened since `generation`."""
+        size = len(item.body)
+        if not self._l1_active or generation != self._generation or size > self.l1_max_bytes:
+            return
+        ttl = self.L1_TTL
+        seconds_left = item.seconds_left()
+        if seconds_left is not None:
+            ttl = min(ttl, seconds_left)
+        self._l1_discard(key)
+        self._l1[key] = (time.monotonic() + ttl, item)
+        self._l1_bytes += size
+        while self._l1_bytes > self.l1_max_bytes:
+            self._l1_discard(next(iter(self._l1)))
+            self._stats.evictions += 1
+
+    def _l1_discard(self, key: str) -> None:
+        """Drop an L1 entry."""
+        entry = self._l1.pop(key, None)
+        if entry is not None:
+            self._l1_bytes -= len(entry[1].body)
+
+    def _evict_local(self, keys: list[str]) -> None:
+        """Evict `keys` from L1 and invalidate in-flight loads."""
+        self._generation += 1
+        for key in keys:
+            self._l1_discard(key)
+
+    def _disable_l1(self) -> None:
+        """Stop serving from L1 and drop its contents."""
+        self._l1_active = False
+        self._generation += 1
+        self._l1.clear()
+        self._l1_bytes = 0
+
+    async def _listen(self) -> None:
+        """
+        Apply invalidations published by any worker to this worker's L1.
+
+        Runs until cancelled. If Redis is unavailable L1 simply stays disabled;
+        on a connection error it is disabled and the subscription retried.
+        """
+        while True:
+            pubsub = self._redis.pubsub()
+            if pubsub is None:
+                return
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        # Initial subscribe or a transparent reconnect: anything
+                        # published in between was missed, so start from empty.
+                        self._disable_l1()
+                        self._l1_active = True
+                        logger.info("public_share_cache_l1_enabled")
+                    elif message["type"] == "message":
+                        data = message["data"]
+                        if isinstance(data, bytes):
+                            data = data.decode()
+                        self._evict_local(data.split("\n"))
+            except RedisError as e:
+                logger.warning("public_share_cache_l1_disabled: subscription failed: %s", e)
+            finally:
+                self._disable_l1()
+                await pubsub.aclose()
+            await asyncio.sleep(self.L1_RESUBSCRIBE_DELAY)
+
+
+async def invalidate_public_share(
+    db: "AsyncSession", content_type: str, *tokens: str | None,
+) -> None:
+    """
+    Drop cached public payloads for share tokens, now and after commit.
+
+    Call from any write that changes what a token serves. The immediate
+    eviction makes the change visible to this worker's next read; the
+    post-commit one (run by get_async_session) removes anything a concurrent
+    read cached from the pre-commit row in between. None tokens (never
+    shared) are ignored.
+    """
+    cache = get_public_share_cache()
+    live = [token for token in tokens if token]
+    if cache is None or not live:
+        return
+
+    async def evict() -> None:
+        if not await cache.invalidate(content_type, *live):
+            # Redis fail-open: a revoked share may be served for up to one TTL.
+            logger.error(
+                "public_share_cache_invalidation_failed type=%s: payload may stay "
+                "cached for up to one TTL",
+                content_type,
+            )
+
+    await evict()
+    run_after_commit(db, evict)
+
+
+# Global public share cache instance (set during app startup)
+_public_share_cache: PublicShareCache | None = None
+
+
+def get_public_share_cache() -> PublicShareCache | None:
+    """Get the global public share cache instance."""
+    return _public_share_cache
+
+
+def set_public_share_cache(cache: PublicShareCache | None) -> None:
+    """Set the global public share cache instance."""
+    global _public_share_cache  # noqa: PLW0603
+    _public_share_cache = cache
@@ -0,0 +1,143 @@
+"""Per-user relationship adjacency cache for multi-hop graph queries."""
+import json
+import logging
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from core.redis import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# Cache schema version - included in cache keys. Bump when the serialized
+# edge format changes so old entries are ignored until they expire.
+CACHE_SCHEMA_VERSION = 1
+
+# One relationship as (source_type, source_id, target_type, target_id)
+Edge = tuple[str, UUID, str, UUID]
+
+
+@dataclass
+class RelationshipGraphCacheStats:
+    """Hit/miss counters for adjacency lookups."""
+
+    hits: int = 0
+    misses: int = 0
+
+
+@dataclass(frozen=True)
+class CachedAdjacency:
+    """
+    A user's cached relationship topology.
+
+    `edges` is None when the user has more than MAX_EDGES relationships: such
+    graphs are not cached and are walked in the database instead.
+    """
+
+    edges: list[Edge] | None
+
+
+class RelationshipGraphCache:
+    """
+    Redis cache of each user's relationship edges (topology only).
+
+    Lets get_relationship_graph walk a neighbourhood in memory instead of
+    running the recursive query. Edges are stored newest first, matching the
+    order the database walk applies its fan-out limit in. Descriptions and
+    content info are not cached; they are always read fresh.
+
+    Every write that adds or removes relationships must invalidate the user's
+    entry, before and after its commit (see invalidate_graph_cache()). The
+    TTL bounds staleness if an invalidation is ever missed.
+
+    While Redis is disabled, or for UNAVAILABLE_BACKOFF seconds after a failed
+    write, `available` is False and callers should use the recursive query:
+    loading the adjacency only pays off when it can be cached.
+    """
+
+    CACHE_TTL = 300  # 5 minutes
+    MAX_EDGES = 5000
+    UNAVAILABLE_BACKOFF = 30.0  # Seconds to skip the cache after a failed write
+
+    def __init__(self, redis_client: "RedisClient") -> None:
+        """Initialize the cache with a Redis client."""
+        self._redis = redis_client
+        self._stats = RelationshipGraphCacheStats()
+        self._unavailable_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Whether adjacency can currently be cached (Redis connected and writable)."""
+        return self._redis.is_connected and time.monotonic() >= self._unavailable_until
+
+    def stats(self) -> RelationshipGraphCacheStats:
+        """Return a snapshot of the hit/miss counters."""
+        return replace(self._stats)
+
+    def _cache_key(self, user_id: UUID) -> str:
+        """Generate the adjacency cache key for a user."""
+        return f"relgraph:v{CACHE_SCHEMA_VERSION}:adj:{user_id}"
+
+    async def get(self, user_id: UUID) -> CachedAdjacency | None:
+        """
+        Get a user's cached adjacency.
+
+        Returns:
+            CachedAdjacency if cached, None on cache miss or Redis failure.
+        """
+        data = await self._redis.get(self._cache_key(user_id))
+        if data is None:
+            self._stats.misses += 1
+            return None
+        try:
+            raw = json.loads(data)
+            edges = None if raw is None else [
+                (source_type, UUID(source_id), target_type, UUID(target_id))
+                for source_type, source_id, target_type, target_id in raw
+            ]
+        except (ValueError, TypeError) as e:
+            logger.warning("relationship_graph_cache_corrupt user_id=%s error=%s", user_id, e)
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        return CachedAdjacency(edges=edges)
+
+    async def set(self, user_id: UUID, edges: list[Edge] | None) -> bool:
+        """
+        Cache a user's edges (newest first), or None to mark the graph as too large.
+
+        Returns:
+            False if Redis was unavailable; the cache then reports itself
+            unavailable for UNAVAILABLE_BACKOFF seconds.
+        """
+        data = None if edges is None else [
+            [source_type, str(source_id), target_type, str(target_id)]
+            for source_type, source_id, target_type, target_id in edges
+        ]
+        stored = await self._redis.setex(
+            self._cache_key(user_id), self.CACHE_TTL, json.dumps(data),
+        )
+        if not stored:
+            self._unavailable_until = time.monotonic() + self.UNAVAILABLE_BACKOFF
+        return stored
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drop a user's cached adjacency after their relationships change."""
+        await self._redis.delete(self._cache_key(user_id))
+
+
+# Global relationship graph cache instance (set during app startup)
+_relationship_graph_cache: RelationshipGraphCache | None = None
+
+
+def get_relationship_graph_cache() -> RelationshipGraphCache | None:
+    """Get the global relationship graph cache instance."""
+    return _relationship_graph_cache
+
+
+def set_relationship_graph_cache(cache: RelationshipGraphCache | None) -> None:
+    """Set the global relationship graph cache instance."""
+    global _relationship_graph_cache  # noqa: PLW0603
+    _relationship_graph_cache = cache
@@ -1,25 +1,46 @@
 """Service layer for content relationship CRUD operations."""
+from dataclasses import dataclass
 from datetime import datetime, UTC
 from uuid import UUID
 
-from sqlalchemy import and_, delete, exists, func, or_, select, update
+from sqlalchemy import (
+    Integer,
+    String,
+    Uuid,
+    and_,
+    case,
+    delete,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    update,
+)
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, defer, selectinload
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import ScalarSelect
 
 from models.bookmark import Bookmark
-from models.content_history import ActionType, EntityType
+from models.content_history import EntityType
 from models.content_relationship import ContentRelationship
 from models.note import Note
 from models.prompt import Prompt
 from schemas.relationship import RelationshipInput, RelationshipWithContentResponse
 from core.request_context import RequestContext
 from core.tier_limits import TierLimits
+from db.hooks import run_after_commit
 from services.exceptions import (
     ContentNotFoundError,
     DuplicateRelationshipError,
     InvalidRelationshipError,
     QuotaExceededError,
 )
+from services.public_share_cache import invalidate_public_share
+from services.relationship_graph_cache import Edge, get_relationship_graph_cache
 
 # Map EntityType values to model classes for validation queries.
 # Uses direct model imports (not services) to avoid circular dependencies,
@@ -44,6 +65,14 @@ BIDIRECTIONAL_TYPES = frozenset({"related"})
 # Sits above the tier limit (e.g. 50) as a hard DB-level guard.
 _RELATIONSHIP_QUERY_CAP = 200
 
+# Bounds for get_relationship_graph: hops from the root, neighbours followed
+# per item, and items returned. The graph endpoint validates against these.
+GRAPH_MAX_DEPTH = 3
+GRAPH_MAX_FAN_OUT = 50
+GRAPH_MAX_NODES = 500
+# Safety cap on relationships returned between the graph's items
+_GRAPH_EDGE_CAP = 2000
+
 
 async def validate_content_exists(
     db: AsyncSession,
@@ -208,6 +237,7 @@ async def create_relationship(
             raise DuplicateRelationshipError from e
         raise
     await db.refresh(rel)
+    await invalidate_graph_cache(db, user_id)
     return rel
 
 
@@ -270,6 +300,7 @@ async def delete_relationship(
         return False
     await db.delete(rel)
     await db.flush()
+    await invalidate_graph_cache(db, user_id)
     return True
 
 
@@ -332,6 +363,204 @@ async def get_relationships_for_content(
     return list(result.scalars().all()), total
 
 
+@dataclass
+class RelationshipGraph:
+    """Neighbourhood of a content item, as returned by get_relationship_graph."""
+
+    # (content_type, content_id) -> hops from the root (0 for the root itself)
+    nodes: dict[tuple[str, UUID], int]
+    # Relationships between any two of the nodes, newest first
+    relationships: list[ContentRelationship]
+    # True if nodes or relationships were cut off by max_nodes or the edge cap
+    truncated: bool
+
+
+async def get_relationship_graph(
+    db: AsyncSession,
+    user_id: UUID,
+    content_type: str,
+    content_id: UUID,
+    *,
+    depth: int = 2,
+    fan_out: int = 25,
+    max_nodes: int = 100,
+) -> RelationshipGraph:
+    """
+    Get the items within `depth` hops of a content item and the relationships between them.
+
+    Relationships are followed in both directions. From each item at most
+    `fan_out` relationships are followed (newest first). Items are ranked by
+    distance from the root, and the closest `max_nodes` are returned.
+
+    The walk runs in memory over the user's cached adjacency when the
+    relationship graph cache is available, and as one recursive query
+    otherwise (no Redis, or the user has too many relationships to cache). Either way the
+    relationships between the resulting items are loaded with one query.
+    """
+    root = (content_type, content_id)
+    nodes: dict[tuple[str, UUID], int] | None = None
+    cache = get_relationship_graph_cache()
+    if cache is not None and cache.available:
+        adjacency = await cache.get(user_id)
+        if adjacency is None:
+            edges = await _load_adjacency(db, user_id, cache.MAX_EDGES)
+            await cache.set(user_id, edges)
+        else:
+            edges = adjacency.edges
+        if edges is not None:
+            nodes = _walk_adjacency(edges, root, depth, fan_out)
+    if nodes is None:
+        nodes = await _walk_relationships(
+            db, user_id, root, depth=depth, fan_out=fan_out, limit=max_nodes + 1,
+        )
+
+    ranked = sorted(nodes.items(), key=lambda item: (item[1], item[0][0], str(item[0][1])))
+    truncated = len(ranked) > max_nodes
+    nodes = dict(ranked[:max_nodes])
+
+    relationships: list[ContentRelationship] = []
+    if len(nodes) > 1:
+        by_type = _group_by_type(set(nodes))
+        stmt = (
+            select(ContentRelationship)
+            .where(
+                ContentRelationship.user_id == user_id,
+                or_(*(
+                    and_(
+                        ContentRelationship.source_type == t,
+                        ContentRelationship.source_id.in_(ids),
+                    )
+                    for t, ids in by_type.items()
+                )),
+                or_(*(
+                    and_(
+                        ContentRelationship.target_type == t,
+                        ContentRelationship.target_id.in_(ids),
+                    )
+                    for t, ids in by_type.items()
+                )),
+            )
+            .order_by(ContentRelationship.created_at.desc(), ContentRelationship.id.desc())
+            .limit(_GRAPH_EDGE_CAP + 1)
+        )
+        relationships = list((await db.execute(stmt)).scalars().all())
+        if len(relationships) > _GRAPH_EDGE_CAP:
+            relationships = relationships[:_GRAPH_EDGE_CAP]
+            truncated = True
+
+    return RelationshipGraph(nodes=nodes, relationships=relationships, truncated=truncated)
+
+
+async def _walk_relationships(
+    db: AsyncSession,
+    user_id: UUID,
+    root: tuple[str, UUID],
+    *,
+    depth: int,
+    fan_out: int,
+    limit: int,
+) -> dict[tuple[str, UUID], int]:
+    """
+    Breadth-first walk from `root` as one recursive CTE.
+
+    Each step joins a LATERAL subquery that takes the node's `fan_out` newest
+    relationships (either direction, via ix_content_rel_source/target). UNION
+    drops repeated (node, depth) rows, so each level only expands distinct
+    nodes; the outer query keeps each node's shortest distance.
+    """
+    rel = ContentRelationship
+    walk = select(
+        literal(root[0], String(20)).label("node_type"),
+        literal(root[1], Uuid).label("node_id"),
+        literal(0, Integer).label("depth"),
+    ).cte("walk", recursive=True)
+
+    from_source = and_(rel.source_type == walk.c.node_type, rel.source_id == walk.c.node_id)
+    from_target = and_(rel.target_type == walk.c.node_type, rel.target_id == walk.c.node_id)
+    neighbours = (
+        select(
+            case((from_source, rel.target_type), else_=rel.source_type).label("node_type"),
+            case((from_source, rel.target_id), else_=rel.source_id).label("node_id"),
+        )
+        .where(rel.user_id == user_id, or_(from_source, from_target))
+        .order_by(rel.created_at.desc(), rel.id.desc())
+        .limit(fan_out)
+        .lateral("neighbours")
+    )
+    walk = walk.union(
+        select(neighbours.c.node_type, neighbours.c.node_id, walk.c.depth + 1)
+        .select_from(walk.join(neighbours, true()))
+        .where(walk.c.depth < depth),
+    )
+
+    min_depth = func.min(walk.c.depth)
+    stmt = (
+        select(walk.c.node_type, walk.c.node_id, min_depth)
+        .group_by(walk.c.node_type, walk.c.node_id)
+        .order_by(min_depth, walk.c.node_type, walk.c.node_id)
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return {(node_type, node_id): d for node_type, node_id, d in result.all()}
+
+
+async def _load_adjacency(db: AsyncSession, user_id: UUID, max_edges: int) -> list[Edge] | None:
+    """All of a user's relationship edges, newest first; None if there are more than max_edges."""
+    rel = ContentRelationship
+    stmt = (
+        select(rel.source_type, rel.source_id, rel.target_type, rel.target_id)
+        .where(rel.user_id == user_id)
+        .order_by(rel.created_at.desc(), rel.id.desc())
+        .limit(max_edges + 1)
+    )
+    edges = [tuple(row) for row in (await db.execute(stmt)).all()]
+    return None if len(edges) > max_edges else edges
+
+
+def _walk_adjacency(
+    edges: list[Edge],
+    root: tuple[str, UUID],
+    depth: int,
+    fan_out: int,
+) -> dict[tuple[str, UUID], int]:
+    """In-memory equivalent of _walk_relationships over newest-first edges."""
+    neighbours: dict[tuple[str, UUID], list[tuple[str, UUID]]] = {}
+    for source_type, source_id, target_type, target_id in edges:
+        source, target = (source_type, source_id), (target_type, target_id)
+        neighbours.setdefault(source, []).append(target)
+        neighbours.setdefault(target, []).append(source)
+
+    nodes = {root: 0}
+    frontier = [root]
+    for hop in range(1, depth + 1):
+        next_frontier = []
+        for node in frontier:
+            for other in neighbours.get(node, [])[:fan_out]:
+                if other not in nodes:
+                    nodes[other] = hop
+                    next_frontier.append(other)
+        frontier = next_frontier
+    return nodes
+
+
+async def invalidate_graph_cache(db: AsyncSession, user_id: UUID) -> None:
+    """
+    Drop the user's cached adjacency; call after adding or removing relationships.
+
+    Evicts now and again once the transaction commits, so a concurrent read
+    that cached the pre-commit edges in between does not survive.
+    """
+    cache = get_relationship_graph_cache()
+    if cache is None:
+        return
+
+    async def evict() -> None:
+        await cache.invalidate(user_id)
+
+    await evict()
+    run_after_commit(db, evict)
+
+
 def _group_by_type(pairs: set[tuple[str, UUID]]) -> dict[str, set[UUID]]:
     """Group (entity_type, entity_id) pairs into {type: {ids}} for batch operations."""
     grouped: dict[str, set[UUID]] = {}
@@ -386,6 +615,7 @@ async def delete_relationships_for_content(
 
     if not deleted_rows:
         return 0
+    await invalidate_graph_cache(db, user_id)
 
     # Collect the "other side" entities that survive the delete
     affected: set[tuple[str, UUID]] = set()
@@ -591,42 +821,65 @@ async def get_relationships_snapshot(
     source or target due to canonical ordering. Batch-fetches target titles
     so they are preserved in history even if the target is later deleted.
     """
+    snapshots = await get_relationships_snapshots(db, user_id, [(entity_type, entity_id)])
+    return snapshots[(entity_type, entity_id)]
+
+
+async def get_relationships_snapshots(
+    db: AsyncSession,
+    user_id: UUID,
+    entities: list[tuple[str, UUID]],
+) -> dict[tuple[str, UUID], list[dict]]:
+    """
+    Relationship snapshots for many entities with one relationship query.
+
+    Same output per entity as get_relationships_snapshot; titles for all
+    entities are fetched in one batch.
+
+    Returns:
+        Mapping from each (entity_type, entity_id) in `entities` to its snapshot.
+    """
+    snapshots: dict[tuple[str, UUID], list[dict]] = {entity: [] for entity in entities}
+    if not entities:
+        return snapshots
+
+    by_type: dict[str, list[UUID]] = {}
+    for t, eid in entities:
+        by_type.setdefault(t, []).append(eid)
+    touches_entity = or_(*(
+        or_(
+            and_(ContentRelationship.source_type == t, ContentRelationship.source_id.in_(ids)),
+            and_(ContentRelationship.target_type == t, ContentRelationship.target_id.in_(ids)),
+        )
+        for t, ids in by_type.items()
+    ))
     # Single efficient SELECT — no pagination, no COUNT
-    is_source = and_(
-        ContentRelationship.source_type == entity_type,
-        ContentRelationship.source_id == entity_id,
-    )
-    is_target = and_(
-        ContentRelationship.target_type == entity_type,
-        ContentRelationship.target_id == entity_id,
-    )
     stmt = (
         select(ContentRelationship)
-        .where(
-            ContentRelationship.user_id == user_id,
-            or_(is_source, is_target),
-        )
-        .limit(_RELATIONSHIP_QUERY_CAP)
+        .where(ContentRelationship.user_id == user_id, touches_entity)
+        .limit(_RELATIONSHIP_QUERY_CAP * len(snapshots))
     )
     result = await db.execute(stmt)
     rows = list(result.scalars().all())
 
     if not rows:
-        return []
+        return snapshots
 
-    # Resolve perspective for each relationship
-    resolved: list[tuple[str, UUID, ContentRelationship]] = []
+    # Resolve perspective for each relationship. A relationship between two
+    # requested entities appears in both snapshots.
+    resolved: list[tuple[tuple[str, UUID], str, UUID, ContentRelationship]] = []
     for rel in rows:
-        other_type, other_id = _resolve_other_side(rel, entity_type, entity_id)
-        resolved.append((other_type, other_id, rel))
+        for side in ((rel.source_type, rel.source_id), (rel.target_type, rel.target_id)):
+            if side in snapshots:
+                other_type, other_id = _resolve_other_side(rel, *side)
+                resolved.append((side, other_type, other_id, rel))
 
     # Batch-fetch titles for all targets
-    targets = [(t, eid) for t, eid, _ in resolved]
+    targets = list({(t, eid) for _, t, eid, _ in resolved})
     titles = await _batch_fetch_titles(db, user_id, targets)
 
-    snapshot: list[dict] = []
-    for other_type, other_id, rel in resolved:
-        snapshot.append({
+    for entity, other_type, other_id, rel in resolved:
+        snapshots[entity].append({
             "target_type": other_type,
             "target_id": str(other_id),
             "target_title": titles.get((other_type, other_id), ""),
@@ -635,12 +888,13 @@ async def get_relationships_snapshot(
         })
 
     # Sort by type then title (case-insensitive) for stable, user-meaningful ordering
-    snapshot.sort(key=lambda r: (
-        r["target_type"],
-        r["target_title"].lower(),
-        r["target_id"],
-    ))
-    return snapshot
+    for snapshot in snapshots.values():
+        snapshot.sort(key=lambda r: (
+            r["target_type"],
+            r["target_title"].lower(),
+            r["target_id"],
+        ))
+    return snapshots
 
 
 async def sync_relationships_for_entity(  # noqa: PLR0912
@@ -764,6 +1018,9 @@ async def sync_relationships_for_entity(  # noqa: PLR0912
     if in_both:
         await db.flush()
 
+    if to_add or to_remove:
+        await invalidate_graph_cache(db, user_id)
+
     # Bump updated_at and record history on affected target entities.
     affected_targets = _collect_affected_targets(
         to_add, to_remove, in_both, desired_by_key, current_descriptions,
@@ -807,12 +1064,19 @@ async def _notify_affected_targets(
     """
     Bump updated_at on affected target entities and optionally record history.
 
+    Batched per target type: one UPDATE bumps updated_at (skipping deleted
+    targets, like service.get() would) and returns the share tokens whose
+    cached public payloads it makes stale, and with a context, one query loads
+    the targets' metadata without their content, one query builds all their
+    relationship snapshots, and HistoryService.record_metadata_updates writes
+    the metadata-only history rows with a multi-row insert.
+
     NOTE: _record_relationship_history in relationships.py router implements the
-    same logic for the standalone endpoint path. If changing the record_action call
-    signature, changed_fields value, or content passthrough (current=previous=
-    entity.content), update both. The gating differs intentionally: the router
-    always records history (it has request context); this function gates on
-    `if context:` since callers may not have it (e.g. during restore).
+    same logic for the standalone endpoint path. If changing the action,
+    changed_fields value, or the metadata-only (unchanged content) semantics,
+    update both. The gating differs intentionally: the router always records
+    history (it has request context); this function gates on `if context:`
+    since callers may not have it (e.g. during restore).
     """
     # Lazy imports to avoid circular dependencies — entity services import
     # relationship_service, so we can't import them at module level.
@@ -827,36 +1091,97 @@ async def _notify_affected_targets(
         EntityType.PROMPT: PromptService(),
     }
 
-    # Per-entity service.get() instead of grouped select(model).where(id.in_(...))
-    # because get_metadata_snapshot accesses entity.tag_objects, which requires
-    # eager loading (selectinload) that service.get() handles correctly.
+    by_type: dict[EntityType, list[UUID]] = {}
     for target_type, target_id in affected_targets:
-        et = EntityType(target_type)
-        service = _entity_services[et]
-        entity = await service.get(db, user_id, target_id, include_archived=True)
-        if entity is None:
-            continue
-        entity.updated_at = func.clock_timestamp()
+        by_type.setdefault(EntityType(target_type), []).append(target_id)
 
-        if context:
-            current_metadata = await service.get_metadata_snapshot(
-                db, user_id, entity,
-            )
-            await history_service.record_action(
-                db=db,
-                user_id=user_id,
-                entity_type=et,
-                entity_id=entity.id,
-                action=ActionType.UPDATE,
-                current_content=entity.content,
-                previous_content=entity.content,
-                metadata=current_metadata,
-                context=context,
-                limits=limits,
-                changed_fields=["relationships"],
+    bumped: dict[EntityType, list[UUID]] = {}
+    for et, ids in by_type.items():
+        model = MODEL_MAP[et]
+        result = await db.execute(
+            update(model)
+            .where(model.user_id == user_id, model.id.in_(ids), model.deleted_at.is_(None))
+            .values(updated_at=func.clock_timestamp())
+            .returning(model.id, model.public_token),
+        )
+        rows = result.all()
+        bumped[et] = [row.id for row in rows]
+        # updated_at is part of the public share payload
+        await invalidate_public_share(db, et, *(row.public_token for row in rows))
+
+    if not context:
+        return
+
+    snapshots = await get_relationships_snapshots(
+        db, user_id, [(et, entity_id) for et, ids in bumped.items() for entity_id in ids],
+    )
+    for et, ids in bumped.items():
+        if not ids:
+            continue
+        service = _entity_services[et]
+        model = MODEL_MAP[et]
+        # Metadata only: content can be up to MBs and is unchanged here
+        result = await db.execute(
+            select(model)
+            .options(defer(model.content), selectinload(model.tag_objects))
+            .where(model.user_id == user_id, model.id.in_(ids)),
+        )
+        entries = [
+            (
+                entity.id,
+                await service.get_metadata_snapshot(
+                    db, user_id, entity, relationships_override=snapshots[(et, entity.id)],
+                ),
             )
+            for entity in result.scalars()
+        ]
+        await history_service.record_metadata_updates(
+            db, user_id, et, entries, context,
+            limits=limits, changed_fields=["relationships"],
+        )
 
-    await db.flush()
+
+def relationships_validator(
+    user_id: UUID,
+    content_type: str,
+    content_id: ColumnElement[UUID],
+) -> ScalarSelect[list[str] | None]:
+    """
+    Correlated subquery summarising what embed_relationships shows for an item.
+
+    Yields one signature per relationship (unordered): the relationship's id
+    and updated_at, plus the other item's updated_at and its deleted/archived
+    flags (archived is time-aware, as in enrich_with_content_info). Changes to
+    a related item's title, URL, or name bump its updated_at, so the
+    signatures change whenever the enriched relationships would. Used for
+    HTTP cache validation.
+    """
+    rel = ContentRelationship
+    is_source = and_(rel.source_type == content_type, rel.source_id == content_id)
+    is_target = and_(rel.target_type == content_type, rel.target_id == content_id)
+    other_type = case((is_source, rel.target_type), else_=rel.source_type)
+    other_id = case((is_source, rel.target_id), else_=rel.source_id)
+
+    others = [aliased(model) for model in MODEL_MAP.values()]
+    joined = rel.__table__
+    for content_type_, other in zip(MODEL_MAP, others, strict=True):
+        joined = joined.outerjoin(
+            other, and_(other_type == content_type_, other.id == other_id),
+        )
+    signature = func.concat_ws(
+        ':',
+        rel.id,
+        rel.updated_at,
+        func.coalesce(*(other.updated_at for other in others)),
+        func.coalesce(*(other.deleted_at.is_not(None) for other in others)),
+        func.coalesce(*(other.archived_at <= func.now() for other in others)),
+    )
+    return (
+        select(func.array_agg(signature))
+        .select_from(joined)
+        .where(rel.user_id == user_id, or_(is_source, is_target))
+        .scalar_subquery()
+    )
 
 
 async def embed_relationships(
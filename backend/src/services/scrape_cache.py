@@ -0,0 +1,318 @@
+"""Shared cache of URL scrape results, with single-flight fetching."""
+import asyncio
+import hashlib
+import json
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, replace
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from services.url_scraper import ExtractedMetadata, ScrapedPage
+
+if TYPE_CHECKING:
+    from core.redis import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# Cache schema version - included in cache keys. Bump when the serialized
+# ScrapedPage format changes so old entries are ignored until they expire.
+CACHE_SCHEMA_VERSION = 1
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Lua script releasing a fetch lock only if this caller still holds it (it
+# may have expired and been taken by another worker).
+#
+# KEYS: lock key. ARGV: holder's token. Returns 1 if released, 0 otherwise.
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for cache keys.
+
+    Lowercases the scheme and host, drops the default port and the fragment,
+    sorts query parameters, and uses "/" for an empty path. URLs that cannot
+    be parsed are returned unchanged.
+    """
+    parts = urlsplit(url.strip())
+    try:
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    host = parts.hostname or ''
+    if ':' in host:
+        host = f'[{host}]'  # IPv6 literal
+    userinfo, _, _ = parts.netloc.rpartition('@')
+    netloc = f'{userinfo}@{host}' if userinfo else host
+    if port is not None and port != _DEFAULT_PORTS.get(scheme):
+        netloc = f'{netloc}:{port}'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+@dataclass
+class ScrapeCacheStats:
+    """Hit/miss counters per cache tier (L1 = in-process, L2 = Redis)."""
+
+    l1_hits: int = 0
+    l1_misses: int = 0
+    l2_hits: int = 0
+    l2_misses: int = 0
+    coalesced: int = 0  # Requests that joined an in-flight scrape of the same URL
+    lock_waits: int = 0  # Scrapes that waited on another worker's fetch of the same URL
+    evictions: int = 0
+
+
+class ScrapeCache:
+    """
+    Cache of scrape_url results, shared by all users.
+
+    Scrapes are anonymous (no cookies or credentials), so a page's result
+    does not depend on who asked for it. Entries are keyed by normalized URL;
+    a successful result is stored under both the requested and the final
+    (post-redirect) URL. Failed scrapes are cached briefly so a failing site
+    isn't hammered by retries.
+
+    Two tiers sit behind the same keys: a byte-bounded in-process LRU (L1) in
+    front of Redis (L2). Results never need invalidating, only expiring, so
+    L1 needs no cross-worker coordination and keeps working when Redis is
+    down. Concurrent lookups of the same URL share a single scrape: within a
+    worker through an in-flight task, across workers through a short Redis
+    fetch lock (see get_or_scrape()).
+    """
+
+    CACHE_TTL = 3600  # 1 hour
+    ERROR_TTL = 60  # Negative caching of failed scrapes
+    MAX_ENTRY_BYTES = 1024 * 1024  # Larger results (serialized) are not cached
+    L1_MAX_BYTES = 16 * 1024 * 1024
+    # How long a worker may hold a URL's fetch lock: covers the fetch and
+    # extraction timeouts, after which waiting workers fetch themselves.
+    FETCH_LOCK_TTL = 30.0
+    FETCH_LOCK_POLL_INTERVAL = 0.1  # Seconds between checks for the lock holder's result
+
+    def __init__(self, redis_client: "RedisClient", l1_max_bytes: int = L1_MAX_BYTES) -> None:
+        """Initialize the cache with a Redis client."""
+        self._redis = redis_client
+        self.l1_max_bytes = l1_max_bytes
+        # key -> (expires_at, page, serialized size)
+        self._l1: OrderedDict[str, tuple[float, ScrapedPage, int]] = OrderedDict()
+        self._l1_bytes = 0
+        self._in_flight: dict[str, asyncio.Task[ScrapedPage]] = {}
+        self._stats = ScrapeCacheStats()
+
+    def stats(self) -> ScrapeCacheStats:
+        """Return a snapshot of the per-tier hit/miss counters."""
+        return replace(self._stats)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total serialized size of L1 entries."""
+        return self._l1_bytes
+
+    def _cache_key(self, url: str) -> str:
+        """Generate the cache key for a URL (hashed to bound key length)."""
+        digest = hashlib.sha256(normalize_url(url).encode()).hexdigest()
+        return f"scrape:v{CACHE_SCHEMA_VERSION}:{digest}"
+
+    async def get(self, url: str) -> ScrapedPage | None:
+        """
+        Get the cached result for a URL.
+
+        Returns:
+            ScrapedPage if cached, None on cache miss.
+        """
+        return await self._get(self._cache_key(url))
+
+    async def set(self, url: str, page: ScrapedPage) -> None:
+        """Cache a scrape result under the requested URL (and its final URL, on success)."""
+        ttl = self.ERROR_TTL if page.error else self.CACHE_TTL
+        expires_at = time.time() + ttl
+        payload = json.dumps({'expires_at': expires_at, 'page': asdict(page)})
+        size = len(payload)
+        if size > self.MAX_ENTRY_BYTES:
+            return
+        keys = {self._cache_key(url)}
+        if not page.error and page.final_url:
+            keys.add(self._cache_key(page.final_url))
+        for key in keys:
+            self._l1_put(key, expires_at, page, size)
+            await self._redis.setex(key, ttl, payload)
+
+    async def get_or_scrape(
+        self, url: str, scrape: Callable[[], Awaitable[ScrapedPage]],
+    ) -> ScrapedPage:
+        """
+        Return the cached result for a URL, or scrape and cache it.
+
+        Concurrent callers for the same URL in this worker wait on one scrape
+        instead of each fetching the page. The scrape runs in its own task,
+        so a caller that goes away (client disconnect) doesn't cancel it for
+        the others, and its result is still cached.
+
+        Across workers, the scrape first takes the URL's fetch lock in Redis.
+        If another worker holds it, this one polls Redis for that worker's
+        result instead of fetching, and only fetches itself if the lock is
+        released or expires without a cached result. Without Redis every
+        worker fetches.
+        """
+        key = self._cache_key(url)
+        page = await self._get(key)
+        if page is not None:
+            return page
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._scrape_and_store(key, url, scrape))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self._stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        """Drop L1 and forget in-flight scrapes (Redis entries expire on their own)."""
+        self._l1.clear()
+        self._l1_bytes = 0
+        self._in_flight.clear()
+
+    async def _scrape_and_store(
+        self, key: str, url: str, scrape: Callable[[], Awaitable[ScrapedPage]],
+    ) -> ScrapedPage:
+        """Run a scrape and cache its result, unless another worker is already fetching it."""
+        lock_key = f"{key}:lock"
+        token = secrets.token_hex(8)
+        acquired = await self._redis.set_nx(lock_key, token, int(self.FETCH_LOCK_TTL * 1000))
+        if acquired is False:
+            self._stats.lock_waits += 1
+            page = await self._wait_for_fetch(key, lock_key)
+            if page is not None:
+                return page
+        elif acquired:
+            # The previous holder may have stored its result since our lookup
+            page = await self._get_l2(key)
+            if page is not None:
+                await self._release_lock(lock_key, token)
+                return page
+        try:
+            page = await scrape()
+            await self.set(url, page)
+        finally:
+            if acquired:
+                await self._release_lock(lock_key, token)
+        return page
+
+    async def _wait_for_fetch(self, key: str, lock_key: str) -> ScrapedPage | None:
+        """
+        Poll Redis for the result of another worker's fetch.
+
+        Returns None if the lock is released or expires without a result
+        (the fetch failed, or its result was too large to cache).
+        """
+        deadline = time.monotonic() + self.FETCH_LOCK_TTL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.FETCH_LOCK_POLL_INTERVAL)
+            page = await self._get_l2(key)
+            if page is not None:
+                return page
+            if await self._redis.get(lock_key) is None:
+                # Released; it may have stored the result just before
+                return await self._get_l2(key)
+        return None
+
+    async def _release_lock(self, lock_key: str, token: str) -> None:
+        """Release a fetch lock if this caller still holds it."""
+        await self._redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+    def _finish(self, key: str, task: asyncio.Task[ScrapedPage]) -> None:
+        """Done callback: stop routing callers to a finished scrape."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    async def _get(self, key: str) -> ScrapedPage | None:
+        """Look a key up in L1, then Redis (populating L1 on a Redis hit)."""
+        now = time.time()
+        entry = self._l1.get(key)
+        if entry is not None and entry[0] > now:
+            self._stats.l1_hits += 1
+            self._l1.move_to_end(key)
+            return entry[1]
+        if entry is not None:
+            self._l1_discard(key)
+        self._stats.l1_misses += 1
+
+        page = await self._get_l2(key)
+        if page is None:
+            self._stats.l2_misses += 1
+            return None
+        self._stats.l2_hits += 1
+        return page
+
+    async def _get_l2(self, key: str) -> ScrapedPage | None:
+        """Look a key up in Redis, populating L1 on a hit (not counted in stats)."""
+        data = await self._redis.get(key)
+        if data is None:
+            return None
+        try:
+            raw = json.loads(data)
+            expires_at = float(raw['expires_at'])
+            page = _page_from_dict(raw['page'])
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning("scrape_cache_corrupt key=%s error=%s", key, e)
+            return None
+        if expires_at > time.time():
+            self._l1_put(key, expires_at, page, len(data))
+        return page
+
+    def _l1_put(self, key: str, expires_at: float, page: ScrapedPage, size: int) -> None:
+        """Store an entry in L1, evicting least recently used entries to stay in budget."""
+        if size > self.l1_max_bytes:
+            return
+        self._l1_discard(key)
+        self._l1[key] = (expires_at, page, size)
+        self._l1_bytes += size
+        while self._l1_bytes > self.l1_max_bytes:
+            self._l1_discard(next(iter(self._l1)))
+            self._stats.evictions += 1
+
+    def _l1_discard(self, key: str) -> None:
+        """Drop an L1 entry."""
+        entry = self._l1.pop(key, None)
+        if entry is not None:
+            self._l1_bytes -= entry[2]
+
+
+def _page_from_dict(data: dict) -> ScrapedPage:
+    """Rebuild a ScrapedPage from its asdict() form."""
+    metadata = data['metadata']
+    return ScrapedPage(
+        text=data['text'],
+        metadata=ExtractedMetadata(**metadata) if metadata is not None else None,
+        final_url=data['final_url'],
+        content_type=data['content_type'],
+        error=data['error'],
+    )
+
+
+# Global scrape cache instance (set during app startup)
+_scrape_cache: ScrapeCache | None = None
+
+
+def get_scrape_cache() -> ScrapeCache | None:
+    """Get the global scrape cache instance."""
+    return _scrape_cache
+
+
+def set_scrape_cache(cache: ScrapeCache | None) -> None:
+    """Set the global scrape cache instance."""
+    global _scrape_cache  # noqa: PLW0603
+    _scrape_cache = cache
@@ -4,8 +4,10 @@ from uuid import UUID
 
 from sqlalchemy import cast, func, literal, select, type_coerce
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TEXT as PG_TEXT
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from uuid6 import uuid7
 
 from models.bookmark import Bookmark
 from models.content_filter import ContentFilter
@@ -16,6 +18,9 @@ from models.tag import Tag, bookmark_tags, filter_group_tags, note_tags, prompt_
 from schemas.tag import TagCount
 from schemas.validators import validate_and_normalize_tags
 
+# Tag names per statement in get_or_create_tag_ids (3 bind parameters each)
+TAG_BATCH_SIZE = 5000
+
 
 class TagNotFoundError(Exception):
     """Raised when a tag is not found."""
@@ -147,6 +152,41 @@ async def get_or_create_tags(
     return tags
 
 
+async def get_or_create_tag_ids(
+    db: AsyncSession,
+    user_id: UUID,
+    tag_names: set[str],
+) -> dict[str, UUID]:
+    """
+    Set-based get-or-create for many tag names at once (bulk create).
+
+    Inserts all missing names in one statement. Names created concurrently by
+    another request are skipped by ON CONFLICT and picked up by the final read.
+
+    Args:
+        db: Database session.
+        user_id: User ID to scope tags.
+        tag_names: Already-normalized tag names.
+
+    Returns:
+        Mapping from tag name to tag ID.
+    """
+    names = sorted(tag_names)
+    tag_ids: dict[str, UUID] = {}
+    for start in range(0, len(names), TAG_BATCH_SIZE):
+        chunk = names[start:start + TAG_BATCH_SIZE]
+        await db.execute(
+            pg_insert(Tag)
+            .values([{"id": uuid7(), "user_id": user_id, "name": name} for name in chunk])
+            .on_conflict_do_nothing(constraint="uq_tags_user_id_name"),
+        )
+        result = await db.execute(
+            select(Tag.name, Tag.id).where(Tag.user_id == user_id, Tag.name.in_(chunk)),
+        )
+        tag_ids.update({row.name: row.id for row in result})
+    return tag_ids
+
+
 async def resolve_tag_ids_to_names(
     db: AsyncSession,
     user_id: UUID,
@@ -4,17 +4,28 @@ Jinja2 template rendering with strict validation.
 Renders prompt templates with user-provided arguments,
 validating that required arguments are present and
 rejecting unknown arguments.
+
+Compiled templates are cached by content hash, so repeated renders of the same
+prompt (and validation followed by rendering) parse and compile it once.
 """
 
+import hashlib
 import logging
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from typing import Any
 
-from jinja2 import StrictUndefined, TemplateSyntaxError, UndefinedError
+from jinja2 import StrictUndefined, Template, TemplateSyntaxError, UndefinedError, meta
 from jinja2.exceptions import SecurityError
 from jinja2.sandbox import SandboxedEnvironment
 
 logger = logging.getLogger(__name__)
 
+# Compiled template cache bounds: entry count, and total template source size
+# (a rough proxy for compiled size, which is a few times larger)
+TEMPLATE_CACHE_MAX_ENTRIES = 512
+TEMPLATE_CACHE_MAX_CHARS = 4 * 1024 * 1024
+
 
 class TemplateError(Exception):
     """Raised when template rendering fails."""
@@ -29,6 +40,113 @@ class TemplateError(Exception):
 _jinja_env = SandboxedEnvironment(undefined=StrictUndefined)
 
 
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A parsed and compiled template with the variables it references."""
+
+    template: Template
+    # Variables referenced but not bound in the template. Jinja2's built-in
+    # globals (range, cycler, namespace, ...) are not included.
+    variables: frozenset[str]
+    source_chars: int
+
+
+@dataclass
+class TemplateCacheStats:
+    """Hit/miss counters for the compiled template cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class TemplateCache:
+    """
+    LRU cache of compiled templates keyed by a hash of the template source.
+
+    Bounded by entry count and by total source size. Templates that fail to
+    parse are not cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = TEMPLATE_CACHE_MAX_ENTRIES,
+        max_chars: int = TEMPLATE_CACHE_MAX_CHARS,
+    ) -> None:
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries: OrderedDict[bytes, CompiledTemplate] = OrderedDict()
+        self._chars = 0
+        self._stats = TemplateCacheStats()
+
+    def stats(self) -> TemplateCacheStats:
+        """Return a snapshot of the counters."""
+        return replace(self._stats)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def compile(self, content: str) -> CompiledTemplate:
+        """
+        Return the compiled template for `content`, compiling it on a miss.
+
+        Raises:
+            TemplateSyntaxError: If the template has invalid syntax.
+        """
+        key = hashlib.sha256(content.encode()).digest()
+        compiled = self._entries.get(key)
+        if compiled is not None:
+            self._stats.hits += 1
+            self._entries.move_to_end(key)
+            return compiled
+        self._stats.misses += 1
+
+        ast = _jinja_env.parse(content)
+        # Collect variables before compiling: the optimizer may rewrite the AST
+        variables = frozenset(meta.find_undeclared_variables(ast))
+        template = _jinja_env.template_class.from_code(
+            _jinja_env, _jinja_env.compile(ast), _jinja_env.make_globals(None), None,
+        )
+        compiled = CompiledTemplate(
+            template=template, variables=variables, source_chars=len(content),
+        )
+        if compiled.source_chars <= self.max_chars:
+            self._entries[key] = compiled
+            self._chars += compiled.source_chars
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= evicted.source_chars
+                self._stats.evictions += 1
+        return compiled
+
+    def clear(self) -> None:
+        """Drop everything."""
+        self._entries.clear()
+        self._chars = 0
+
+
+_template_cache = TemplateCache()
+
+
+def get_template_cache() -> TemplateCache:
+    """Get the process-wide compiled template cache."""
+    return _template_cache
+
+
+def compile_template(content: str) -> CompiledTemplate:
+    """
+    Parse and compile a template through the shared cache.
+
+    Used by both validation (for the referenced variables) and rendering, so a
+    template validated on save is already compiled for its first render.
+
+    Raises:
+        TemplateSyntaxError: If the template has invalid syntax.
+    """
+    return _template_cache.compile(content)
+
+
 def render_template(
     content: str | None,
     arguments: dict[str, Any] | None,
@@ -85,7 +203,7 @@ def render_template(
 
     # Render template
     try:
-        template = _jinja_env.from_string(content)
+        template = compile_template(content).template
         return template.render(**render_args)
     except TemplateSyntaxError as e:
         raise TemplateError(f"Template syntax error: {e.message}") from e
@@ -4,13 +4,14 @@ import secrets
 from datetime import datetime, timedelta, UTC
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.tier_limits import TierLimits
 from models.api_token import ApiToken
 from schemas.token import TokenCreate
 from services.exceptions import QuotaExceededError
+from services.token_usage import get_token_usage_buffer
 
 
 def generate_token() -> tuple[str, str, str]:
@@ -158,12 +159,38 @@ async def delete_token(
     Note:
         Does not commit. Caller (session generator) handles commit at request end.
     """
+    return await revoke_token(db, user_id, token_id) is not None
+
+
+async def revoke_token(
+    db: AsyncSession,
+    user_id: UUID,
+    token_id: UUID,
+) -> str | None:
+    """
+    Delete (revoke) an API token and return its hash.
+
+    The hash is what the auth cache keys validated tokens by; callers that
+    revoke on behalf of a user must pass it to AuthCache.invalidate_token()
+    after committing (see api/routers/tokens.py).
+
+    Args:
+        db: Database session.
+        user_id: ID of the user.
+        token_id: ID of the token to delete.
+
+    Returns:
+        The deleted token's hash, or None if not found.
+
+    Note:
+        Does not commit. Caller handles commit.
+    """
     token = await get_token_by_id(db, user_id, token_id)
     if token is None:
-        return False
+        return None
 
     await db.delete(token)
-    return True
+    return token.token_hash
 
 
 async def rename_token(
@@ -215,17 +242,14 @@ async def validate_token(
         ApiToken if valid and not expired, None otherwise.
 
     Note:
-        Updates last_used_at on successful validation (uses flush, not commit).
+        Records the use on successful validation (see record_token_use).
     """
     # SECURITY: Hash before lookup to prevent timing attacks. The database query
     # time is constant regardless of whether the token exists, since we're always
     # comparing hashes (not doing early-return on plaintext mismatch).
     token_hash = hash_token(plaintext_token)
 
-    result = await db.execute(
-        select(ApiToken).where(ApiToken.token_hash == token_hash),
-    )
-    api_token = result.scalar_one_or_none()
+    api_token = await get_token_by_hash(db, token_hash)
 
     if api_token is None:
         return None
@@ -234,8 +258,38 @@ async def validate_token(
     if api_token.expires_at is not None and datetime.now(UTC) > api_token.expires_at:
         return None
 
-    # Update last_used_at
-    api_token.last_used_at = datetime.now(UTC)
-    await db.flush()
+    await record_token_use(db, api_token.id)
 
     return api_token
+
+
+async def get_token_by_hash(db: AsyncSession, token_hash: str) -> ApiToken | None:
+    """Look up a token by its SHA-256 hash (see hash_token)."""
+    result = await db.execute(
+        select(ApiToken).where(ApiToken.token_hash == token_hash),
+    )
+    return result.scalar_one_or_none()
+
+
+async def token_exists(db: AsyncSession, token_id: UUID) -> bool:
+    """Check whether a token row still exists (i.e. has not been revoked)."""
+    result = await db.execute(select(ApiToken.id).where(ApiToken.id == token_id))
+    return result.scalar_one_or_none() is not None
+
+
+async def record_token_use(db: AsyncSession, token_id: UUID) -> None:
+    """
+    Record that a token was just used (last_used_at).
+
+    With the app's TokenUsageBuffer running, the timestamp is buffered and
+    written in bulk later; otherwise (tests, scripts) it is updated directly
+    in the caller's transaction.
+    """
+    now = datetime.now(UTC)
+    buffer = get_token_usage_buffer()
+    if buffer is not None:
+        buffer.record(token_id, now)
+        return
+    await db.execute(
+        update(ApiToken).where(ApiToken.id == token_id).values(last_used_at=now),
+    )
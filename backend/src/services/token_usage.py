@@ -0,0 +1,112 @@
+"""Write-behind buffer for API token (PAT) last_used_at updates."""
+import asyncio
+import contextlib
+import logging
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, Uuid, column, func, update, values
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from models.api_token import ApiToken
+
+logger = logging.getLogger(__name__)
+
+
+class TokenUsageBuffer:
+    """
+    Coalesces last_used_at updates per token and flushes them in bulk.
+
+    Every PAT-authenticated request records a use; instead of an UPDATE per
+    request, the latest timestamp per token is kept in memory and written with
+    a single UPDATE ... FROM (VALUES ...) every FLUSH_INTERVAL seconds (and on
+    stop()). The write uses GREATEST so a worker flushing an older timestamp
+    never moves last_used_at backwards.
+
+    last_used_at is informational (shown in the tokens UI), so losing up to
+    one interval of updates on a hard crash is acceptable.
+    """
+
+    FLUSH_INTERVAL = 30  # seconds
+
+    def __init__(self, session_factory: async_sessionmaker) -> None:
+        """Initialize the buffer with the session factory used for flushes."""
+        self._session_factory = session_factory
+        self._pending: dict[UUID, datetime] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def record(self, token_id: UUID, used_at: datetime) -> None:
+        """Record a use of `token_id`, keeping only the latest timestamp."""
+        current = self._pending.get(token_id)
+        if current is None or used_at > current:
+            self._pending[token_id] = used_at
+
+    async def flush(self) -> int:
+        """
+        Write all pending timestamps in one UPDATE.
+
+        Returns:
+            Number of tokens written. On failure the batch is merged back into
+            the buffer for the next flush and 0 is returned.
+        """
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+
+        rows = values(
+            column("id", Uuid),
+            column("last_used_at", DateTime(timezone=True)),
+            name="token_usage",
+        ).data(list(batch.items()))
+        stmt = (
+            update(ApiToken)
+            .where(ApiToken.id == rows.c.id)
+            .values(last_used_at=func.greatest(ApiToken.last_used_at, rows.c.last_used_at))
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            async with self._session_factory() as session:
+                await session.execute(stmt)
+                await session.commit()
+        except Exception:
+            logger.exception("token_usage_flush_failed tokens=%d", len(batch))
+            for token_id, used_at in batch.items():
+                self.record(token_id, used_at)
+            return 0
+        return len(batch)
+
+    async def start(self) -> None:
+        """Start the periodic flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush task and flush what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        """Flush every FLUSH_INTERVAL seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            await self.flush()
+
+
+# Global buffer instance (set during app startup). When unset, uses are
+# written directly in the request's transaction.
+_token_usage_buffer: TokenUsageBuffer | None = None
+
+
+def get_token_usage_buffer() -> TokenUsageBuffer | None:
+    """Get the global token usage buffer instance."""
+    return _token_usage_buffer
+
+
+def set_token_usage_buffer(buffer: TokenUsageBuffer | None) -> None:
+    """Set the global token usage buffer instance."""
+    global _token_usage_buffer  # noqa: PLW0603
+    _token_usage_buffer = buffer
@@ -1,18 +1,48 @@
 """URL scraping service for fetching and extracting metadata from web pages."""
+import asyncio
+import codecs
 import ipaddress
 import socket
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
 from dataclasses import dataclass
 from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO
 from urllib.parse import urlparse
 
+import httpcore
 import httpx
 import trafilatura
 from bs4 import BeautifulSoup
 from pypdf import PdfReader
 
+from core.metrics import (
+    SCRAPE_FETCH_BODIES,
+    SCRAPE_FETCH_BODY_BYTES,
+    SCRAPE_FETCH_BUFFERED_BYTES_PEAK,
+    SCRAPE_FETCH_DURATION,
+)
+from services.extraction_worker import ExtractionLimitError, get_extraction_pool
+
 USER_AGENT = 'Mozilla/5.0 (compatible; Bookmarks/1.0)'
 DEFAULT_TIMEOUT = 10.0
 
+# Seconds a hostname's resolved addresses are reused (getaddrinfo exposes no TTLs)
+DNS_CACHE_TTL = 60.0
+DNS_CACHE_MAX_ENTRIES = 1024
+
+# Response body limits. HTML is truncated at its limit; larger PDFs are rejected.
+DEFAULT_MAX_HTML_BYTES = 5 * 1024 * 1024
+DEFAULT_MAX_PDF_BYTES = 25 * 1024 * 1024
+
+# Connection pool of the shared scrape client
+CLIENT_LIMITS = httpx.Limits(
+    max_connections=50, max_keepalive_connections=10, keepalive_expiry=30.0,
+)
+
 
 class SSRFBlockedError(Exception):
     """Raised when a URL targets a private/internal network address."""
@@ -45,56 +75,236 @@ def is_private_ip(ip_str: str) -> bool:
         return True
 
 
-def validate_url_not_private(url: str) -> None:
+class HostResolver:
     """
-    Validate that a URL does not target a private/internal network.
+    Async hostname resolver with a small TTL cache.
+
+    getaddrinfo runs in the event loop's default executor, so a slow lookup
+    doesn't block the loop. Successful lookups are reused for DNS_CACHE_TTL
+    seconds; failures are not cached.
+    """
+
+    def __init__(
+        self, ttl: float = DNS_CACHE_TTL, max_entries: int = DNS_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """Initialize an empty cache."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+
+    async def resolve(self, hostname: str) -> list[str]:
+        """
+        Resolve a hostname to its IP addresses.
+
+        Raises:
+            ValueError: If the hostname cannot be resolved.
+        """
+        key = hostname.lower()
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            return cached[1]
+        try:
+            # getaddrinfo returns list of (family, type, proto, canonname, sockaddr)
+            # sockaddr is (ip, port) for IPv4 or (ip, port, flow, scope) for IPv6
+            addrinfo = await asyncio.get_running_loop().getaddrinfo(
+                hostname, None, family=socket.AF_UNSPEC, type=socket.SOCK_STREAM,
+            )
+        except (socket.gaierror, UnicodeError) as e:
+            raise ValueError(f"Could not resolve hostname: {hostname}") from e
+        addresses = list(dict.fromkeys(str(sockaddr[0]) for *_, sockaddr in addrinfo))
+        self._cache[key] = (time.monotonic() + self.ttl, addresses)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return addresses
 
-    Resolves the hostname to check the actual IP address, preventing
-    DNS rebinding attacks where a hostname resolves to an internal IP.
+    def clear(self) -> None:
+        """Drop all cached lookups."""
+        self._cache.clear()
+
+
+_resolver = HostResolver()
+
+
+async def resolve_public_addresses(hostname: str) -> list[str]:
+    """
+    Resolve a hostname, refusing names that reach a private/internal network.
+
+    Every resolved address must be public, preventing DNS rebinding attacks
+    where a hostname resolves to an internal IP.
+
+    Args:
+        hostname: Hostname or IP literal.
+
+    Returns:
+        The hostname's IP addresses.
+
+    Raises:
+        SSRFBlockedError: If the hostname is localhost or resolves to a private address.
+        ValueError: If the hostname cannot be resolved.
+    """
+    # Block common localhost variants
+    if hostname.lower() in ('localhost', 'localhost.localdomain'):
+        raise SSRFBlockedError(f"Blocked request to localhost: {hostname}")
+
+    addresses = await _resolver.resolve(hostname)
+    for ip_str in addresses:
+        if is_private_ip(ip_str):
+            raise SSRFBlockedError(
+                f"Blocked request to private/internal address: {hostname} resolves to {ip_str}",
+            )
+    return addresses
+
+
+async def validate_url_not_private(url: str) -> None:
+    """
+    Validate that a URL does not target a private/internal network.
 
     Args:
         url: The URL to validate.
 
     Raises:
         SSRFBlockedError: If the URL targets a private network.
-        ValueError: If the URL is malformed.
+        ValueError: If the URL is malformed or its hostname cannot be resolved.
     """
-    parsed = urlparse(url)
-    hostname = parsed.hostname
-
+    hostname = urlparse(url).hostname
     if not hostname:
         raise ValueError(f"Invalid URL (no hostname): {url}")
+    await resolve_public_addresses(hostname)
 
-    # Block common localhost variants
-    if hostname.lower() in ('localhost', 'localhost.localdomain'):
-        raise SSRFBlockedError(f"Blocked request to localhost: {url}")
 
-    # Try to resolve hostname to IP addresses
-    try:
-        # getaddrinfo returns list of (family, type, proto, canonname, sockaddr)
-        # sockaddr is (ip, port) for IPv4 or (ip, port, flow, scope) for IPv6
-        addrinfo = socket.getaddrinfo(hostname, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
-        for family, _, _, _, sockaddr in addrinfo:
-            ip_str = sockaddr[0]
-            if is_private_ip(ip_str):
-                raise SSRFBlockedError(
-                    f"Blocked request to private/internal address: {url} resolves to {ip_str}",
+class _PublicOnlyNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that connects only to addresses that passed the SSRF check.
+
+    Each new connection resolves its host through resolve_public_addresses
+    and connects to one of the checked addresses, so the address validated
+    is the address used (no rebinding window), including for every redirect
+    hop. TLS still verifies against the hostname.
+    """
+
+    def __init__(self) -> None:
+        """Wrap httpcore's anyio backend."""
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,  # noqa: ASYNC109
+        local_address: str | None = None,
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        """Resolve and check host, then connect to the first reachable address."""
+        try:
+            addresses = await asyncio.wait_for(resolve_public_addresses(host), timeout)
+        except TimeoutError as e:
+            raise httpcore.ConnectTimeout(f"Timed out resolving {host}") from e
+        except ValueError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        error: httpcore.ConnectError | None = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
                 )
-    except socket.gaierror as e:
-        # DNS resolution failed - could be legitimate or could be an attack
-        # We'll let it fail naturally when httpx tries to connect
-        raise ValueError(f"Could not resolve hostname: {hostname}") from e
+            except httpcore.ConnectError as e:
+                error = e
+        assert error is not None  # resolve() never returns an empty list
+        raise error
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,  # noqa: ARG002, ASYNC109
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,  # noqa: ARG002
+    ) -> httpcore.AsyncNetworkStream:
+        """Unix sockets are never a scrape target."""
+        raise SSRFBlockedError(f"Blocked connection to unix socket: {path}")
+
+    async def sleep(self, seconds: float) -> None:
+        """Sleep using the wrapped backend."""
+        await self._backend.sleep(seconds)
+
+
+class _PublicOnlyTransport(httpx.AsyncHTTPTransport):
+    """
+    HTTP/2 transport whose connection pool uses _PublicOnlyNetworkBackend.
+
+    httpx has no option for the network backend, so the pool is built here
+    with httpcore's public constructor and installed as the transport's pool.
+    If a future httpx stops sending requests through `_pool`, construction
+    fails instead of silently dropping the SSRF guard.
+    """
+
+    def __init__(self) -> None:
+        """Build the pool with the same settings httpx would, plus the backend."""
+        super().__init__(http2=True, limits=CLIENT_LIMITS, trust_env=False)
+        if not isinstance(getattr(self, '_pool', None), httpcore.AsyncConnectionPool):
+            raise RuntimeError(
+                "httpx.AsyncHTTPTransport no longer keeps its pool in `_pool`; "
+                "cannot install the public-only network backend",
+            )
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(trust_env=False),
+            max_connections=CLIENT_LIMITS.max_connections,
+            max_keepalive_connections=CLIENT_LIMITS.max_keepalive_connections,
+            keepalive_expiry=CLIENT_LIMITS.keepalive_expiry,
+            http1=True,
+            http2=True,
+            network_backend=_PublicOnlyNetworkBackend(),
+        )
+
+
+def create_scrape_client() -> httpx.AsyncClient:
+    """
+    Create the HTTP client used for scraping.
+
+    HTTP/2 with a connection pool, connecting only to public addresses (see
+    _PublicOnlyTransport). Environment proxy settings are ignored: a proxy
+    would resolve hosts itself and bypass the address check.
+    """
+    return httpx.AsyncClient(
+        transport=_PublicOnlyTransport(),
+        follow_redirects=True,
+        timeout=DEFAULT_TIMEOUT,
+        headers={'User-Agent': USER_AGENT},
+        trust_env=False,
+    )
+
+
+# Global scrape client (set during app startup). When unset, fetch_url
+# creates a client per call.
+_scrape_client: httpx.AsyncClient | None = None
+
+
+def get_scrape_client() -> httpx.AsyncClient | None:
+    """Get the global scrape client instance."""
+    return _scrape_client
+
+
+def set_scrape_client(client: httpx.AsyncClient | None) -> None:
+    """Set the global scrape client instance."""
+    global _scrape_client  # noqa: PLW0603
+    _scrape_client = client
 
 
 @dataclass
 class FetchResult:
     """Result of fetching a URL (raw content before extraction)."""
 
-    content: str | bytes | None  # str for HTML, bytes for PDF
+    content: str | Path | None  # str for HTML, temp file path for PDF (see discard())
     final_url: str
     status_code: int | None
     content_type: str | None
     error: str | None
+    bytes_read: int = 0  # Body bytes received
+    truncated: bool = False  # HTML cut off at the size limit
 
     @property
     def is_pdf(self) -> bool:
@@ -106,6 +316,25 @@ class FetchResult:
         """Check if the content type indicates HTML."""
         return bool(self.content_type and 'text/html' in self.content_type.lower())
 
+    def discard(self) -> None:
+        """Delete the temp file a PDF body was spooled to, if any."""
+        if isinstance(self.content, Path):
+            self.content.unlink(missing_ok=True)
+
+
+# Peak body bytes one fetch held in memory in this worker (exported as a gauge)
+_buffered_bytes_peak = 0
+
+
+def _record_fetch(kind: str, result: str, bytes_read: int, buffered_bytes: int) -> None:
+    """Add one body to the fetch metrics, for sizing worker memory."""
+    global _buffered_bytes_peak  # noqa: PLW0603
+    SCRAPE_FETCH_BODIES.inc(kind, result)
+    SCRAPE_FETCH_BODY_BYTES.inc(kind, amount=bytes_read)
+    if buffered_bytes > _buffered_bytes_peak:
+        _buffered_bytes_peak = buffered_bytes
+        SCRAPE_FETCH_BUFFERED_BYTES_PEAK.set(buffered_bytes)
+
 
 @dataclass
 class ExtractedMetadata:
@@ -126,28 +355,61 @@ class ScrapedPage:
     error: str | None
 
 
-async def fetch_url(url: str, timeout: float = DEFAULT_TIMEOUT) -> FetchResult:  # noqa: ASYNC109, PLR0911
+async def fetch_url(
+    url: str,
+    timeout: float = DEFAULT_TIMEOUT,  # noqa: ASYNC109
+    *,
+    max_html_bytes: int = DEFAULT_MAX_HTML_BYTES,
+    max_pdf_bytes: int = DEFAULT_MAX_PDF_BYTES,
+) -> FetchResult:
     """
     Fetch content from a URL (HTML or PDF).
 
     Best-effort fetch that returns error info on failure rather than raising.
     Follows redirects and captures the final URL.
 
+    The body is streamed: error responses and unsupported content types are
+    never downloaded, HTML is decoded incrementally and truncated at
+    `max_html_bytes`, and PDFs are written to a temp file as they arrive and
+    rejected past `max_pdf_bytes`. Callers must discard() the result to
+    delete a PDF's temp file.
+
     Security: Validates that the URL does not target private/internal networks
-    to prevent SSRF attacks.
+    to prevent SSRF attacks. Redirect targets are checked by the client's
+    network backend as each connection is opened.
 
     Args:
         url:
             The URL to fetch.
         timeout:
             Request timeout in seconds.
+        max_html_bytes:
+            HTML body bytes to keep; the rest of the page is not read.
+        max_pdf_bytes:
+            Largest PDF body accepted.
 
     Returns:
-        FetchResult containing content (str for HTML, bytes for PDF) or error info.
+        FetchResult containing content (str for HTML, temp file path for PDF)
+        or error info.
     """
+    started = time.perf_counter()
+    result = await _fetch_url(url, timeout, max_html_bytes, max_pdf_bytes)
+    SCRAPE_FETCH_DURATION.observe(
+        time.perf_counter() - started, "error" if result.error else "success",
+    )
+    return result
+
+
+async def _fetch_url(
+    url: str,
+    timeout: float,  # noqa: ASYNC109
+    max_html_bytes: int,
+    max_pdf_bytes: int,
+) -> FetchResult:
+    """Validate and fetch url (see fetch_url())."""
     # SSRF protection: validate URL doesn't target internal networks
     try:
-        validate_url_not_private(url)
+        await validate_url_not_private(url)
     except (SSRFBlockedError, ValueError) as e:
         return FetchResult(
             content=None,
@@ -158,63 +420,20 @@ async def fetch_url(url: str, timeout: float = DEFAULT_TIMEOUT) -> FetchResult:
         )
 
     try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=timeout,
-            headers={'User-Agent': USER_AGENT},
-            http2=True,
-        ) as client:
-            response = await client.get(url)
-
-            # SSRF protection: validate final URL after redirects
-            final_url_str = str(response.url)
-            try:
-                validate_url_not_private(final_url_str)
-            except (SSRFBlockedError, ValueError) as e:
-                return FetchResult(
-                    content=None,
-                    final_url=final_url_str,
-                    status_code=response.status_code,
-                    content_type=None,
-                    error=f"Redirect blocked: {e}",
-                )
-
-            # Check for successful response (2xx status codes)
-            if not response.is_success:
-                return FetchResult(
-                    content=None,
-                    final_url=str(response.url),
-                    status_code=response.status_code,
-                    content_type=response.headers.get('content-type', ''),
-                    error=f"HTTP {response.status_code}",
-                )
-
-            content_type = response.headers.get('content-type', '')
-
-            # Route based on content type
-            if 'application/pdf' in content_type.lower():
-                return FetchResult(
-                    content=response.content,  # bytes for PDF
-                    final_url=str(response.url),
-                    status_code=response.status_code,
-                    content_type=content_type,
-                    error=None,
-                )
-            if 'text/html' in content_type.lower():
-                return FetchResult(
-                    content=response.text,  # str for HTML
-                    final_url=str(response.url),
-                    status_code=response.status_code,
-                    content_type=content_type,
-                    error=None,
-                )
-            return FetchResult(
-                content=None,
-                final_url=str(response.url),
-                status_code=response.status_code,
-                content_type=content_type,
-                error=f"Unsupported content type: {content_type}",
-            )
+        client = get_scrape_client()
+        if client is not None:
+            return await _stream_response(client, url, timeout, max_html_bytes, max_pdf_bytes)
+        async with create_scrape_client() as client:
+            return await _stream_response(client, url, timeout, max_html_bytes, max_pdf_bytes)
+    except SSRFBlockedError as e:
+        # A redirect led to a private/internal address
+        return FetchResult(
+            content=None,
+            final_url=url,
+            status_code=None,
+            content_type=None,
+            error=f"Redirect blocked: {e}",
+        )
     except httpx.TimeoutException:
         return FetchResult(
             content=None,
@@ -233,6 +452,130 @@ async def fetch_url(url: str, timeout: float = DEFAULT_TIMEOUT) -> FetchResult:
         )
 
 
+async def _stream_response(
+    client: httpx.AsyncClient,
+    url: str,
+    timeout: float,  # noqa: ASYNC109
+    max_html_bytes: int,
+    max_pdf_bytes: int,
+) -> FetchResult:
+    """GET url and read the body according to its status and content type."""
+    async with client.stream('GET', url, timeout=timeout) as response:
+        final_url = str(response.url)
+        content_type = response.headers.get('content-type', '')
+
+        # Check for successful response (2xx status codes)
+        if not response.is_success:
+            return FetchResult(
+                content=None,
+                final_url=final_url,
+                status_code=response.status_code,
+                content_type=content_type,
+                error=f"HTTP {response.status_code}",
+            )
+
+        # Route based on content type
+        if 'application/pdf' in content_type.lower():
+            return await _read_pdf(response, max_pdf_bytes)
+        if 'text/html' in content_type.lower():
+            return await _read_html(response, max_html_bytes)
+        return FetchResult(
+            content=None,
+            final_url=final_url,
+            status_code=response.status_code,
+            content_type=content_type,
+            error=f"Unsupported content type: {content_type}",
+        )
+
+
+async def _read_html(response: httpx.Response, max_bytes: int) -> FetchResult:
+    """Decode an HTML body incrementally, stopping after max_bytes."""
+    try:
+        decoder = codecs.getincrementaldecoder(response.charset_encoding or 'utf-8')(
+            errors='replace',
+        )
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    parts: list[str] = []
+    bytes_read = 0
+    kept = 0
+    truncated = False
+    async for chunk in response.aiter_bytes():
+        bytes_read += len(chunk)
+        if kept + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - kept]  # noqa: PLW2901
+            truncated = True
+        kept += len(chunk)
+        parts.append(decoder.decode(chunk))
+        if truncated:
+            break
+    if not truncated:
+        parts.append(decoder.decode(b'', final=True))
+    _record_fetch('html', 'truncated' if truncated else 'complete', bytes_read, kept)
+    return FetchResult(
+        content=''.join(parts),
+        final_url=str(response.url),
+        status_code=response.status_code,
+        content_type=response.headers.get('content-type', ''),
+        error=None,
+        bytes_read=bytes_read,
+        truncated=truncated,
+    )
+
+
+def _unlink_spool(path: Path) -> None:
+    """Delete a PDF spool file (local temp dir; cheap enough to do inline)."""
+    path.unlink(missing_ok=True)
+
+
+async def _read_pdf(response: httpx.Response, max_bytes: int) -> FetchResult:
+    """Spool a PDF body to a temp file, rejecting it past max_bytes."""
+    content_type = response.headers.get('content-type', '')
+    too_large = FetchResult(
+        content=None,
+        final_url=str(response.url),
+        status_code=response.status_code,
+        content_type=content_type,
+        error=f"Response too large (limit {max_bytes} bytes)",
+    )
+    declared = response.headers.get('content-length', '')
+    if declared.isdigit() and int(declared) > max_bytes:
+        _record_fetch('pdf', 'too_large', 0, 0)
+        return too_large
+
+    bytes_read = 0
+    largest_chunk = 0
+    spool = tempfile.NamedTemporaryFile(  # noqa: SIM115 - path outlives this function
+        prefix='scrape-', suffix='.pdf', delete=False,
+    )
+    path = Path(spool.name)
+    try:
+        with spool:
+            async for chunk in response.aiter_bytes():
+                bytes_read += len(chunk)
+                largest_chunk = max(largest_chunk, len(chunk))
+                if bytes_read > max_bytes:
+                    break
+                spool.write(chunk)
+    except BaseException:
+        _unlink_spool(path)
+        raise
+    too_big = bytes_read > max_bytes
+    _record_fetch('pdf', 'too_large' if too_big else 'complete', bytes_read, largest_chunk)
+    if too_big:
+        _unlink_spool(path)
+        too_large.bytes_read = bytes_read
+        return too_large
+    return FetchResult(
+        content=path,
+        final_url=str(response.url),
+        status_code=response.status_code,
+        content_type=content_type,
+        error=None,
+        bytes_read=bytes_read,
+    )
+
+
 def extract_html_metadata(html: str) -> ExtractedMetadata:
     """
     Extract title and description from HTML.
@@ -306,7 +649,12 @@ def extract_html_content(html: str) -> str | None:
     return trafilatura.extract(html)
 
 
-def extract_pdf_metadata(pdf_bytes: bytes) -> ExtractedMetadata:
+def _open_pdf(pdf: bytes | Path) -> BinaryIO:
+    """Open PDF bytes or a spooled PDF file as a seekable stream."""
+    return pdf.open('rb') if isinstance(pdf, Path) else BytesIO(pdf)
+
+
+def extract_pdf_metadata(pdf: bytes | Path) -> ExtractedMetadata:
     """
     Extract title and description from PDF document metadata.
 
@@ -318,14 +666,14 @@ def extract_pdf_metadata(pdf_bytes: bytes) -> ExtractedMetadata:
     Expect None values frequently.
 
     Args:
-        pdf_bytes: Raw PDF file bytes.
+        pdf: Raw PDF file bytes, or the path of a PDF file.
 
     Returns:
         ExtractedMetadata with title and description (may be None if not found).
     """
     try:
-        reader = PdfReader(BytesIO(pdf_bytes))
-        meta = reader.metadata
+        with _open_pdf(pdf) as stream:
+            meta = PdfReader(stream).metadata
 
         title = meta.title if meta and meta.title else None
         description = meta.subject if meta and meta.subject else None
@@ -335,7 +683,7 @@ def extract_pdf_metadata(pdf_bytes: bytes) -> ExtractedMetadata:
         return ExtractedMetadata(title=None, description=None)
 
 
-def extract_pdf_content(pdf_bytes: bytes) -> str | None:
+def extract_pdf_content(pdf: bytes | Path) -> str | None:
     """
     Extract text content from all PDF pages.
 
@@ -343,18 +691,18 @@ def extract_pdf_content(pdf_bytes: bytes) -> str | None:
     or PDF contains no extractable text (e.g., scanned images).
 
     Args:
-        pdf_bytes: Raw PDF file bytes.
+        pdf: Raw PDF file bytes, or the path of a PDF file.
 
     Returns:
         Extracted plain text content, or None if extraction fails.
     """
     try:
-        reader = PdfReader(BytesIO(pdf_bytes))
         text_parts = []
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                text_parts.append(text)
+        with _open_pdf(pdf) as stream:
+            for page in PdfReader(stream).pages:
+                text = page.extract_text()
+                if text:
+                    text_parts.append(text)
 
         if not text_parts:
             return None
@@ -364,7 +712,34 @@ def extract_pdf_content(pdf_bytes: bytes) -> str | None:
         return None
 
 
-async def scrape_url(url: str, timeout: float = DEFAULT_TIMEOUT) -> ScrapedPage:  # noqa: ASYNC109
+def extract_page(
+    content: str | bytes | Path, is_pdf: bool,
+) -> tuple[ExtractedMetadata, str | None]:
+    """
+    Extract metadata and text from fetched HTML or PDF content.
+
+    CPU-bound; scrape_url runs it in the extraction worker pool when one is
+    configured.
+
+    Args:
+        content: HTML string, or PDF bytes or file path.
+        is_pdf: Whether content is a PDF.
+
+    Returns:
+        Tuple of (metadata, text).
+    """
+    if is_pdf:
+        return extract_pdf_metadata(content), extract_pdf_content(content)
+    return extract_html_metadata(content), extract_html_content(content)
+
+
+async def scrape_url(
+    url: str,
+    timeout: float = DEFAULT_TIMEOUT,  # noqa: ASYNC109
+    *,
+    max_html_bytes: int = DEFAULT_MAX_HTML_BYTES,
+    max_pdf_bytes: int = DEFAULT_MAX_PDF_BYTES,
+) -> ScrapedPage:
     """
     Fetch a URL and extract text content and metadata.
 
@@ -374,11 +749,15 @@ async def scrape_url(url: str, timeout: float = DEFAULT_TIMEOUT) -> ScrapedPage:
     Args:
         url: The URL to scrape.
         timeout: Request timeout in seconds.
+        max_html_bytes: HTML body bytes to read (see fetch_url).
+        max_pdf_bytes: Largest PDF body accepted (see fetch_url).
 
     Returns:
         ScrapedPage with extracted text, metadata, and any error info.
     """
-    result = await fetch_url(url, timeout)
+    result = await fetch_url(
+        url, timeout, max_html_bytes=max_html_bytes, max_pdf_bytes=max_pdf_bytes,
+    )
 
     if result.error:
         return ScrapedPage(
@@ -389,12 +768,22 @@ async def scrape_url(url: str, timeout: float = DEFAULT_TIMEOUT) -> ScrapedPage:
             error=result.error,
         )
 
-    if result.is_pdf:
-        metadata = extract_pdf_metadata(result.content)
-        text = extract_pdf_content(result.content)
-    else:
-        metadata = extract_html_metadata(result.content)
-        text = extract_html_content(result.content)
+    pool = get_extraction_pool()
+    try:
+        if pool is None:
+            metadata, text = extract_page(result.content, result.is_pdf)
+        else:
+            metadata, text = await pool.run(extract_page, result.content, result.is_pdf)
+    except ExtractionLimitError as e:
+        return ScrapedPage(
+            text=None,
+            metadata=None,
+            final_url=result.final_url,
+            content_type=result.content_type,
+            error=str(e),
+        )
+    finally:
+        result.discard()
 
     return ScrapedPage(
         text=text,
@@ -11,7 +11,8 @@ from uuid6 import uuid7
 from models.content_filter import ContentFilter
 from models.deleted_identity import DeletedIdentity
 from models.user import User
-from services import content_filter_service
+from services import content_filter_service, public_item_service
+from services.public_share_cache import invalidate_public_share
 
 logger = logging.getLogger(__name__)
 
@@ -122,6 +123,8 @@ async def delete_user_by_external_auth_id(
        else. Two constant statements regardless of account size; no ORM
        collection is ever loaded (see the passive_deletes notes on
        models/user.py; end-state exercised by test_user_cascade.py).
+    4. Invalidate the cached public payloads of the user's published items
+       (one token query per content type; see services/public_share_cache.py).
 
     Idempotent: replays and unknown identities tombstone-and-succeed.
     Uses flush(), not commit — the caller's session owns the transaction.
@@ -165,8 +168,11 @@ async def delete_user_by_external_auth_id(
     # Filters first, set-based: this statement's cascades stop at the
     # association rows, clearing them before the user delete cascades tags.
     await db.execute(delete(ContentFilter).where(ContentFilter.user_id == user_id))
+    public_tokens = await public_item_service.get_user_public_tokens(db, user_id)
     await db.delete(user)
     await db.flush()
+    for content_type, tokens in public_tokens.items():
+        await invalidate_public_share(db, content_type, *tokens)
 
     logger.info(
         "user_deleted user_id=%s external_auth_id=%s auth0_id=%s",
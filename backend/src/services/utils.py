@@ -1,4 +1,8 @@
 """Shared utility functions for service layer."""
+import base64
+import binascii
+import json
+from datetime import datetime
 from typing import Any
 from uuid import UUID
 
@@ -6,6 +10,7 @@ from sqlalchemy import Table, and_, exists, or_, select
 from sqlalchemy.orm import InstrumentedAttribute
 
 from models.tag import Tag
+from services.exceptions import InvalidCursorError
 
 
 def escape_ilike(value: str) -> str:
@@ -22,6 +27,49 @@ def escape_ilike(value: str) -> str:
     return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """Encode a keyset cursor payload as an opaque URL-safe token (unpadded base64 JSON)."""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """
+    Decode a token produced by encode_cursor back into its payload.
+
+    Only the envelope is checked here; callers validate the payload's fields
+    and raise InvalidCursorError themselves (see parse_cursor_timestamp).
+
+    Raises:
+        InvalidCursorError: If the token is not base64-encoded JSON object.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Invalid cursor")
+    return payload
+
+
+def parse_cursor_timestamp(value: Any) -> datetime:
+    """
+    Parse an ISO-format timestamp from a cursor payload.
+
+    Keyset comparisons run against timestamptz columns, so a naive timestamp
+    would be read in the database session's time zone; it is rejected.
+
+    Raises:
+        TypeError: If the value is not a string.
+        ValueError: If it is not an ISO timestamp or has no time zone.
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        raise ValueError("cursor timestamp must be timezone-aware")
+    return parsed
+
+
 def build_tag_filter_from_expression(
     filter_expression: dict[str, Any],
     user_id: UUID,
@@ -0,0 +1,139 @@
+"""In-process cache of reconstructed history versions."""
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from uuid import UUID
+
+# Upper bound on cached content, measured as in-memory string size
+VERSION_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# (user_id, entity_type, entity_id) - the versions of one entity
+EntityKey = tuple[UUID, str, UUID]
+
+
+@dataclass(frozen=True)
+class CachedVersion:
+    """
+    Content of an entity at one version.
+
+    `record_id` is the ContentHistory row the content was reconstructed for.
+    A version's content never changes while its row exists, so callers treat
+    an entry as valid only while the row with that id is still the one at
+    that version. This covers deletes the cache never hears about (pruning
+    in another worker, the scheduled cleanup task).
+    """
+
+    version: int
+    record_id: UUID
+    content: str | None
+
+
+@dataclass
+class VersionCacheStats:
+    """Hit/miss counters for the version cache."""
+
+    hits: int = 0
+    misses: int = 0
+    anchor_hits: int = 0  # Cached neighbour used as the replay starting point
+    stale: int = 0  # Entries dropped because their history row was gone
+    evictions: int = 0
+
+
+class VersionCache:
+    """
+    LRU cache of reconstructed version content, bounded by total content size.
+
+    Entries are grouped per entity so reconstruction can find the nearest
+    cached version above a target and replay from there instead of from a
+    snapshot or the entity's current content.
+    """
+
+    def __init__(self, max_bytes: int = VERSION_CACHE_MAX_BYTES) -> None:
+        """Initialize an empty cache holding at most `max_bytes` of content."""
+        self.max_bytes = max_bytes
+        self._lru: OrderedDict[tuple[EntityKey, int], int] = OrderedDict()
+        self._entities: dict[EntityKey, dict[int, CachedVersion]] = {}
+        self._bytes = 0
+        self._stats = VersionCacheStats()
+
+    def stats(self) -> VersionCacheStats:
+        """Return a snapshot of the counters."""
+        return replace(self._stats)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of cached content."""
+        return self._bytes
+
+    def get(self, entity: EntityKey, version: int) -> CachedVersion | None:
+        """Return the cached content at `version`, if present."""
+        entry = self._entities.get(entity, {}).get(version)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        self._lru.move_to_end((entity, version))
+        return entry
+
+    def nearest_above(self, entity: EntityKey, version: int) -> CachedVersion | None:
+        """Return the lowest cached version greater than `version`, if any."""
+        versions = self._entities.get(entity)
+        if not versions:
+            return None
+        above = [v for v in versions if v > version]
+        if not above:
+            return None
+        entry = versions[min(above)]
+        self._lru.move_to_end((entity, entry.version))
+        return entry
+
+    def put(self, entity: EntityKey, entry: CachedVersion) -> None:
+        """Cache `entry`, evicting least recently used versions to stay in budget."""
+        size = sys.getsizeof(entry.content)
+        if size > self.max_bytes:
+            return
+        self.discard(entity, entry.version)
+        self._entities.setdefault(entity, {})[entry.version] = entry
+        self._lru[(entity, entry.version)] = size
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            (old_entity, old_version), _ = next(iter(self._lru.items()))
+            self.discard(old_entity, old_version)
+            self._stats.evictions += 1
+
+    def discard(self, entity: EntityKey, version: int) -> None:
+        """Drop one cached version."""
+        size = self._lru.pop((entity, version), None)
+        if size is None:
+            return
+        self._bytes -= size
+        versions = self._entities[entity]
+        del versions[version]
+        if not versions:
+            del self._entities[entity]
+
+    def mark_anchor_used(self) -> None:
+        """Count a cached version that served as a replay starting point."""
+        self._stats.anchor_hits += 1
+
+    def mark_stale(self, entity: EntityKey, version: int) -> None:
+        """Drop a version whose history row no longer matches the cached entry."""
+        self._stats.stale += 1
+        self.discard(entity, version)
+
+    def discard_below(self, entity: EntityKey, version: int) -> None:
+        """Drop all cached versions of an entity older than `version` (pruning)."""
+        for old in [v for v in self._entities.get(entity, {}) if v < version]:
+            self.discard(entity, old)
+
+    def invalidate_entity(self, entity: EntityKey) -> None:
+        """Drop every cached version of an entity."""
+        for version in list(self._entities.get(entity, {})):
+            self.discard(entity, version)
+
+    def clear(self) -> None:
+        """Drop everything."""
+        self._lru.clear()
+        self._entities.clear()
+        self._bytes = 0
+
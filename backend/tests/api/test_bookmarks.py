@@ -3278,3 +3278,58 @@ async def test__create_bookmark__too_many_tags__returns_422(client: AsyncClient)
     response = await client.post("/bookmarks/", json={"url": "https://example.com", "tags": tags})
     assert response.status_code == 422
     assert "Too many tags" in response.json()["detail"][0]["msg"]
+
+
+# =============================================================================
+# Bulk Create Tests
+# =============================================================================
+
+
+async def test__bulk_create_bookmarks__reports_per_item_results(client: AsyncClient) -> None:
+    """Valid items are created; invalid and duplicate items are reported in place."""
+    await client.post("/bookmarks/", json={"url": "https://bulk-existing.com"})
+
+    response = await client.post(
+        "/bookmarks/bulk",
+        json={"items": [
+            {"url": "https://bulk-a.com", "title": "A", "tags": ["imported"]},
+            {"url": "not a url"},
+            {"url": "https://bulk-existing.com"},
+            {"url": "https://bulk-b.com", "tags": ["imported"]},
+        ]},
+    )
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["created"] == 2
+    assert body["failed"] == 2
+    results = body["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[0]["id"] is not None
+    assert results[1]["error_code"] == "VALIDATION_ERROR"
+    assert results[2]["error_code"] == "ACTIVE_URL_EXISTS"
+    assert results[3]["id"] is not None
+
+    created = await client.get(f"/bookmarks/{results[0]['id']}")
+    assert created.json()["title"] == "A"
+    assert created.json()["tags"] == ["imported"]
+
+
+async def test__bulk_create_bookmarks__quota_exceeded_per_item(
+    client: AsyncClient, low_limits: TierLimits,
+) -> None:
+    """Items past the quota fail with QUOTA_EXCEEDED instead of failing the request."""
+    items = [{"url": f"https://bulk-quota{i}.com"} for i in range(low_limits.max_bookmarks + 1)]
+
+    response = await client.post("/bookmarks/bulk", json={"items": items})
+    assert response.status_code == 200
+
+    results = response.json()["results"]
+    assert all(r["id"] is not None for r in results[:-1])
+    assert results[-1]["error_code"] == "QUOTA_EXCEEDED"
+
+
+async def test__bulk_create_bookmarks__empty_request__returns_422(client: AsyncClient) -> None:
+    """A bulk request needs at least one item."""
+    response = await client.post("/bookmarks/bulk", json={"items": []})
+    assert response.status_code == 422
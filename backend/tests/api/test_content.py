@@ -376,6 +376,48 @@ async def test__list_all_content__pagination_works(
     assert data['has_more'] is False
 
 
+async def test__list_all_content__cursor_pagination_works(
+    client: AsyncClient,
+) -> None:
+    """Following next_cursor returns every item once, and include_total=false skips the count."""
+    for i in range(3):
+        await client.post('/bookmarks/', json={'url': f'https://test{i}.com', 'title': f'B{i}'})
+    for i in range(2):
+        await client.post('/notes/', json={'title': f'N{i}'})
+
+    response = await client.get('/content/?limit=5')
+    expected_ids = [item['id'] for item in response.json()['items']]
+
+    seen_ids: list[str] = []
+    params: dict[str, str | int] = {'limit': 2, 'include_total': 'false'}
+    while True:
+        response = await client.get('/content/', params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert data['total'] is None
+        seen_ids.extend(item['id'] for item in data['items'])
+        if not data['has_more']:
+            assert data['next_cursor'] is None
+            break
+        params = {'limit': 2, 'include_total': 'false', 'cursor': data['next_cursor']}
+
+    assert seen_ids == expected_ids
+
+
+async def test__list_all_content__invalid_cursor_returns_422(
+    client: AsyncClient,
+) -> None:
+    """Malformed cursors and cursor+offset combinations are rejected."""
+    response = await client.get('/content/?cursor=garbage')
+    assert response.status_code == 422
+
+    for i in range(3):
+        await client.post('/notes/', json={'title': f'N{i}'})
+    cursor = (await client.get('/content/?limit=1')).json()['next_cursor']
+    response = await client.get(f'/content/?cursor={cursor}&offset=1')
+    assert response.status_code == 422
+
+
 async def test__list_all_content__response_schema_is_correct(
     client: AsyncClient,
 ) -> None:
@@ -524,6 +524,41 @@ async def test_get_user_history_pagination(client: AsyncClient) -> None:
     assert data["has_more"] is False
 
 
+async def test_get_user_history_cursor_pagination(client: AsyncClient) -> None:
+    """Following next_cursor returns the same records as offset pagination."""
+    for i in range(5):
+        await client.post("/bookmarks/", json={"url": f"https://example{i}.com"})
+    response = await client.get("/history/", params={"limit": 100})
+    expected = [item["id"] for item in response.json()["items"]]
+
+    seen = []
+    params: dict = {"limit": 2, "include_total": False}
+    while True:
+        response = await client.get("/history/", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        seen.extend(item["id"] for item in data["items"])
+        if not data["has_more"]:
+            assert data["next_cursor"] is None
+            break
+        params["cursor"] = data["next_cursor"]
+
+    assert seen == expected
+
+
+async def test_get_user_history_invalid_cursor_returns_422(client: AsyncClient) -> None:
+    """Malformed cursors, and cursors combined with offset, return 422."""
+    response = await client.get("/history/", params={"cursor": "garbage"})
+    assert response.status_code == 422
+
+    for i in range(2):
+        await client.post("/bookmarks/", json={"url": f"https://example{i}.com"})
+    cursor = (await client.get("/history/", params={"limit": 1})).json()["next_cursor"]
+    response = await client.get("/history/", params={"cursor": cursor, "offset": 1})
+    assert response.status_code == 422
+
+
 async def test_get_user_history_offset_beyond_total(client: AsyncClient) -> None:
     """Test user history with offset beyond total count."""
     await client.post("/bookmarks/", json={"url": "https://example.com"})
@@ -678,6 +713,16 @@ async def test_get_entity_history_pagination(
     assert len(data["items"]) == 2
     assert data["has_more"] is True
 
+    # Follow the cursor to the next page
+    response = await client.get(
+        f"/history/{content_type}/{content_id}",
+        params={"limit": 2, "cursor": data["next_cursor"]},
+    )
+    data = response.json()
+    assert data["total"] == 5
+    assert [item["version"] for item in data["items"]] == [3, 2]
+    assert data["has_more"] is True
+
 
 # --- /history/{content_type}/{content_id}/version/{version} endpoint tests (parametrized) ---
 
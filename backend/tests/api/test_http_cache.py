@@ -1,17 +1,21 @@
 """Tests for HTTP caching (ETag middleware and Last-Modified)."""
 import asyncio
-from datetime import datetime, UTC
+from datetime import datetime, timedelta, UTC
 from unittest.mock import MagicMock
 
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
+from starlette.types import Receive, Scope, Send
 
 from core.http_cache import (
+    ETagMiddleware,
     _etag_matches,
     _parse_if_none_match,
+    check_etag_not_modified,
     check_not_modified,
     format_http_date,
     generate_etag,
     parse_http_date,
+    resource_etag,
 )
 
 
@@ -184,6 +188,49 @@ class TestETagMiddleware:
         assert response2.status_code == 304
 
 
+async def _chunked_json_app(scope: Scope, receive: Receive, send: Send) -> None:  # noqa: ARG001
+    """Minimal ASGI app that streams a JSON body in three messages."""
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json"), (b"x-upstream", b"kept")],
+    })
+    for chunk in (b'{"items": ', b'[1, 2, 3]', b'}'):
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+class TestETagMiddlewareStreaming:
+    """Tests for ETag hashing across multiple http.response.body messages."""
+
+    async def test__etag_middleware__hashes_all_body_messages(self) -> None:
+        """The ETag covers the whole body; messages and upstream headers pass through."""
+        transport = ASGITransport(app=ETagMiddleware(_chunked_json_app))
+        async with AsyncClient(transport=transport, base_url="http://test") as test_client:
+            response = await test_client.get("/items")
+
+        assert response.status_code == 200
+        assert response.content == b'{"items": [1, 2, 3]}'
+        assert response.headers["etag"] == generate_etag(b'{"items": [1, 2, 3]}')
+        assert response.headers["x-upstream"] == "kept"
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    async def test__etag_middleware__streamed_body_matching_if_none_match_returns_304(
+        self,
+    ) -> None:
+        """A matching If-None-Match gets an empty 304 even for a streamed body."""
+        etag = generate_etag(b'{"items": [1, 2, 3]}')
+        transport = ASGITransport(app=ETagMiddleware(_chunked_json_app))
+        async with AsyncClient(transport=transport, base_url="http://test") as test_client:
+            response = await test_client.get("/public/notes/x", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == "public, max-age=0, must-revalidate"
+        assert "x-upstream" not in response.headers
+
+
 class TestCachingHeaders:
     """Tests for Cache-Control and Vary headers."""
 
@@ -492,6 +539,177 @@ class TestCheckNotModified:
         assert result.status_code == 304
 
 
+def _mock_request(path: str, query: str = "", headers: dict[str, str] | None = None) -> MagicMock:
+    """Build a request mock with url.path, url.query and headers."""
+    request = MagicMock()
+    request.url.path = path
+    request.url.query = query
+    request.headers = headers or {}
+    return request
+
+
+class TestResourceEtag:
+    """Tests for resource_etag (route-computed strong ETags)."""
+
+    def test__resource_etag__strong_and_quoted(self) -> None:
+        """Resource ETags are strong (no W/ prefix) and quoted."""
+        etag = resource_etag(_mock_request("/notes/abc"), "v1")
+        assert not etag.startswith("W/")
+        assert etag.startswith('"')
+        assert etag.endswith('"')
+
+    def test__resource_etag__same_inputs_same_etag(self) -> None:
+        """The same path, query and validator give the same ETag."""
+        assert resource_etag(_mock_request("/notes/abc"), "v1") == resource_etag(
+            _mock_request("/notes/abc"), "v1",
+        )
+
+    def test__resource_etag__varies_by_validator_path_and_query(self) -> None:
+        """Each of validator, path and query string changes the ETag."""
+        base = resource_etag(_mock_request("/notes/abc"), "v1")
+        assert resource_etag(_mock_request("/notes/abc"), "v2") != base
+        assert resource_etag(_mock_request("/bookmarks/abc"), "v1") != base
+        assert resource_etag(_mock_request("/notes/abc", "start_line=1"), "v1") != base
+
+
+class TestCheckEtagNotModified:
+    """Tests for check_etag_not_modified helper function."""
+
+    def test__check_etag_not_modified__no_header_returns_none(self) -> None:
+        """Returns None when If-None-Match is absent."""
+        request = _mock_request("/notes/abc")
+        assert check_etag_not_modified(request, '"abc"') is None
+
+    def test__check_etag_not_modified__match_returns_304(self) -> None:
+        """Returns 304 with the ETag and caching headers when it matches."""
+        request = _mock_request("/notes/abc", headers={"if-none-match": '"other", "abc"'})
+
+        result = check_etag_not_modified(request, '"abc"')
+        assert result is not None
+        assert result.status_code == 304
+        assert result.headers.get("etag") == '"abc"'
+        assert result.headers.get("cache-control") == "private, no-cache"
+
+    def test__check_etag_not_modified__wildcard_returns_304(self) -> None:
+        """If-None-Match: * matches any current representation."""
+        request = _mock_request("/notes/abc", headers={"if-none-match": "*"})
+        result = check_etag_not_modified(request, '"abc"')
+        assert result is not None
+        assert result.status_code == 304
+
+    def test__check_etag_not_modified__mismatch_returns_none(self) -> None:
+        """Returns None when no listed ETag matches."""
+        request = _mock_request("/notes/abc", headers={"if-none-match": 'W/"old"'})
+        assert check_etag_not_modified(request, '"abc"') is None
+
+
+class TestResourceEtagIntegration:
+    """Single-item GETs answer If-None-Match from the cache validator."""
+
+    async def test__resource_etag__note_get_returns_strong_etag(
+        self, client: AsyncClient,
+    ) -> None:
+        """GET /notes/{id} returns a strong ETag that revalidates to 304."""
+        note = (await client.post("/notes/", json={"title": "Strong", "content": "a\nb"})).json()
+
+        response = await client.get(f"/notes/{note['id']}")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert not etag.startswith("W/")
+
+        cached = await client.get(f"/notes/{note['id']}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+
+    async def test__resource_etag__partial_read_has_own_etag(
+        self, client: AsyncClient,
+    ) -> None:
+        """A partial read is a different representation with a different ETag."""
+        note = (await client.post("/notes/", json={"title": "Lines", "content": "a\nb\nc"})).json()
+
+        full = await client.get(f"/notes/{note['id']}")
+        partial = await client.get(f"/notes/{note['id']}", params={"start_line": 2, "end_line": 2})
+        assert partial.status_code == 200
+        assert partial.headers["etag"] != full.headers["etag"]
+
+        stale = await client.get(
+            f"/notes/{note['id']}",
+            params={"start_line": 2, "end_line": 2},
+            headers={"If-None-Match": full.headers["etag"]},
+        )
+        assert stale.status_code == 200
+
+    async def test__resource_etag__changes_on_tag_rename(
+        self, client: AsyncClient,
+    ) -> None:
+        """Renaming a tag changes the ETag even though updated_at is untouched."""
+        note = (await client.post("/notes/", json={"title": "Tagged", "tags": ["before"]})).json()
+        etag = (await client.get(f"/notes/{note['id']}")).headers["etag"]
+
+        rename = await client.patch("/tags/before", json={"new_name": "after"})
+        assert rename.status_code == 200
+
+        response = await client.get(f"/notes/{note['id']}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["tags"] == ["after"]
+        assert response.headers["etag"] != etag
+
+    async def test__resource_etag__changes_when_related_item_changes(
+        self, client: AsyncClient,
+    ) -> None:
+        """Editing a related item's title changes the ETag of the linking item."""
+        target = (await client.post("/notes/", json={"title": "Target"})).json()
+        source = (await client.post("/notes/", json={
+            "title": "Source",
+            "relationships": [{
+                "target_type": "note",
+                "target_id": target["id"],
+                "relationship_type": "related",
+            }],
+        })).json()
+        etag = (await client.get(f"/notes/{source['id']}")).headers["etag"]
+
+        await client.patch(f"/notes/{target['id']}", json={"title": "Renamed target"})
+
+        response = await client.get(f"/notes/{source['id']}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    async def test__resource_etag__prompt_by_name(
+        self, client: AsyncClient,
+    ) -> None:
+        """GET /prompts/name/{name} uses the same validator path."""
+        await client.post("/prompts/", json={"name": "etag-prompt", "content": "Hi"})
+
+        response = await client.get("/prompts/name/etag-prompt")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert not etag.startswith("W/")
+
+        cached = await client.get("/prompts/name/etag-prompt", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+    async def test__resource_etag__changes_when_scheduled_archive_passes(
+        self, client: AsyncClient,
+    ) -> None:
+        """is_archived flipping at a future archived_at changes the ETag (no stale 304)."""
+        archive_at = datetime.now(UTC) + timedelta(seconds=1)
+        note = (await client.post(
+            "/notes/", json={"title": "Scheduled", "archived_at": archive_at.isoformat()},
+        )).json()
+        before = await client.get(f"/notes/{note['id']}")
+        assert before.json()["is_archived"] is False
+
+        await asyncio.sleep(max(0.0, (archive_at - datetime.now(UTC)).total_seconds()) + 0.1)
+
+        response = await client.get(
+            f"/notes/{note['id']}", headers={"If-None-Match": before.headers["etag"]},
+        )
+        assert response.status_code == 200
+        assert response.json()["is_archived"] is True
+        assert response.headers["etag"] != before.headers["etag"]
+
+
 class TestLastModifiedIntegration:
     """Integration tests for Last-Modified with real endpoints."""
 
@@ -0,0 +1,69 @@
+"""Tests for the /metrics endpoint."""
+from collections.abc import AsyncGenerator
+
+import pytest
+from httpx import AsyncClient
+
+from core.config import get_settings
+
+TEST_METRICS_TOKEN = "test-metrics-token"
+
+
+@pytest.fixture
+async def metrics_client(client: AsyncClient) -> AsyncGenerator[AsyncClient]:
+    """Client for an app with METRICS_TOKEN configured."""
+    from api.main import app  # noqa: PLC0415
+
+    settings_with_token = get_settings().model_copy(
+        update={"metrics_token": TEST_METRICS_TOKEN},
+    )
+    app.dependency_overrides[get_settings] = lambda: settings_with_token
+    yield client
+    app.dependency_overrides.pop(get_settings, None)
+
+
+AUTH_HEADERS = {"Authorization": f"Bearer {TEST_METRICS_TOKEN}"}
+
+
+async def test__metrics__not_exposed_without_token_configured(client: AsyncClient) -> None:
+    """With METRICS_TOKEN unset the endpoint does not exist."""
+    response = await client.get("/metrics", headers=AUTH_HEADERS)
+    assert response.status_code == 404
+
+
+async def test__metrics__rejects_missing_or_wrong_token(metrics_client: AsyncClient) -> None:
+    """The configured token is required."""
+    response = await metrics_client.get("/metrics")
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+
+    response = await metrics_client.get(
+        "/metrics", headers={"Authorization": "Bearer wrong"},
+    )
+    assert response.status_code == 401
+
+
+async def test__metrics__exposes_request_metrics_by_route_template(
+    metrics_client: AsyncClient,
+) -> None:
+    """Requests show up under their route template with DB statement counts."""
+    created = await metrics_client.post(
+        "/notes/", json={"title": "Metrics", "content": "body"},
+    )
+    assert created.status_code == 201
+    await metrics_client.get(f"/notes/{created.json()['id']}")
+
+    response = await metrics_client.get("/metrics", headers=AUTH_HEADERS)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/notes/{note_id}",'
+        'status="200"}'
+    ) in body
+    assert 'http_request_db_statements_count{route="/notes/{note_id}"}' in body
+    assert 'http_requests_in_progress{method="GET"}' in body
+    assert "history_record_action_duration_seconds_count" in body
+    assert created.json()["id"] not in body
@@ -203,6 +203,27 @@ async def test_list_notes_pagination(client: AsyncClient) -> None:
     assert data["total"] == 5
 
 
+async def test_list_notes_cursor_pagination(client: AsyncClient) -> None:
+    """Test note listing with keyset cursor pagination."""
+    for i in range(5):
+        await client.post("/notes/", json={"title": f"Cursor Note {i}"})
+
+    response = await client.get("/notes/?limit=3&sort_by=title&sort_order=asc")
+    data = response.json()
+    assert data["has_more"] is True
+    assert data["next_cursor"] is not None
+
+    response = await client.get(
+        "/notes/",
+        params={"limit": 3, "sort_by": "title", "sort_order": "asc", "cursor": data["next_cursor"]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["title"] for item in data["items"]] == ["Cursor Note 3", "Cursor Note 4"]
+    assert data["has_more"] is False
+    assert data["next_cursor"] is None
+    assert data["total"] == 5
+
 async def test_list_notes_excludes_content(client: AsyncClient) -> None:
     """Test that list endpoint doesn't return content field for performance."""
     await client.post(
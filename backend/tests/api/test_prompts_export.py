@@ -427,9 +427,28 @@ async def test__export_skills__name_collision_deduped(client: AsyncClient) -> No
     assert len(files) == 1
     assert truncated_path in files
 
-    # Verify content is from one of the prompts (deterministic, but order depends on DB)
+    # The last prompt in (name, id) byte order wins
     content = files[truncated_path]
-    assert "First content" in content or "Second content" in content
+    assert "Second content" in content
+
+
+async def test__export_skills__name_collision_across_pages(client: AsyncClient) -> None:
+    """Colliding prompts are deduped even when a page boundary falls between them."""
+    from api.routers import prompts as prompts_router  # noqa: PLC0415
+
+    await _create_prompt(client, "x" * 64 + "-first", content="First content")
+    await _create_prompt(client, "x" * 64 + "-second", content="Second content")
+    # Truncates to a different directory; sorts between the two above under
+    # collations that ignore hyphens
+    await _create_prompt(client, "x" * 63 + "-xg", content="Other content")
+
+    with patch.object(prompts_router, "EXPORT_PAGE_SIZE", 1):
+        response = await client.get("/prompts/export/skills?client=claude-code")
+
+    files = _extract_tar_gz(response.content)
+    assert set(files) == {"x" * 64 + "/SKILL.md", "x" * 63 + "-/SKILL.md"}
+    assert "Second content" in files["x" * 64 + "/SKILL.md"]
+    assert "Other content" in files["x" * 63 + "-/SKILL.md"]
 
 
 # =============================================================================
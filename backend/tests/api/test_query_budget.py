@@ -0,0 +1,65 @@
+"""Query-count regression tests for key read endpoints."""
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+
+import pytest
+from httpx import AsyncClient
+
+from core.query_budget import QueryTracker
+
+MaxQueries = Callable[[int], AbstractContextManager[QueryTracker]]
+
+
+async def _create_notes(client: AsyncClient, count: int, start: int = 0) -> None:
+    """Create `count` tagged notes, each with its own tag plus a shared one."""
+    for i in range(start, start + count):
+        response = await client.post(
+            "/notes/",
+            json={"title": f"Note {i}", "content": "body", "tags": ["shared", f"tag-{i}"]},
+        )
+        assert response.status_code == 201
+
+
+async def _count_queries(
+    client: AsyncClient, assert_max_queries: MaxQueries, path: str, budget: int,
+) -> int:
+    """Statements run by one GET of `path`, asserting it stays within `budget`."""
+    with assert_max_queries(budget) as tracker:
+        response = await client.get(path)
+    assert response.status_code == 200
+    return tracker.count
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/notes/", "/content/", "/content/?include_total=false", "/tags/"],
+)
+async def test__list_endpoints__query_count_does_not_grow_with_items(
+    client: AsyncClient, assert_max_queries: MaxQueries, path: str,
+) -> None:
+    """Listing 2 or 12 tagged items runs the same number of statements (no N+1)."""
+    await _create_notes(client, 2)
+    # Warm-up request so one-time work (dev user, auth cache) is not counted
+    await client.get(path)
+    few = await _count_queries(client, assert_max_queries, path, budget=12)
+
+    await _create_notes(client, 10, start=2)
+    many = await _count_queries(client, assert_max_queries, path, budget=12)
+
+    assert many == few
+
+
+async def test__get_note__within_query_budget(
+    client: AsyncClient, assert_max_queries: MaxQueries,
+) -> None:
+    """Fetching one note (tags and relationships included) stays within its budget."""
+    created = await client.post(
+        "/notes/", json={"title": "Budget", "content": "body", "tags": ["a", "b", "c"]},
+    )
+    note_id = created.json()["id"]
+    await client.get(f"/notes/{note_id}")
+
+    with assert_max_queries(15):
+        response = await client.get(f"/notes/{note_id}")
+
+    assert response.status_code == 200
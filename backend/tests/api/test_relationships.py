@@ -714,6 +714,57 @@ async def test__api_query__content_info_missing_entity(
         assert item['target_deleted'] is True
 
 
+# =============================================================================
+# GET /relationships/graph/{type}/{id} - Multi-hop graph
+# =============================================================================
+
+
+async def test__api_graph__returns_nodes_and_edges(client: AsyncClient) -> None:
+    """Graph includes items within depth, with content info and hop counts."""
+    bm = await _create_bookmark(client, title='Root')
+    note = await _create_note(client, title='Hop 1')
+    prompt = await _create_prompt(client, title='Hop 2')
+    far = await _create_note(client, title='Hop 3')
+    await _create_relationship(client, 'bookmark', bm['id'], 'note', note['id'])
+    await _create_relationship(client, 'prompt', prompt['id'], 'note', note['id'])
+    await _create_relationship(client, 'prompt', prompt['id'], 'note', far['id'])
+
+    response = await client.get(f'/relationships/graph/bookmark/{bm["id"]}')
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data['root_id'] == bm['id']
+    assert data['depth'] == 2
+    assert data['truncated'] is False
+    nodes = {n['content_id']: n for n in data['nodes']}
+    assert set(nodes) == {bm['id'], note['id'], prompt['id']}
+    assert nodes[bm['id']]['depth'] == 0
+    assert nodes[bm['id']]['url'] == bm['url']
+    assert nodes[note['id']]['depth'] == 1
+    assert nodes[prompt['id']]['depth'] == 2
+    assert nodes[prompt['id']]['prompt_name'] == prompt['name']
+    assert len(data['edges']) == 2
+    assert all(e['source_title'] and e['target_title'] for e in data['edges'])
+
+
+async def test__api_graph__unrelated_item(client: AsyncClient) -> None:
+    """An item without relationships returns only itself."""
+    note = await _create_note(client)
+
+    response = await client.get(f'/relationships/graph/note/{note["id"]}')
+    assert response.status_code == 200
+    data = response.json()
+    assert [n['content_id'] for n in data['nodes']] == [note['id']]
+    assert data['edges'] == []
+
+
+async def test__api_graph__bounds_validated(client: AsyncClient) -> None:
+    """Depth, fan_out, and max_nodes are bounded."""
+    for params in ({'depth': 4}, {'depth': 0}, {'fan_out': 51}, {'max_nodes': 501}):
+        response = await client.get(f'/relationships/graph/note/{FAKE_UUID}', params=params)
+        assert response.status_code == 422
+
+
 # =============================================================================
 # Standalone endpoint history recording
 # =============================================================================
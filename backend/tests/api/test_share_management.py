@@ -15,9 +15,15 @@ Items are created via the API as the dev user, so the owner-scoped share
 endpoints resolve them. The behaviour is identical across types, so each case is
 parametrized over the three URL segments.
 """
+import asyncio
+from collections.abc import AsyncGenerator
+
 import pytest
 from httpx import AsyncClient
 
+from core.redis import RedisClient
+from services.public_share_cache import PublicShareCache, set_public_share_cache
+
 _SEGMENTS = ["bookmarks", "notes", "prompts"]
 
 # A syntactically valid UUID that never matches a real item.
@@ -264,8 +270,8 @@ async def test_etag_revalidation_reflects_share_change(
     client: AsyncClient, segment: str,
 ) -> None:
     """
-    The ETag (full-body validator) catches a share change even though sharing
-    leaves updated_at untouched.
+    The ETag catches a share change even though sharing leaves updated_at
+    untouched.
 
     This is the path the web app relies on: an If-None-Match revalidation after
     publishing returns 200 with the fresh share fields, not a stale 304. The
@@ -418,3 +424,182 @@ async def test_shared_date_range_filter(
     # A past upper bound excludes it; a future upper bound includes it.
     assert item["id"] not in _ids(await client.get(f"{base}&shared_before=2000-01-01T00:00:00Z"))
     assert item["id"] in _ids(await client.get(f"{base}&shared_before=2999-01-01T00:00:00Z"))
+
+
+# --- Public share cache revocation ------------------------------------------
+#
+# With the rendered-payload cache in front of the public reads, every owner
+# write that changes what a token serves must evict it before the next read.
+# Each test warms the cache (two reads, the second from L1) and then checks
+# the write is visible on the very next public read.
+
+
+@pytest.fixture
+async def public_share_cache(redis_client: RedisClient) -> AsyncGenerator[PublicShareCache]:
+    """Install a started public share cache (L1 active) for the public reads."""
+    cache = PublicShareCache(redis_client)
+    await cache.start()
+    for _ in range(200):
+        if cache.l1_active:
+            break
+        await asyncio.sleep(0.01)
+    set_public_share_cache(cache)
+    yield cache
+    set_public_share_cache(None)
+    await cache.stop()
+
+
+async def _create_cached_share(
+    client: AsyncClient, segment: str, cache: PublicShareCache,
+) -> tuple[dict, str]:
+    """Create and share an item with content, and warm its public cache entry."""
+    if segment == "bookmarks":
+        payload: dict = {
+            "url": "https://example.com/cached", "title": "Cached", "content": "alpha body",
+        }
+    elif segment == "notes":
+        payload = {"title": "Cached", "content": "alpha body"}
+    else:
+        payload = {"name": "cached-prompt", "title": "Cached", "content": "alpha body"}
+    item = (await client.post(f"/{segment}/", json=payload)).json()
+    token = (await client.post(f"/{segment}/{item['id']}/share")).json()["public_token"]
+
+    hits = cache.stats().l1_hits
+    assert (await client.get(f"/public/{segment}/{token}")).status_code == 200
+    assert (await client.get(f"/public/{segment}/{token}")).status_code == 200
+    assert cache.stats().l1_hits == hits + 1
+    return item, token
+
+
+@pytest.mark.parametrize("segment", _SEGMENTS)
+async def test_cached_public_read_revalidates_with_etag(
+    client: AsyncClient, public_share_cache: PublicShareCache, segment: str,
+) -> None:
+    """A cached public read carries an ETag and answers If-None-Match with 304."""
+    _, token = await _create_cached_share(client, segment, public_share_cache)
+
+    resp = await client.get(f"/public/{segment}/{token}")
+    assert resp.json()["content"] == "alpha body"
+    assert resp.headers["cache-control"] == "public, max-age=0, must-revalidate"
+
+    revalidated = await client.get(
+        f"/public/{segment}/{token}", headers={"If-None-Match": resp.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+
+
+@pytest.mark.parametrize("segment", _SEGMENTS)
+async def test_cached_public_read_revoked_by_unshare(
+    client: AsyncClient, public_share_cache: PublicShareCache, segment: str,
+) -> None:
+    """Unsharing revokes the cached public URL immediately."""
+    item, token = await _create_cached_share(client, segment, public_share_cache)
+
+    await client.delete(f"/{segment}/{item['id']}/share")
+
+    assert (await client.get(f"/public/{segment}/{token}")).status_code == 404
+
+
+@pytest.mark.parametrize("segment", _SEGMENTS)
+async def test_cached_public_read_revoked_by_rotate(
+    client: AsyncClient, public_share_cache: PublicShareCache, segment: str,
+) -> None:
+    """Rotating revokes the cached old URL immediately."""
+    item, token = await _create_cached_share(client, segment, public_share_cache)
+
+    await client.post(f"/{segment}/{item['id']}/rotate-share-token")
+
+    assert (await client.get(f"/public/{segment}/{token}")).status_code == 404
+
+
+@pytest.mark.parametrize("segment", _SEGMENTS)
+async def test_cached_public_read_revoked_by_delete(
+    client: AsyncClient, public_share_cache: PublicShareCache, segment: str,
+) -> None:
+    """Deleting a shared item revokes the cached public URL immediately."""
+    item, token = await _create_cached_share(client, segment, public_share_cache)
+
+    await client.delete(f"/{segment}/{item['id']}")
+
+    assert (await client.get(f"/public/{segment}/{token}")).status_code == 404
+
+
+@pytest.mark.parametrize("segment", _SEGMENTS)
+async def test_cached_public_read_reflects_update(
+    client: AsyncClient, public_share_cache: PublicShareCache, segment: str,
+) -> None:
+    """A PATCH is visible on the next public read."""
+    item, token = await _create_cached_share(client, segment, public_share_cache)
+
+    await client.patch(f"/{segment}/{item['id']}", json={"title": "Edited"})
+
+    assert (await client.get(f"/public/{segment}/{token}")).json()["title"] == "Edited"
+
+
+@pytest.mark.parametrize("segment", _SEGMENTS)
+async def test_cached_public_read_reflects_str_replace(
+    client: AsyncClient, public_share_cache: PublicShareCache, segment: str,
+) -> None:
+    """A str-replace edit is visible on the next public read."""
+    item, token = await _create_cached_share(client, segment, public_share_cache)
+
+    resp = await client.patch(
+        f"/{segment}/{item['id']}/str-replace", json={"old_str": "alpha", "new_str": "beta"},
+    )
+    assert resp.status_code == 200, resp.text
+
+    assert (await client.get(f"/public/{segment}/{token}")).json()["content"] == "beta body"
+
+
+@pytest.mark.parametrize("segment", _SEGMENTS)
+async def test_cached_public_read_reflects_archive(
+    client: AsyncClient, public_share_cache: PublicShareCache, segment: str,
+) -> None:
+    """Archiving is visible on the next public read (is_archived flips)."""
+    item, token = await _create_cached_share(client, segment, public_share_cache)
+
+    await client.post(f"/{segment}/{item['id']}/archive")
+
+    assert (await client.get(f"/public/{segment}/{token}")).json()["is_archived"] is True
+
+
+@pytest.mark.parametrize("segment", _SEGMENTS)
+async def test_cached_public_read_reflects_relationship_bump(
+    client: AsyncClient, public_share_cache: PublicShareCache, segment: str,
+) -> None:
+    """Linking another item to a shared one bumps its updated_at on the next public read."""
+    item, token = await _create_cached_share(client, segment, public_share_cache)
+    before = (await client.get(f"/public/{segment}/{token}")).json()["updated_at"]
+
+    resp = await client.post("/notes/", json={
+        "title": "Linking note",
+        "relationships": [{
+            "target_type": segment.removesuffix("s"),
+            "target_id": item["id"],
+            "relationship_type": "related",
+        }],
+    })
+    assert resp.status_code == 201, resp.text
+
+    assert (await client.get(f"/public/{segment}/{token}")).json()["updated_at"] != before
+
+
+@pytest.mark.parametrize("segment", _SEGMENTS)
+async def test_cached_public_read_reflects_relationship_endpoint(
+    client: AsyncClient, public_share_cache: PublicShareCache, segment: str,
+) -> None:
+    """Linking through the relationships endpoint is visible on the next public read."""
+    item, token = await _create_cached_share(client, segment, public_share_cache)
+    before = (await client.get(f"/public/{segment}/{token}")).json()["updated_at"]
+    note = (await client.post("/notes/", json={"title": "Linking note"})).json()
+
+    resp = await client.post("/relationships/", json={
+        "source_type": "note",
+        "source_id": note["id"],
+        "target_type": segment.removesuffix("s"),
+        "target_id": item["id"],
+        "relationship_type": "related",
+    })
+    assert resp.status_code == 201, resp.text
+
+    assert (await client.get(f"/public/{segment}/{token}")).json()["updated_at"] != before
@@ -216,6 +216,69 @@ async def test_authenticate_with_pat(
     app.dependency_overrides.clear()
 
 
+async def test_revoked_pat_rejected_after_being_cached(
+    client: AsyncClient,
+    db_session: AsyncSession,
+) -> None:
+    """Revoking a PAT evicts its auth-cache entry, so it stops working at once."""
+    create_response = await client.post(
+        "/tokens/",
+        json={"name": "Revoke Test Token"},
+    )
+    token_id = create_response.json()["id"]
+    plaintext_token = create_response.json()["token"]
+
+    dev_user = await db_session.execute(
+        select(User).where(User.auth0_id == "dev|local-development-user"),
+    )
+    await add_consent_for_user(db_session, dev_user.scalar_one())
+
+    from api.main import app  # noqa: PLC0415
+
+    get_settings.cache_clear()
+    dev_mode = {"enabled": False}
+
+    async def override_get_async_session() -> AsyncGenerator[AsyncSession]:
+        yield db_session
+
+    def override_get_settings() -> Settings:
+        return Settings(
+            database_url="postgresql://test",
+            dev_mode=dev_mode["enabled"],
+            auth0_custom_claim_namespace="https://test.example.com",
+            clerk_frontend_api="test-instance.clerk.accounts.dev",
+            clerk_authorized_parties_str="http://localhost:5173",
+        )
+
+    from db.session import get_async_session  # noqa: PLC0415
+
+    app.dependency_overrides[get_async_session] = override_get_async_session
+    app.dependency_overrides[get_settings] = override_get_settings
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {plaintext_token}"},
+    ) as pat_client:
+        # First use caches the token and its owner
+        assert (await pat_client.get("/bookmarks/")).status_code == 200
+        assert (await pat_client.get("/bookmarks/")).status_code == 200
+
+        # Revoke through the session-only endpoint (dev mode = session auth)
+        dev_mode["enabled"] = True
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test",
+        ) as session_client:
+            assert (await session_client.delete(f"/tokens/{token_id}")).status_code == 204
+        dev_mode["enabled"] = False
+
+        response = await pat_client.get("/bookmarks/")
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Invalid or expired token"
+
+    app.dependency_overrides.clear()
+
+
 async def test_authenticate_with_invalid_pat(db_session: AsyncSession) -> None:
     """Test that an invalid PAT is rejected."""
     from api.main import app  # noqa: PLC0415
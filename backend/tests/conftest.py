@@ -1,7 +1,8 @@
 """Pytest fixtures for testing."""
 import asyncio
 import os
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import AsyncGenerator, Callable, Generator, Iterator
+from contextlib import AbstractContextManager, contextmanager
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 from unittest.mock import patch
@@ -24,6 +25,7 @@ from testcontainers.redis import RedisContainer
 
 from core.auth_cache import AuthCache, set_auth_cache
 from core.config import Settings, get_settings
+from core.query_budget import QueryTracker, track_queries
 from core.redis import RedisClient, set_redis_client
 from core.tier_limits import Tier, TierLimits, get_tier_limits
 from models.base import Base
@@ -51,6 +53,9 @@ def pytest_configure(config: pytest.Config) -> None:  # noqa: ARG001
     missing/alternate values override these explicitly (monkeypatch / subprocess env).
     """
     os.environ["VITE_DEV_MODE"] = "true"
+    # Routes over their query budget (core/query_budget.py) fail the request
+    # instead of only logging, so query-count regressions fail CI.
+    os.environ["QUERY_BUDGET_MODE"] = "raise"
     os.environ["VITE_API_URL"] = "http://localhost:8000"
     os.environ["CLERK_FRONTEND_API"] = "test-instance.clerk.accounts.dev"
     os.environ["CONTENT_MCP_RESOURCE_URL"] = "http://localhost:8001/mcp"
@@ -538,6 +543,30 @@ async def client(
     set_redis_client(None)
 
 
+@pytest.fixture
+def assert_max_queries() -> Callable[[int], AbstractContextManager[QueryTracker]]:
+    """
+    Assert that a block runs at most `max_statements` SQL statements.
+
+        with assert_max_queries(8):
+            response = await client.get("/notes/")
+
+    Counts every statement on any engine, authentication and savepoints
+    included. The failure message lists the most executed (normalized)
+    statements, which is usually enough to spot an N+1 query. The yielded
+    QueryTracker can be inspected after the block.
+    """
+    @contextmanager
+    def _assert_max_queries(max_statements: int) -> Iterator[QueryTracker]:
+        with track_queries() as tracker:
+            yield tracker
+        assert tracker.count <= max_statements, (
+            f"{tracker.count} SQL statements (max {max_statements}):\n{tracker.summary()}"
+        )
+
+    return _assert_max_queries
+
+
 @pytest.fixture
 async def rate_limit_client(
     client: AsyncClient,
@@ -1,5 +1,7 @@
 """Tests for the auth caching module."""
+import asyncio
 import json
+from collections.abc import Callable
 from datetime import UTC, datetime
 from uuid import uuid4
 
@@ -8,11 +10,14 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from core.auth_cache import CACHE_SCHEMA_VERSION, AuthCache, get_auth_cache, set_auth_cache
+from core.auth_cache import (
+    CACHE_SCHEMA_VERSION, AuthCache, AuthCacheStats, get_auth_cache, set_auth_cache,
+)
 from core.redis import RedisClient
 from models.user import User
 from core.tier_limits import Tier
 from models.user_consent import UserConsent
+from schemas.cached_token import CachedToken
 from schemas.cached_user import CachedUser
 
 
@@ -304,6 +309,57 @@ class TestAuthCacheExternalAuthId:
         assert await cache.get_by_external_auth_id("user_clerk_invalidate") is None
 
 
+class TestAuthCacheTokens:
+    """Tests for API token (PAT) entries."""
+
+    async def test__set_token__round_trips(
+        self,
+        redis_client: RedisClient,
+        test_user: User,
+    ) -> None:
+        """A cached token is returned by its hash with id, owner and expiry."""
+        cache = AuthCache(redis_client)
+        token = CachedToken(
+            id=uuid4(),
+            user_id=test_user.id,
+            expires_at=datetime(2030, 1, 1, tzinfo=UTC),
+        )
+
+        await cache.set_token("abc123", token)
+        result = await cache.get_by_token_hash("abc123")
+
+        assert result == token
+        assert result.is_expired() is False
+
+    async def test__set_token__handles_no_expiry(
+        self,
+        redis_client: RedisClient,
+        test_user: User,
+    ) -> None:
+        """A token without expiry round-trips with expires_at None."""
+        cache = AuthCache(redis_client)
+        token = CachedToken(id=uuid4(), user_id=test_user.id, expires_at=None)
+
+        await cache.set_token("abc123", token)
+        result = await cache.get_by_token_hash("abc123")
+
+        assert result == token
+
+    async def test__invalidate_token__removes_entry(
+        self,
+        redis_client: RedisClient,
+        test_user: User,
+    ) -> None:
+        """invalidate_token removes the token entry."""
+        cache = AuthCache(redis_client)
+        await cache.set_token(
+            "abc123", CachedToken(id=uuid4(), user_id=test_user.id, expires_at=None),
+        )
+
+        assert await cache.invalidate_token("abc123") is True
+        assert await cache.get_by_token_hash("abc123") is None
+
+
 class TestAuthCacheSchemaVersioning:
     """Tests for schema versioning in auth cache."""
 
@@ -332,6 +388,120 @@ class TestAuthCacheSchemaVersioning:
         assert result is None
 
 
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    """Poll `condition` for up to 2s (pub/sub delivery is asynchronous)."""
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met within 2s")
+
+
+class TestAuthCacheL1:
+    """Tests for the in-process L1 tier and pub/sub invalidation."""
+
+    async def test__l1__disabled_until_started(
+        self,
+        redis_client: RedisClient,
+        test_user: User,
+    ) -> None:
+        """Without a subscription every lookup goes to Redis."""
+        cache = AuthCache(redis_client)
+
+        await cache.set(test_user)
+        await cache.get_by_user_id(test_user.id)
+        await cache.get_by_user_id(test_user.id)
+
+        assert cache.l1_active is False
+        assert cache.stats() == AuthCacheStats(l1_misses=2, l2_hits=2)
+
+    async def test__l1__serves_repeat_lookups(
+        self,
+        redis_client: RedisClient,
+        test_user: User,
+    ) -> None:
+        """Once subscribed, a Redis hit populates L1 and later lookups skip Redis."""
+        cache = AuthCache(redis_client)
+        await cache.start()
+        try:
+            await _wait_for(lambda: cache.l1_active)
+            await cache.set(test_user)
+
+            first = await cache.get_by_user_id(test_user.id)
+            second = await cache.get_by_user_id(test_user.id)
+
+            assert first == second
+            assert cache.stats() == AuthCacheStats(l1_hits=1, l1_misses=1, l2_hits=1)
+        finally:
+            await cache.stop()
+
+        assert cache.l1_active is False
+
+    async def test__l1__invalidation_on_other_worker_evicts(
+        self,
+        redis_client: RedisClient,
+        test_user: User,
+    ) -> None:
+        """invalidate() on one instance evicts the L1 copy held by another."""
+        reader = AuthCache(redis_client)
+        writer = AuthCache(redis_client)
+        await reader.start()
+        try:
+            await _wait_for(lambda: reader.l1_active)
+            await writer.set(test_user)
+            assert await reader.get_by_auth0_id(test_user.auth0_id) is not None
+
+            assert await writer.invalidate(test_user.id, auth0_id=test_user.auth0_id)
+            await _wait_for(lambda: not reader._l1)
+
+            assert await reader.get_by_auth0_id(test_user.auth0_id) is None
+        finally:
+            await reader.stop()
+
+    async def test__l1__entries_expire(
+        self,
+        redis_client: RedisClient,
+        test_user: User,
+    ) -> None:
+        """An L1 entry older than L1_TTL is not served."""
+        cache = AuthCache(redis_client)
+        cache.L1_TTL = 0
+        await cache.start()
+        try:
+            await _wait_for(lambda: cache.l1_active)
+            await cache.set(test_user)
+
+            await cache.get_by_user_id(test_user.id)
+            await cache.get_by_user_id(test_user.id)
+
+            assert cache.stats().l1_hits == 0
+            assert cache.stats().l2_hits == 2
+        finally:
+            await cache.stop()
+
+    async def test__l1__bounded_by_max_entries(
+        self,
+        redis_client: RedisClient,
+        test_user: User,
+        test_user_with_consent: User,
+    ) -> None:
+        """The least recently used entry is dropped when L1 is full."""
+        cache = AuthCache(redis_client)
+        cache.L1_MAX_ENTRIES = 1
+        await cache.start()
+        try:
+            await _wait_for(lambda: cache.l1_active)
+            await cache.set(test_user)
+            await cache.set(test_user_with_consent)
+
+            await cache.get_by_user_id(test_user.id)
+            await cache.get_by_user_id(test_user_with_consent.id)
+
+            assert list(cache._l1) == [cache._cache_key_user_id(test_user_with_consent.id)]
+        finally:
+            await cache.stop()
+
+
 class TestAuthCacheFallback:
     """Tests for auth cache fallback when Redis unavailable."""
 
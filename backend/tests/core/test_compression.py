@@ -0,0 +1,277 @@
+"""Tests for negotiated response compression."""
+import gzip
+import json
+from collections.abc import Callable
+
+import brotli
+import pytest
+import zstandard
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.compression import (
+    CompressionMiddleware,
+    encoded_etag,
+    get_compression_stats,
+    negotiate_encoding,
+    skip_compression,
+)
+from core.http_cache import ETagMiddleware, generate_etag
+
+LARGE_BODY = json.dumps({"items": [{"id": i, "title": f"Item {i}"} for i in range(200)]}).encode()
+SMALL_BODY = b'{"status": "ok"}'
+
+
+def _json_app(body: bytes, content_type: bytes = b"application/json") -> ASGIApp:
+    """ASGI app that returns `body` in a single message."""
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:  # noqa: ARG001
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", content_type),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def _chunked_json_app(scope: Scope, receive: Receive, send: Send) -> None:  # noqa: ARG001
+    """ASGI app that streams LARGE_BODY in several messages without a Content-Length."""
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json")],
+    })
+    for start in range(0, len(LARGE_BODY), 1000):
+        chunk = LARGE_BODY[start:start + 1000]
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    """Decompress a streamed zstd frame (no content size in the header)."""
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+DECOMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": gzip.decompress,
+    "br": brotli.decompress,
+    "zstd": _zstd_decompress,
+}
+
+
+async def _get(
+    app: ASGIApp, path: str = "/items", headers: dict[str, str] | None = None,
+) -> tuple[Response, bytes]:
+    """GET through an ASGI app, returning the response with its raw (still encoded) body."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as test_client:
+        async with test_client.stream("GET", path, headers=headers) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    return response, raw
+
+
+class TestNegotiateEncoding:
+    """Tests for Accept-Encoding negotiation."""
+
+    def test__negotiate_encoding__gzip(self) -> None:
+        """A client that only accepts gzip gets gzip."""
+        assert negotiate_encoding("gzip") == "gzip"
+
+    def test__negotiate_encoding__identity_when_nothing_supported(self) -> None:
+        """Unknown codings and an empty header mean no compression."""
+        assert negotiate_encoding("") is None
+        assert negotiate_encoding("deflate, compress") is None
+        assert negotiate_encoding("identity") is None
+
+    def test__negotiate_encoding__q_zero_refuses(self) -> None:
+        """q=0 refuses a coding."""
+        assert negotiate_encoding("gzip;q=0") is None
+        assert negotiate_encoding("*, zstd;q=0") == "br"
+
+    def test__negotiate_encoding__br_and_zstd(self) -> None:
+        """Brotli and zstd are offered alongside gzip."""
+        assert negotiate_encoding("br") == "br"
+        assert negotiate_encoding("zstd") == "zstd"
+        assert negotiate_encoding("gzip, deflate, br, zstd") == "zstd"
+
+    def test__negotiate_encoding__highest_q_wins(self) -> None:
+        """The coding with the highest q-value wins over server preference."""
+        assert negotiate_encoding("gzip;q=1.0, br;q=0.5, zstd;q=0.1") == "gzip"
+        assert negotiate_encoding("gzip, br, zstd") == "zstd"
+        assert negotiate_encoding("gzip, br") == "br"
+
+    def test__negotiate_encoding__wildcard(self) -> None:
+        """`*` matches codings the client did not list."""
+        assert negotiate_encoding("*") == "zstd"
+        assert negotiate_encoding("zstd;q=0.1, *;q=0.5") == "br"
+
+
+class TestEncodedEtag:
+    """Tests for per-encoding ETags."""
+
+    def test__encoded_etag__appends_coding_inside_quotes(self) -> None:
+        """The coding goes inside the quotes, keeping the weak prefix."""
+        assert encoded_etag('W/"abc"', "gzip") == 'W/"abc-gzip"'
+        assert encoded_etag('"abc"', "br") == '"abc-br"'
+
+
+class TestCompressionMiddleware:
+    """Tests for CompressionMiddleware."""
+
+    async def test__compression__large_json_is_gzipped(self) -> None:
+        """A large JSON body is gzipped with Content-Encoding, Vary and a matching length."""
+        response, raw = await _get(
+            CompressionMiddleware(_json_app(LARGE_BODY)), headers={"Accept-Encoding": "gzip"},
+        )
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) == len(raw)
+        assert len(raw) < len(LARGE_BODY)
+        assert gzip.decompress(raw) == LARGE_BODY
+
+    @pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+    async def test__compression__each_coding_round_trips(self, encoding: str) -> None:
+        """Every supported coding produces a body that decodes to the original."""
+        response, raw = await _get(
+            CompressionMiddleware(_json_app(LARGE_BODY)), headers={"Accept-Encoding": encoding},
+        )
+        assert response.headers["content-encoding"] == encoding
+        assert int(response.headers["content-length"]) == len(raw)
+        assert len(raw) < len(LARGE_BODY)
+        assert DECOMPRESSORS[encoding](raw) == LARGE_BODY
+
+    @pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+    async def test__compression__each_coding_streams(self, encoding: str) -> None:
+        """Every supported coding compresses a streamed body incrementally."""
+        response, raw = await _get(
+            CompressionMiddleware(_chunked_json_app), headers={"Accept-Encoding": encoding},
+        )
+        assert response.headers["content-encoding"] == encoding
+        assert DECOMPRESSORS[encoding](raw) == LARGE_BODY
+
+    async def test__compression__small_body_is_not_compressed(self) -> None:
+        """Bodies under the threshold go out as identity."""
+        before = get_compression_stats().skipped_small
+        response, raw = await _get(
+            CompressionMiddleware(_json_app(SMALL_BODY)), headers={"Accept-Encoding": "gzip"},
+        )
+        assert "content-encoding" not in response.headers
+        assert "vary" not in response.headers
+        assert raw == SMALL_BODY
+        assert get_compression_stats().skipped_small == before + 1
+
+    async def test__compression__threshold_is_configurable(self) -> None:
+        """minimum_size sets the threshold."""
+        app = CompressionMiddleware(_json_app(LARGE_BODY), minimum_size=len(LARGE_BODY) + 1)
+        response, raw = await _get(app, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert raw == LARGE_BODY
+
+    async def test__compression__no_accept_encoding_is_identity(self) -> None:
+        """Without an acceptable coding the response is untouched."""
+        response, raw = await _get(
+            CompressionMiddleware(_json_app(LARGE_BODY)), headers={"Accept-Encoding": "identity"},
+        )
+        assert "content-encoding" not in response.headers
+        assert raw == LARGE_BODY
+
+    async def test__compression__non_text_media_type_is_not_compressed(self) -> None:
+        """Binary and already-compressed media types pass through."""
+        app = CompressionMiddleware(_json_app(LARGE_BODY, b"application/zip"))
+        response, raw = await _get(app, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert raw == LARGE_BODY
+
+    async def test__compression__streamed_body_is_compressed_incrementally(self) -> None:
+        """A streamed body is compressed chunk by chunk without a Content-Length."""
+        stats_before = get_compression_stats()
+        response, raw = await _get(
+            CompressionMiddleware(_chunked_json_app), headers={"Accept-Encoding": "gzip"},
+        )
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert gzip.decompress(raw) == LARGE_BODY
+
+        stats = get_compression_stats()
+        assert stats.compressed == stats_before.compressed + 1
+        assert stats.bytes_in - stats_before.bytes_in == len(LARGE_BODY)
+        assert stats.bytes_out - stats_before.bytes_out == len(raw)
+
+
+class TestCompressionWithETags:
+    """Tests for CompressionMiddleware wrapping ETagMiddleware."""
+
+    async def test__compression__etag_is_suffixed_per_encoding(self) -> None:
+        """The gzip representation carries the identity ETag with -gzip appended."""
+        app = CompressionMiddleware(ETagMiddleware(_json_app(LARGE_BODY)))
+        response, _ = await _get(app, headers={"Accept-Encoding": "gzip"})
+        assert response.headers["etag"] == encoded_etag(generate_etag(LARGE_BODY), "gzip")
+
+        identity, _ = await _get(app, headers={"Accept-Encoding": "identity"})
+        assert identity.headers["etag"] == generate_etag(LARGE_BODY)
+
+    async def test__compression__encoded_if_none_match_returns_304(self) -> None:
+        """Revalidating with the gzip ETag gets a 304 carrying that same ETag."""
+        app = CompressionMiddleware(ETagMiddleware(_json_app(LARGE_BODY)))
+        first, _ = await _get(app, headers={"Accept-Encoding": "gzip"})
+        etag = first.headers["etag"]
+
+        compressed_before = get_compression_stats().compressed
+        response, raw = await _get(
+            app, headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+        )
+        assert response.status_code == 304
+        assert raw == b""
+        assert response.headers["etag"] == etag
+        assert "content-encoding" not in response.headers
+        assert get_compression_stats().compressed == compressed_before
+
+    async def test__compression__etag_differs_per_encoding(self) -> None:
+        """gzip, br and zstd representations each get their own ETag."""
+        app = CompressionMiddleware(ETagMiddleware(_json_app(LARGE_BODY)))
+        etags = set()
+        for encoding in ("gzip", "br", "zstd"):
+            response, _ = await _get(app, headers={"Accept-Encoding": encoding})
+            assert response.headers["etag"] == encoded_etag(generate_etag(LARGE_BODY), encoding)
+            etags.add(response.headers["etag"])
+        assert len(etags) == 3
+
+    async def test__compression__etag_of_other_encoding_does_not_match(self) -> None:
+        """A gzip ETag does not validate the identity representation."""
+        app = CompressionMiddleware(ETagMiddleware(_json_app(LARGE_BODY)))
+        etag = encoded_etag(generate_etag(LARGE_BODY), "gzip")
+        response, raw = await _get(
+            app, headers={"Accept-Encoding": "identity", "If-None-Match": etag},
+        )
+        assert response.status_code == 200
+        assert raw == LARGE_BODY
+
+
+class TestSkipCompression:
+    """Tests for the per-route opt-out."""
+
+    async def test__skip_compression__route_dependency_disables_compression(self) -> None:
+        """A route with the skip_compression dependency is sent uncompressed."""
+        api = FastAPI()
+        payload = {"items": list(range(1000))}
+
+        @api.get("/compressed")
+        async def compressed() -> dict:
+            return payload
+
+        @api.get("/streamed", dependencies=[Depends(skip_compression)])
+        async def streamed() -> dict:
+            return payload
+
+        app = CompressionMiddleware(api)
+        response, raw = await _get(app, "/compressed", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert json.loads(gzip.decompress(raw)) == payload
+
+        response, raw = await _get(app, "/streamed", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert json.loads(raw) == payload
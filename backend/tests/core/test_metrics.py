@@ -0,0 +1,261 @@
+"""Tests for runtime metrics (registry, middleware and cross-worker export)."""
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from core.metrics import (
+    GAUGES_KEY_PREFIX,
+    HTTP_REQUEST_DB_STATEMENTS,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUEST_REDIS_COMMANDS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    REGISTRY,
+    TOTALS_KEY,
+    UNMATCHED_ROUTE,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsExporter,
+    MetricsMiddleware,
+    MetricsRegistry,
+    _sample_key,
+    current_request_counts,
+    record_db_statement,
+    record_redis_command,
+)
+from core.redis import RedisClient
+
+
+def _total(key: str) -> float:
+    """This worker's total for a sample key in the global registry."""
+    return REGISTRY.local_totals().get(key, 0.0)
+
+
+class TestMetricsRegistry:
+    """Tests for metric families and text rendering."""
+
+    def test__render__counter_with_labels(self) -> None:
+        """Counters render HELP, TYPE and one line per label set."""
+        registry = MetricsRegistry()
+        counter = Counter("jobs_total", "Jobs run.", ("kind",), registry=registry)
+        counter.inc("a")
+        counter.inc("a", amount=2)
+        counter.inc("b")
+
+        assert registry.render_local() == (
+            "# HELP jobs_total Jobs run.\n"
+            "# TYPE jobs_total counter\n"
+            'jobs_total{kind="a"} 3\n'
+            'jobs_total{kind="b"} 1\n'
+        )
+
+    def test__histogram__buckets_are_cumulative_and_in_le_order(self) -> None:
+        """An observation counts in every bucket at or above it; +Inf sorts last."""
+        registry = MetricsRegistry()
+        histogram = Histogram("wait_seconds", "Wait.", buckets=(0.1, 1.0, 10.0), registry=registry)
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(20.0)
+
+        lines = registry.render_local().splitlines()
+        assert lines[2:] == [
+            'wait_seconds_bucket{le="0.1"} 1',
+            'wait_seconds_bucket{le="1"} 2',
+            'wait_seconds_bucket{le="10"} 2',
+            'wait_seconds_bucket{le="+Inf"} 3',
+            "wait_seconds_count 3",
+            "wait_seconds_sum 20.55",
+        ]
+
+    def test__histogram__observation_on_bucket_bound_counts_in_that_bucket(self) -> None:
+        """Buckets are upper-inclusive (le), and empty buckets are still exported."""
+        registry = MetricsRegistry()
+        histogram = Histogram("calls", "Calls.", buckets=(0, 1, 2), registry=registry)
+        histogram.observe(1)
+
+        totals = registry.local_totals()
+        assert totals['calls_bucket{le="0"}'] == 0
+        assert totals['calls_bucket{le="1"}'] == 1
+
+    def test__gauge__set_inc_dec(self) -> None:
+        """Gauges hold the current value, not a total."""
+        registry = MetricsRegistry()
+        gauge = Gauge("in_flight", "In flight.", ("method",), registry=registry)
+        gauge.inc("GET")
+        gauge.inc("GET")
+        gauge.dec("GET")
+        gauge.set(7, "POST")
+
+        assert registry.gauge_values() == {
+            'in_flight{method="GET"}': 1.0,
+            'in_flight{method="POST"}': 7,
+        }
+        assert registry.local_totals() == {}
+
+    def test__sample_key__escapes_label_values(self) -> None:
+        """Quotes, backslashes and newlines in label values are escaped."""
+        key = _sample_key("x", ("path",), ('a"b\\c\nd',))
+        assert key == 'x{path="a\\"b\\\\c\\nd"}'
+
+    def test__register__duplicate_name_raises(self) -> None:
+        """Two families cannot share a name."""
+        registry = MetricsRegistry()
+        Counter("dup_total", "First.", registry=registry)
+        with pytest.raises(ValueError, match="already registered"):
+            Counter("dup_total", "Second.", registry=registry)
+
+    def test__take_pending__returns_deltas_and_restore_merges_them_back(self) -> None:
+        """Pending deltas are handed out once; a failed flush can put them back."""
+        registry = MetricsRegistry()
+        counter = Counter("n_total", "N.", registry=registry)
+        counter.inc()
+        batch = registry.take_pending()
+        assert batch == {"n_total": 1.0}
+        assert registry.take_pending() == {}
+
+        counter.inc()
+        registry.restore_pending(batch)
+        assert registry.take_pending() == {"n_total": 2.0}
+        assert registry.local_totals() == {"n_total": 2.0}
+
+
+def _metrics_app() -> FastAPI:
+    """App with routes that make DB/Redis 'calls', wrapped in MetricsMiddleware."""
+    api = FastAPI()
+
+    @api.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict:
+        record_db_statement()
+        record_db_statement()
+        record_redis_command()
+        return {"id": item_id}
+
+    @api.get("/fail")
+    async def fail() -> dict:
+        raise RuntimeError("boom")
+
+    return MetricsMiddleware(api)
+
+
+class TestMetricsMiddleware:
+    """Tests for per-request metrics."""
+
+    async def test__middleware__labels_by_route_template_and_status(self) -> None:
+        """Latency is recorded under the route template, not the raw path."""
+        count_key = _sample_key(
+            "http_request_duration_seconds_count", HTTP_REQUEST_DURATION.labelnames,
+            ("GET", "/items/{item_id}", "200"),
+        )
+        before = _total(count_key)
+        async with AsyncClient(
+            transport=ASGITransport(app=_metrics_app()), base_url="http://test",
+        ) as test_client:
+            await test_client.get("/items/1")
+            await test_client.get("/items/2")
+
+        assert _total(count_key) == before + 2
+
+    async def test__middleware__counts_db_statements_and_redis_commands(self) -> None:
+        """Calls made while handling the request land in the per-request histograms."""
+        db_sum = _sample_key(
+            "http_request_db_statements_sum", HTTP_REQUEST_DB_STATEMENTS.labelnames,
+            ("/items/{item_id}",),
+        )
+        redis_sum = _sample_key(
+            "http_request_redis_commands_sum", HTTP_REQUEST_REDIS_COMMANDS.labelnames,
+            ("/items/{item_id}",),
+        )
+        db_before, redis_before = _total(db_sum), _total(redis_sum)
+        async with AsyncClient(
+            transport=ASGITransport(app=_metrics_app()), base_url="http://test",
+        ) as test_client:
+            await test_client.get("/items/1")
+
+        assert _total(db_sum) == db_before + 2
+        assert _total(redis_sum) == redis_before + 1
+
+    async def test__middleware__unmatched_path_uses_fixed_label(self) -> None:
+        """Paths that match no route share one label value."""
+        count_key = _sample_key(
+            "http_request_duration_seconds_count", HTTP_REQUEST_DURATION.labelnames,
+            ("GET", UNMATCHED_ROUTE, "404"),
+        )
+        before = _total(count_key)
+        async with AsyncClient(
+            transport=ASGITransport(app=_metrics_app()), base_url="http://test",
+        ) as test_client:
+            response = await test_client.get("/no/such/path")
+
+        assert response.status_code == 404
+        assert _total(count_key) == before + 1
+
+    async def test__middleware__exception_is_recorded_as_500(self) -> None:
+        """A request that raises is recorded with status 500 and leaves in-flight at 0."""
+        count_key = _sample_key(
+            "http_request_duration_seconds_count", HTTP_REQUEST_DURATION.labelnames,
+            ("GET", "/fail", "500"),
+        )
+        before = _total(count_key)
+        async with AsyncClient(
+            transport=ASGITransport(app=_metrics_app(), raise_app_exceptions=False),
+            base_url="http://test",
+        ) as test_client:
+            await test_client.get("/fail")
+
+        assert _total(count_key) == before + 1
+        in_flight = _sample_key(
+            "http_requests_in_progress", HTTP_REQUESTS_IN_PROGRESS.labelnames, ("GET",),
+        )
+        assert REGISTRY.gauge_values()[in_flight] == 0
+
+    def test__record__outside_a_request_is_ignored(self) -> None:
+        """Background work (no request) is not counted anywhere."""
+        assert current_request_counts() is None
+        record_db_statement()
+        record_redis_command()
+        assert current_request_counts() is None
+
+
+class TestMetricsExporter:
+    """Tests for flushing to and collecting from Redis."""
+
+    async def test__collect__without_redis_renders_local_samples(self) -> None:
+        """With Redis unavailable, this worker's samples are rendered and kept pending."""
+        registry = MetricsRegistry()
+        counter = Counter("local_total", "Local.", registry=registry)
+        counter.inc()
+        exporter = MetricsExporter(RedisClient("redis://unused", enabled=False), registry)
+
+        body = await exporter.collect()
+
+        assert "local_total 1" in body
+        assert registry.take_pending() == {"local_total": 1.0}
+
+    async def test__collect__sums_workers(self, redis_client: RedisClient) -> None:
+        """Totals and gauges from several workers are summed."""
+        registry_a, registry_b = MetricsRegistry(), MetricsRegistry()
+        for registry in (registry_a, registry_b):
+            Counter("requests_total", "Requests.", registry=registry).inc(amount=2)
+            Gauge("busy", "Busy.", registry=registry).set(1)
+        worker_a = MetricsExporter(redis_client, registry_a, worker_id="a")
+        worker_b = MetricsExporter(redis_client, registry_b, worker_id="b")
+
+        assert await worker_b.flush()
+        body = await worker_a.collect()
+
+        assert "requests_total 4" in body
+        assert "busy 2" in body
+        assert registry_a.take_pending() == {}
+
+    async def test__flush__adds_deltas_once(self, redis_client: RedisClient) -> None:
+        """A second flush without new samples adds nothing."""
+        registry = MetricsRegistry()
+        Counter("once_total", "Once.", registry=registry).inc()
+        exporter = MetricsExporter(redis_client, registry, worker_id="w")
+
+        await exporter.flush()
+        await exporter.flush()
+
+        totals = await redis_client.hgetall(TOTALS_KEY)
+        assert float(totals["once_total"]) == 1
+        assert await redis_client.scan_keys(f"{GAUGES_KEY_PREFIX}*") == []
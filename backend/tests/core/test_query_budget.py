@@ -0,0 +1,182 @@
+"""Tests for per-request query tracking, budgets and N+1 detection."""
+import logging
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import get_settings
+from core.query_budget import (
+    QueryBudgetExceededError,
+    QueryTracker,
+    check_query_budget,
+    current_query_tracker,
+    normalize_sql,
+    query_budget,
+    report_repeated_queries,
+    track_queries,
+)
+
+
+class TestNormalizeSql:
+    """Tests for reducing statements to their shape."""
+
+    def test__normalize_sql__replaces_literals_and_parameters(self) -> None:
+        """String/number literals and bind parameters become `?`."""
+        sql = "SELECT * FROM notes\n  WHERE user_id = $1 AND title = 'it''s' LIMIT 20"
+        assert normalize_sql(sql) == "SELECT * FROM notes WHERE user_id = ? AND title = ? LIMIT ?"
+
+    def test__normalize_sql__keeps_identifiers_with_digits(self) -> None:
+        """Digits inside identifiers are not literals."""
+        sql = "SELECT anon_1.id, t2.name FROM anon_1 JOIN t2 ON t2.id = %(id_1)s"
+        assert normalize_sql(sql) == "SELECT anon_1.id, t2.name FROM anon_1 JOIN t2 ON t2.id = ?"
+
+    def test__normalize_sql__collapses_in_lists_of_any_length(self) -> None:
+        """The same IN query with 1 or 3 ids normalizes to the same string."""
+        one = normalize_sql("SELECT * FROM tags WHERE id IN ($1)")
+        three = normalize_sql("SELECT * FROM tags WHERE id IN ($1, $2, $3)")
+        assert one == three == "SELECT * FROM tags WHERE id IN (...)"
+
+    def test__normalize_sql__collapses_multi_row_values(self) -> None:
+        """Multi-row VALUES collapse to a single group."""
+        sql = "INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4), ($5, $6)"
+        assert normalize_sql(sql) == "INSERT INTO t (a, b) VALUES (...)"
+
+
+class TestQueryTracker:
+    """Tests for recording statements."""
+
+    def test__track_queries__nested_trackers_both_record(self) -> None:
+        """A statement recorded in an inner tracker also counts in the outer one."""
+        with track_queries() as outer:
+            current_query_tracker().record("SELECT ?", 0.001)
+            with track_queries() as inner:
+                current_query_tracker().record("SELECT ?", 0.002)
+            assert current_query_tracker() is outer
+
+        assert current_query_tracker() is None
+        assert (outer.count, inner.count) == (2, 1)
+        assert outer.total_seconds == pytest.approx(0.003)
+
+    def test__repeated__returns_statements_at_or_over_threshold(self) -> None:
+        """Statements repeated `threshold` times are reported, most repeated first."""
+        with track_queries() as tracker:
+            for _ in range(3):
+                tracker.record("SELECT tags WHERE id = ?", 0.0)
+            for _ in range(4):
+                tracker.record("SELECT users WHERE id = ?", 0.0)
+            tracker.record("SELECT notes", 0.0)
+
+        assert tracker.repeated(threshold=3) == {
+            "SELECT users WHERE id = ?": 4,
+            "SELECT tags WHERE id = ?": 3,
+        }
+
+    def test__summary__lists_most_executed_statements(self) -> None:
+        """The summary has one line per statement with count and total time."""
+        with track_queries() as tracker:
+            tracker.record("SELECT a", 0.001)
+            tracker.record("SELECT a", 0.001)
+            tracker.record("SELECT b", 0.0005)
+
+        assert tracker.summary() == "  2x 2.0ms SELECT a\n  1x 0.5ms SELECT b"
+
+    async def test__engine_events__record_normalized_statements(
+        self, db_session: AsyncSession,
+    ) -> None:
+        """Statements on any engine are recorded while a tracker is active."""
+        await db_session.execute(text("SELECT 1"))
+        with track_queries() as tracker:
+            await db_session.execute(text("SELECT :n"), {"n": 1})
+            await db_session.execute(text("SELECT :n"), {"n": 2})
+        await db_session.execute(text("SELECT 1"))
+
+        assert tracker.count == 2
+        assert [record.sql for record in tracker.statements] == ["SELECT ?", "SELECT ?"]
+        assert all(record.duration >= 0 for record in tracker.statements)
+
+
+class TestCheckQueryBudget:
+    """Tests for budget enforcement modes."""
+
+    def _tracker_with(self, count: int) -> QueryTracker:
+        with track_queries() as tracker:
+            for _ in range(count):
+                tracker.record("SELECT ?", 0.0)
+        return tracker
+
+    def test__check_query_budget__within_budget_passes(self) -> None:
+        """At or under the budget nothing happens in any mode."""
+        check_query_budget(self._tracker_with(3), 3, "raise", "GET /x")
+
+    def test__check_query_budget__raise_mode_raises_with_statements(self) -> None:
+        """Over budget in raise mode raises, naming the route and the statements."""
+        with pytest.raises(QueryBudgetExceededError, match=r"GET /x ran 4 SQL statements \(budget 3\)"):
+            check_query_budget(self._tracker_with(4), 3, "raise", "GET /x")
+
+    def test__check_query_budget__log_mode_warns(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Over budget in log mode logs a warning instead."""
+        with caplog.at_level(logging.WARNING, logger="core.query_budget"):
+            check_query_budget(self._tracker_with(4), 3, "log", "GET /x")
+        assert "Query budget exceeded" in caplog.text
+        assert "4x" in caplog.text
+
+    def test__check_query_budget__off_mode_ignores(self) -> None:
+        """Off mode never raises."""
+        check_query_budget(self._tracker_with(4), 3, "off", "GET /x")
+
+    def test__report_repeated_queries__logs_n_plus_one(
+        self, caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """A statement repeated per item is logged as a possible N+1."""
+        with caplog.at_level(logging.WARNING, logger="core.query_budget"):
+            report_repeated_queries(self._tracker_with(10))
+        assert "Possible N+1 queries" in caplog.text
+        assert "10x SELECT ?" in caplog.text
+
+
+def _budget_app(mode: str) -> FastAPI:
+    """App whose route 'runs' `n` statements against a budget of 2."""
+    api = FastAPI()
+    settings = get_settings().model_copy(update={"query_budget_mode": mode})
+    api.dependency_overrides[get_settings] = lambda: settings
+
+    @api.get("/items/{n}", dependencies=[Depends(query_budget(2))])
+    async def items(n: int) -> dict:
+        tracker = current_query_tracker()
+        for _ in range(n):
+            if tracker is not None:
+                tracker.record("SELECT * FROM items WHERE id = ?", 0.0)
+        return {"n": n}
+
+    return api
+
+
+class TestQueryBudgetDependency:
+    """Tests for the route-level query_budget dependency."""
+
+    async def test__query_budget__within_budget_succeeds(self) -> None:
+        """A request within its budget is unaffected."""
+        async with AsyncClient(
+            transport=ASGITransport(app=_budget_app("raise")), base_url="http://test",
+        ) as test_client:
+            response = await test_client.get("/items/2")
+        assert response.status_code == 200
+
+    async def test__query_budget__raise_mode_fails_request(self) -> None:
+        """Over budget in raise mode surfaces QueryBudgetExceededError with the route template."""
+        async with AsyncClient(
+            transport=ASGITransport(app=_budget_app("raise")), base_url="http://test",
+        ) as test_client:
+            with pytest.raises(QueryBudgetExceededError, match=r"GET /items/\{n\} ran 3"):
+                await test_client.get("/items/3")
+
+    async def test__query_budget__off_mode_does_not_track(self) -> None:
+        """With tracking off the route runs without a tracker."""
+        async with AsyncClient(
+            transport=ASGITransport(app=_budget_app("off")), base_url="http://test",
+        ) as test_client:
+            response = await test_client.get("/items/10")
+        assert response.status_code == 200
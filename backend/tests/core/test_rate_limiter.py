@@ -58,25 +58,15 @@ class TestCheckRateLimit:
         assert result.remaining >= 0
 
     async def test__check__blocks_request_over_limit(
-        self, redis_client: RedisClient,
+        self, redis_client: RedisClient,  # noqa: ARG002
     ) -> None:
         """Requests over the limit are blocked."""
         user_id = uuid4()
         limit = FREE_LIMITS.rate_read_per_minute
 
-        # Fill up the limit by manually adding entries via sliding window
-        key = f"rate:{user_id}:read:min"
-        now = int(time.time())
-        for i in range(limit):
-            await redis_client.evalsha(
-                redis_client.sliding_window_sha,
-                1,
-                key,
-                now,
-                60,
-                limit,
-                f"test-{i}",
-            )
+        # Use up the whole per-minute burst
+        for _ in range(limit):
+            assert (await check_rate_limit(user_id, OperationType.READ, Tier.FREE)).allowed
 
         # Next request should be blocked
         result = await check_rate_limit(
@@ -89,6 +79,52 @@ class TestCheckRateLimit:
         assert result.remaining == 0
         assert result.retry_after > 0
 
+    async def test__check__minute_window_is_single_o1_key(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """The per-minute state is one string key, regardless of request count."""
+        user_id = uuid4()
+
+        for _ in range(5):
+            await check_rate_limit(user_id, OperationType.READ, Tier.FREE)
+
+        key = f"rate:{user_id}:read:gcra"
+        assert await redis_client._client.type(key) == b"string"
+        assert await redis_client.ttl(key) is not None
+
+    async def test__check__refills_gradually_after_burst(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """Once the burst is spent, one request frees up every window/limit seconds."""
+        user_id = uuid4()
+        limit = FREE_LIMITS.rate_read_per_minute
+        interval_ms = 60_000 / limit
+        # Drained bucket whose next slot opened a moment ago
+        now_ms = int(time.time() * 1000)
+        await redis_client.setex(
+            f"rate:{user_id}:read:gcra", 60, str(now_ms + 60_000 - interval_ms - 50),
+        )
+
+        first = await check_rate_limit(user_id, OperationType.READ, Tier.FREE)
+        second = await check_rate_limit(user_id, OperationType.READ, Tier.FREE)
+
+        assert first.allowed is True
+        assert first.remaining == 0
+        assert second.allowed is False
+        assert 0 < second.retry_after <= interval_ms / 1000 + 1
+
+    async def test__check__denied_request_consumes_no_quota(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """A request denied per minute does not count against the daily pool."""
+        user_id = uuid4()
+        limit = FREE_LIMITS.rate_read_per_minute
+
+        for _ in range(limit + 5):
+            await check_rate_limit(user_id, OperationType.READ, Tier.FREE)
+
+        assert await redis_client.get(f"rate:{user_id}:daily:general") == str(limit).encode()
+
     async def test__check__different_users_have_separate_limits(
         self, redis_client: RedisClient,  # noqa: ARG002
     ) -> None:
@@ -178,18 +214,9 @@ class TestDailyLimits:
         user_id = uuid4()
         daily_limit = FREE_LIMITS.rate_read_per_day
 
-        # Pre-fill the daily limit directly using the fixed window key
+        # Exhaust the daily limit by setting the fixed window counter directly
         daily_key = f"rate:{user_id}:daily:general"
-
-        # Exhaust daily limit by incrementing counter
-        for _ in range(daily_limit):
-            await redis_client.evalsha(
-                redis_client.fixed_window_sha,
-                1,
-                daily_key,
-                daily_limit,
-                86400,
-            )
+        await redis_client.setex(daily_key, 86400, str(daily_limit))
 
         # The per-minute limit should still have room (we haven't used it)
         # But daily limit is exhausted, so request should be blocked
@@ -215,14 +242,7 @@ class TestDailyLimits:
 
         # Exhaust the general daily pool (READ/WRITE share this)
         general_key = f"rate:{user_id}:daily:general"
-        for _ in range(daily_limit):
-            await redis_client.evalsha(
-                redis_client.fixed_window_sha,
-                1,
-                general_key,
-                daily_limit,
-                86400,
-            )
+        await redis_client.setex(general_key, 86400, str(daily_limit))
 
         # READ should be blocked (uses general pool)
         read_result = await check_rate_limit(
@@ -249,14 +269,7 @@ class TestDailyLimits:
 
         # Exhaust the sensitive daily pool
         sensitive_key = f"rate:{user_id}:daily:sensitive"
-        for _ in range(sensitive_daily_limit):
-            await redis_client.evalsha(
-                redis_client.fixed_window_sha,
-                1,
-                sensitive_key,
-                sensitive_daily_limit,
-                86400,
-            )
+        await redis_client.setex(sensitive_key, 86400, str(sensitive_daily_limit))
 
         # SENSITIVE should be blocked
         sensitive_result = await check_rate_limit(
@@ -300,14 +313,7 @@ class TestDailyLimits:
 
         # Exhaust general daily pool
         general_key = f"rate:{user_id}:daily:general"
-        for _ in range(daily_limit):
-            await redis_client.evalsha(
-                redis_client.fixed_window_sha,
-                1,
-                general_key,
-                daily_limit,
-                86400,
-            )
+        await redis_client.setex(general_key, 86400, str(daily_limit))
 
         # WRITE should be blocked (shares general pool with READ)
         write_result = await check_rate_limit(
@@ -385,11 +391,8 @@ class TestRateLimiterFallback:
 
         This handles the edge case where Redis connects but script loading fails.
         """
-        original_sliding = redis_client._sliding_window_sha
-        original_fixed = redis_client._fixed_window_sha
-
-        redis_client._sliding_window_sha = None
-        redis_client._fixed_window_sha = None
+        original_sha = redis_client._rate_limit_sha
+        redis_client._rate_limit_sha = None
 
         try:
             result = await check_rate_limit(
@@ -400,5 +403,4 @@ class TestRateLimiterFallback:
 
             assert result.allowed is True
         finally:
-            redis_client._sliding_window_sha = original_sliding
-            redis_client._fixed_window_sha = original_fixed
+            redis_client._rate_limit_sha = original_sha
@@ -22,77 +22,65 @@ class TestRedisLuaScripts:
         self, redis_client: RedisClient,
     ) -> None:
         """Lua scripts are loaded when connecting."""
-        assert redis_client.sliding_window_sha is not None
-        assert redis_client.fixed_window_sha is not None
+        assert redis_client.rate_limit_sha is not None
 
-    async def test__evalsha__sliding_window_script(
+    async def test__evalsha__rate_limit_script_minute_window(
         self, redis_client: RedisClient,
     ) -> None:
-        """Sliding window Lua script works correctly."""
-        key = "test:sliding"
-        now = int(time.time())
-        window = 60  # 1 minute
+        """The per-minute GCRA admits a burst of `limit`, then denies."""
+        now_ms = int(time.time() * 1000)
         limit = 3
 
         # Make 3 requests - all should be allowed
         for i in range(3):
             result = await redis_client.evalsha(
-                redis_client.sliding_window_sha,
-                1,
-                key,
-                now + i,  # Slightly different timestamps
-                window,
+                redis_client.rate_limit_sha,
+                2,
+                "test:minute",
+                "test:day",
+                now_ms + i,  # Slightly different timestamps
                 limit,
-                str(uuid.uuid4()),
+                60_000,
+                100,
+                86400,
             )
             assert result[0] == 1  # allowed
-            assert result[1] == limit - i - 1  # remaining (2, 1, 0)
+            assert result[1] == 0  # not limited
+            assert result[2] == limit - i - 1  # remaining (2, 1, 0)
 
-        # 4th request should be denied
+        # 4th request should be denied by the minute window
         result = await redis_client.evalsha(
-            redis_client.sliding_window_sha,
-            1,
-            key,
-            now + 3,
-            window,
-            limit,
-            str(uuid.uuid4()),
+            redis_client.rate_limit_sha,
+            2, "test:minute", "test:day", now_ms + 3, limit, 60_000, 100, 86400,
         )
         assert result[0] == 0  # denied
-        assert result[1] == 0  # remaining
-        assert result[2] > 0  # retry_after
+        assert result[1] == 1  # limited per minute
+        assert result[2] == 0  # remaining
+        assert result[3] > 0  # retry_after
+        # The denied request consumed no daily quota
+        assert await redis_client.get("test:day") == b"3"
 
-    async def test__evalsha__fixed_window_script(
+    async def test__evalsha__rate_limit_script_day_window(
         self, redis_client: RedisClient,
     ) -> None:
-        """Fixed window Lua script works correctly."""
-        key = "test:fixed"
-        limit = 3
-        window = 60
+        """The daily counter denies once exhausted, with the key's TTL as retry_after."""
+        now_ms = int(time.time() * 1000)
+        day_limit = 2
 
-        # Make 3 requests - all should be allowed
-        for i in range(3):
+        for _ in range(day_limit):
             result = await redis_client.evalsha(
-                redis_client.fixed_window_sha,
-                1,
-                key,
-                limit,
-                window,
+                redis_client.rate_limit_sha,
+                2, "test:minute", "test:day", now_ms, 100, 60_000, day_limit, 86400,
             )
-            assert result[0] == 1  # allowed
-            assert result[1] == limit - i - 1  # remaining
+            assert result[0] == 1
 
-        # 4th request should be denied
         result = await redis_client.evalsha(
-            redis_client.fixed_window_sha,
-            1,
-            key,
-            limit,
-            window,
+            redis_client.rate_limit_sha,
+            2, "test:minute", "test:day", now_ms, 100, 60_000, day_limit, 86400,
         )
         assert result[0] == 0  # denied
-        assert result[1] == 0  # remaining
-        assert result[3] > 0  # retry_after
+        assert result[1] == 2  # limited daily
+        assert 0 < result[3] <= 86400  # retry_after
 
 
 class TestRedisClientDisabled:
@@ -256,13 +244,10 @@ class TestRedisOperationFailures:
 class TestNoScriptErrorHandling:
     """Tests for NOSCRIPT error handling (script reload after Redis restart)."""
 
-    async def test__eval_sliding_window__reloads_on_noscript(
+    async def test__eval_rate_limit__reloads_on_noscript(
         self, redis_client: RedisClient,
     ) -> None:
-        """Sliding window reloads scripts on NOSCRIPT error and retries."""
-        key = "test:noscript:sliding"
-        now = int(time.time())
-
+        """Rate limit script reloads on NOSCRIPT error and retries."""
         # First call raises NOSCRIPT, simulating Redis restart
         call_count = 0
         original_evalsha = redis_client._client.evalsha
@@ -275,48 +260,14 @@ class TestNoScriptErrorHandling:
             return await original_evalsha(*args, **kwargs)
 
         with patch.object(redis_client._client, "evalsha", side_effect=mock_evalsha):
-            result = await redis_client.eval_sliding_window(
-                key=key,
-                now=now,
-                window_seconds=60,
-                max_requests=10,
-                request_id="test-uuid",
-            )
+            result = await redis_client.eval_rate_limit(**_rate_limit_args("test:noscript"))
 
         # Should succeed after reload and retry
         assert result is not None
         assert result[0] == 1  # allowed
         assert call_count == 2  # First call failed, second succeeded
 
-    async def test__eval_fixed_window__reloads_on_noscript(
-        self, redis_client: RedisClient,
-    ) -> None:
-        """Fixed window reloads scripts on NOSCRIPT error and retries."""
-        key = "test:noscript:fixed"
-
-        call_count = 0
-        original_evalsha = redis_client._client.evalsha
-
-        async def mock_evalsha(*args: object, **kwargs: object) -> list[int]:
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                raise NoScriptError("NOSCRIPT No matching script")
-            return await original_evalsha(*args, **kwargs)
-
-        with patch.object(redis_client._client, "evalsha", side_effect=mock_evalsha):
-            result = await redis_client.eval_fixed_window(
-                key=key,
-                max_requests=10,
-                window_seconds=60,
-            )
-
-        # Should succeed after reload and retry
-        assert result is not None
-        assert result[0] == 1  # allowed
-        assert call_count == 2
-
-    async def test__eval_sliding_window__returns_none_if_retry_fails(
+    async def test__eval_rate_limit__returns_none_if_retry_fails(
         self, redis_client: RedisClient,
     ) -> None:
         """Returns None if retry also fails after reload."""
@@ -326,126 +277,42 @@ class TestNoScriptErrorHandling:
             side_effect=NoScriptError("NOSCRIPT No matching script"),
         ):
             # Script reload will work but evalsha keeps failing
-            result = await redis_client.eval_sliding_window(
-                key="test:fail",
-                now=int(time.time()),
-                window_seconds=60,
-                max_requests=10,
-                request_id="test-uuid",
-            )
+            result = await redis_client.eval_rate_limit(**_rate_limit_args("test:fail"))
 
         # Should return None after retry fails
         assert result is None
 
-    async def test__eval_fixed_window__returns_none_if_retry_fails(
-        self, redis_client: RedisClient,
-    ) -> None:
-        """Returns None if retry also fails after reload."""
-        with patch.object(
-            redis_client._client, "evalsha",
-            new_callable=AsyncMock,
-            side_effect=NoScriptError("NOSCRIPT No matching script"),
-        ):
-            result = await redis_client.eval_fixed_window(
-                key="test:fail",
-                max_requests=10,
-                window_seconds=60,
-            )
-
-        assert result is None
-
-    async def test__eval_sliding_window__returns_none_when_not_connected(
+    async def test__eval_rate_limit__returns_none_when_not_connected(
         self,
     ) -> None:
         """Returns None when client is not connected."""
         client = RedisClient("redis://localhost:6379", enabled=False)
         await client.connect()
 
-        result = await client.eval_sliding_window(
-            key="test:key",
-            now=int(time.time()),
-            window_seconds=60,
-            max_requests=10,
-            request_id="test-uuid",
-        )
-
-        assert result is None
-        await client.close()
-
-    async def test__eval_fixed_window__returns_none_when_not_connected(
-        self,
-    ) -> None:
-        """Returns None when client is not connected."""
-        client = RedisClient("redis://localhost:6379", enabled=False)
-        await client.connect()
-
-        result = await client.eval_fixed_window(
-            key="test:key",
-            max_requests=10,
-            window_seconds=60,
-        )
+        result = await client.eval_rate_limit(**_rate_limit_args("test:key"))
 
         assert result is None
         await client.close()
 
 
 class TestEvalScriptMethods:
-    """Tests for the new eval_sliding_window and eval_fixed_window methods."""
+    """Tests for the eval_rate_limit method."""
 
-    async def test__eval_sliding_window__works_correctly(
+    async def test__eval_rate_limit__works_correctly(
         self, redis_client: RedisClient,
     ) -> None:
-        """Sliding window method works correctly."""
-        key = "test:eval:sliding"
-        now = int(time.time())
+        """Rate limit method works correctly."""
+        args = _rate_limit_args("test:eval", minute_limit=3)
 
         # Make 3 requests - all should be allowed
         for i in range(3):
-            result = await redis_client.eval_sliding_window(
-                key=key,
-                now=now + i,
-                window_seconds=60,
-                max_requests=3,
-                request_id=str(uuid.uuid4()),
-            )
-            assert result is not None
-            assert result[0] == 1  # allowed
-            assert result[1] == 3 - i - 1  # remaining
-
-        # 4th request should be denied
-        result = await redis_client.eval_sliding_window(
-            key=key,
-            now=now + 3,
-            window_seconds=60,
-            max_requests=3,
-            request_id=str(uuid.uuid4()),
-        )
-        assert result is not None
-        assert result[0] == 0  # denied
-
-    async def test__eval_fixed_window__works_correctly(
-        self, redis_client: RedisClient,
-    ) -> None:
-        """Fixed window method works correctly."""
-        key = "test:eval:fixed"
-
-        # Make 3 requests - all should be allowed
-        for i in range(3):
-            result = await redis_client.eval_fixed_window(
-                key=key,
-                max_requests=3,
-                window_seconds=60,
-            )
+            result = await redis_client.eval_rate_limit(**args)
             assert result is not None
             assert result[0] == 1  # allowed
-            assert result[1] == 3 - i - 1  # remaining
+            assert result[2] == 3 - i - 1  # remaining
 
         # 4th request should be denied
-        result = await redis_client.eval_fixed_window(
-            key=key,
-            max_requests=3,
-            window_seconds=60,
-        )
+        result = await redis_client.eval_rate_limit(**args)
         assert result is not None
         assert result[0] == 0  # denied
 
@@ -503,3 +370,16 @@ class TestRedisTTL:
         disabled = RedisClient(url="redis://localhost:6379", enabled=False)
         result = await disabled.ttl("any-key")
         assert result is None
+
+
+def _rate_limit_args(prefix: str, minute_limit: int = 10) -> dict[str, object]:
+    """Keyword arguments for eval_rate_limit with generous daily quota."""
+    return {
+        "minute_key": f"{prefix}:minute",
+        "day_key": f"{prefix}:day",
+        "now_ms": int(time.time() * 1000),
+        "minute_limit": minute_limit,
+        "minute_window_ms": 60_000,
+        "day_limit": 1000,
+        "day_window_seconds": 86400,
+    }
@@ -160,19 +160,19 @@ class TestRateLimitEnforcement:
         user_id = user_response.json()["id"]
 
         # Now pre-fill the remaining slots (we already used 1)
-        now = int(time.time())
-        key = f"rate:{user_id}:sensitive:min"
+        now_ms = int(time.time() * 1000)
+        key = f"rate:{user_id}:sensitive:gcra"
 
         # Fill up the remaining slots (limit - 1 we already used)
-        for i in range(limit - 1):
-            await redis_client.evalsha(
-                redis_client.sliding_window_sha,
-                1,
-                key,
-                now,
-                60,  # window
-                limit,
-                f"prefill-{i}",  # unique request ID
+        for _ in range(limit - 1):
+            await redis_client.eval_rate_limit(
+                minute_key=key,
+                day_key=f"rate:{user_id}:daily:sensitive",
+                now_ms=now_ms,
+                minute_limit=limit,
+                minute_window_ms=60_000,
+                day_limit=TEST_USER_LIMITS.rate_sensitive_per_day,
+                day_window_seconds=86400,
             )
 
         return user_id
@@ -308,31 +308,29 @@ class TestRateLimitUserIsolation:
         verifies isolation by checking different user_id keys in Redis directly.
         """
         limit = TEST_USER_LIMITS.rate_sensitive_per_minute
-        now = int(time.time())
+        now_ms = int(time.time() * 1000)
 
         # Pre-fill user 100's bucket to the limit
-        key_user_100 = "rate:100:sensitive:min"
-        for i in range(limit):
-            await redis_client.evalsha(
-                redis_client.sliding_window_sha,
-                1,
-                key_user_100,
-                now,
-                60,
-                limit,
-                f"user100-{i}",
+        for _ in range(limit):
+            await redis_client.eval_rate_limit(
+                minute_key="rate:100:sensitive:gcra",
+                day_key="rate:100:daily:sensitive",
+                now_ms=now_ms,
+                minute_limit=limit,
+                minute_window_ms=60_000,
+                day_limit=TEST_USER_LIMITS.rate_sensitive_per_day,
+                day_window_seconds=86400,
             )
 
         # User 200's bucket should still have room
-        key_user_200 = "rate:200:sensitive:min"
-        result = await redis_client.evalsha(
-            redis_client.sliding_window_sha,
-            1,
-            key_user_200,
-            now,
-            60,
-            limit,
-            "user200-first",
+        result = await redis_client.eval_rate_limit(
+            minute_key="rate:200:sensitive:gcra",
+            day_key="rate:200:daily:sensitive",
+            now_ms=now_ms,
+            minute_limit=limit,
+            minute_window_ms=60_000,
+            day_limit=TEST_USER_LIMITS.rate_sensitive_per_day,
+            day_window_seconds=86400,
         )
 
         # result[0] = allowed (1 or 0)
@@ -361,17 +359,17 @@ class TestRateLimitDevModeBypass:
         user_id = user_response.json()["id"]
 
         # Pre-fill the rate limit bucket to simulate exceeded limit
-        now = int(time.time())
-        key = f"rate:{user_id}:sensitive:min"
-        for i in range(limit + 10):  # Fill way past the limit
-            await redis_client.evalsha(
-                redis_client.sliding_window_sha,
-                1,
-                key,
-                now,
-                60,
-                limit,
-                f"prefill-{i}",
+        now_ms = int(time.time() * 1000)
+        key = f"rate:{user_id}:sensitive:gcra"
+        for _ in range(limit + 10):  # Fill way past the limit
+            await redis_client.eval_rate_limit(
+                minute_key=key,
+                day_key=f"rate:{user_id}:daily:sensitive",
+                now_ms=now_ms,
+                minute_limit=limit,
+                minute_window_ms=60_000,
+                day_limit=TEST_USER_LIMITS.rate_sensitive_per_day,
+                day_window_seconds=86400,
             )
 
         # In dev mode, request should still succeed (rate limiting bypassed)
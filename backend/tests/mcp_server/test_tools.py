@@ -1790,3 +1790,70 @@ async def test__create_relationship__not_found_raises_error(
 
     assert result.is_error
     assert "not found" in result.content[0].text.lower()
+
+
+# --- get_relationship_graph tests ---
+
+
+async def test__get_relationship_graph__success(
+    mock_api,
+    mcp_client: Client,
+    sample_relationship: dict[str, Any],
+) -> None:
+    """Test get_relationship_graph passes depth and returns the graph."""
+    graph = {
+        "root_type": "bookmark",
+        "root_id": sample_relationship["source_id"],
+        "depth": 3,
+        "nodes": [
+            {"content_type": "bookmark", "content_id": sample_relationship["source_id"], "depth": 0},
+            {"content_type": "note", "content_id": sample_relationship["target_id"], "depth": 1},
+        ],
+        "edges": [sample_relationship],
+        "truncated": False,
+    }
+    route = mock_api.get(
+        f"/relationships/graph/bookmark/{sample_relationship['source_id']}",
+    ).mock(return_value=Response(200, json=graph))
+
+    result = await mcp_client.call_tool("get_relationship_graph", {
+        "id": sample_relationship["source_id"],
+        "type": "bookmark",
+        "depth": 3,
+    })
+
+    assert route.calls[0].request.url.params["depth"] == "3"
+    assert len(result.data["nodes"]) == 2
+    assert result.data["edges"][0]["id"] == sample_relationship["id"]
+
+
+async def test__get_relationship_graph__depth_out_of_range(
+    mock_api,  # noqa: ARG001 - needed to reset HTTP client
+    mcp_client: Client,
+) -> None:
+    """Test get_relationship_graph rejects depth above the API maximum."""
+    result = await mcp_client.call_tool("get_relationship_graph", {
+        "id": "550e8400-e29b-41d4-a716-446655440001",
+        "type": "note",
+        "depth": 4,
+    }, raise_on_error=False)
+
+    assert result.is_error
+
+
+async def test__get_relationship_graph__api_unavailable(
+    mock_api,
+    mcp_client: Client,
+) -> None:
+    """Test get_relationship_graph reports network errors."""
+    mock_api.get("/relationships/graph/note/550e8400-e29b-41d4-a716-446655440001").mock(
+        side_effect=httpx.ConnectError("Connection refused"),
+    )
+
+    result = await mcp_client.call_tool("get_relationship_graph", {
+        "id": "550e8400-e29b-41d4-a716-446655440001",
+        "type": "note",
+    }, raise_on_error=False)
+
+    assert result.is_error
+    assert "unavailable" in result.content[0].text.lower()
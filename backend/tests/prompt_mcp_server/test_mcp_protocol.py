@@ -106,22 +106,24 @@ async def test__list_prompts__includes_arguments(
     assert result.prompts[0].arguments[1].name == "code"
 
 
-async def test__list_prompts__uses_limit_100_and_offset_0(
+async def test__list_prompts__uses_limit_100_and_skips_total(
     mock_api,
     mock_auth,  # noqa: ARG001 - needed for side effect
     mcp_client: Client,
     sample_prompt_list: dict[str, Any],
 ) -> None:
-    """Test list_prompts uses limit=100 and offset=0 by default."""
+    """Test list_prompts uses limit=100, no cursor, and skips the total count."""
     mock_api.get("/prompts/").mock(
         return_value=Response(200, json=sample_prompt_list),
     )
 
     await mcp_client.session.list_prompts()
 
-    url = str(mock_api.calls[0].request.url)
-    assert "limit=100" in url
-    assert "offset=0" in url
+    params = mock_api.calls[0].request.url.params
+    assert params["limit"] == "100"
+    assert params["include_total"] == "false"
+    assert "cursor" not in params
+    assert "offset" not in params
 
 
 async def test__list_prompts__returns_next_cursor_when_has_more(
@@ -129,13 +131,14 @@ async def test__list_prompts__returns_next_cursor_when_has_more(
     mock_auth,  # noqa: ARG001 - needed for side effect
     mcp_client: Client,
 ) -> None:
-    """Test list_prompts returns nextCursor when has_more=True."""
+    """Test list_prompts forwards the API's next_cursor when has_more=True."""
     response_with_more = {
         "items": [{"name": "prompt-1", "arguments": []}],
-        "total": 150,
+        "total": None,
         "offset": 0,
         "limit": 100,
         "has_more": True,
+        "next_cursor": "opaque-token",
     }
     mock_api.get("/prompts/").mock(
         return_value=Response(200, json=response_with_more),
@@ -143,43 +146,48 @@ async def test__list_prompts__returns_next_cursor_when_has_more(
 
     result = await mcp_client.session.list_prompts()
 
-    assert result.nextCursor == "100"  # Next page starts at offset 100
+    assert result.nextCursor == "opaque-token"
 
 
-async def test__list_prompts__uses_cursor_as_offset(
+async def test__list_prompts__passes_cursor_to_api(
     mock_api,
     mock_auth,  # noqa: ARG001 - needed for side effect
     mcp_client: Client,
 ) -> None:
-    """Test list_prompts uses cursor value as offset parameter."""
+    """Test list_prompts passes the MCP cursor through as the API keyset cursor."""
     response = {
         "items": [{"name": "prompt-101", "arguments": []}],
-        "total": 150,
-        "offset": 100,
+        "total": None,
+        "offset": 0,
         "limit": 100,
         "has_more": False,
+        "next_cursor": None,
     }
     mock_api.get("/prompts/").mock(
         return_value=Response(200, json=response),
     )
 
-    result = await mcp_client.session.list_prompts(cursor="100")
+    result = await mcp_client.session.list_prompts(cursor="opaque-token")
 
-    # Verify offset=100 was passed to API
-    url = str(mock_api.calls[0].request.url)
-    assert "offset=100" in url
+    params = mock_api.calls[0].request.url.params
+    assert params["cursor"] == "opaque-token"
+    assert "offset" not in params
     # No more pages
     assert result.nextCursor is None
 
 
 async def test__list_prompts__invalid_cursor_returns_error(
-    mock_api,  # noqa: ARG001 - needed for fixture
+    mock_api,
     mock_auth,  # noqa: ARG001 - needed for side effect
     mcp_client: Client,
 ) -> None:
-    """Test list_prompts returns error for invalid cursor."""
+    """Test list_prompts returns error when the API rejects the cursor."""
+    mock_api.get("/prompts/").mock(
+        return_value=Response(400, json={"detail": "Invalid cursor"}),
+    )
+
     with pytest.raises(McpError) as exc_info:
-        await mcp_client.session.list_prompts(cursor="not-a-number")
+        await mcp_client.session.list_prompts(cursor="not-a-cursor")
 
     assert "Invalid cursor" in str(exc_info.value)
 
@@ -67,10 +67,10 @@ class TestURLValidation:
         "http://localhost.localdomain/",
         "https://localhost/",
     ])
-    def test__validate_url__blocks_localhost(self, url: str) -> None:
+    async def test__validate_url__blocks_localhost(self, url: str) -> None:
         """Localhost URLs are blocked."""
         with pytest.raises(SSRFBlockedError) as exc_info:
-            validate_url_not_private(url)
+            await validate_url_not_private(url)
         assert "localhost" in str(exc_info.value).lower()
 
     @pytest.mark.parametrize("url", [
@@ -80,18 +80,18 @@ class TestURLValidation:
         "http://192.168.1.1/router",
         "http://172.16.0.1/private",
     ])
-    def test__validate_url__blocks_private_ips(self, url: str) -> None:
+    async def test__validate_url__blocks_private_ips(self, url: str) -> None:
         """Private IP URLs are blocked."""
         with pytest.raises(SSRFBlockedError) as exc_info:
-            validate_url_not_private(url)
+            await validate_url_not_private(url)
         assert "private" in str(exc_info.value).lower() or "internal" in str(exc_info.value).lower()
 
-    def test__validate_url__allows_public_urls(self) -> None:
+    async def test__validate_url__allows_public_urls(self) -> None:
         """Public URLs are allowed."""
         # Should not raise
-        validate_url_not_private("https://example.com/")
-        validate_url_not_private("https://www.google.com/")
-        validate_url_not_private("https://api.github.com/")
+        await validate_url_not_private("https://example.com/")
+        await validate_url_not_private("https://www.google.com/")
+        await validate_url_not_private("https://api.github.com/")
 
 
 class TestFetchURLSSRFProtection:
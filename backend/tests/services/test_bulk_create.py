@@ -0,0 +1,313 @@
+"""Tests for set-based bulk creation (BaseEntityService.create_many)."""
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.request_context import AuthType, RequestContext
+from core.tier_limits import Tier, get_tier_limits
+from models.bookmark import Bookmark
+from models.content_history import ActionType, ContentHistory, EntityType
+from models.note import Note
+from models.tag import Tag
+from models.user import User
+from schemas.bookmark import BookmarkCreate
+from schemas.note import NoteCreate
+from schemas.prompt import PromptCreate
+from services.bookmark_service import ArchivedUrlExistsError, BookmarkService, DuplicateUrlError
+from services.exceptions import FieldLimitExceededError, QuotaExceededError
+from services.note_service import NoteService
+from services.prompt_service import NameConflictError, PromptService
+
+
+bookmark_service = BookmarkService()
+note_service = NoteService()
+prompt_service = PromptService()
+DEFAULT_LIMITS = get_tier_limits(Tier.DEV)
+
+
+@pytest.fixture
+async def test_user(db_session: AsyncSession) -> User:
+    """Create a test user."""
+    user = User(auth0_id='bulk-user-123', email='bulk@example.com', tier=Tier.FREE.value)
+    db_session.add(user)
+    await db_session.flush()
+    await db_session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def request_context() -> RequestContext:
+    """Create a test request context."""
+    return RequestContext(source="web", auth_type=AuthType.SESSION)
+
+
+async def test__create_many__creates_items_with_tags(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """Items are created with shared tags resolved once, in input order."""
+    items = [
+        BookmarkCreate(url=f'https://bulk{i}.example.com', title=f'Bulk {i}', tags=['shared', f't{i}'])
+        for i in range(3)
+    ]
+
+    results = await bookmark_service.create_many(db_session, test_user.id, items, DEFAULT_LIMITS)
+
+    assert all(isinstance(r, UUID) for r in results)
+    for i, bookmark_id in enumerate(results):
+        bookmark = await bookmark_service.get(db_session, test_user.id, bookmark_id)
+        assert bookmark.url == f'https://bulk{i}.example.com/'
+        assert bookmark.title == f'Bulk {i}'
+        assert sorted(t.name for t in bookmark.tag_objects) == sorted(['shared', f't{i}'])
+        assert bookmark.last_used_at == bookmark.created_at
+
+    created_at = [
+        (await bookmark_service.get(db_session, test_user.id, r)).created_at for r in results
+    ]
+    assert created_at == sorted(created_at)
+
+    tags = (await db_session.execute(
+        select(Tag.name).where(Tag.user_id == test_user.id, Tag.name == 'shared'),
+    )).scalars().all()
+    assert tags == ['shared']
+
+
+async def test__create_many__reuses_existing_tags(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """A tag the user already has is linked rather than duplicated."""
+    await note_service.create(
+        db_session, test_user.id, NoteCreate(title='Existing', tags=['existing']), DEFAULT_LIMITS,
+    )
+
+    results = await note_service.create_many(
+        db_session, test_user.id, [NoteCreate(title='New', tags=['existing'])], DEFAULT_LIMITS,
+    )
+
+    assert isinstance(results[0], UUID)
+    count = len((await db_session.execute(
+        select(Tag.id).where(Tag.user_id == test_user.id, Tag.name == 'existing'),
+    )).all())
+    assert count == 1
+
+
+async def test__create_many__duplicate_url_within_batch(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """A URL repeated in the batch is created once; later copies fail."""
+    items = [
+        BookmarkCreate(url='https://same.example.com'),
+        BookmarkCreate(url='https://same.example.com'),
+    ]
+
+    results = await bookmark_service.create_many(db_session, test_user.id, items, DEFAULT_LIMITS)
+
+    assert isinstance(results[0], UUID)
+    assert isinstance(results[1], DuplicateUrlError)
+
+
+async def test__create_many__duplicate_url_in_database(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """Active and archived URLs already stored fail with the create() errors."""
+    await bookmark_service.create(
+        db_session, test_user.id, BookmarkCreate(url='https://active.example.com'), DEFAULT_LIMITS,
+    )
+    archived = await bookmark_service.create(
+        db_session, test_user.id, BookmarkCreate(url='https://archived.example.com'), DEFAULT_LIMITS,
+    )
+    await bookmark_service.archive(db_session, test_user.id, archived.id)
+
+    results = await bookmark_service.create_many(
+        db_session,
+        test_user.id,
+        [
+            BookmarkCreate(url='https://active.example.com'),
+            BookmarkCreate(url='https://archived.example.com'),
+            BookmarkCreate(url='https://fresh.example.com'),
+        ],
+        DEFAULT_LIMITS,
+    )
+
+    assert isinstance(results[0], DuplicateUrlError)
+    assert isinstance(results[1], ArchivedUrlExistsError)
+    assert results[1].existing_bookmark_id == archived.id
+    assert isinstance(results[2], UUID)
+
+
+async def test__create_many__soft_deleted_url_does_not_conflict(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """A URL held only by a soft-deleted bookmark can be imported again."""
+    deleted = await bookmark_service.create(
+        db_session, test_user.id, BookmarkCreate(url='https://deleted.example.com'), DEFAULT_LIMITS,
+    )
+    await bookmark_service.delete(db_session, test_user.id, deleted.id)
+
+    results = await bookmark_service.create_many(
+        db_session, test_user.id, [BookmarkCreate(url='https://deleted.example.com')], DEFAULT_LIMITS,
+    )
+
+    assert isinstance(results[0], UUID)
+
+
+async def test__create_many__quota_accepts_items_in_order(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """Items beyond the remaining quota fail with QuotaExceededError."""
+    limits = replace(DEFAULT_LIMITS, max_notes=3)
+    await note_service.create(db_session, test_user.id, NoteCreate(title='Existing'), limits)
+
+    results = await note_service.create_many(
+        db_session, test_user.id, [NoteCreate(title=f'Note {i}') for i in range(4)], limits,
+    )
+
+    assert isinstance(results[0], UUID)
+    assert isinstance(results[1], UUID)
+    assert isinstance(results[2], QuotaExceededError)
+    assert isinstance(results[3], QuotaExceededError)
+    assert await note_service.count_user_items(db_session, test_user.id) == 3
+
+
+async def test__create_many__field_limit_fails_only_that_item(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """An item over a field limit fails without affecting the rest."""
+    limits = replace(DEFAULT_LIMITS, max_title_length=10)
+
+    results = await note_service.create_many(
+        db_session,
+        test_user.id,
+        [NoteCreate(title='Short'), NoteCreate(title='x' * 11)],
+        limits,
+    )
+
+    assert isinstance(results[0], UUID)
+    assert isinstance(results[1], FieldLimitExceededError)
+
+
+async def test__create_many__rejects_relationships(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """Relationships are not supported in bulk and fail the item."""
+    note = NoteCreate.model_validate({
+        'title': 'Linked',
+        'relationships': [{
+            'target_type': 'note',
+            'target_id': '00000000-0000-0000-0000-000000000001',
+            'relationship_type': 'related',
+        }],
+    })
+
+    results = await note_service.create_many(db_session, test_user.id, [note], DEFAULT_LIMITS)
+
+    assert isinstance(results[0], ValueError)
+    assert 'Relationships' in str(results[0])
+
+
+async def test__create_many__future_archived_at_is_stored(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """A scheduled archive date is stored like in create()."""
+    archived_at = datetime.now(UTC) + timedelta(days=7)
+
+    results = await note_service.create_many(
+        db_session, test_user.id, [NoteCreate(title='Later', archived_at=archived_at)], DEFAULT_LIMITS,
+    )
+
+    note = await db_session.get(Note, results[0])
+    assert note.archived_at == archived_at
+
+
+async def test__create_many__prompt_name_conflict_and_template_error(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """Prompts get the same name and template checks as create()."""
+    await prompt_service.create(
+        db_session, test_user.id, PromptCreate(name='taken', content='Hi'), DEFAULT_LIMITS,
+    )
+
+    results = await prompt_service.create_many(
+        db_session,
+        test_user.id,
+        [
+            PromptCreate(name='taken', content='Hi'),
+            PromptCreate(name='broken', content='{{ unclosed'),
+            PromptCreate(name='undeclared', content='Hello {{ who }}'),
+            PromptCreate(
+                name='ok', content='Hello {{ who }}', arguments=[{'name': 'who'}],
+            ),
+        ],
+        DEFAULT_LIMITS,
+    )
+
+    assert isinstance(results[0], NameConflictError)
+    assert isinstance(results[1], ValueError)
+    assert isinstance(results[2], ValueError)
+    assert isinstance(results[3], UUID)
+    prompt = await prompt_service.get(db_session, test_user.id, results[3])
+    assert prompt.arguments == [{'name': 'who', 'description': None, 'required': None}]
+
+
+async def test__create_many__records_create_history(
+    db_session: AsyncSession, test_user: User, request_context: RequestContext,
+) -> None:
+    """Each created item gets a version 1 CREATE record with a snapshot."""
+    results = await bookmark_service.create_many(
+        db_session,
+        test_user.id,
+        [
+            BookmarkCreate(url='https://h1.example.com', content='Body', tags=['x']),
+            BookmarkCreate(url='https://h2.example.com'),
+        ],
+        DEFAULT_LIMITS,
+        request_context,
+    )
+
+    records = (await db_session.execute(
+        select(ContentHistory)
+        .where(ContentHistory.user_id == test_user.id)
+        .order_by(ContentHistory.created_at),
+    )).scalars().all()
+    assert [r.entity_id for r in records] == results
+    for record in records:
+        assert record.entity_type == EntityType.BOOKMARK
+        assert record.action == ActionType.CREATE.value
+        assert record.version == 1
+        assert record.source == 'web'
+        assert record.auth_type == AuthType.SESSION.value
+    assert records[0].content_snapshot == 'Body'
+    assert records[0].metadata_snapshot['tags'] == ['x']
+    assert records[0].metadata_snapshot['url'] == 'https://h1.example.com/'
+
+
+async def test__create_many__no_context_skips_history(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """Without a request context no history is recorded, as in create()."""
+    await bookmark_service.create_many(
+        db_session, test_user.id, [BookmarkCreate(url='https://quiet.example.com')], DEFAULT_LIMITS,
+    )
+
+    records = (await db_session.execute(
+        select(ContentHistory).where(ContentHistory.user_id == test_user.id),
+    )).scalars().all()
+    assert records == []
+    stored = (await db_session.execute(
+        select(Bookmark).where(Bookmark.user_id == test_user.id),
+    )).scalars().all()
+    assert len(stored) == 1
+
+
+def test__duplicate_error__default_is_generic_value_error() -> None:
+    """A service with a unique column but no override gets a per-item ValueError."""
+    class TitledNoteService(NoteService):
+        unique_active_column = 'title'
+
+    error = TitledNoteService()._duplicate_error('Taken', None)
+
+    assert isinstance(error, ValueError)
+    assert str(error) == "A note with title 'Taken' already exists."
@@ -10,6 +10,9 @@ from services.content_lines import (
     build_content_metadata,
     count_lines,
     extract_lines,
+    line_offsets,
+    line_span,
+    resolve_line_range,
 )
 
 
@@ -222,6 +225,48 @@ class TestBuildContentMetadata:
         assert metadata.is_partial is True
 
 
+class TestLineOffsets:
+    """Tests for line_offsets and line_span."""
+
+    @pytest.mark.parametrize("content", ["", "hello", "hello\n", "a\nb", "a\n\nb\n", "\n\n"])
+    def test__line_offsets__one_entry_per_line(self, content: str) -> None:
+        """There is one offset per line, each the start of a line."""
+        offsets = line_offsets(content)
+        assert len(offsets) == count_lines(content)
+        assert offsets[0] == 0
+        assert all(content[offset - 1] == "\n" for offset in offsets[1:])
+
+    @pytest.mark.parametrize("content", ["", "x", "a\nb\nc", "a\n\nb\n", "\n\n", "é\nß\n日本"])
+    def test__line_span__matches_extract_lines(self, content: str) -> None:
+        """Every line range's span slices out the same text as extract_lines."""
+        offsets = line_offsets(content)
+        total = len(offsets)
+        for start in range(1, total + 1):
+            for end in range(start, total + 1):
+                span_start, span_end = line_span(offsets, len(content), start, end)
+                assert content[span_start:span_end] == extract_lines(content, start, end)
+
+
+class TestResolveLineRange:
+    """Tests for resolve_line_range."""
+
+    def test__resolve_line_range__defaults_and_clamping(self) -> None:
+        """Missing bounds default to the whole content; end is clamped."""
+        assert resolve_line_range(5, None, None) == ContentMetadata(
+            total_lines=5, start_line=1, end_line=5, is_partial=False,
+        )
+        assert resolve_line_range(5, 2, 99) == ContentMetadata(
+            total_lines=5, start_line=2, end_line=5, is_partial=True,
+        )
+
+    def test__resolve_line_range__invalid_ranges_raise(self) -> None:
+        """Start beyond the content or after the end raises ValueError."""
+        with pytest.raises(ValueError, match="exceeds total lines"):
+            resolve_line_range(3, 4, None)
+        with pytest.raises(ValueError, match="must be <="):
+            resolve_line_range(3, 3, 2)
+
+
 class MockResponse(BaseModel):
     """Mock response object for testing apply_partial_read."""
 
@@ -291,3 +336,12 @@ class TestApplyPartialRead:
 
         assert exc_info.value.status_code == 400
         assert "must be <=" in exc_info.value.detail
+
+    def test__apply_partial_read__existing_metadata_left_unchanged(self) -> None:
+        """Content already read as a line range (metadata set) is not re-sliced."""
+        metadata = ContentMetadata(total_lines=100, start_line=50, end_line=51, is_partial=True)
+        response = MockResponse(content="line 50\nline 51", content_metadata=metadata)
+        apply_partial_read(response, 50, 51)
+
+        assert response.content == "line 50\nline 51"
+        assert response.content_metadata == metadata
@@ -1,5 +1,6 @@
 """Tests for content search service."""
 
+from services.content_lines import line_offsets
 from services.content_search_service import (
     get_match_context,
     search_in_content,
@@ -366,6 +367,41 @@ class TestSearchInContent:
         assert all(m.line == 1 for m in matches)
 
 
+    def test__search_in_content__precomputed_offsets_give_same_matches(self) -> None:
+        """Passing cached line offsets gives the same matches as computing them."""
+        content = "alpha\nbeta target\n\ngamma\ntarget delta\nend target"
+        kwargs = {
+            "content": content,
+            "title": None,
+            "description": None,
+            "query": "target",
+            "fields": ["content"],
+            "context_lines": 1,
+        }
+
+        computed = search_in_content(**kwargs)
+        cached = search_in_content(**kwargs, offsets=line_offsets(content))
+
+        assert cached == computed
+        assert [m.line for m in computed] == [2, 5, 6]
+        assert computed[2].context == "target delta\nend target"
+
+    def test__search_in_content__multiline_match_context_at_end(self) -> None:
+        """Context after a multiline match stops at the last line."""
+        content = "one\ntwo\nthree"
+        matches = search_in_content(
+            content=content,
+            title=None,
+            description=None,
+            query="two\nthree",
+            fields=["content"],
+            context_lines=2,
+        )
+        assert len(matches) == 1
+        assert matches[0].line == 2
+        assert matches[0].context == content
+
+
 class TestGetMatchContext:
     """Tests for get_match_context function."""
 
@@ -6,8 +6,10 @@ into a unified list with proper pagination and sorting.
 """
 import asyncio
 from datetime import UTC, datetime, timedelta
+from uuid import uuid4
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.tier_limits import Tier, get_tier_limits
@@ -16,9 +18,11 @@ from schemas.bookmark import BookmarkCreate
 from schemas.note import NoteCreate
 from schemas.prompt import PromptCreate
 from services.bookmark_service import BookmarkService
-from services.content_service import search_all_content
+from services.content_service import search_all_content, search_content_page
+from services.exceptions import InvalidCursorError
 from services.note_service import NoteService
 from services.prompt_service import PromptService
+from services.utils import encode_cursor
 
 
 bookmark_service = BookmarkService()
@@ -809,6 +813,240 @@ async def test__search_all_content__returns_total_before_pagination(
     assert len(items) == 3
 
 
+async def _walk_cursor_pages(
+    db_session: AsyncSession,
+    user: User,
+    limit: int,
+    **kwargs: object,
+) -> list[tuple[str, object]]:
+    """Follow next_cursor from the first page to the last, collecting (type, id)."""
+    seen: list[tuple[str, object]] = []
+    cursor = None
+    for _ in range(50):
+        page = await search_content_page(
+            db_session, user.id, limit=limit, cursor=cursor, include_total=False, **kwargs,
+        )
+        assert page.total is None
+        seen.extend((item.type, item.id) for item in page.items)
+        if not page.has_more:
+            assert page.next_cursor is None
+            return seen
+        cursor = page.next_cursor
+    raise AssertionError("cursor pagination did not terminate")
+
+
+async def _create_mixed_items(db_session: AsyncSession, user: User) -> None:
+    """Create bookmarks, notes, and prompts with duplicate and missing titles."""
+    for i in range(4):
+        await bookmark_service.create(
+            db_session, user.id,
+            BookmarkCreate(url=f'https://cursor{i}.com', title='Same' if i % 2 else None),
+            DEFAULT_LIMITS,
+        )
+    for i in range(4):
+        await note_service.create(
+            db_session, user.id, NoteCreate(title=f'Python note {i % 2}'), DEFAULT_LIMITS,
+        )
+    for i in range(3):
+        await prompt_service.create(
+            db_session, user.id,
+            PromptCreate(name=f'cursor-prompt-{i}', content='python prompt'),
+            DEFAULT_LIMITS,
+        )
+    await db_session.flush()
+
+
+@pytest.mark.parametrize(
+    ('sort_by', 'sort_order'),
+    [
+        ('created_at', 'desc'),
+        ('created_at', 'asc'),
+        ('title', 'asc'),
+        ('title', 'desc'),
+        ('archived_at', 'desc'),
+        ('archived_at', 'asc'),
+    ],
+)
+async def test__search_content_page__cursor_walk_matches_offset_order(
+    db_session: AsyncSession,
+    test_user: User,
+    sort_by: str,
+    sort_order: str,
+) -> None:
+    """Following next_cursor visits every item exactly once, in the offset order."""
+    await _create_mixed_items(db_session, test_user)
+
+    expected, total = await search_all_content(
+        db_session, test_user.id, sort_by=sort_by, sort_order=sort_order, limit=100,
+    )
+    walked = await _walk_cursor_pages(
+        db_session, test_user, limit=3, sort_by=sort_by, sort_order=sort_order,
+    )
+
+    assert total == 11
+    assert walked == [(item.type, item.id) for item in expected]
+
+
+async def test__search_content_page__cursor_walk_relevance(
+    db_session: AsyncSession,
+    test_user: User,
+) -> None:
+    """Cursor pagination works with relevance sort (float sort key)."""
+    await _create_mixed_items(db_session, test_user)
+
+    expected, total = await search_all_content(
+        db_session, test_user.id, query='python', sort_by='relevance', limit=100,
+    )
+    walked = await _walk_cursor_pages(
+        db_session, test_user, limit=2, query='python', sort_by='relevance',
+    )
+
+    assert total == 7
+    assert walked == [(item.type, item.id) for item in expected]
+
+
+async def test__search_content_page__offset_page_returns_cursor_for_next_page(
+    db_session: AsyncSession,
+    test_user: User,
+) -> None:
+    """An offset page hands out a cursor that continues exactly where it ended."""
+    await _create_mixed_items(db_session, test_user)
+
+    first = await search_content_page(db_session, test_user.id, offset=2, limit=3)
+    assert first.total == 11
+    assert first.has_more is True
+    assert first.next_cursor is not None
+
+    after_offset, _ = await search_all_content(db_session, test_user.id, offset=5, limit=3)
+    via_cursor = await search_content_page(
+        db_session, test_user.id, limit=3, cursor=first.next_cursor,
+    )
+    assert [i.id for i in via_cursor.items] == [i.id for i in after_offset]
+    assert via_cursor.total == 11
+
+
+async def test__search_content_page__last_page_has_no_cursor(
+    db_session: AsyncSession,
+    test_user: User,
+) -> None:
+    """has_more is False and next_cursor is None when the page reaches the end."""
+    await _create_mixed_items(db_session, test_user)
+
+    page = await search_content_page(db_session, test_user.id, limit=11)
+
+    assert len(page.items) == 11
+    assert page.has_more is False
+    assert page.next_cursor is None
+
+
+async def test__search_content_page__rejects_malformed_cursor(
+    db_session: AsyncSession,
+    test_user: User,
+) -> None:
+    """Garbage cursors raise InvalidCursorError (a ValueError)."""
+    for bad in ('not-a-cursor', 'e30', '!!!'):
+        with pytest.raises(InvalidCursorError):
+            await search_content_page(db_session, test_user.id, cursor=bad)
+
+
+async def test__search_content_page__rejects_naive_cursor_timestamps(
+    db_session: AsyncSession,
+    test_user: User,
+) -> None:
+    """Cursor timestamps without a time zone (sort value or tiebreaker) are rejected."""
+    aware = datetime.now(UTC).isoformat()
+    naive = datetime.now(UTC).replace(tzinfo=None).isoformat()
+    base = {'s': 'updated_at', 'o': 'desc', 'v': aware, 't': 'note', 'c': aware, 'i': str(uuid4())}
+    for field in ('v', 'c'):
+        with pytest.raises(InvalidCursorError):
+            await search_content_page(
+                db_session, test_user.id, cursor=encode_cursor({**base, field: naive}),
+            )
+
+
+async def test__search_content_page__rejects_cursor_for_different_sort(
+    db_session: AsyncSession,
+    test_user: User,
+) -> None:
+    """A cursor issued for one sort cannot be replayed against another."""
+    await _create_mixed_items(db_session, test_user)
+    page = await search_content_page(
+        db_session, test_user.id, limit=2, sort_by='title', sort_order='asc',
+    )
+
+    with pytest.raises(InvalidCursorError, match='sort'):
+        await search_content_page(
+            db_session, test_user.id, limit=2, cursor=page.next_cursor,
+            sort_by='title', sort_order='desc',
+        )
+
+
+async def test__search_content_page__rejects_cursor_with_offset(
+    db_session: AsyncSession,
+    test_user: User,
+) -> None:
+    """Cursor and offset are mutually exclusive."""
+    await _create_mixed_items(db_session, test_user)
+    page = await search_content_page(db_session, test_user.id, limit=2)
+
+    with pytest.raises(InvalidCursorError, match='offset'):
+        await search_content_page(
+            db_session, test_user.id, limit=2, offset=2, cursor=page.next_cursor,
+        )
+
+
+async def test__search_content_page__single_round_trip(
+    db_session: AsyncSession,
+    test_user: User,
+) -> None:
+    """A text search with tags and total runs as one statement, tags included."""
+    await bookmark_service.create(
+        db_session, test_user.id,
+        BookmarkCreate(url='https://fused.com', title='Fused python', tags=['web', 'py']),
+        DEFAULT_LIMITS,
+    )
+    await note_service.create(
+        db_session, test_user.id, NoteCreate(title='Fused python note', tags=['py']),
+        DEFAULT_LIMITS,
+    )
+    await prompt_service.create(
+        db_session, test_user.id, PromptCreate(name='fused-python', content='python'),
+        DEFAULT_LIMITS,
+    )
+    await db_session.flush()
+
+    statements: list[str] = []
+
+    def record(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        page = await search_content_page(db_session, test_user.id, query='python')
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    assert len(statements) == 1
+    assert page.total == 3
+    tags = {item.type: sorted(item.tags) for item in page.items}
+    assert tags == {'bookmark': ['py', 'web'], 'note': ['py'], 'prompt': []}
+
+
+async def test__search_content_page__total_for_page_past_end(
+    db_session: AsyncSession,
+    test_user: User,
+) -> None:
+    """An empty page past the end still reports the exact total."""
+    await _create_mixed_items(db_session, test_user)
+
+    page = await search_content_page(db_session, test_user.id, offset=50, limit=5)
+
+    assert page.items == []
+    assert page.total == 11
+    assert page.has_more is False
+
+
 # =============================================================================
 # User Isolation Tests
 # =============================================================================
@@ -0,0 +1,176 @@
+"""Tests for the diff worker pool used by HistoryService."""
+import asyncio
+import time
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+
+from core.metrics import REGISTRY
+from services import diff_worker
+from services.diff_worker import (
+    DiffWorkerPool,
+    apply_reverse_diffs,
+    make_replacement_diff,
+    make_reverse_diff,
+)
+
+
+INLINE_JOBS = 'history_diff_run_seconds_count{mode="inline"}'
+OFFLOADED_JOBS = 'history_diff_run_seconds_count{mode="offloaded"}'
+TIMEOUTS = "history_diff_timeouts_total"
+
+
+def _total(key: str) -> float:
+    """This worker's running total for a metric sample."""
+    return REGISTRY.local_totals().get(key, 0.0)
+
+
+@pytest.fixture
+def pool() -> Generator[DiffWorkerPool]:
+    """Thread pool that offloads everything (threshold 0)."""
+    pool = DiffWorkerPool(offload_threshold=0, timeout=5.0)
+    yield pool
+    pool.shutdown()
+
+
+class TestDiffFunctions:
+    """Tests for the module-level diff/patch functions."""
+
+    def test__make_reverse_diff__round_trips(self) -> None:
+        """Applying the reverse diff to current yields previous."""
+        previous = "The quick brown fox jumps over the lazy dog."
+        current = "The quick red fox leaps over the lazy dog!"
+
+        diff_text = make_reverse_diff(current, previous)
+        content, issues = apply_reverse_diffs(current, [(2, diff_text)])
+
+        assert content == previous
+        assert issues == []
+
+    def test__make_replacement_diff__round_trips(self) -> None:
+        """The wholesale replacement diff also turns current into previous."""
+        previous = "line one\nline two\n" * 200
+        current = "something else entirely\n" * 150
+
+        content, issues = apply_reverse_diffs(
+            current, [(2, make_replacement_diff(current, previous))],
+        )
+
+        assert content == previous
+        assert issues == []
+
+    def test__apply_reverse_diffs__chains_in_order(self) -> None:
+        """Diffs apply newest first, walking back through versions."""
+        v1, v2, v3 = "alpha", "alpha beta", "alpha beta gamma"
+        diffs = [(3, make_reverse_diff(v3, v2)), (2, make_reverse_diff(v2, v1))]
+
+        content, issues = apply_reverse_diffs(v3, diffs)
+
+        assert content == v1
+        assert issues == []
+
+    def test__apply_reverse_diffs__corrupted_diff_passes_content_through(self) -> None:
+        """A corrupted diff is reported and skipped; content is unchanged by it."""
+        content, issues = apply_reverse_diffs("hello", [(4, "not a valid patch")])
+
+        assert content == "hello"
+        assert len(issues) == 1
+        assert issues[0].version == 4
+        assert issues[0].error is not None
+
+    def test__apply_reverse_diffs__none_content_without_diffs(self) -> None:
+        """None content passes through when there is nothing to apply."""
+        assert apply_reverse_diffs(None, []) == (None, [])
+
+
+class TestDiffWorkerPool:
+    """Tests for size-aware scheduling, timeouts, and metrics."""
+
+    async def test__make_reverse_diff__small_input_runs_inline(self) -> None:
+        """Inputs under the threshold never touch the executor."""
+        pool = DiffWorkerPool(offload_threshold=1_000)
+        inline, offloaded = _total(INLINE_JOBS), _total(OFFLOADED_JOBS)
+
+        diff_text = await pool.make_reverse_diff("abc", "abd")
+
+        assert diff_text == make_reverse_diff("abc", "abd")
+        assert _total(INLINE_JOBS) == inline + 1
+        assert _total(OFFLOADED_JOBS) == offloaded
+        assert pool._executor is None
+
+    async def test__make_reverse_diff__large_input_is_offloaded(
+        self, pool: DiffWorkerPool,
+    ) -> None:
+        """Inputs over the threshold run in the executor and record timings."""
+        inline, offloaded = _total(INLINE_JOBS), _total(OFFLOADED_JOBS)
+        queued = _total('history_diff_queue_seconds_count{mode="offloaded"}')
+
+        diff_text = await pool.make_reverse_diff("abc" * 100, "abd" * 100)
+
+        assert diff_text == make_reverse_diff("abc" * 100, "abd" * 100)
+        assert _total(INLINE_JOBS) == inline
+        assert _total(OFFLOADED_JOBS) == offloaded + 1
+        assert _total('history_diff_queue_seconds_count{mode="offloaded"}') == queued + 1
+
+    async def test__make_reverse_diff__returns_none_on_timeout(self) -> None:
+        """A diff that exceeds the timeout yields None so the caller can snapshot."""
+        pool = DiffWorkerPool(offload_threshold=0, timeout=0.05)
+        timeouts = _total(TIMEOUTS)
+
+        def slow_diff(*_args: object) -> str:
+            time.sleep(0.5)
+            return "never used"
+
+        with patch.object(diff_worker, "make_reverse_diff", slow_diff):
+            result = await pool.make_reverse_diff("a", "b")
+
+        assert result is None
+        assert _total(TIMEOUTS) == timeouts + 1
+        pool.shutdown()
+
+    async def test__make_reverse_diff__event_loop_stays_responsive(
+        self, pool: DiffWorkerPool,
+    ) -> None:
+        """While an offloaded diff runs, other coroutines still get scheduled."""
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        def slow_diff(*_args: object) -> str:
+            time.sleep(0.1)
+            return "diff"
+
+        task = asyncio.create_task(ticker())
+        with patch.object(diff_worker, "make_reverse_diff", slow_diff):
+            await pool.make_reverse_diff("a", "b")
+        task.cancel()
+
+        assert ticks > 1
+
+    async def test__apply_reverse_diffs__offloaded_matches_inline(
+        self, pool: DiffWorkerPool,
+    ) -> None:
+        """Offloaded patch application produces the same result as inline."""
+        v1, v2 = "first draft " * 50, "second draft " * 50
+        diffs = [(2, make_reverse_diff(v2, v1))]
+        offloaded = _total(OFFLOADED_JOBS)
+
+        result = await pool.apply_reverse_diffs(v2, diffs)
+
+        assert result == apply_reverse_diffs(v2, diffs)
+        assert _total(OFFLOADED_JOBS) == offloaded + 1
+
+    async def test__process_pool__computes_diffs(self) -> None:
+        """The process pool variant pickles the work and returns the same result."""
+        pool = DiffWorkerPool(kind="process", max_workers=1, offload_threshold=0, timeout=30.0)
+        try:
+            diff_text = await pool.make_reverse_diff("hello world", "hello there")
+        finally:
+            pool.shutdown()
+
+        assert diff_text == make_reverse_diff("hello world", "hello there")
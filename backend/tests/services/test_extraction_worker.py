@@ -0,0 +1,124 @@
+"""Tests for the extraction worker pool used by url_scraper."""
+import time
+from collections.abc import Generator
+
+import pytest
+
+from core.metrics import REGISTRY
+from services.extraction_worker import ExtractionLimitError, ExtractionWorkerPool
+from services.url_scraper import extract_page
+
+
+def _double(value: int) -> int:
+    """Trivial job."""
+    return value * 2
+
+
+def _burn_cpu() -> None:
+    """Spin until stopped by the CPU limit."""
+    while True:
+        pass
+
+
+def _sleep(seconds: float) -> None:
+    """Hold the worker without using CPU."""
+    time.sleep(seconds)
+
+
+def _text_heavy_pdf(operators: int) -> bytes:
+    """A one-page PDF whose text takes seconds of CPU to extract (~70us per operator)."""
+    content = b'BT /F1 12 Tf ' + b'1 0 Td (word) Tj ' * operators + b'ET'
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+        b'/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+        b'<< /Length %d >>\nstream\n%b\nendstream' % (len(content), content),
+    ]
+    pdf = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b'%d 0 obj\n%b\nendobj\n' % (number, body)
+    xref = len(pdf)
+    pdf += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    pdf += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    pdf += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+        len(objects) + 1, xref,
+    )
+    return pdf
+
+
+def _exit_worker() -> None:
+    """Kill the worker process."""
+    import os  # noqa: PLC0415
+    os._exit(1)
+
+
+def _total(key: str) -> float:
+    """This worker's running total for a metric sample."""
+    return REGISTRY.local_totals().get(key, 0.0)
+
+
+@pytest.fixture
+def pool() -> Generator[ExtractionWorkerPool]:
+    """Single-worker pool with a 1 CPU-second budget."""
+    pool = ExtractionWorkerPool(max_workers=1, cpu_seconds=1, timeout=20.0)
+    yield pool
+    pool.shutdown()
+
+
+class TestExtractionWorkerPool:
+    """Tests for CPU and wall-clock limits, recovery, and metrics."""
+
+    async def test__run__returns_result(self, pool: ExtractionWorkerPool) -> None:
+        """Jobs run in the worker and return their result."""
+        jobs = _total("scrape_extraction_run_seconds_count")
+
+        assert await pool.run(_double, 21) == 42
+
+        assert _total("scrape_extraction_run_seconds_count") == jobs + 1
+
+    async def test__run__cpu_limit_aborts_job(self, pool: ExtractionWorkerPool) -> None:
+        """A job that spins past its CPU budget is aborted; the worker survives."""
+        aborted = _total('scrape_extraction_failures_total{reason="cpu_limit"}')
+
+        with pytest.raises(ExtractionLimitError, match="CPU limit"):
+            await pool.run(_burn_cpu)
+
+        assert _total('scrape_extraction_failures_total{reason="cpu_limit"}') == aborted + 1
+        # The same worker keeps serving jobs with a fresh budget
+        assert await pool.run(_double, 2) == 4
+
+    async def test__run__cpu_limit_aborts_pdf_extraction(
+        self, pool: ExtractionWorkerPool,
+    ) -> None:
+        """The limit also stops extract_page, whose PDF extractors catch Exception."""
+        aborted = _total('scrape_extraction_failures_total{reason="cpu_limit"}')
+
+        with pytest.raises(ExtractionLimitError, match="CPU limit"):
+            await pool.run(extract_page, _text_heavy_pdf(100_000), True)
+
+        assert _total('scrape_extraction_failures_total{reason="cpu_limit"}') == aborted + 1
+
+    async def test__run__timeout(self) -> None:
+        """A job that outlives the wall-clock timeout raises ExtractionLimitError."""
+        pool = ExtractionWorkerPool(max_workers=1, timeout=0.5)
+        timeouts = _total('scrape_extraction_failures_total{reason="timeout"}')
+        try:
+            with pytest.raises(ExtractionLimitError, match="timed out"):
+                await pool.run(_sleep, 2.0)
+            assert _total('scrape_extraction_failures_total{reason="timeout"}') == timeouts + 1
+        finally:
+            pool.shutdown()
+
+    async def test__run__dead_worker_recovers(self, pool: ExtractionWorkerPool) -> None:
+        """A worker that dies breaks the executor; the next job gets a new one."""
+        broken = _total('scrape_extraction_failures_total{reason="broken_pool"}')
+
+        with pytest.raises(ExtractionLimitError, match="failed"):
+            await pool.run(_exit_worker)
+
+        assert _total('scrape_extraction_failures_total{reason="broken_pool"}') == broken + 1
+        assert await pool.run(_double, 5) == 10
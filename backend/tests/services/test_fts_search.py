@@ -6,6 +6,7 @@ stop-word guard, and relevance sorting.
 """
 import pytest
 from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.tier_limits import Tier, get_tier_limits
@@ -13,7 +14,14 @@ from models.user import User
 from schemas.bookmark import BookmarkCreate
 from schemas.note import NoteCreate
 from services.bookmark_service import BookmarkService
-from services.content_service import search_all_content
+from models.bookmark import Bookmark
+from models.note import Note
+from services.content_service import (
+    BOOKMARK_SEARCH_FIELDS,
+    SEARCH_TEXT_SEPARATOR,
+    build_search_text_expr,
+    search_all_content,
+)
 from services.note_service import NoteService
 from services.prompt_service import PromptService
 
@@ -279,6 +287,68 @@ async def test__search__bookmark_url_ilike_match(
     assert items[0].title == 'Claude Code'
 
 
+async def test__search__ilike_matches_each_field_of_search_text(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """Substring matches in description, content, and url are all found."""
+    for i, field in enumerate(['description', 'content']):
+        await bookmark_service.create(
+            db_session, test_user.id,
+            BookmarkCreate(url=f'https://field{i}.example.com', title=f'B{i}', **{field: 'xyzzyplugh'}),
+            DEFAULT_LIMITS, None,
+        )
+    await bookmark_service.create(
+        db_session, test_user.id,
+        BookmarkCreate(url='https://xyzzyplugh.example.com', title='B2'),
+        DEFAULT_LIMITS, None,
+    )
+    _items, total = await search_all_content(
+        db_session, test_user.id, query='yzzyplu', content_types=['bookmark'],
+    )
+    assert total == 3
+
+
+async def test__search__ilike_does_not_match_across_field_boundary(
+    db_session: AsyncSession, test_user: User,
+) -> None:
+    """A query spanning the separator must not match the end of one field plus the next."""
+    await note_service.create(
+        db_session, test_user.id,
+        NoteCreate(title='Qwxz', description='Zxwq'),
+        DEFAULT_LIMITS, None,
+    )
+    _items, total = await search_all_content(
+        db_session, test_user.id, query=f'xz{SEARCH_TEXT_SEPARATOR}zx', content_types=['note'],
+    )
+    assert total == 0
+
+
+def test__build_search_text_expr__inlines_literals_to_match_trigram_index() -> None:
+    """
+    The search text must compile with inlined literals, not bind parameters.
+
+    The pg_trgm GIN indexes (migration f3a9c1d7e2b4) are expression indexes; a
+    bound separator would not match the index expression under generic plans.
+    """
+    columns = [field for field, _ in BOOKMARK_SEARCH_FIELDS] + [Bookmark.url]
+    compiled = build_search_text_expr(columns).compile(dialect=postgresql.dialect())
+
+    assert compiled.params == {}
+    sql = str(compiled)
+    assert sql.count("E'\\x1f'") == 4
+    assert sql.index('bookmarks.title') < sql.index('bookmarks.description') \
+        < sql.index('bookmarks.summary') < sql.index('bookmarks.content') < sql.index('bookmarks.url')
+
+
+def test__build_search_text_expr__note_columns() -> None:
+    """Note search text concatenates title, description, content in order."""
+    sql = str(build_search_text_expr([Note.title, Note.description, Note.content]).compile(
+        dialect=postgresql.dialect(),
+    ))
+    assert sql.count('coalesce(') == 3
+    assert sql.index('notes.title') < sql.index('notes.description') < sql.index('notes.content')
+
+
 # =============================================================================
 # Combined Scoring Tests
 # =============================================================================
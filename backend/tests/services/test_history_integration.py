@@ -1686,6 +1686,83 @@ class TestRelationshipHistoryIntegration:
         assert len(history) == 1
         assert len(history[0].metadata_snapshot['relationships']) == 1
 
+    async def test__update_with_relationships__records_history_on_each_target(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        limits: dict,
+        context: RequestContext,
+    ) -> None:
+        """Each affected target gets a metadata-only UPDATE with its own relationship snapshot."""
+        note_service = NoteService()
+        bm_service = BookmarkService()
+
+        bookmark = await bm_service.create(
+            db_session, test_user.id,
+            BookmarkCreate(url="https://example.com", title="Target BM", content="BM body"),
+            limits, context,
+        )
+        target_notes = [
+            await note_service.create(
+                db_session, test_user.id, NoteCreate(title=f"Target {i}"), limits, context,
+            )
+            for i in range(2)
+        ]
+        deleted_note = await note_service.create(
+            db_session, test_user.id, NoteCreate(title="Deleted"), limits, context,
+        )
+        note = await note_service.create(
+            db_session, test_user.id, NoteCreate(title="Source"), limits, context,
+        )
+        relationships = [
+            RelationshipInput(target_type='bookmark', target_id=bookmark.id),
+            *(RelationshipInput(target_type='note', target_id=n.id) for n in target_notes),
+        ]
+        await note_service.update(
+            db_session, test_user.id, note.id,
+            NoteUpdate(relationships=[
+                *relationships,
+                RelationshipInput(target_type='note', target_id=deleted_note.id),
+            ]),
+            limits, context,
+        )
+        await note_service.delete(db_session, test_user.id, deleted_note.id, context=context)
+        bookmark_updated_at = (await bm_service.get(db_session, test_user.id, bookmark.id)).updated_at
+
+        # Removing the deleted note's link must not record history on it
+        await note_service.update(
+            db_session, test_user.id, note.id,
+            NoteUpdate(relationships=relationships[:1]),
+            limits, context,
+        )
+
+        bm_history = await get_entity_history(db_session, test_user.id, EntityType.BOOKMARK, bookmark.id)
+        assert [r.version for r in bm_history] == [1, 2]
+        assert [r.changed_fields for r in bm_history[1:]] == [["relationships"]]
+        assert bm_history[1].action == ActionType.UPDATE.value
+        assert bm_history[1].content_diff is None
+        assert bm_history[1].content_snapshot is None
+        assert bm_history[1].metadata_snapshot['url'] == "https://example.com/"
+        assert bm_history[1].metadata_snapshot['relationships'][0]['target_id'] == str(note.id)
+        # Still linked: untouched by the second update
+        assert (await bm_service.get(db_session, test_user.id, bookmark.id)).updated_at == (
+            bookmark_updated_at
+        )
+
+        for target in target_notes:
+            history = await get_entity_history(db_session, test_user.id, EntityType.NOTE, target.id)
+            # create, link, unlink
+            assert [r.version for r in history] == [1, 2, 3]
+            assert len(history[1].metadata_snapshot['relationships']) == 1
+            assert history[2].metadata_snapshot['relationships'] == []
+
+        deleted_history = await get_entity_history(
+            db_session, test_user.id, EntityType.NOTE, deleted_note.id,
+        )
+        assert [r.action for r in deleted_history] == [
+            ActionType.CREATE.value, ActionType.UPDATE.value, ActionType.DELETE.value,
+        ]
+
 
 class TestCleanupPreservationServicePathRegression:
     """
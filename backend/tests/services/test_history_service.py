@@ -1,23 +1,35 @@
 """Tests for the HistoryService."""
-from datetime import timedelta
+import time
+from collections.abc import Generator
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
 from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
 from diff_match_patch import diff_match_patch
+from sqlalchemy import delete, inspect
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.metrics import REGISTRY
 from core.request_context import AuthType, RequestContext
-from core.tier_limits import TierLimits
+from core.tier_limits import Tier, TierLimits, get_tier_limits
 from models.content_history import ActionType, ContentHistory, EntityType
 from models.note import Note
 from models.user import User
+from services import diff_worker
+from services.diff_worker import DiffWorkerPool, apply_reverse_diffs, set_diff_pool
+from services.exceptions import InvalidCursorError
 from services.history_service import (
+    MAX_SNAPSHOT_INTERVAL,
     PRUNE_CHECK_INTERVAL,
-    SNAPSHOT_INTERVAL,
+    ReconstructionResult,
+    SnapshotPolicy,
+    _encode_history_cursor,
     history_service,
 )
+from services.version_cache import CachedVersion
 
 
 @pytest.fixture
@@ -33,6 +45,15 @@ async def test_user(db_session: AsyncSession) -> User:
     return user
 
 
+@pytest.fixture
+def snapshot_every_10() -> Generator[None]:
+    """Snapshot on every 10th version only, so tests can rely on where snapshots land."""
+    original = history_service.snapshot_policy
+    history_service.snapshot_policy = SnapshotPolicy(diff_ratio=float("inf"), max_interval=10)
+    yield
+    history_service.snapshot_policy = original
+
+
 @pytest.fixture
 def request_context() -> RequestContext:
     """Create a test request context."""
@@ -229,13 +250,13 @@ class TestHistoryServiceRecordAction:
         test_user: User,
         request_context: RequestContext,
     ) -> None:
-        """Periodic snapshot (every 10th version) stores both snapshot and diff."""
+        """Periodic snapshot (every MAX_SNAPSHOT_INTERVAL-th version) stores snapshot and diff."""
         entity_id = uuid4()
         metadata = {"title": "Test", "tags": []}
 
-        # Create versions 1-9
+        # Create versions 1-19
         previous = None
-        for i in range(1, SNAPSHOT_INTERVAL):
+        for i in range(1, MAX_SNAPSHOT_INTERVAL):
             content = f"Content v{i}"
             await history_service.record_action(
                 db=db_session,
@@ -250,22 +271,22 @@ class TestHistoryServiceRecordAction:
             )
             previous = content
 
-        # Create version 10 (periodic snapshot)
-        content_v10 = "Content v10"
+        # Create version 20 (periodic snapshot)
+        content_v20 = "Content v20"
         history = await history_service.record_action(
             db=db_session,
             user_id=test_user.id,
             entity_type=EntityType.NOTE,
             entity_id=entity_id,
             action=ActionType.UPDATE,
-            current_content=content_v10,
+            current_content=content_v20,
             previous_content=previous,
             metadata=metadata,
             context=request_context,
         )
 
-        assert history.version == SNAPSHOT_INTERVAL
-        assert history.content_snapshot == content_v10  # Full content
+        assert history.version == MAX_SNAPSHOT_INTERVAL
+        assert history.content_snapshot == content_v20  # Full content
         assert history.content_diff is not None  # Also has diff for chain traversal
 
     async def test__record_action__metadata_only_at_snapshot_interval(
@@ -274,14 +295,14 @@ class TestHistoryServiceRecordAction:
         test_user: User,
         request_context: RequestContext,
     ) -> None:
-        """Metadata-only change at modulo-10 version stores content_snapshot for bounded reconstruction."""
+        """Metadata-only change at the periodic interval still stores content_snapshot."""
         entity_id = uuid4()
         content = "Stable content"
 
-        # Create versions 1-9
+        # Create versions 1-19
         previous = None
-        for i in range(1, SNAPSHOT_INTERVAL):
-            c = f"Content v{i}" if i < SNAPSHOT_INTERVAL - 1 else content
+        for i in range(1, MAX_SNAPSHOT_INTERVAL):
+            c = f"Content v{i}" if i < MAX_SNAPSHOT_INTERVAL - 1 else content
             await history_service.record_action(
                 db=db_session,
                 user_id=test_user.id,
@@ -295,7 +316,7 @@ class TestHistoryServiceRecordAction:
             )
             previous = c
 
-        # Create version 10 as metadata-only (same content, different title)
+        # Create version 20 as metadata-only (same content, different title)
         history = await history_service.record_action(
             db=db_session,
             user_id=test_user.id,
@@ -308,7 +329,7 @@ class TestHistoryServiceRecordAction:
             context=request_context,
         )
 
-        assert history.version == SNAPSHOT_INTERVAL
+        assert history.version == MAX_SNAPSHOT_INTERVAL
         assert history.content_snapshot == content  # Snapshot for bounded reconstruction
         assert history.content_diff is None  # No content change
 
@@ -597,6 +618,135 @@ class TestHistoryServiceDiffComputation:
         assert result == original
 
 
+class TestHistoryServiceDiffPool:
+    """Tests for diff work routed through the diff worker pool."""
+
+    @pytest.fixture
+    def diff_pool(self) -> Generator[DiffWorkerPool]:
+        """Install a pool that offloads every diff, removing it afterwards."""
+        pool = DiffWorkerPool(offload_threshold=0, timeout=5.0)
+        set_diff_pool(pool)
+        yield pool
+        set_diff_pool(None)
+        pool.shutdown()
+
+    async def _record_versions(
+        self,
+        db_session: AsyncSession,
+        user: User,
+        note: Note,
+        context: RequestContext,
+        contents: list[str],
+    ) -> list[ContentHistory]:
+        """Record a CREATE for contents[0] and an UPDATE for each later entry."""
+        records = []
+        previous = None
+        for content in contents:
+            records.append(await history_service.record_action(
+                db=db_session,
+                user_id=user.id,
+                entity_type=EntityType.NOTE,
+                entity_id=note.id,
+                action=ActionType.UPDATE if previous is not None else ActionType.CREATE,
+                current_content=content,
+                previous_content=previous,
+                metadata={"title": note.title},
+                context=context,
+            ))
+            previous = content
+        return records
+
+    @pytest.mark.usefixtures("diff_pool")
+    async def test__diff_pool__offloaded_diffs_reconstruct(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        request_context: RequestContext,
+    ) -> None:
+        """Diffs computed and applied in the pool reconstruct every version."""
+        offloaded_key = 'history_diff_run_seconds_count{mode="offloaded"}'
+        offloaded = REGISTRY.local_totals().get(offloaded_key, 0.0)
+        contents = ["v1 content", "v2 content, longer", "v3 rewritten entirely"]
+        await self._record_versions(
+            db_session, test_user, test_note, request_context, contents,
+        )
+        test_note.content = contents[-1]
+        await db_session.flush()
+
+        for version, expected in enumerate(contents, start=1):
+            result = await history_service.reconstruct_content_at_version(
+                db=db_session,
+                user_id=test_user.id,
+                entity_type=EntityType.NOTE,
+                entity_id=test_note.id,
+                target_version=version,
+            )
+            assert result.content == expected
+        assert REGISTRY.local_totals()[offloaded_key] > offloaded
+
+    async def test__diff_pool__timeout_stores_snapshot_and_replacement_diff(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        request_context: RequestContext,
+        diff_pool: DiffWorkerPool,
+    ) -> None:
+        """When a diff times out, the record keeps a snapshot and a usable reverse diff."""
+        diff_pool.timeout = 0.05
+        timeouts = REGISTRY.local_totals().get("history_diff_timeouts_total", 0.0)
+
+        def slow_diff(*_args: object) -> str:
+            time.sleep(0.5)
+            return "never used"
+
+        contents = ["first version", "second version", "third version"]
+        await self._record_versions(
+            db_session, test_user, test_note, request_context, contents[:2],
+        )
+        with patch.object(diff_worker, "make_reverse_diff", slow_diff):
+            record = await history_service.record_action(
+                db=db_session,
+                user_id=test_user.id,
+                entity_type=EntityType.NOTE,
+                entity_id=test_note.id,
+                action=ActionType.UPDATE,
+                current_content=contents[2],
+                previous_content=contents[1],
+                metadata={"title": test_note.title},
+                context=request_context,
+            )
+        test_note.content = contents[-1]
+        await db_session.flush()
+
+        assert record.version == 3
+        assert record.content_snapshot == contents[2]
+        assert record.content_diff is not None
+        assert REGISTRY.local_totals()["history_diff_timeouts_total"] == timeouts + 1
+
+        # v2 is reached by applying v3's replacement diff to v3's snapshot
+        result = await history_service.reconstruct_content_at_version(
+            db=db_session,
+            user_id=test_user.id,
+            entity_type=EntityType.NOTE,
+            entity_id=test_note.id,
+            target_version=2,
+        )
+        assert result.content == contents[1]
+        assert result.warnings is None
+
+        diff = await history_service.get_version_diff(
+            db=db_session,
+            user_id=test_user.id,
+            entity_type=EntityType.NOTE,
+            entity_id=test_note.id,
+            version=3,
+        )
+        assert diff.before_content == contents[1]
+        assert diff.after_content == contents[2]
+
+
 class TestHistoryServiceReconstruction:
     """Tests for content reconstruction at specific versions."""
 
@@ -783,6 +933,7 @@ class TestHistoryServiceReconstruction:
         assert result.found is True
         assert result.content == "Content v3"
 
+    @pytest.mark.usefixtures("snapshot_every_10")
     async def test__reconstruct__through_metadata_snapshot(
         self,
         db_session: AsyncSession,
@@ -808,7 +959,7 @@ class TestHistoryServiceReconstruction:
 
         # Create v2-9 with content changes
         previous = "Content v1"
-        for i in range(2, SNAPSHOT_INTERVAL):
+        for i in range(2, 10):
             c = f"Content v{i}"
             await history_service.record_action(
                 db=db_session,
@@ -866,7 +1017,7 @@ class TestHistoryServiceReconstruction:
         )
 
         assert result.found is True
-        assert result.content == f"Content v{SNAPSHOT_INTERVAL - 1}"
+        assert result.content == "Content v9"
 
 
 class TestReconstructionChainIntegrity:
@@ -962,6 +1113,7 @@ class TestReconstructionChainIntegrity:
             )
 
 
+@pytest.mark.usefixtures("snapshot_every_10")
 class TestPeriodicSnapshotDualStorage:
     """[P0] Tests for periodic snapshot dual-storage traversal."""
 
@@ -1678,6 +1830,124 @@ class TestHistoryRetrieval:
         assert len(items) == 2
         assert all(item.entity_type == "note" for item in items)
 
+    async def _record_creates(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        request_context: RequestContext,
+        count: int,
+    ) -> None:
+        """Record CREATE history for `count` new notes."""
+        for i in range(count):
+            await history_service.record_action(
+                db=db_session,
+                user_id=test_user.id,
+                entity_type=EntityType.NOTE,
+                entity_id=uuid4(),
+                action=ActionType.CREATE,
+                current_content=f"Content {i}",
+                previous_content=None,
+                metadata={"title": f"Note {i}"},
+                context=request_context,
+            )
+
+    async def test__get_user_history_page__cursor_walks_all_records(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        request_context: RequestContext,
+    ) -> None:
+        """Following next_cursor visits every record once, in offset order."""
+        await self._record_creates(db_session, test_user, request_context, 7)
+        expected, _ = await history_service.get_user_history(
+            db_session, test_user.id, limit=100,
+        )
+
+        seen = []
+        cursor = None
+        while True:
+            page = await history_service.get_user_history_page(
+                db_session, test_user.id, limit=3, cursor=cursor,
+            )
+            assert page.total == 7
+            seen.extend(item.id for item in page.items)
+            if not page.has_more:
+                assert page.next_cursor is None
+                break
+            cursor = page.next_cursor
+
+        assert seen == [item.id for item in expected]
+
+    async def test__get_user_history_page__without_total(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        request_context: RequestContext,
+    ) -> None:
+        """include_total=False skips the count; has_more stays exact."""
+        await self._record_creates(db_session, test_user, request_context, 4)
+
+        page = await history_service.get_user_history_page(
+            db_session, test_user.id, limit=2, include_total=False,
+        )
+        assert page.total is None
+        assert page.has_more is True
+
+        page = await history_service.get_user_history_page(
+            db_session, test_user.id, limit=2, cursor=page.next_cursor, include_total=False,
+        )
+        assert len(page.items) == 2
+        assert page.has_more is False
+        assert page.next_cursor is None
+
+    async def test__get_entity_history_page__loads_timeline_columns_only(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        request_context: RequestContext,
+    ) -> None:
+        """List queries leave content_snapshot and content_diff unread."""
+        entity_id = uuid4()
+        for i in range(1, 3):
+            await history_service.record_action(
+                db=db_session,
+                user_id=test_user.id,
+                entity_type=EntityType.NOTE,
+                entity_id=entity_id,
+                action=ActionType.CREATE if i == 1 else ActionType.UPDATE,
+                current_content=f"Content {i}",
+                previous_content=None if i == 1 else "Content 1",
+                metadata={"title": "Test"},
+                context=request_context,
+            )
+        db_session.expunge_all()
+
+        page = await history_service.get_entity_history_page(
+            db_session, test_user.id, EntityType.NOTE, entity_id,
+        )
+
+        assert [item.version for item in page.items] == [2, 1]
+        for item in page.items:
+            assert {"content_snapshot", "content_diff"} <= inspect(item).unloaded
+            assert item.metadata_snapshot == {"title": "Test"}
+
+    async def test__get_user_history_page__rejects_bad_cursor(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+    ) -> None:
+        """Malformed cursors, and cursors combined with an offset, are rejected."""
+        with pytest.raises(InvalidCursorError):
+            await history_service.get_user_history_page(
+                db_session, test_user.id, cursor="not-a-cursor",
+            )
+        with pytest.raises(InvalidCursorError):
+            await history_service.get_user_history_page(
+                db_session, test_user.id, cursor=_encode_history_cursor(
+                    ContentHistory(id=uuid4(), created_at=datetime.now(UTC)),
+                ), offset=5,
+            )
+
     async def test__get_history_at_version__returns_correct_record(
         self,
         db_session: AsyncSession,
@@ -3622,3 +3892,394 @@ class TestGetVersionDiff:
         assert result.before_content is None  # Cannot derive — fallback to None
         assert result.warnings is not None
         assert any("corrupted" in w.lower() or "before-content" in w.lower() for w in result.warnings)
+
+
+class TestReconstructionVersionCache:
+    """Tests for the reconstructed-version cache in reconstruct_content_at_version."""
+
+    async def _create_versions(
+        self,
+        db_session: AsyncSession,
+        user: User,
+        note: Note,
+        context: RequestContext,
+        count: int,
+    ) -> list[str]:
+        """Record `count` versions of the note (v1 CREATE, then UPDATEs) and return contents."""
+        contents = [f"content version {i}" for i in range(1, count + 1)]
+        previous = None
+        for content in contents:
+            await history_service.record_action(
+                db=db_session,
+                user_id=user.id,
+                entity_type=EntityType.NOTE,
+                entity_id=note.id,
+                action=ActionType.UPDATE if previous is not None else ActionType.CREATE,
+                current_content=content,
+                previous_content=previous,
+                metadata={"title": note.title},
+                context=context,
+            )
+            previous = content
+        note.content = contents[-1]
+        await db_session.flush()
+        return contents
+
+    async def _reconstruct(
+        self, db_session: AsyncSession, user: User, note: Note, version: int,
+    ) -> ReconstructionResult:
+        """Reconstruct the note at a version."""
+        return await history_service.reconstruct_content_at_version(
+            db=db_session,
+            user_id=user.id,
+            entity_type=EntityType.NOTE,
+            entity_id=note.id,
+            target_version=version,
+        )
+
+    async def test__version_cache__repeat_read_skips_replay(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        request_context: RequestContext,
+    ) -> None:
+        """A second read of the same version is served from the cache."""
+        contents = await self._create_versions(
+            db_session, test_user, test_note, request_context, 5,
+        )
+        first = await self._reconstruct(db_session, test_user, test_note, 3)
+
+        with patch(
+            "services.history_service.apply_reverse_diffs",
+            side_effect=AssertionError("should not replay"),
+        ):
+            second = await self._reconstruct(db_session, test_user, test_note, 3)
+
+        assert first.content == contents[2]
+        assert second.content == contents[2]
+
+    async def test__version_cache__adjacent_version_anchors_replay(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        request_context: RequestContext,
+    ) -> None:
+        """Scrubbing down one version replays only the cached neighbour's diff."""
+        contents = await self._create_versions(
+            db_session, test_user, test_note, request_context, 6,
+        )
+        await self._reconstruct(db_session, test_user, test_note, 4)
+        anchor_hits = history_service.version_cache.stats().anchor_hits
+
+        with patch(
+            "services.history_service.apply_reverse_diffs",
+            wraps=apply_reverse_diffs,
+        ) as apply_mock:
+            result = await self._reconstruct(db_session, test_user, test_note, 3)
+
+        assert result.content == contents[2]
+        # Only v4's diff (v4 → v3) is applied, starting from cached v4
+        diffs = apply_mock.call_args.args[1]
+        assert [version for version, _ in diffs] == [4]
+        assert history_service.version_cache.stats().anchor_hits == anchor_hits + 1
+
+    async def test__version_cache__pruned_version_not_served(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        request_context: RequestContext,
+    ) -> None:
+        """A cached version whose row was deleted elsewhere is not returned."""
+        await self._create_versions(db_session, test_user, test_note, request_context, 4)
+        result = await self._reconstruct(db_session, test_user, test_note, 2)
+        assert result.found is True
+
+        # Simulates the scheduled cleanup task, which never touches this cache
+        await db_session.execute(
+            delete(ContentHistory).where(
+                ContentHistory.entity_id == test_note.id,
+                ContentHistory.version <= 2,
+            ),
+        )
+        await db_session.flush()
+
+        result = await self._reconstruct(db_session, test_user, test_note, 2)
+        assert result.found is False
+
+    async def test__version_cache__stale_anchor_falls_back_to_latest(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        request_context: RequestContext,
+    ) -> None:
+        """If the cached anchor's row was replaced, reconstruction still succeeds."""
+        contents = await self._create_versions(
+            db_session, test_user, test_note, request_context, 5,
+        )
+        entity = (test_user.id, EntityType.NOTE.value, test_note.id)
+        history_service.version_cache.put(
+            entity, CachedVersion(version=4, record_id=uuid4(), content="bogus"),
+        )
+
+        result = await self._reconstruct(db_session, test_user, test_note, 2)
+
+        assert result.content == contents[1]
+        assert history_service.version_cache.get(entity, 4) is None
+
+    async def test__version_cache__delete_entity_history_invalidates(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        request_context: RequestContext,
+    ) -> None:
+        """Hard-delete cascade drops the entity's cached versions."""
+        await self._create_versions(db_session, test_user, test_note, request_context, 4)
+        await self._reconstruct(db_session, test_user, test_note, 2)
+        entity = (test_user.id, EntityType.NOTE.value, test_note.id)
+        assert history_service.version_cache.nearest_above(entity, 0) is not None
+
+        await history_service.delete_entity_history(
+            db_session, test_user.id, EntityType.NOTE, test_note.id,
+        )
+
+        assert history_service.version_cache.nearest_above(entity, 0) is None
+
+
+class TestSnapshotPolicy:
+    """Tests for SnapshotPolicy.should_snapshot."""
+
+    def test__should_snapshot__diff_volume_over_content_size(self) -> None:
+        """Diffs since the last snapshot outweighing the content trigger a snapshot."""
+        policy = SnapshotPolicy(diff_ratio=1.0, min_diff_bytes=100, max_interval=20)
+
+        assert policy.should_snapshot(version=3, content_size=5000, diff_bytes_since=5000)
+        assert not policy.should_snapshot(version=3, content_size=5000, diff_bytes_since=4999)
+
+    def test__should_snapshot__min_diff_bytes_floor_for_small_content(self) -> None:
+        """Small content does not snapshot until the diffs reach min_diff_bytes."""
+        policy = SnapshotPolicy(diff_ratio=1.0, min_diff_bytes=4096, max_interval=20)
+
+        assert not policy.should_snapshot(version=3, content_size=50, diff_bytes_since=4000)
+        assert policy.should_snapshot(version=3, content_size=50, diff_bytes_since=4096)
+
+    def test__should_snapshot__every_max_interval_versions(self) -> None:
+        """Every max_interval-th version snapshots regardless of diff volume."""
+        policy = SnapshotPolicy(max_interval=20)
+
+        assert policy.should_snapshot(version=20, content_size=10, diff_bytes_since=0)
+        assert policy.should_snapshot(version=40, content_size=10, diff_bytes_since=0)
+        assert not policy.should_snapshot(version=21, content_size=10, diff_bytes_since=0)
+
+
+class TestAdaptiveSnapshots:
+    """Tests for snapshot placement driven by diff volume."""
+
+    @staticmethod
+    def _rewrite(i: int) -> str:
+        """~6KB content that shares nothing with the previous rewrite."""
+        return f"{i} " + "lorem ipsum " * 500 if i % 2 else "x" * 6000
+
+    async def _record(
+        self,
+        db_session: AsyncSession,
+        user: User,
+        note: Note,
+        context: RequestContext,
+        contents: list[str],
+    ) -> list[ContentHistory]:
+        """Record contents as successive versions of the note and return the records."""
+        records = []
+        previous = None
+        for content in contents:
+            records.append(await history_service.record_action(
+                db=db_session,
+                user_id=user.id,
+                entity_type=EntityType.NOTE,
+                entity_id=note.id,
+                action=ActionType.UPDATE if previous is not None else ActionType.CREATE,
+                current_content=content,
+                previous_content=previous,
+                metadata={"title": note.title},
+                context=context,
+            ))
+            previous = content
+        return records
+
+    async def test__record_action__large_rewrites_snapshot_early(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        request_context: RequestContext,
+    ) -> None:
+        """Rewrites of a large note snapshot once their diffs outweigh the content."""
+        contents = [self._rewrite(i) for i in range(1, 6)]
+
+        records = await self._record(
+            db_session, test_user, test_note, request_context, contents,
+        )
+
+        snapshot_versions = [r.version for r in records if r.content_snapshot is not None]
+        assert 1 in snapshot_versions  # CREATE always snapshots
+        assert len(snapshot_versions) > 1
+        assert all(v < MAX_SNAPSHOT_INTERVAL for v in snapshot_versions)
+
+    async def test__record_action__small_edits_wait_for_interval(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        request_context: RequestContext,
+    ) -> None:
+        """Small edits to a small note only snapshot at the periodic interval."""
+        contents = [f"Short note, edit {i}" for i in range(1, MAX_SNAPSHOT_INTERVAL + 1)]
+
+        records = await self._record(
+            db_session, test_user, test_note, request_context, contents,
+        )
+
+        snapshot_versions = [r.version for r in records if r.content_snapshot is not None]
+        assert snapshot_versions == [1, MAX_SNAPSHOT_INTERVAL]
+
+    async def test__reconstruct__from_adaptive_snapshots(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        request_context: RequestContext,
+    ) -> None:
+        """Every version reconstructs correctly across adaptively placed snapshots."""
+        contents = [self._rewrite(i) for i in range(1, 8)]
+        await self._record(db_session, test_user, test_note, request_context, contents)
+        test_note.content = contents[-1]
+        await db_session.flush()
+
+        for version, expected in enumerate(contents, start=1):
+            result = await history_service.reconstruct_content_at_version(
+                db=db_session,
+                user_id=test_user.id,
+                entity_type=EntityType.NOTE,
+                entity_id=test_note.id,
+                target_version=version,
+            )
+            assert result.content == expected
+
+
+class TestRecordMetadataUpdates:
+    """Tests for HistoryService.record_metadata_updates() (batched metadata-only writes)."""
+
+    async def _record_versions(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        note: Note,
+        request_context: RequestContext,
+        count: int,
+    ) -> None:
+        """Record `count` versions of the note without changing its content."""
+        for i in range(1, count + 1):
+            await history_service.record_action(
+                db=db_session,
+                user_id=test_user.id,
+                entity_type=EntityType.NOTE,
+                entity_id=note.id,
+                action=ActionType.CREATE if i == 1 else ActionType.UPDATE,
+                current_content=note.content,
+                previous_content=None if i == 1 else note.content,
+                metadata={"title": f"v{i}"},
+                context=request_context,
+            )
+
+    async def test__record_metadata_updates__allocates_next_version_per_entity(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        pat_context: RequestContext,
+    ) -> None:
+        """Each entity gets its own next version; entities without history start at 1."""
+        await self._record_versions(db_session, test_user, test_note, pat_context, 3)
+        new_entity_id = uuid4()
+
+        await history_service.record_metadata_updates(
+            db_session,
+            test_user.id,
+            EntityType.NOTE,
+            [(test_note.id, {"title": "linked"}), (new_entity_id, {"title": "other"})],
+            pat_context,
+            changed_fields=["relationships"],
+        )
+
+        record = await history_service.get_history_at_version(
+            db_session, test_user.id, EntityType.NOTE, test_note.id, 4,
+        )
+        assert record.content_diff is None
+        assert record.content_snapshot is None
+        items, _ = await history_service.get_entity_history(
+            db_session, test_user.id, EntityType.NOTE, test_note.id,
+        )
+        latest = items[0]
+        assert latest.version == 4
+        assert latest.action == ActionType.UPDATE.value
+        assert latest.metadata_snapshot == {"title": "linked"}
+        assert latest.changed_fields == ["relationships"]
+        assert latest.auth_type == AuthType.PAT.value
+        assert latest.token_prefix == pat_context.token_prefix
+        items, _ = await history_service.get_entity_history(
+            db_session, test_user.id, EntityType.NOTE, new_entity_id,
+        )
+        assert [r.version for r in items] == [1]
+
+    @pytest.mark.usefixtures("snapshot_every_10")
+    async def test__record_metadata_updates__snapshots_on_interval(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        request_context: RequestContext,
+    ) -> None:
+        """A version on the snapshot interval stores the entity's current content."""
+        await self._record_versions(db_session, test_user, test_note, request_context, 9)
+
+        await history_service.record_metadata_updates(
+            db_session, test_user.id, EntityType.NOTE,
+            [(test_note.id, {"title": "v10"})], request_context,
+        )
+
+        record = await history_service.get_history_at_version(
+            db_session, test_user.id, EntityType.NOTE, test_note.id, 10,
+        )
+        assert record.content_snapshot == test_note.content
+        result = await history_service.reconstruct_content_at_version(
+            db_session, test_user.id, EntityType.NOTE, test_note.id, 5,
+        )
+        assert result.content == test_note.content
+
+    async def test__record_metadata_updates__prunes_on_check_interval(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_note: Note,
+        request_context: RequestContext,
+    ) -> None:
+        """Pruning runs for entities whose new version hits PRUNE_CHECK_INTERVAL."""
+        limits = replace(get_tier_limits(Tier.FREE), max_history_per_entity=5)
+        await self._record_versions(
+            db_session, test_user, test_note, request_context, PRUNE_CHECK_INTERVAL - 1,
+        )
+
+        await history_service.record_metadata_updates(
+            db_session, test_user.id, EntityType.NOTE,
+            [(test_note.id, {"title": "linked"})], request_context,
+            limits=limits,
+        )
+
+        _, total = await history_service.get_entity_history(
+            db_session, test_user.id, EntityType.NOTE, test_note.id,
+        )
+        assert total == limits.max_history_per_entity
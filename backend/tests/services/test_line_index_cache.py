@@ -0,0 +1,86 @@
+"""Tests for the line index cache."""
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from services.content_lines import line_offsets
+from services.line_index_cache import EntityKey, LineIndex, LineIndexCache
+
+
+def _entity() -> EntityKey:
+    """Random (entity_type, entity_id) key."""
+    return ("note", uuid4())
+
+
+def _index(content: str = "a\nb\nc") -> LineIndex:
+    """Line index of `content`."""
+    return LineIndex(
+        updated_at=datetime(2026, 1, 1, tzinfo=UTC),
+        length=len(content),
+        byte_length=len(content.encode()),
+        offsets=line_offsets(content),
+    )
+
+
+class TestLineIndexCache:
+    """Tests for LineIndexCache lookups, eviction, and staleness."""
+
+    def test__get__returns_cached_index(self) -> None:
+        """A cached index is returned and counted as a hit."""
+        cache = LineIndexCache()
+        entity = _entity()
+        entry = _index()
+        cache.put(entity, entry)
+
+        assert cache.get(entity) == entry
+        assert cache.get(_entity()) is None
+        stats = cache.stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+        assert entry.total_lines == 3
+
+    def test__put__replaces_entity_entry(self) -> None:
+        """Putting a new version replaces the old one and its size."""
+        cache = LineIndexCache()
+        entity = _entity()
+        cache.put(entity, _index("a\nb\nc"))
+        newer = _index("a")
+        cache.put(entity, newer)
+
+        assert cache.get(entity) == newer
+        assert cache.size_bytes == newer.offsets.itemsize
+
+    def test__put__evicts_least_recently_used(self) -> None:
+        """Going over budget evicts the least recently used index."""
+        entry_size = _index().offsets.itemsize * 3
+        cache = LineIndexCache(max_bytes=entry_size * 2)
+        first, second, third = _entity(), _entity(), _entity()
+        cache.put(first, _index())
+        cache.put(second, _index())
+        cache.get(first)  # first is now more recent than second
+        cache.put(third, _index())
+
+        assert cache.get(second) is None
+        assert cache.get(first) is not None
+        assert cache.get(third) is not None
+        assert cache.stats().evictions == 1
+        assert cache.size_bytes == entry_size * 2
+
+    def test__put__skips_index_larger_than_budget(self) -> None:
+        """An index bigger than the whole budget is not cached."""
+        cache = LineIndexCache(max_bytes=4)
+        entity = _entity()
+        cache.put(entity, _index("a\nb"))
+
+        assert cache.get(entity) is None
+        assert cache.size_bytes == 0
+
+    def test__mark_stale__drops_entry(self) -> None:
+        """A stale index is dropped and counted."""
+        cache = LineIndexCache()
+        entity = _entity()
+        cache.put(entity, _index())
+        cache.mark_stale(entity)
+
+        assert cache.get(entity) is None
+        assert cache.stats().stale == 1
+        assert cache.size_bytes == 0
@@ -5,6 +5,7 @@ Tests the soft delete, archive, restore, and view filtering functionality
 that was added to support the trash/archive features.
 """
 import asyncio
+from collections.abc import Generator
 from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 import re
@@ -22,6 +23,7 @@ from models.tag import note_tags
 from models.user import User
 from schemas.note import NoteCreate, NoteUpdate
 from services.exceptions import FieldLimitExceededError, InvalidStateError, QuotaExceededError
+from services.line_index_cache import LineIndexCache, set_line_index_cache
 from services.note_service import NoteService
 from services.utils import build_tag_filter_from_expression, escape_ilike
 from services.base_entity_service import CONTENT_PREVIEW_LENGTH
@@ -1235,3 +1237,133 @@ async def test__update__tag_name_exceeds_max_length__raises(
             db_session, test_user.id, note.id,
             NoteUpdate(tags=[long_tag]), low_limits,
         )
+
+
+# =============================================================================
+# Line Range Read Tests
+# =============================================================================
+
+
+@pytest.fixture
+def line_index_cache() -> Generator[LineIndexCache]:
+    """Enable the line index cache for the test."""
+    cache = LineIndexCache()
+    set_line_index_cache(cache)
+    yield cache
+    set_line_index_cache(None)
+
+
+async def _create_note_with_lines(db_session: AsyncSession, user: User, lines: int) -> Note:
+    """Create a note with numbered lines and drop it from the session's identity map."""
+    note = await note_service.create(
+        db_session, user.id,
+        NoteCreate(title='Lines', content='\n'.join(f'line {i}' for i in range(1, lines + 1))),
+        DEFAULT_LIMITS,
+    )
+    db_session.expunge_all()
+    return note
+
+
+async def test__get_with_line_range__builds_then_uses_index(
+    db_session: AsyncSession,
+    test_user: User,
+    line_index_cache: LineIndexCache,
+) -> None:
+    """The first read builds the index; later reads select only the range."""
+    note = await _create_note_with_lines(db_session, test_user, 1000)
+
+    first = await note_service.get_with_line_range(db_session, test_user.id, note.id, 500, 502)
+    assert first.content == 'line 500\nline 501\nline 502'
+    assert first.content_metadata.total_lines == 1000
+    assert first.content_metadata.is_partial is True
+    assert line_index_cache.stats().misses == 1
+
+    second = await note_service.get_with_line_range(db_session, test_user.id, note.id, 999, None)
+    assert second.content == 'line 999\nline 1000'
+    assert second.content_metadata.end_line == 1000
+    assert second.content_length == len(
+        '\n'.join(f'line {i}' for i in range(1, 1001)),
+    )
+    assert [t.name for t in second.tag_objects] == []
+    assert line_index_cache.stats().hits == 1
+
+
+async def test__get_with_line_range__content_change_rebuilds_index(
+    db_session: AsyncSession,
+    test_user: User,
+    line_index_cache: LineIndexCache,
+) -> None:
+    """An index for an older content version is not used."""
+    note = await _create_note_with_lines(db_session, test_user, 10)
+    await note_service.get_with_line_range(db_session, test_user.id, note.id, 1, 1)
+
+    await note_service.update(
+        db_session, test_user.id, note.id, NoteUpdate(content='new\nfirst\nlines'), DEFAULT_LIMITS,
+    )
+    db_session.expunge_all()
+
+    result = await note_service.get_with_line_range(db_session, test_user.id, note.id, 2, 3)
+    assert result.content == 'first\nlines'
+    assert result.content_metadata.total_lines == 3
+    assert line_index_cache.stats().stale == 1
+
+
+async def test__get_with_line_range__invalid_range_raises(
+    db_session: AsyncSession,
+    test_user: User,
+    line_index_cache: LineIndexCache,  # noqa: ARG001
+) -> None:
+    """A start line past the end of the content raises ValueError."""
+    note = await _create_note_with_lines(db_session, test_user, 3)
+
+    with pytest.raises(ValueError, match='exceeds total lines'):
+        await note_service.get_with_line_range(db_session, test_user.id, note.id, 4, None)
+
+
+async def test__get_with_line_range__null_content(
+    db_session: AsyncSession,
+    test_user: User,
+) -> None:
+    """NULL content is returned as None without metadata."""
+    note = await note_service.create(
+        db_session, test_user.id, NoteCreate(title='Empty'), DEFAULT_LIMITS,
+    )
+    db_session.expunge_all()
+
+    result = await note_service.get_with_line_range(db_session, test_user.id, note.id, 1, 2)
+    assert result.content is None
+    assert getattr(result, 'content_metadata', None) is None
+
+
+async def test__get_with_line_range__respects_filters(
+    db_session: AsyncSession,
+    test_user: User,
+) -> None:
+    """Deleted notes are only returned when include_deleted is set."""
+    note = await _create_note_with_lines(db_session, test_user, 3)
+    await note_service.delete(db_session, test_user.id, note.id)
+    db_session.expunge_all()
+
+    assert await note_service.get_with_line_range(
+        db_session, test_user.id, note.id, 1, 1,
+    ) is None
+    result = await note_service.get_with_line_range(
+        db_session, test_user.id, note.id, 1, 1, include_deleted=True,
+    )
+    assert result.content == 'line 1'
+
+
+async def test__line_index__shared_with_line_range_reads(
+    db_session: AsyncSession,
+    test_user: User,
+    line_index_cache: LineIndexCache,
+) -> None:
+    """line_index() reuses the index built by a range read of the same version."""
+    note = await _create_note_with_lines(db_session, test_user, 5)
+    await note_service.get_with_line_range(db_session, test_user.id, note.id, 1, 1)
+
+    full = await note_service.get(db_session, test_user.id, note.id)
+    index = note_service.line_index(full)
+    assert index is not None
+    assert index.total_lines == 5
+    assert line_index_cache.stats().hits == 1
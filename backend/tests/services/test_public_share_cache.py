@@ -0,0 +1,352 @@
+"""Tests for the rendered public share payload cache."""
+import asyncio
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.http_cache import generate_etag
+from core.redis import RedisClient
+from db.hooks import run_after_commit_callbacks
+from services.public_share_cache import (
+    CACHE_SCHEMA_VERSION,
+    CachedPublicItem,
+    PublicShareCache,
+    PublicShareCacheStats,
+    get_public_share_cache,
+    invalidate_public_share,
+    set_public_share_cache,
+)
+
+
+class _Loader:
+    """A `load` callable that counts calls and can be held open."""
+
+    def __init__(
+        self,
+        body: bytes | None = b'{"title": "Shared"}',
+        archived_at: datetime | None = None,
+    ) -> None:
+        self.body = body
+        self.archived_at = archived_at
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self) -> CachedPublicItem | None:
+        self.calls += 1
+        await self.release.wait()
+        if self.body is None:
+            return None
+        return CachedPublicItem.from_body(self.body, self.archived_at)
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    """Poll `condition` for up to 2s (pub/sub delivery is asynchronous)."""
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met within 2s")
+
+
+@pytest.fixture
+def local_cache() -> PublicShareCache:
+    """Cache whose Redis tier is disabled (nothing is stored)."""
+    return PublicShareCache(RedisClient("redis://localhost:6379", enabled=False))
+
+
+class TestPublicShareCacheLocal:
+    """Tests that need no Redis."""
+
+    async def test__get_or_load__returns_body_with_etag(
+        self, local_cache: PublicShareCache,
+    ) -> None:
+        """A miss renders the body; its ETag is the one ETagMiddleware would compute."""
+        item = await local_cache.get_or_load("note", "tok", _Loader())
+
+        assert item == CachedPublicItem(b'{"title": "Shared"}', generate_etag(b'{"title": "Shared"}'))
+
+    async def test__get_or_load__unknown_token_returns_none(
+        self, local_cache: PublicShareCache,
+    ) -> None:
+        """A load returning None yields None."""
+        assert await local_cache.get_or_load("note", "tok", _Loader(None)) is None
+
+    async def test__get_or_load__concurrent_misses_share_one_load(
+        self, local_cache: PublicShareCache,
+    ) -> None:
+        """Concurrent requests for the same token wait on a single load."""
+        loader = _Loader()
+        loader.release.clear()
+
+        tasks = [
+            asyncio.create_task(local_cache.get_or_load("note", "tok", loader))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.01)
+        loader.release.set()
+        items = await asyncio.gather(*tasks)
+
+        assert loader.calls == 1
+        assert len(set(items)) == 1
+        assert local_cache.stats().coalesced == 4
+
+    async def test__get_or_load__different_tokens_load_separately(
+        self, local_cache: PublicShareCache,
+    ) -> None:
+        """Single-flight is per token (and per content type)."""
+        loader = _Loader()
+
+        await asyncio.gather(
+            local_cache.get_or_load("note", "a", loader),
+            local_cache.get_or_load("note", "b", loader),
+            local_cache.get_or_load("prompt", "a", loader),
+        )
+
+        assert loader.calls == 3
+
+    async def test__get_or_load__waiters_retry_when_load_fails(
+        self, local_cache: PublicShareCache,
+    ) -> None:
+        """If the shared load fails, the waiter runs its own instead of failing too."""
+        release = asyncio.Event()
+
+        async def failing() -> CachedPublicItem | None:
+            await release.wait()
+            raise RuntimeError("db down")
+
+        loader = _Loader()
+        leader = asyncio.create_task(local_cache.get_or_load("note", "tok", failing))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(local_cache.get_or_load("note", "tok", loader))
+        await asyncio.sleep(0.01)
+        release.set()
+
+        with pytest.raises(RuntimeError):
+            await leader
+        assert (await waiter) is not None
+        assert loader.calls == 1
+
+    async def test__invalidate__without_redis_succeeds(
+        self, local_cache: PublicShareCache,
+    ) -> None:
+        """With Redis disabled nothing can be cached, so invalidation trivially succeeds."""
+        assert await local_cache.invalidate("note", "tok") is True
+
+    def test__from_body__future_archive_sets_expiry(self) -> None:
+        """A scheduled archive bounds the item's lifetime; a past one does not."""
+        archived_at = datetime.now(UTC) + timedelta(minutes=1)
+
+        scheduled = CachedPublicItem.from_body(b"{}", archived_at)
+        archived = CachedPublicItem.from_body(b"{}", datetime.now(UTC) - timedelta(minutes=1))
+
+        assert scheduled.expires_at == archived_at.timestamp()
+        assert 0 < scheduled.seconds_left() <= 60
+        assert archived.expires_at is None
+
+    def test__encode__round_trips(self) -> None:
+        """Items read back from Redis keep their body, ETag and expiry."""
+        expiring = CachedPublicItem.from_body(b'{"a": 1}', datetime.now(UTC) + timedelta(minutes=1))
+        plain = CachedPublicItem.from_body(b'{"a": 1}')
+
+        assert CachedPublicItem.decode(expiring.encode()) == expiring
+        assert CachedPublicItem.decode(plain.encode()) == plain
+
+    def test__cache_key__hashes_token(self, local_cache: PublicShareCache) -> None:
+        """Share tokens are secrets and never appear in keys."""
+        key = local_cache._cache_key("note", "secret-token")
+
+        assert key.startswith(f"public:v{CACHE_SCHEMA_VERSION}:note:")
+        assert "secret-token" not in key
+
+
+class TestPublicShareCacheRedis:
+    """Tests for the Redis tier and invalidation."""
+
+    async def test__get_or_load__second_read_hits_redis(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """A rendered payload is stored; the next read does not load."""
+        cache = PublicShareCache(redis_client)
+        loader = _Loader()
+
+        first = await cache.get_or_load("note", "tok", loader)
+        second = await cache.get_or_load("note", "tok", loader)
+
+        assert first == second
+        assert loader.calls == 1
+        assert cache.stats() == PublicShareCacheStats(l1_misses=2, l2_hits=1, l2_misses=1)
+
+    async def test__get_or_load__unknown_token_is_not_cached(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """404s are not cached: every read of an unknown token loads."""
+        cache = PublicShareCache(redis_client)
+        loader = _Loader(None)
+
+        await cache.get_or_load("note", "tok", loader)
+        await cache.get_or_load("note", "tok", loader)
+
+        assert loader.calls == 2
+
+    async def test__invalidate__next_read_loads(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """After invalidate() the payload is rendered again."""
+        cache = PublicShareCache(redis_client)
+        loader = _Loader()
+        await cache.get_or_load("note", "tok", loader)
+
+        assert await cache.invalidate("note", "tok") is True
+        loader.body = b'{"title": "Edited"}'
+        item = await cache.get_or_load("note", "tok", loader)
+
+        assert item is not None
+        assert item.body == b'{"title": "Edited"}'
+        assert loader.calls == 2
+
+    async def test__invalidate__during_load_is_not_overwritten(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """A payload read before an invalidation is served once but never cached."""
+        cache = PublicShareCache(redis_client)
+        loader = _Loader()
+        loader.release.clear()
+
+        stale = asyncio.create_task(cache.get_or_load("note", "tok", loader))
+        await asyncio.sleep(0.01)
+        await cache.invalidate("note", "tok")
+        loader.release.set()
+        await stale
+
+        assert await redis_client.get(cache._cache_key("note", "tok")) is None
+
+    async def test__invalidate__on_other_worker_during_load_is_not_cached(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """A load overlapping another worker's invalidation does not cache its payload."""
+        reader = PublicShareCache(redis_client)
+        writer = PublicShareCache(redis_client)
+        loader = _Loader()
+        loader.release.clear()
+
+        stale = asyncio.create_task(reader.get_or_load("note", "tok", loader))
+        await asyncio.sleep(0.01)
+        assert await writer.invalidate("note", "tok")
+        loader.release.set()
+        assert await stale is not None
+
+        assert await redis_client.get(reader._cache_key("note", "tok")) is None
+        # The next load (after the invalidation) is cached again.
+        await reader.get_or_load("note", "tok", loader)
+        assert await redis_client.get(reader._cache_key("note", "tok")) is not None
+
+    async def test__invalidate__on_other_worker_keeps_newer_payload(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """A slow stale load cannot overwrite the payload cached after the write."""
+        slow = PublicShareCache(redis_client)
+        fast = PublicShareCache(redis_client)
+        stale_loader = _Loader(b'{"title": "Old"}')
+        stale_loader.release.clear()
+
+        stale = asyncio.create_task(slow.get_or_load("note", "tok", stale_loader))
+        await asyncio.sleep(0.01)
+        assert await fast.invalidate("note", "tok")
+        await fast.get_or_load("note", "tok", _Loader(b'{"title": "New"}'))
+        stale_loader.release.set()
+        await stale
+
+        item = await PublicShareCache(redis_client).get_or_load("note", "tok", _Loader(None))
+        assert item is not None
+        assert item.body == b'{"title": "New"}'
+
+    async def test__get_or_load__scheduled_archive_caps_ttl(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """An item whose archive is scheduled is cached only until it takes effect."""
+        cache = PublicShareCache(redis_client)
+        loader = _Loader(archived_at=datetime.now(UTC) + timedelta(seconds=2))
+
+        await cache.get_or_load("note", "tok", loader)
+        ttl = await redis_client.ttl(cache._cache_key("note", "tok"))
+        assert ttl is not None
+        assert ttl <= 2
+
+        await asyncio.sleep(2.1)
+        loader.archived_at = None
+        await cache.get_or_load("note", "tok", loader)
+        assert loader.calls == 2
+
+    async def test__l1__invalidation_on_other_worker_evicts(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """invalidate() on one instance evicts the L1 copy held by another."""
+        reader = PublicShareCache(redis_client)
+        writer = PublicShareCache(redis_client)
+        await reader.start()
+        try:
+            await _wait_for(lambda: reader.l1_active)
+            loader = _Loader()
+            await reader.get_or_load("note", "tok", loader)
+            await reader.get_or_load("note", "tok", loader)
+            assert reader.stats().l1_hits == 1
+
+            assert await writer.invalidate("note", "tok")
+            await _wait_for(lambda: not reader._l1)
+
+            await reader.get_or_load("note", "tok", loader)
+            assert loader.calls == 2
+        finally:
+            await reader.stop()
+
+        assert reader.l1_active is False
+        assert reader.size_bytes == 0
+
+
+class TestInvalidatePublicShare:
+    """Tests for the write-path helper."""
+
+    @pytest.fixture
+    def installed_cache(self) -> Iterator[PublicShareCache]:
+        """Install a Redis-less cache as the global instance."""
+        cache = PublicShareCache(RedisClient("redis://localhost:6379", enabled=False))
+        set_public_share_cache(cache)
+        yield cache
+        set_public_share_cache(None)
+
+    async def test__invalidate_public_share__evicts_now_and_after_commit(
+        self, installed_cache: PublicShareCache,
+    ) -> None:
+        """The token is evicted immediately and again by the post-commit hook."""
+        db = AsyncSession()
+        generation = installed_cache._generation
+
+        await invalidate_public_share(db, "note", "tok")
+        assert installed_cache._generation == generation + 1
+
+        await run_after_commit_callbacks(db)
+        assert installed_cache._generation == generation + 2
+
+    async def test__invalidate_public_share__ignores_unshared(
+        self, installed_cache: PublicShareCache,
+    ) -> None:
+        """Items that were never shared (no token) need no invalidation."""
+        db = AsyncSession()
+        generation = installed_cache._generation
+
+        await invalidate_public_share(db, "note", None)
+        await run_after_commit_callbacks(db)
+
+        assert installed_cache._generation == generation
+
+    async def test__invalidate_public_share__no_cache_is_noop(self) -> None:
+        """Without a cache installed nothing is registered."""
+        assert get_public_share_cache() is None
+        db = AsyncSession()
+
+        await invalidate_public_share(db, "note", "tok")
+
+        assert "after_commit" not in db.info
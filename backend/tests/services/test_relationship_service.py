@@ -1,12 +1,16 @@
 """Tests for the relationship service layer."""
+from collections.abc import AsyncGenerator
 from datetime import UTC, datetime, timedelta
+from itertools import pairwise
 from uuid import UUID, uuid4
 
 import pytest
 from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.redis import RedisClient
 from core.tier_limits import Tier
+from db.hooks import run_after_commit_callbacks
 from models.bookmark import Bookmark
 from models.note import Note
 from models.prompt import Prompt
@@ -18,15 +22,23 @@ from services.exceptions import (
     InvalidRelationshipError,
     QuotaExceededError,
 )
+from services.relationship_graph_cache import (
+    RelationshipGraphCache,
+    get_relationship_graph_cache,
+    set_relationship_graph_cache,
+)
 from services.relationship_service import (
+    _walk_adjacency,
     canonical_pair,
     create_relationship,
     delete_relationship,
     delete_relationships_for_content,
     enrich_with_content_info,
     get_relationship,
+    get_relationship_graph,
     get_relationships_for_content,
     get_relationships_snapshot,
+    get_relationships_snapshots,
     sync_relationships_for_entity,
     update_relationship,
     validate_content_exists,
@@ -1390,6 +1402,34 @@ class TestGetRelationshipsSnapshot:
         )
         assert snap1 == snap2
 
+    async def test__snapshots__batch_matches_single_entity_snapshots(
+        self, db_session: AsyncSession, test_user: User,
+        bookmark_a: Bookmark, note_a: Note, note_b: Note, prompt_a: Prompt,
+    ) -> None:
+        """Batched snapshots equal per-entity snapshots, including links between batch members."""
+        await create_relationship(
+            db_session, test_user.id,
+            'bookmark', bookmark_a.id, 'note', note_a.id, 'related',
+        )
+        await create_relationship(
+            db_session, test_user.id,
+            'note', note_a.id, 'prompt', prompt_a.id, 'related', description='Uses',
+        )
+        entities = [
+            ('bookmark', bookmark_a.id), ('note', note_a.id),
+            ('note', note_b.id), ('prompt', prompt_a.id),
+        ]
+
+        snapshots = await get_relationships_snapshots(db_session, test_user.id, entities)
+
+        assert set(snapshots) == set(entities)
+        for entity_type, entity_id in entities:
+            assert snapshots[(entity_type, entity_id)] == await get_relationships_snapshot(
+                db_session, test_user.id, entity_type, entity_id,
+            )
+        assert len(snapshots[('note', note_a.id)]) == 2
+        assert snapshots[('note', note_b.id)] == []
+
 
 # ---------------------------------------------------------------------------
 # sync_relationships_for_entity
@@ -1655,3 +1695,264 @@ class TestSyncRelationshipsForEntity:
             db_session, test_user.id, 'bookmark', bookmark_a.id,
         )
         assert len(snapshot) == 2
+
+
+class TestWalkAdjacency:
+    """Tests for the in-memory graph walk used with cached adjacency."""
+
+    A, B, C, D, E = (('note', uuid4()) for _ in range(5))
+
+    def _edge(self, a: tuple[str, UUID], b: tuple[str, UUID]) -> tuple[str, UUID, str, UUID]:
+        return (a[0], a[1], b[0], b[1])
+
+    def test__walk__follows_both_directions_up_to_depth(self) -> None:
+        """Edges are followed from either end; items past `depth` are left out."""
+        edges = [self._edge(self.A, self.B), self._edge(self.C, self.B), self._edge(self.C, self.D)]
+
+        nodes = _walk_adjacency(edges, self.A, depth=2, fan_out=10)
+
+        assert nodes == {self.A: 0, self.B: 1, self.C: 2}
+
+    def test__walk__fan_out_keeps_newest_edges(self) -> None:
+        """Only the first `fan_out` (newest) edges of each item are followed."""
+        edges = [self._edge(self.A, self.B), self._edge(self.A, self.C), self._edge(self.A, self.D)]
+
+        nodes = _walk_adjacency(edges, self.A, depth=1, fan_out=2)
+
+        assert nodes == {self.A: 0, self.B: 1, self.C: 1}
+
+    def test__walk__keeps_shortest_distance(self) -> None:
+        """An item reachable at several depths is reported at the smallest one."""
+        edges = [
+            self._edge(self.A, self.B),
+            self._edge(self.B, self.C),
+            self._edge(self.A, self.C),
+            self._edge(self.C, self.A),
+        ]
+
+        nodes = _walk_adjacency(edges, self.A, depth=3, fan_out=10)
+
+        assert nodes == {self.A: 0, self.B: 1, self.C: 1}
+
+    def test__walk__isolated_root(self) -> None:
+        """A root with no relationships is the whole graph."""
+        assert _walk_adjacency([], self.E, depth=3, fan_out=10) == {self.E: 0}
+
+
+@pytest.fixture
+async def graph_cache(redis_client: RedisClient) -> AsyncGenerator[RelationshipGraphCache]:
+    """Enable the relationship graph cache for the test."""
+    cache = RelationshipGraphCache(redis_client)
+    set_relationship_graph_cache(cache)
+    yield cache
+    set_relationship_graph_cache(None)
+
+
+async def _create_chain(
+    db_session: AsyncSession, user_id: UUID, length: int,
+) -> list[Note]:
+    """Create `length` notes where each is related to the next."""
+    notes = [Note(user_id=user_id, title=f'Chain {i}') for i in range(length)]
+    db_session.add_all(notes)
+    await db_session.flush()
+    for a, b in pairwise(notes):
+        await create_relationship(db_session, user_id, 'note', a.id, 'note', b.id, 'related')
+    return notes
+
+
+class TestGetRelationshipGraph:
+    """Tests for get_relationship_graph()."""
+
+    async def test__graph__returns_items_within_depth(
+        self, db_session: AsyncSession, test_user: User,
+    ) -> None:
+        """Items are returned with their hop count; relationships are the induced subgraph."""
+        chain = await _create_chain(db_session, test_user.id, 4)
+
+        graph = await get_relationship_graph(
+            db_session, test_user.id, 'note', chain[1].id, depth=1,
+        )
+
+        assert graph.nodes == {
+            ('note', chain[1].id): 0,
+            ('note', chain[0].id): 1,
+            ('note', chain[2].id): 1,
+        }
+        assert len(graph.relationships) == 2
+        assert graph.truncated is False
+
+    async def test__graph__fan_out_and_max_nodes(
+        self, db_session: AsyncSession, test_user: User,
+        bookmark_a: Bookmark, note_a: Note, note_b: Note, prompt_a: Prompt,
+    ) -> None:
+        """fan_out limits relationships followed per item; max_nodes truncates by distance."""
+        for target_type, target_id in [
+            ('note', note_a.id), ('note', note_b.id), ('prompt', prompt_a.id),
+        ]:
+            await create_relationship(
+                db_session, test_user.id, 'bookmark', bookmark_a.id,
+                target_type, target_id, 'related',
+            )
+
+        graph = await get_relationship_graph(
+            db_session, test_user.id, 'bookmark', bookmark_a.id, fan_out=2,
+        )
+        assert len(graph.nodes) == 3
+        assert ('prompt', prompt_a.id) in graph.nodes  # Newest relationship is kept
+
+        graph = await get_relationship_graph(
+            db_session, test_user.id, 'bookmark', bookmark_a.id, max_nodes=2,
+        )
+        assert len(graph.nodes) == 2
+        assert graph.nodes[('bookmark', bookmark_a.id)] == 0
+        assert graph.truncated is True
+
+    async def test__graph__unrelated_root(
+        self, db_session: AsyncSession, test_user: User, note_a: Note,
+    ) -> None:
+        """An item without relationships yields just itself."""
+        graph = await get_relationship_graph(db_session, test_user.id, 'note', note_a.id)
+
+        assert graph.nodes == {('note', note_a.id): 0}
+        assert graph.relationships == []
+
+    async def test__graph__isolated_between_users(
+        self, db_session: AsyncSession, test_user: User, other_user: User,
+    ) -> None:
+        """Another user's relationships are never followed."""
+        chain = await _create_chain(db_session, test_user.id, 2)
+
+        graph = await get_relationship_graph(
+            db_session, other_user.id, 'note', chain[0].id,
+        )
+
+        assert graph.nodes == {('note', chain[0].id): 0}
+
+    async def test__graph__cached_walk_matches_database_walk(
+        self, db_session: AsyncSession, test_user: User, graph_cache: RelationshipGraphCache,
+    ) -> None:
+        """The walk over cached adjacency returns the same graph as the recursive query."""
+        chain = await _create_chain(db_session, test_user.id, 5)
+        await create_relationship(
+            db_session, test_user.id, 'note', chain[0].id, 'note', chain[3].id, 'related',
+        )
+
+        set_relationship_graph_cache(None)
+        expected = await get_relationship_graph(
+            db_session, test_user.id, 'note', chain[0].id, depth=3, fan_out=2,
+        )
+        set_relationship_graph_cache(graph_cache)
+
+        first = await get_relationship_graph(
+            db_session, test_user.id, 'note', chain[0].id, depth=3, fan_out=2,
+        )
+        second = await get_relationship_graph(
+            db_session, test_user.id, 'note', chain[0].id, depth=3, fan_out=2,
+        )
+
+        assert first.nodes == expected.nodes
+        assert second.nodes == expected.nodes
+        assert [r.id for r in second.relationships] == [r.id for r in expected.relationships]
+        assert graph_cache.stats().misses == 1
+        assert graph_cache.stats().hits == 1
+
+    async def test__graph__cache_invalidated_by_relationship_changes(
+        self, db_session: AsyncSession, test_user: User, graph_cache: RelationshipGraphCache,
+        note_a: Note, note_b: Note,
+    ) -> None:
+        """Creating, syncing, and deleting relationships drop the cached adjacency."""
+        assert get_relationship_graph_cache() is graph_cache
+
+        async def node_ids() -> set[UUID]:
+            graph = await get_relationship_graph(db_session, test_user.id, 'note', note_a.id)
+            return {node_id for _, node_id in graph.nodes}
+
+        assert await node_ids() == {note_a.id}
+
+        rel = await create_relationship(
+            db_session, test_user.id, 'note', note_a.id, 'note', note_b.id, 'related',
+        )
+        assert await node_ids() == {note_a.id, note_b.id}
+
+        await delete_relationship(db_session, test_user.id, rel.id)
+        assert await node_ids() == {note_a.id}
+
+        await sync_relationships_for_entity(
+            db_session, test_user.id, 'note', note_a.id,
+            [RelationshipInput(target_type='note', target_id=note_b.id)],
+        )
+        assert await node_ids() == {note_a.id, note_b.id}
+
+        await delete_relationships_for_content(db_session, test_user.id, 'note', note_b.id)
+        assert await node_ids() == {note_a.id}
+
+    async def test__graph__stale_fill_before_commit_is_evicted_after_commit(
+        self, db_session: AsyncSession, test_user: User, graph_cache: RelationshipGraphCache,
+        note_a: Note, note_b: Note,
+    ) -> None:
+        """Adjacency cached by a concurrent read before the commit is dropped after it."""
+        await create_relationship(
+            db_session, test_user.id, 'note', note_a.id, 'note', note_b.id, 'related',
+        )
+        # A concurrent request that still sees the pre-commit (empty) graph
+        await graph_cache.set(test_user.id, [])
+
+        await run_after_commit_callbacks(db_session)
+
+        assert await graph_cache.get(test_user.id) is None
+
+    async def test__graph__without_redis_uses_database_walk(
+        self, db_session: AsyncSession, test_user: User,
+    ) -> None:
+        """With Redis disabled the cache is unavailable and the adjacency is never loaded."""
+        cache = RelationshipGraphCache(RedisClient('redis://localhost:6379', enabled=False))
+        set_relationship_graph_cache(cache)
+        try:
+            chain = await _create_chain(db_session, test_user.id, 3)
+            graph = await get_relationship_graph(db_session, test_user.id, 'note', chain[0].id)
+        finally:
+            set_relationship_graph_cache(None)
+
+        assert len(graph.nodes) == 3
+        assert cache.available is False
+        assert cache.stats().misses == 0
+
+    async def test__graph__oversized_adjacency_falls_back_to_database(
+        self, db_session: AsyncSession, test_user: User, graph_cache: RelationshipGraphCache,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Users with more than MAX_EDGES relationships are walked in the database."""
+        monkeypatch.setattr(RelationshipGraphCache, 'MAX_EDGES', 1)
+        chain = await _create_chain(db_session, test_user.id, 3)
+
+        graph = await get_relationship_graph(db_session, test_user.id, 'note', chain[0].id)
+
+        assert len(graph.nodes) == 3
+        cached = await graph_cache.get(test_user.id)
+        assert cached is not None
+        assert cached.edges is None
+
+
+class TestRelationshipGraphCacheAvailability:
+    """Tests for when the adjacency cache is used at all."""
+
+    async def test__available__false_without_redis(self) -> None:
+        """A disabled Redis client makes the cache unavailable."""
+        cache = RelationshipGraphCache(RedisClient('redis://localhost:6379', enabled=False))
+
+        assert cache.available is False
+
+    async def test__set__failure_backs_off(
+        self, redis_client: RedisClient, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """A failed write marks the cache unavailable for UNAVAILABLE_BACKOFF seconds."""
+        cache = RelationshipGraphCache(redis_client)
+        assert cache.available is True
+
+        async def failing_setex(*_args: object) -> bool:
+            return False
+
+        monkeypatch.setattr(redis_client, 'setex', failing_setex)
+
+        assert await cache.set(uuid4(), []) is False
+        assert cache.available is False
@@ -0,0 +1,262 @@
+"""Tests for the shared scrape result cache."""
+import asyncio
+import json
+
+import pytest
+
+from core.redis import RedisClient
+from services.scrape_cache import (
+    CACHE_SCHEMA_VERSION,
+    ScrapeCache,
+    normalize_url,
+)
+from services.url_scraper import ExtractedMetadata, ScrapedPage
+
+
+def _page(url: str = 'https://example.com/', error: str | None = None) -> ScrapedPage:
+    """Build a scrape result."""
+    if error:
+        return ScrapedPage(
+            text=None, metadata=None, final_url=url, content_type=None, error=error,
+        )
+    return ScrapedPage(
+        text='Body text',
+        metadata=ExtractedMetadata(title='Title', description='Description'),
+        final_url=url,
+        content_type='text/html',
+        error=None,
+    )
+
+
+@pytest.fixture
+def local_cache() -> ScrapeCache:
+    """Cache whose Redis tier is disabled (in-process fallback only)."""
+    return ScrapeCache(RedisClient('redis://localhost:6379', enabled=False))
+
+
+class TestNormalizeUrl:
+    """Tests for cache key URL normalization."""
+
+    @pytest.mark.parametrize(('url', 'expected'), [
+        ('HTTPS://Example.COM', 'https://example.com/'),
+        ('https://example.com:443/a', 'https://example.com/a'),
+        ('http://example.com:80/a', 'http://example.com/a'),
+        ('http://example.com:8080/a', 'http://example.com:8080/a'),
+        ('https://example.com/a#section', 'https://example.com/a'),
+        ('https://example.com/a?b=2&a=1', 'https://example.com/a?a=1&b=2'),
+        ('https://example.com/a?flag=', 'https://example.com/a?flag='),
+        ('http://[::1]:8080/', 'http://[::1]:8080/'),
+    ])
+    def test__normalize_url(self, url: str, expected: str) -> None:
+        """Equivalent URLs normalize to the same string."""
+        assert normalize_url(url) == expected
+
+    def test__normalize_url__path_case_preserved(self) -> None:
+        """Paths are case-sensitive and kept as-is."""
+        assert normalize_url('https://example.com/Page') == 'https://example.com/Page'
+
+
+class TestScrapeCacheLocal:
+    """Tests for the in-process tier (Redis unavailable)."""
+
+    async def test__get_or_scrape__caches_result(self, local_cache: ScrapeCache) -> None:
+        """The second lookup of a URL is served without scraping."""
+        calls = 0
+
+        async def scrape() -> ScrapedPage:
+            nonlocal calls
+            calls += 1
+            return _page()
+
+        first = await local_cache.get_or_scrape('https://example.com/', scrape)
+        second = await local_cache.get_or_scrape('https://EXAMPLE.com', scrape)
+
+        assert calls == 1
+        assert first == second
+        assert local_cache.stats().l1_hits == 1
+
+    async def test__get_or_scrape__coalesces_concurrent_requests(
+        self, local_cache: ScrapeCache,
+    ) -> None:
+        """A burst of identical requests produces a single scrape."""
+        calls = 0
+        release = asyncio.Event()
+
+        async def scrape() -> ScrapedPage:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return _page()
+
+        waiters = [
+            asyncio.create_task(local_cache.get_or_scrape('https://example.com/', scrape))
+            for _ in range(10)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert all(result == _page() for result in results)
+        assert local_cache.stats().coalesced == 9
+
+    async def test__get_or_scrape__cancelled_waiter_does_not_cancel_scrape(
+        self, local_cache: ScrapeCache,
+    ) -> None:
+        """A caller that goes away leaves the shared scrape running for the others."""
+        release = asyncio.Event()
+
+        async def scrape() -> ScrapedPage:
+            await release.wait()
+            return _page()
+
+        first = asyncio.create_task(local_cache.get_or_scrape('https://example.com/', scrape))
+        second = asyncio.create_task(local_cache.get_or_scrape('https://example.com/', scrape))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == _page()
+        assert await local_cache.get('https://example.com/') == _page()
+
+    async def test__set__success_cached_under_final_url(self, local_cache: ScrapeCache) -> None:
+        """A redirected page is also cached under the URL it ended up at."""
+        page = _page(url='https://www.example.com/final')
+
+        await local_cache.set('https://example.com/old', page)
+
+        assert await local_cache.get('https://www.example.com/final') == page
+
+    async def test__set__error_cached_briefly(
+        self, local_cache: ScrapeCache, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Failed scrapes are cached for ERROR_TTL, not CACHE_TTL."""
+        now = 1_000_000.0
+        monkeypatch.setattr('services.scrape_cache.time.time', lambda: now)
+        await local_cache.set('https://example.com/', _page(error='HTTP 503'))
+
+        now += ScrapeCache.ERROR_TTL - 1
+        assert (await local_cache.get('https://example.com/')).error == 'HTTP 503'
+        now += 2
+        assert await local_cache.get('https://example.com/') is None
+
+    async def test__set__error_not_cached_under_final_url(self, local_cache: ScrapeCache) -> None:
+        """Errors are only cached for the URL that was requested."""
+        await local_cache.set(
+            'https://example.com/a', _page(url='https://example.com/b', error='HTTP 404'),
+        )
+
+        assert await local_cache.get('https://example.com/b') is None
+
+    async def test__set__oversized_entry_not_cached(
+        self, local_cache: ScrapeCache, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Results larger than MAX_ENTRY_BYTES are not cached."""
+        monkeypatch.setattr(ScrapeCache, 'MAX_ENTRY_BYTES', 100)
+        page = _page()
+        page.text = 'x' * 200
+
+        await local_cache.set('https://example.com/', page)
+
+        assert await local_cache.get('https://example.com/') is None
+
+    async def test__l1__evicts_least_recently_used(self) -> None:
+        """L1 stays within its byte budget by evicting the oldest entries."""
+        cache = ScrapeCache(RedisClient('redis://localhost:6379', enabled=False), l1_max_bytes=600)
+
+        for i in range(5):
+            await cache.set(f'https://example.com/{i}', _page(url=f'https://example.com/{i}'))
+
+        assert cache.size_bytes <= 600
+        assert cache.stats().evictions > 0
+        assert await cache.get('https://example.com/0') is None
+        assert await cache.get('https://example.com/4') is not None
+
+
+class TestScrapeCacheRedis:
+    """Tests for the shared Redis tier."""
+
+    async def test__set__stored_in_redis(self, redis_client: RedisClient) -> None:
+        """Entries are written to Redis under a versioned key with the success TTL."""
+        cache = ScrapeCache(redis_client)
+        await cache.set('https://example.com/', _page())
+
+        keys = await redis_client.scan_keys(f'scrape:v{CACHE_SCHEMA_VERSION}:*')
+        assert len(keys) == 1
+        ttl = await redis_client.ttl(keys[0])
+        assert ScrapeCache.CACHE_TTL - 5 < ttl <= ScrapeCache.CACHE_TTL
+        raw = json.loads(await redis_client.get(keys[0]))
+        assert raw['page']['metadata']['title'] == 'Title'
+
+    async def test__get__shared_between_workers(self, redis_client: RedisClient) -> None:
+        """A result cached by one worker is an L2 hit for another."""
+        await ScrapeCache(redis_client).set('https://example.com/', _page())
+        other_worker = ScrapeCache(redis_client)
+
+        assert await other_worker.get('https://example.com/') == _page()
+        assert other_worker.stats().l2_hits == 1
+        # Now also in the other worker's L1
+        assert await other_worker.get('https://example.com/') == _page()
+        assert other_worker.stats().l1_hits == 1
+
+    async def test__get__corrupt_entry_is_miss(self, redis_client: RedisClient) -> None:
+        """Unparseable Redis entries are treated as misses."""
+        cache = ScrapeCache(redis_client)
+        await redis_client.setex(cache._cache_key('https://example.com/'), 60, 'not json')
+
+        assert await cache.get('https://example.com/') is None
+        assert cache.stats().l2_misses == 1
+
+    async def test__get_or_scrape__one_fetch_across_workers(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """A burst spread over several workers produces a single scrape."""
+        workers = [ScrapeCache(redis_client) for _ in range(3)]
+        calls = 0
+        release = asyncio.Event()
+
+        async def scrape() -> ScrapedPage:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return _page()
+
+        first = asyncio.create_task(workers[0].get_or_scrape('https://example.com/', scrape))
+        await asyncio.sleep(0.05)
+        others = [
+            asyncio.create_task(worker.get_or_scrape('https://example.com/', scrape))
+            for worker in workers[1:]
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(first, *others)
+
+        assert calls == 1
+        assert all(result == _page() for result in results)
+        assert [worker.stats().lock_waits for worker in workers] == [0, 1, 1]
+        assert await redis_client.get(f"{workers[0]._cache_key('https://example.com/')}:lock") is None
+
+    async def test__get_or_scrape__waiter_fetches_when_holder_fails(
+        self, redis_client: RedisClient,
+    ) -> None:
+        """If the lock holder's scrape fails, a waiting worker fetches the page itself."""
+        holder, waiter = ScrapeCache(redis_client), ScrapeCache(redis_client)
+        release = asyncio.Event()
+
+        async def failing() -> ScrapedPage:
+            await release.wait()
+            raise RuntimeError("network down")
+
+        async def scrape() -> ScrapedPage:
+            return _page()
+
+        failed = asyncio.create_task(holder.get_or_scrape('https://example.com/', failing))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(waiter.get_or_scrape('https://example.com/', scrape))
+        await asyncio.sleep(0.05)
+        release.set()
+
+        with pytest.raises(RuntimeError):
+            await failed
+        assert await waiting == _page()
+        assert waiter.stats().lock_waits == 1
@@ -4,7 +4,15 @@ import logging
 
 import pytest
 
-from services.template_renderer import TemplateError, render_template
+from jinja2 import TemplateSyntaxError
+
+from services.template_renderer import (
+    TemplateCache,
+    TemplateError,
+    compile_template,
+    get_template_cache,
+    render_template,
+)
 
 
 def test__render_template__simple_substitution() -> None:
@@ -270,3 +278,74 @@ def test__render_template__blocks_str_format_escape() -> None:
 
     with pytest.raises(TemplateError, match="disallowed operation"):
         render_template(content, {}, args)
+
+
+def test__template_cache__repeated_compile_is_a_hit() -> None:
+    """The same source compiles once; later lookups return the cached template."""
+    cache = TemplateCache()
+
+    first = cache.compile("Hello, {{ name }}!")
+    second = cache.compile("Hello, {{ name }}!")
+
+    assert second is first
+    assert first.variables == frozenset({"name"})
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+
+
+def test__template_cache__evicts_least_recently_used_by_count() -> None:
+    """Past max_entries, the least recently used template is evicted."""
+    cache = TemplateCache(max_entries=2)
+    a = cache.compile("{{ a }}")
+    cache.compile("{{ b }}")
+    cache.compile("{{ a }}")  # a is now most recently used
+
+    cache.compile("{{ c }}")
+
+    assert len(cache) == 2
+    assert cache.compile("{{ a }}") is a
+    assert cache.stats().evictions == 1
+
+
+def test__template_cache__bounded_by_source_size() -> None:
+    """Total cached source stays within max_chars; oversized templates are not cached."""
+    cache = TemplateCache(max_chars=20)
+    cache.compile("{{ a }} " + "x" * 8)
+    cache.compile("{{ b }} " + "y" * 8)
+
+    assert len(cache) == 1
+
+    cache.compile("z" * 50)
+
+    assert len(cache) == 1
+
+
+def test__template_cache__syntax_error_not_cached() -> None:
+    """Invalid templates raise and leave nothing behind."""
+    cache = TemplateCache()
+
+    with pytest.raises(TemplateSyntaxError):
+        cache.compile("{% if %}")
+
+    assert len(cache) == 0
+
+
+def test__compile_template__variables_exclude_locals_and_builtins() -> None:
+    """Loop variables and Jinja2 globals are not reported as referenced variables."""
+    compiled = compile_template("{% for i in range(n) %}{{ i }}{{ sep }}{% endfor %}")
+
+    assert compiled.variables == frozenset({"n", "sep"})
+
+
+def test__render_template__reuses_compiled_template() -> None:
+    """Rendering the same prompt again skips parsing and compiling."""
+    content = "Cached render test: {{ topic }}"
+    args = [{"name": "topic", "required": True}]
+    render_template(content, {"topic": "one"}, args)
+    hits = get_template_cache().stats().hits
+
+    result = render_template(content, {"topic": "two"}, args)
+
+    assert result == "Cached render test: two"
+    assert get_template_cache().stats().hits == hits + 1
@@ -4,7 +4,7 @@ from uuid import uuid4
 
 import pytest
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from models.api_token import ApiToken
 from models.user import User
@@ -16,8 +16,10 @@ from services.token_service import (
     get_tokens,
     hash_token,
     rename_token,
+    revoke_token,
     validate_token,
 )
+from services.token_usage import TokenUsageBuffer, get_token_usage_buffer, set_token_usage_buffer
 from core.tier_limits import Tier, TierLimits, get_tier_limits
 from schemas.token import TokenCreate
 from services.exceptions import QuotaExceededError
@@ -313,6 +315,23 @@ async def test__delete_token__enforces_user_scope(
     assert check is not None
 
 
+async def test__revoke_token__returns_hash_of_deleted_token(
+    db_session: AsyncSession,
+    test_user: User,
+) -> None:
+    """revoke_token deletes the token and returns its hash for cache invalidation."""
+    api_token, plaintext = await create_token(
+        db_session, test_user.id, TokenCreate(name="To Revoke"), DEV_LIMITS,
+    )
+    await db_session.flush()
+
+    result = await revoke_token(db_session, test_user.id, api_token.id)
+    await db_session.flush()
+
+    assert result == hash_token(plaintext)
+    assert await get_token_by_id(db_session, test_user.id, api_token.id) is None
+
+
 # =============================================================================
 # rename_token Tests
 # =============================================================================
@@ -528,3 +547,31 @@ async def test__create_token__up_to_limit__succeeds(
             db_session, test_user.id, TokenCreate(name=f"Token {i}"), limits,
         )
         assert plaintext.startswith("bm_")
+
+
+async def test__validate_token__buffers_last_used_at_when_buffer_running(
+    db_session: AsyncSession,
+    db_session_factory: async_sessionmaker,
+    test_user: User,
+) -> None:
+    """With a TokenUsageBuffer set, last_used_at is only written on flush."""
+    api_token, plaintext = await create_token(
+        db_session, test_user.id, TokenCreate(name="Buffered"), DEV_LIMITS,
+    )
+    await db_session.flush()
+    buffer = TokenUsageBuffer(db_session_factory)
+    original = get_token_usage_buffer()
+
+    try:
+        set_token_usage_buffer(buffer)
+        await validate_token(db_session, plaintext)
+        await validate_token(db_session, plaintext)
+        await db_session.refresh(api_token)
+        assert api_token.last_used_at is None
+
+        assert await buffer.flush() == 1
+    finally:
+        set_token_usage_buffer(original)
+
+    await db_session.refresh(api_token)
+    assert api_token.last_used_at is not None
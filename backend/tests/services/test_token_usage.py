@@ -0,0 +1,91 @@
+"""Tests for the token last_used_at write-behind buffer."""
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.tier_limits import Tier, get_tier_limits
+from models.api_token import ApiToken
+from models.user import User
+from schemas.token import TokenCreate
+from services.token_service import create_token
+from services.token_usage import TokenUsageBuffer
+
+
+DEV_LIMITS = get_tier_limits(Tier.DEV)
+
+
+@pytest.fixture
+async def test_user(db_session: AsyncSession) -> User:
+    """Create a test user."""
+    user = User(auth0_id="test-token-usage-user", email="usage@example.com", tier=Tier.FREE.value)
+    db_session.add(user)
+    await db_session.flush()
+    return user
+
+
+async def _create(db_session: AsyncSession, user: User, name: str) -> ApiToken:
+    api_token, _ = await create_token(db_session, user.id, TokenCreate(name=name), DEV_LIMITS)
+    await db_session.flush()
+    return api_token
+
+
+async def test__flush__writes_latest_use_per_token_in_one_batch(
+    db_session: AsyncSession,
+    db_session_factory: async_sessionmaker,
+    test_user: User,
+) -> None:
+    """Repeated uses coalesce to the latest timestamp per token."""
+    first = await _create(db_session, test_user, "First")
+    second = await _create(db_session, test_user, "Second")
+    buffer = TokenUsageBuffer(db_session_factory)
+    now = datetime.now(UTC)
+
+    buffer.record(first.id, now - timedelta(minutes=5))
+    buffer.record(first.id, now)
+    buffer.record(first.id, now - timedelta(minutes=1))
+    buffer.record(second.id, now - timedelta(minutes=2))
+
+    assert await buffer.flush() == 2
+    assert await buffer.flush() == 0
+
+    await db_session.refresh(first)
+    await db_session.refresh(second)
+    assert first.last_used_at == now
+    assert second.last_used_at == now - timedelta(minutes=2)
+
+
+async def test__flush__never_moves_last_used_at_backwards(
+    db_session: AsyncSession,
+    db_session_factory: async_sessionmaker,
+    test_user: User,
+) -> None:
+    """A stale buffered timestamp (e.g. from another worker) does not overwrite a newer one."""
+    api_token = await _create(db_session, test_user, "Token")
+    now = datetime.now(UTC)
+    api_token.last_used_at = now
+    await db_session.flush()
+    buffer = TokenUsageBuffer(db_session_factory)
+
+    buffer.record(api_token.id, now - timedelta(hours=1))
+    await buffer.flush()
+
+    await db_session.refresh(api_token)
+    assert api_token.last_used_at == now
+
+
+async def test__stop__flushes_pending_uses(
+    db_session: AsyncSession,
+    db_session_factory: async_sessionmaker,
+    test_user: User,
+) -> None:
+    """stop() writes whatever is still buffered."""
+    api_token = await _create(db_session, test_user, "Token")
+    buffer = TokenUsageBuffer(db_session_factory)
+    await buffer.start()
+
+    buffer.record(api_token.id, datetime.now(UTC))
+    await buffer.stop()
+
+    await db_session.refresh(api_token)
+    assert api_token.last_used_at is not None
@@ -2,27 +2,38 @@
 Tests for URL scraper service.
 
 Tests cover:
-- fetch_url: HTTP fetching with mocked responses (success, timeout, errors, non-HTML)
+- fetch_url: HTTP fetching with mocked responses (success, timeout, errors, non-HTML,
+    streamed body size limits)
 - extract_html_metadata: Pure function tests for title/description extraction with various HTML
     structures
 - extract_html_content: Content extraction using trafilatura
 - extract_pdf_metadata: PDF metadata extraction
 - extract_pdf_content: PDF text extraction
+- HostResolver / public-only network backend: cached async DNS and per-connection SSRF checks
 """
 import json
+import socket
 import unittest.mock
+from collections.abc import AsyncIterator, Callable
 from pathlib import Path
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
+import httpcore
 import httpx
 import pytest
 
+from core.metrics import REGISTRY
+from services import url_scraper
 from services.url_scraper import (
     DEFAULT_TIMEOUT,
     USER_AGENT,
     ExtractedMetadata,
     FetchResult,
+    HostResolver,
     SSRFBlockedError,
+    _PublicOnlyNetworkBackend,
+    create_scrape_client,
     extract_html_content,
     extract_html_metadata,
     extract_pdf_content,
@@ -30,8 +41,34 @@ from services.url_scraper import (
     fetch_url,
     is_private_ip,
     scrape_url,
+    set_scrape_client,
     validate_url_not_private,
 )
+from services.extraction_worker import ExtractionLimitError, ExtractionWorkerPool
+
+
+def _scrape_client(handler: Callable[[httpx.Request], httpx.Response]) -> Any:
+    """Patch fetch_url's client factory with a client served by an httpx mock transport."""
+    return patch(
+        'services.url_scraper.create_scrape_client',
+        side_effect=lambda: httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), follow_redirects=True,
+        ),
+    )
+
+
+def _respond(
+    status_code: int = 200,
+    content_type: str = 'text/html',
+    body: bytes | str = b'',
+    headers: dict[str, str] | None = None,
+) -> Callable[[httpx.Request], httpx.Response]:
+    """Build a mock transport handler that answers every request the same way."""
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            status_code, headers={'content-type': content_type, **(headers or {})}, content=body,
+        )
+    return handler
 
 
 class TestFetchUrl:
@@ -40,225 +77,267 @@ class TestFetchUrl:
     async def test__fetch_url__success(self) -> None:
         """Successful fetch returns HTML content and metadata."""
         html = '<html><head><title>Test</title></head><body>Content</body></html>'
-        mock_response = AsyncMock()
-        mock_response.text = html
-        mock_response.url = 'https://example.com/page'
-        mock_response.status_code = 200
-        mock_response.is_success = True
-        mock_response.headers = {'content-type': 'text/html; charset=utf-8'}
+        requests: list[httpx.Request] = []
 
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return _respond(content_type='text/html; charset=utf-8', body=html)(request)
 
-            result = await fetch_url('https://example.com')
+        with _scrape_client(handler):
+            result = await fetch_url('https://example.com/page')
 
-            assert result.content == html
-            assert result.final_url == 'https://example.com/page'
-            assert result.status_code == 200
-            assert result.content_type == 'text/html; charset=utf-8'
-            assert result.error is None
-
-            # Verify client was created with correct params
-            mock_client_class.assert_called_once_with(
-                follow_redirects=True,
-                timeout=DEFAULT_TIMEOUT,
-                headers={'User-Agent': USER_AGENT},
-                http2=True,
-            )
+        assert result.content == html
+        assert result.final_url == 'https://example.com/page'
+        assert result.status_code == 200
+        assert result.content_type == 'text/html; charset=utf-8'
+        assert result.error is None
+        assert result.bytes_read == len(html)
+        assert result.truncated is False
+        assert requests[0].extensions['timeout']['read'] == DEFAULT_TIMEOUT
+
+    async def test__create_scrape_client__config(self) -> None:
+        """The scrape client follows redirects, sends our User-Agent, and ignores env proxies."""
+        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
+            create_scrape_client()
+
+        mock_client_class.assert_called_once_with(
+            transport=unittest.mock.ANY,
+            follow_redirects=True,
+            timeout=DEFAULT_TIMEOUT,
+            headers={'User-Agent': USER_AGENT},
+            trust_env=False,
+        )
 
     async def test__fetch_url__timeout(self) -> None:
         """Timeout returns error info without raising."""
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.side_effect = httpx.TimeoutException("Connection timed out")
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ReadTimeout("Connection timed out", request=request)
 
+        with _scrape_client(handler):
             result = await fetch_url('https://example.com')
 
-            assert result.content is None
-            assert result.final_url == 'https://example.com'
-            assert result.status_code is None
-            assert result.error == "Request timed out"
+        assert result.content is None
+        assert result.final_url == 'https://example.com'
+        assert result.status_code is None
+        assert result.error == "Request timed out"
 
     async def test__fetch_url__connection_error(self) -> None:
         """Connection error returns error info without raising."""
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.side_effect = httpx.ConnectError("Connection refused")
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("Connection refused", request=request)
 
+        with _scrape_client(handler):
             result = await fetch_url('https://example.com')
 
-            assert result.content is None
-            assert result.error is not None
-            assert "Request failed" in result.error
+        assert result.content is None
+        assert result.error is not None
+        assert "Request failed" in result.error
 
     async def test__fetch_url__unsupported_content_type(self) -> None:
-        """Unsupported content type (not HTML or PDF) returns error."""
-        mock_response = AsyncMock()
-        mock_response.url = 'https://example.com/image.png'
-        mock_response.status_code = 200
-        mock_response.is_success = True
-        mock_response.content = b'fake image bytes'
-        mock_response.headers = {'content-type': 'image/png'}
-
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
-
+        """Unsupported content type (not HTML or PDF) returns error without reading the body."""
+        with _scrape_client(_respond(content_type='image/png', body=b'fake image bytes')):
             result = await fetch_url('https://example.com/image.png')
 
-            assert result.content is None
-            assert result.status_code == 200
-            assert result.content_type == 'image/png'
-            assert "Unsupported content type" in result.error
+        assert result.content is None
+        assert result.status_code == 200
+        assert result.content_type == 'image/png'
+        assert "Unsupported content type" in result.error
+        assert result.bytes_read == 0
 
     async def test__fetch_url__pdf_content_type(self) -> None:
-        """PDF content type returns bytes content."""
+        """PDF bodies are spooled to a temp file, which discard() deletes."""
         pdf_bytes = b'%PDF-1.4 fake pdf content'
-        mock_response = AsyncMock()
-        mock_response.url = 'https://example.com/paper.pdf'
-        mock_response.status_code = 200
-        mock_response.is_success = True
-        mock_response.content = pdf_bytes
-        mock_response.headers = {'content-type': 'application/pdf'}
-
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
 
+        with _scrape_client(_respond(content_type='application/pdf', body=pdf_bytes)):
             result = await fetch_url('https://example.com/paper.pdf')
 
-            assert result.content == pdf_bytes
-            assert result.status_code == 200
-            assert result.content_type == 'application/pdf'
-            assert result.is_pdf is True
-            assert result.is_html is False
-            assert result.error is None
+        assert isinstance(result.content, Path)
+        assert result.content.read_bytes() == pdf_bytes
+        assert result.status_code == 200
+        assert result.content_type == 'application/pdf'
+        assert result.is_pdf is True
+        assert result.is_html is False
+        assert result.error is None
+        assert result.bytes_read == len(pdf_bytes)
+
+        result.discard()
+        assert not result.content.exists()
 
     async def test__fetch_url__custom_timeout(self) -> None:
-        """Custom timeout is passed to client."""
-        mock_response = AsyncMock()
-        mock_response.text = '<html></html>'
-        mock_response.url = 'https://example.com'
-        mock_response.status_code = 200
-        mock_response.is_success = True
-        mock_response.headers = {'content-type': 'text/html'}
+        """Custom timeout is passed to the request."""
+        requests: list[httpx.Request] = []
 
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return _respond(body='<html></html>')(request)
 
+        with _scrape_client(handler):
             await fetch_url('https://example.com', timeout=30.0)
 
-            mock_client_class.assert_called_once_with(
-                follow_redirects=True,
-                timeout=30.0,
-                headers={'User-Agent': USER_AGENT},
-                http2=True,
-            )
+        assert requests[0].extensions['timeout']['read'] == 30.0
 
     async def test__fetch_url__redirect_captured(self) -> None:
         """Final URL after redirects is captured."""
-        mock_response = AsyncMock()
-        mock_response.text = '<html></html>'
-        mock_response.url = 'https://www.example.com/final-page'  # Redirected URL
-        mock_response.status_code = 200
-        mock_response.is_success = True
-        mock_response.headers = {'content-type': 'text/html'}
-
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
-
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == '/old-page':
+                return httpx.Response(
+                    301, headers={'location': 'https://www.example.com/final-page'},
+                )
+            return _respond(body='<html></html>')(request)
+
+        with _scrape_client(handler):
             result = await fetch_url('https://example.com/old-page')
 
-            assert result.final_url == 'https://www.example.com/final-page'
+        assert result.final_url == 'https://www.example.com/final-page'
 
     async def test__fetch_url__404_not_found(self) -> None:
         """404 response returns error instead of error page HTML."""
-        mock_response = AsyncMock()
-        mock_response.text = '<html><title>404 Not Found</title></html>'
-        mock_response.url = 'https://example.com/missing'
-        mock_response.status_code = 404
-        mock_response.is_success = False
-        mock_response.headers = {'content-type': 'text/html'}
-
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
-
+        with _scrape_client(
+            _respond(status_code=404, body='<html><title>404 Not Found</title></html>'),
+        ):
             result = await fetch_url('https://example.com/missing')
 
-            assert result.content is None  # Should NOT return error page HTML
-            assert result.status_code == 404
-            assert result.error == "HTTP 404"
-            assert result.final_url == 'https://example.com/missing'
+        assert result.content is None  # Should NOT return error page HTML
+        assert result.status_code == 404
+        assert result.error == "HTTP 404"
+        assert result.final_url == 'https://example.com/missing'
 
     async def test__fetch_url__403_forbidden(self) -> None:
         """403 response (auth-gated content) returns error."""
-        mock_response = AsyncMock()
-        mock_response.url = 'https://example.com/private'
-        mock_response.status_code = 403
-        mock_response.is_success = False
-        mock_response.headers = {'content-type': 'text/html'}
-
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
-
+        with _scrape_client(_respond(status_code=403)):
             result = await fetch_url('https://example.com/private')
 
-            assert result.content is None
-            assert result.status_code == 403
-            assert "403" in result.error
+        assert result.content is None
+        assert result.status_code == 403
+        assert "403" in result.error
 
     async def test__fetch_url__500_server_error(self) -> None:
         """500 response returns error instead of error page."""
-        mock_response = AsyncMock()
-        mock_response.url = 'https://example.com/broken'
-        mock_response.status_code = 500
-        mock_response.is_success = False
-        mock_response.headers = {'content-type': 'text/html'}
+        with _scrape_client(_respond(status_code=500)):
+            result = await fetch_url('https://example.com/broken')
 
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
+        assert result.content is None
+        assert result.status_code == 500
+        assert "500" in result.error
 
-            result = await fetch_url('https://example.com/broken')
+    # --- body size limits ---
+
+    async def test__fetch_url__html_truncated_at_limit(self) -> None:
+        """HTML beyond max_html_bytes is cut off and flagged as truncated."""
+        html = '<html><body>' + 'x' * 5000 + '</body></html>'
+
+        with _scrape_client(_respond(body=html)):
+            result = await fetch_url('https://example.com', max_html_bytes=100)
+
+        assert result.error is None
+        assert result.content == html[:100]
+        assert result.truncated is True
+
+    async def test__fetch_url__endless_html_stream_stops_reading(self) -> None:
+        """An endless HTML stream is read only up to the limit."""
+        chunks_sent = 0
+
+        async def endless() -> AsyncIterator[bytes]:
+            nonlocal chunks_sent
+            while True:
+                chunks_sent += 1
+                yield b'<p>' + b'a' * 1021
+
+        def handler(_request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, headers={'content-type': 'text/html'}, content=endless())
+
+        with _scrape_client(handler):
+            result = await fetch_url('https://example.com', max_html_bytes=10 * 1024)
+
+        assert result.truncated is True
+        assert len(result.content) == 10 * 1024
+        assert chunks_sent <= 11
+
+    async def test__fetch_url__html_decoded_incrementally(self) -> None:
+        """Multi-byte characters split across chunks decode correctly, using the declared charset."""
+        text = '<p>caf\u00e9 \u2014 na\u00efve</p>' * 50
+        encoded = text.encode('utf-8')
+
+        async def one_byte_chunks() -> AsyncIterator[bytes]:
+            for i in range(len(encoded)):
+                yield encoded[i:i + 1]
+
+        def handler(_request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                headers={'content-type': 'text/html; charset=utf-8'},
+                content=one_byte_chunks(),
+            )
+
+        with _scrape_client(handler):
+            result = await fetch_url('https://example.com')
+
+        assert result.content == text
+        assert result.truncated is False
 
-            assert result.content is None
-            assert result.status_code == 500
-            assert "500" in result.error
+    async def test__fetch_url__html_truncation_drops_partial_character(self) -> None:
+        """Truncating inside a multi-byte character does not emit a replacement character."""
+        html = '\u00e9' * 10  # 2 bytes each
+
+        with _scrape_client(_respond(content_type='text/html; charset=utf-8', body=html)):
+            result = await fetch_url('https://example.com', max_html_bytes=5)
+
+        assert result.content == '\u00e9\u00e9'
+
+    async def test__fetch_url__pdf_over_limit_rejected(self) -> None:
+        """PDFs larger than max_pdf_bytes return an error and leave no temp file."""
+        async def body() -> AsyncIterator[bytes]:
+            for _ in range(20):
+                yield b'0' * 100
+
+        def handler(_request: httpx.Request) -> httpx.Response:
+            # No Content-Length: the limit is only discovered while streaming
+            return httpx.Response(200, headers={'content-type': 'application/pdf'}, content=body())
+
+        with (
+            _scrape_client(handler),
+            patch('services.url_scraper._unlink_spool', wraps=url_scraper._unlink_spool) as unlink,
+        ):
+            result = await fetch_url('https://example.com/big.pdf', max_pdf_bytes=1000)
+
+        assert result.content is None
+        assert 'too large' in result.error
+        assert result.status_code == 200
+        unlink.assert_called_once()
+        assert not unlink.call_args.args[0].exists()
+
+    async def test__fetch_url__pdf_declared_length_over_limit_not_downloaded(self) -> None:
+        """A Content-Length over the PDF limit is rejected before reading the body."""
+        async def body() -> AsyncIterator[bytes]:
+            raise AssertionError("body should not be read")
+            yield b''  # pragma: no cover
+
+        def handler(_request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                headers={'content-type': 'application/pdf', 'content-length': '5000'},
+                content=body(),
+            )
+
+        with _scrape_client(handler):
+            result = await fetch_url('https://example.com/big.pdf', max_pdf_bytes=1000)
+
+        assert 'too large' in result.error
+        assert result.bytes_read == 0
+
+    async def test__fetch_url__records_body_metrics(self) -> None:
+        """Body sizes and results are exported as metrics."""
+        result_key = 'scrape_fetch_bodies_total{kind="html",result="truncated"}'
+        bytes_key = 'scrape_fetch_body_bytes_total{kind="html"}'
+        before = REGISTRY.local_totals()
+
+        with _scrape_client(_respond(body='x' * 300)):
+            await fetch_url('https://example.com', max_html_bytes=100)
+
+        after = REGISTRY.local_totals()
+        assert after[result_key] == before.get(result_key, 0) + 1
+        assert after[bytes_key] == before.get(bytes_key, 0) + 300
+        assert REGISTRY.gauge_values()['scrape_fetch_buffered_bytes_peak'] >= 100
 
 
 class TestExtractMetadata:
@@ -604,40 +683,40 @@ class TestSSRFProtection:
 
     # --- validate_url_not_private tests ---
 
-    def test__validate_url_not_private__public_url(self) -> None:
+    async def test__validate_url_not_private__public_url(self) -> None:
         """Public URLs pass validation."""
         # This should not raise
-        validate_url_not_private('https://example.com')
+        await validate_url_not_private('https://example.com')
 
-    def test__validate_url_not_private__localhost(self) -> None:
+    async def test__validate_url_not_private__localhost(self) -> None:
         """Localhost URLs are blocked."""
         with pytest.raises(SSRFBlockedError, match="localhost"):
-            validate_url_not_private('http://localhost:8080/api')
+            await validate_url_not_private('http://localhost:8080/api')
 
-    def test__validate_url_not_private__localhost_localdomain(self) -> None:
+    async def test__validate_url_not_private__localhost_localdomain(self) -> None:
         """localhost.localdomain is blocked."""
         with pytest.raises(SSRFBlockedError, match="localhost"):
-            validate_url_not_private('http://localhost.localdomain/api')
+            await validate_url_not_private('http://localhost.localdomain/api')
 
-    def test__validate_url_not_private__private_ip_direct(self) -> None:
+    async def test__validate_url_not_private__private_ip_direct(self) -> None:
         """Direct private IP addresses are blocked."""
         with pytest.raises(SSRFBlockedError, match="private"):
-            validate_url_not_private('http://192.168.1.1/')
+            await validate_url_not_private('http://192.168.1.1/')
 
-    def test__validate_url_not_private__loopback_ip(self) -> None:
+    async def test__validate_url_not_private__loopback_ip(self) -> None:
         """127.0.0.1 is blocked."""
         with pytest.raises(SSRFBlockedError, match="private"):
-            validate_url_not_private('http://127.0.0.1:3000/')
+            await validate_url_not_private('http://127.0.0.1:3000/')
 
-    def test__validate_url_not_private__no_hostname(self) -> None:
+    async def test__validate_url_not_private__no_hostname(self) -> None:
         """URLs without hostname raise ValueError."""
         with pytest.raises(ValueError, match="no hostname"):
-            validate_url_not_private('file:///etc/passwd')
+            await validate_url_not_private('file:///etc/passwd')
 
-    def test__validate_url_not_private__unresolvable_hostname(self) -> None:
+    async def test__validate_url_not_private__unresolvable_hostname(self) -> None:
         """Unresolvable hostnames raise ValueError."""
         with pytest.raises(ValueError, match="Could not resolve"):
-            validate_url_not_private('http://this-domain-definitely-does-not-exist-12345.com/')
+            await validate_url_not_private('http://this-domain-definitely-does-not-exist-12345.com/')
 
     # --- fetch_url SSRF protection integration tests ---
 
@@ -662,54 +741,32 @@ class TestSSRFProtection:
         assert result.error is not None
 
     async def test__fetch_url__blocks_redirect_to_private(self) -> None:
-        """fetch_url blocks redirects to private addresses."""
-        mock_response = AsyncMock()
-        mock_response.url = 'http://192.168.1.1/internal'  # Redirected to private IP
-        mock_response.status_code = 200
-        mock_response.is_success = True
-        mock_response.headers = {'content-type': 'text/html'}
+        """fetch_url reports redirects that the client refused to follow to private addresses."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == 'attacker.com':
+                return httpx.Response(301, headers={'location': 'http://internal/'})
+            # The pinned network backend raises when a redirect hop resolves privately
+            raise SSRFBlockedError(
+                "Blocked request to private/internal address: internal resolves to 10.0.0.1",
+            )
 
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            # Mock validate_url_not_private to pass for initial URL only
-            with patch('services.url_scraper.validate_url_not_private') as mock_validate:
-                # First call (initial URL) passes, second call (redirect) fails
-                mock_validate.side_effect = [
-                    None,  # Initial URL passes
-                    SSRFBlockedError("Blocked request to private address"),
-                ]
-
-                mock_client = AsyncMock()
-                mock_client.get.return_value = mock_response
-                mock_client.__aenter__.return_value = mock_client
-                mock_client.__aexit__.return_value = None
-                mock_client_class.return_value = mock_client
-
-                result = await fetch_url('https://attacker.com/redirect')
-
-                assert result.content is None
-                assert result.error is not None
-                assert 'blocked' in result.error.lower() or 'redirect' in result.error.lower()
+        with (
+            patch('services.url_scraper.validate_url_not_private', new=AsyncMock()),
+            _scrape_client(handler),
+        ):
+            result = await fetch_url('https://attacker.com/redirect')
+
+        assert result.content is None
+        assert result.error is not None
+        assert result.error.startswith('Redirect blocked:')
 
     async def test__fetch_url__allows_public_urls(self) -> None:
         """fetch_url allows public URLs (with mocked response)."""
-        mock_response = AsyncMock()
-        mock_response.text = '<html><title>Test</title></html>'
-        mock_response.url = 'https://example.com'
-        mock_response.status_code = 200
-        mock_response.is_success = True
-        mock_response.headers = {'content-type': 'text/html'}
-
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
-
+        with _scrape_client(_respond(body='<html><title>Test</title></html>')):
             result = await fetch_url('https://example.com')
 
-            assert result.content is not None
-            assert result.error is None
+        assert result.content is not None
+        assert result.error is None
 
 
 # =============================================================================
@@ -843,98 +900,251 @@ class TestScrapeUrl:
         <body><article><p>Test content paragraph.</p></article></body>
         </html>
         '''
-        mock_response = AsyncMock()
-        mock_response.text = html
-        mock_response.url = 'https://example.com/'
-        mock_response.status_code = 200
-        mock_response.is_success = True
-        mock_response.headers = {'content-type': 'text/html; charset=utf-8'}
-
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
+        with _scrape_client(_respond(content_type='text/html; charset=utf-8', body=html)):
+            result = await scrape_url('https://example.com/')
 
-            result = await scrape_url('https://example.com')
-
-            assert result.error is None
-            assert result.metadata is not None
-            assert result.metadata.title == 'Test Page'
-            assert result.metadata.description == 'Test description'
-            assert result.final_url == 'https://example.com/'
-            assert result.content_type == 'text/html; charset=utf-8'
+        assert result.error is None
+        assert result.metadata is not None
+        assert result.metadata.title == 'Test Page'
+        assert result.metadata.description == 'Test description'
+        assert result.final_url == 'https://example.com/'
+        assert result.content_type == 'text/html; charset=utf-8'
 
     async def test__scrape_url__extracts_pdf_content_and_metadata(self) -> None:
-        """scrape_url extracts content and metadata from PDF files."""
+        """scrape_url extracts content and metadata from PDF files and removes the spool file."""
         pdf_bytes = (PDFS_DIR / 'arxiv_paper.pdf').read_bytes()
         expected_metadata = json.loads(
             (PDFS_EXTRACTED_DIR / 'arxiv_paper_metadata.json').read_text(),
         )
 
-        mock_response = AsyncMock()
-        mock_response.content = pdf_bytes
-        mock_response.url = 'https://arxiv.org/pdf/test.pdf'
-        mock_response.status_code = 200
-        mock_response.is_success = True
-        mock_response.headers = {'content-type': 'application/pdf'}
-
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
-
+        with (
+            _scrape_client(_respond(content_type='application/pdf', body=pdf_bytes)),
+            patch('services.url_scraper.extract_page', wraps=url_scraper.extract_page) as extract,
+        ):
             result = await scrape_url('https://arxiv.org/pdf/test.pdf')
 
-            assert result.error is None
-            assert result.text is not None
-            assert result.metadata is not None
-            assert result.metadata.title == expected_metadata['title']
-            assert result.final_url == 'https://arxiv.org/pdf/test.pdf'
-            assert result.content_type == 'application/pdf'
+        assert result.error is None
+        assert result.text is not None
+        assert result.metadata is not None
+        assert result.metadata.title == expected_metadata['title']
+        assert result.final_url == 'https://arxiv.org/pdf/test.pdf'
+        assert result.content_type == 'application/pdf'
+        spool_path = extract.call_args.args[0]
+        assert isinstance(spool_path, Path)
+        assert not spool_path.exists()
 
     async def test__scrape_url__propagates_fetch_errors(self) -> None:
         """scrape_url propagates errors from fetch_url."""
-        mock_response = AsyncMock()
-        mock_response.url = 'https://example.com'
-        mock_response.status_code = 404
-        mock_response.is_success = False
-        mock_response.headers = {'content-type': 'text/html'}
-
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
-
+        with _scrape_client(_respond(status_code=404)):
             result = await scrape_url('https://example.com')
 
-            assert result.error == 'HTTP 404'
-            assert result.text is None
-            assert result.metadata is None
+        assert result.error == 'HTTP 404'
+        assert result.text is None
+        assert result.metadata is None
 
     async def test__scrape_url__handles_unsupported_content_type(self) -> None:
         """scrape_url returns error for unsupported content types."""
-        mock_response = AsyncMock()
-        mock_response.url = 'https://example.com/image.png'
-        mock_response.status_code = 200
-        mock_response.is_success = True
-        mock_response.content = b'fake image'
-        mock_response.headers = {'content-type': 'image/png'}
+        with _scrape_client(_respond(content_type='image/png', body=b'fake image')):
+            result = await scrape_url('https://example.com/image.png')
 
-        with patch('services.url_scraper.httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client.get.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client_class.return_value = mock_client
+        assert 'Unsupported content type' in result.error
+        assert result.text is None
+        assert result.metadata is None
+
+    async def test__scrape_url__passes_size_limits(self) -> None:
+        """Body limits are forwarded to fetch_url."""
+        with (
+            patch('services.url_scraper.validate_url_not_private', new=AsyncMock()),
+            _scrape_client(_respond(body='<html><title>Long title</title></html>')),
+        ):
+            result = await scrape_url('https://example.com', max_html_bytes=20)
+
+        # Only "<html><title>Long ti" was read
+        assert result.metadata.title == 'Long ti'
+
+    async def test__scrape_url__runs_extraction_in_pool(self) -> None:
+        """When an extraction pool is configured, extraction runs through it."""
+        html = '<html><head><title>Pooled</title></head></html>'
+        pool = AsyncMock(spec=ExtractionWorkerPool)
+        pool.run.return_value = (ExtractedMetadata(title='Pooled', description=None), 'text')
+
+        with (
+            patch('services.url_scraper.validate_url_not_private', new=AsyncMock()),
+            _scrape_client(_respond(body=html)),
+            patch('services.url_scraper.get_extraction_pool', return_value=pool),
+        ):
+            result = await scrape_url('https://example.com')
+
+        pool.run.assert_awaited_once()
+        assert pool.run.call_args.args[1:] == (html, False)
+        assert result.metadata.title == 'Pooled'
+        assert result.text == 'text'
+
+    async def test__scrape_url__extraction_limit_returns_error(self) -> None:
+        """An extraction that exceeds its budget becomes a scrape error."""
+        pool = AsyncMock(spec=ExtractionWorkerPool)
+        pool.run.side_effect = ExtractionLimitError("Content extraction timed out")
+
+        with (
+            patch('services.url_scraper.validate_url_not_private', new=AsyncMock()),
+            _scrape_client(_respond(body='<html></html>')),
+            patch('services.url_scraper.get_extraction_pool', return_value=pool),
+        ):
+            result = await scrape_url('https://example.com/')
+
+        assert result.error == 'Content extraction timed out'
+        assert result.text is None
+        assert result.metadata is None
+        assert result.final_url == 'https://example.com/'
 
-            result = await scrape_url('https://example.com/image.png')
 
-            assert 'Unsupported content type' in result.error
-            assert result.text is None
-            assert result.metadata is None
+# =============================================================================
+# DNS resolution and connection pinning Tests
+# =============================================================================
+
+
+def _addrinfo(*ips: str) -> list[tuple]:
+    """Build a getaddrinfo-style result for the given IPs."""
+    return [
+        (socket.AF_INET6 if ':' in ip else socket.AF_INET, socket.SOCK_STREAM, 6, '', (ip, 0))
+        for ip in ips
+    ]
+
+
+class TestHostResolver:
+    """Tests for the cached async resolver."""
+
+    async def test__resolve__caches_within_ttl(self) -> None:
+        """A second lookup within the TTL does not hit getaddrinfo."""
+        resolver = HostResolver(ttl=60)
+        with patch('asyncio.BaseEventLoop.getaddrinfo', new_callable=AsyncMock) as mock_gai:
+            mock_gai.return_value = _addrinfo('93.184.216.34', '93.184.216.34')
+
+            assert await resolver.resolve('Example.com') == ['93.184.216.34']
+            assert await resolver.resolve('example.com') == ['93.184.216.34']
+
+        mock_gai.assert_awaited_once()
+
+    async def test__resolve__expired_entry_is_refreshed(self) -> None:
+        """Entries older than the TTL are resolved again."""
+        resolver = HostResolver(ttl=0)
+        with patch('asyncio.BaseEventLoop.getaddrinfo', new_callable=AsyncMock) as mock_gai:
+            mock_gai.return_value = _addrinfo('93.184.216.34')
+
+            await resolver.resolve('example.com')
+            await resolver.resolve('example.com')
+
+        assert mock_gai.await_count == 2
+
+    async def test__resolve__failures_are_not_cached(self) -> None:
+        """A failed lookup raises ValueError and is retried next time."""
+        resolver = HostResolver()
+        with patch('asyncio.BaseEventLoop.getaddrinfo', new_callable=AsyncMock) as mock_gai:
+            mock_gai.side_effect = [socket.gaierror('nope'), _addrinfo('93.184.216.34')]
+
+            with pytest.raises(ValueError, match="Could not resolve"):
+                await resolver.resolve('example.com')
+            assert await resolver.resolve('example.com') == ['93.184.216.34']
+
+    async def test__resolve__evicts_oldest_beyond_max_entries(self) -> None:
+        """The cache keeps at most max_entries hostnames."""
+        resolver = HostResolver(max_entries=2)
+        with patch('asyncio.BaseEventLoop.getaddrinfo', new_callable=AsyncMock) as mock_gai:
+            mock_gai.return_value = _addrinfo('93.184.216.34')
+
+            for host in ('a.example', 'b.example', 'c.example', 'a.example'):
+                await resolver.resolve(host)
+
+        assert mock_gai.await_count == 4
+
+
+class TestPublicOnlyNetworkBackend:
+    """Tests for the network backend that pins connections to checked addresses."""
+
+    async def test__connect_tcp__blocks_host_resolving_to_private_ip(self) -> None:
+        """A hostname that resolves privately is refused before connecting."""
+        backend = _PublicOnlyNetworkBackend()
+        with (
+            patch('services.url_scraper._resolver.resolve', new=AsyncMock(return_value=['10.0.0.5'])),
+            patch.object(backend._backend, 'connect_tcp', new=AsyncMock()) as mock_connect,
+            pytest.raises(SSRFBlockedError, match="private"),
+        ):
+            await backend.connect_tcp('rebind.example', 80, timeout=1.0)
+
+        mock_connect.assert_not_awaited()
+
+    async def test__connect_tcp__connects_to_resolved_address(self) -> None:
+        """Connections go to the checked IP, not a fresh lookup of the hostname."""
+        backend = _PublicOnlyNetworkBackend()
+        stream = object()
+        with (
+            patch(
+                'services.url_scraper._resolver.resolve',
+                new=AsyncMock(return_value=['93.184.216.34']),
+            ),
+            patch.object(
+                backend._backend, 'connect_tcp', new=AsyncMock(return_value=stream),
+            ) as mock_connect,
+        ):
+            assert await backend.connect_tcp('example.com', 443, timeout=1.0) is stream
+
+        assert mock_connect.await_args.args == ('93.184.216.34', 443)
+
+    async def test__connect_tcp__falls_back_to_next_address(self) -> None:
+        """If one address refuses the connection, the next one is tried."""
+        backend = _PublicOnlyNetworkBackend()
+        stream = object()
+        with (
+            patch(
+                'services.url_scraper._resolver.resolve',
+                new=AsyncMock(return_value=['2606:2800::1', '93.184.216.34']),
+            ),
+            patch.object(
+                backend._backend,
+                'connect_tcp',
+                new=AsyncMock(side_effect=[httpcore.ConnectError('refused'), stream]),
+            ),
+        ):
+            assert await backend.connect_tcp('example.com', 443) is stream
+
+    async def test__connect_tcp__unresolvable_host_is_connect_error(self) -> None:
+        """Resolution failures surface as httpcore connect errors."""
+        backend = _PublicOnlyNetworkBackend()
+        with (
+            patch(
+                'services.url_scraper._resolver.resolve',
+                new=AsyncMock(side_effect=ValueError("Could not resolve hostname: x")),
+            ),
+            pytest.raises(httpcore.ConnectError),
+        ):
+            await backend.connect_tcp('x', 80)
+
+    async def test__create_scrape_client__uses_public_only_backend(self) -> None:
+        """The scrape client's connection pool connects through the pinned backend."""
+        async with create_scrape_client() as client:
+            pool = client._transport._pool
+            assert isinstance(pool._network_backend, _PublicOnlyNetworkBackend)
+
+    async def test__create_scrape_client__refuses_private_ip_literal(self) -> None:
+        """A request to a private IP fails in the backend's check, not in connect()."""
+        async with create_scrape_client() as client:
+            with pytest.raises(SSRFBlockedError, match="private/internal address"):
+                await client.get('http://127.0.0.1:9/')
+
+    async def test__fetch_url__uses_shared_client(self) -> None:
+        """fetch_url reuses the global scrape client when one is set."""
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(_respond(body='<html></html>')))
+        set_scrape_client(shared)
+        try:
+            with (
+                patch('services.url_scraper.validate_url_not_private', new=AsyncMock()),
+                patch('services.url_scraper.create_scrape_client') as mock_create,
+            ):
+                result = await fetch_url('https://example.com')
+        finally:
+            set_scrape_client(None)
+            await shared.aclose()
+
+        mock_create.assert_not_called()
+        assert result.error is None
+        assert result.content == '<html></html>'
@@ -0,0 +1,35 @@
+"""Tests for the keyset cursor codec in services.utils."""
+from datetime import UTC, datetime
+
+import pytest
+
+from services.exceptions import InvalidCursorError
+from services.utils import decode_cursor, encode_cursor, parse_cursor_timestamp
+
+
+def test__encode_cursor__round_trips_unpadded() -> None:
+    """Tokens are URL-safe base64 without padding and decode to the same payload."""
+    payload = {"c": "2026-01-02T03:04:05+00:00", "i": "abc", "v": None}
+
+    token = encode_cursor(payload)
+
+    assert "=" not in token
+    assert decode_cursor(token) == payload
+
+
+@pytest.mark.parametrize("bad", ["not-a-cursor", "!!!", "WzEsMl0"])
+def test__decode_cursor__rejects_malformed_tokens(bad: str) -> None:
+    """Tokens that are not base64-encoded JSON objects (WzEsMl0 is [1,2]) raise InvalidCursorError."""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(bad)
+
+
+def test__parse_cursor_timestamp__requires_time_zone() -> None:
+    """Aware timestamps parse; naive ones and non-strings are rejected."""
+    now = datetime.now(UTC)
+
+    assert parse_cursor_timestamp(now.isoformat()) == now
+    with pytest.raises(ValueError, match="timezone-aware"):
+        parse_cursor_timestamp(now.replace(tzinfo=None).isoformat())
+    with pytest.raises(TypeError):
+        parse_cursor_timestamp(123)
@@ -0,0 +1,127 @@
+"""Tests for the reconstructed-version cache."""
+import sys
+from uuid import uuid4
+
+from services.version_cache import CachedVersion, EntityKey, VersionCache
+
+
+def _entity() -> EntityKey:
+    """Random (user_id, entity_type, entity_id) key."""
+    return (uuid4(), "note", uuid4())
+
+
+def _entry(version: int, content: str | None = "content") -> CachedVersion:
+    """Cache entry with a fresh record id."""
+    return CachedVersion(version=version, record_id=uuid4(), content=content)
+
+
+class TestVersionCache:
+    """Tests for VersionCache lookups, eviction, and invalidation."""
+
+    def test__get__returns_cached_version(self) -> None:
+        """A cached version is returned and counted as a hit."""
+        cache = VersionCache()
+        entity = _entity()
+        entry = _entry(3)
+        cache.put(entity, entry)
+
+        assert cache.get(entity, 3) == entry
+        assert cache.get(entity, 4) is None
+        stats = cache.stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+
+    def test__get__entities_are_isolated(self) -> None:
+        """The same version number of another entity is a separate entry."""
+        cache = VersionCache()
+        cache.put(_entity(), _entry(3))
+
+        assert cache.get(_entity(), 3) is None
+
+    def test__nearest_above__returns_lowest_version_above_target(self) -> None:
+        """The closest cached version above the target is the replay anchor."""
+        cache = VersionCache()
+        entity = _entity()
+        for version in (2, 5, 9):
+            cache.put(entity, _entry(version))
+
+        assert cache.nearest_above(entity, 3).version == 5
+        assert cache.nearest_above(entity, 5).version == 9
+        assert cache.nearest_above(entity, 9) is None
+        assert cache.nearest_above(_entity(), 1) is None
+
+    def test__put__evicts_least_recently_used_over_budget(self) -> None:
+        """Entries are evicted oldest-first once total content exceeds max_bytes."""
+        content = "x" * 1000
+        cache = VersionCache(max_bytes=sys.getsizeof(content) * 2)
+        entity = _entity()
+        cache.put(entity, _entry(1, content))
+        cache.put(entity, _entry(2, content))
+        cache.get(entity, 1)  # 1 is now most recently used
+
+        cache.put(entity, _entry(3, content))
+
+        assert cache.get(entity, 1) is not None
+        assert cache.get(entity, 2) is None
+        assert cache.get(entity, 3) is not None
+        assert cache.size_bytes <= cache.max_bytes
+        assert cache.stats().evictions == 1
+
+    def test__put__skips_content_larger_than_budget(self) -> None:
+        """Content larger than the whole budget is not cached."""
+        cache = VersionCache(max_bytes=100)
+        entity = _entity()
+
+        cache.put(entity, _entry(1, "x" * 1000))
+
+        assert cache.get(entity, 1) is None
+        assert cache.size_bytes == 0
+
+    def test__put__replacing_version_keeps_size_accurate(self) -> None:
+        """Re-caching a version replaces the entry without double counting."""
+        cache = VersionCache()
+        entity = _entity()
+        cache.put(entity, _entry(1, "a" * 100))
+        cache.put(entity, _entry(1, "b" * 10))
+
+        assert cache.get(entity, 1).content == "b" * 10
+        assert cache.size_bytes == sys.getsizeof("b" * 10)
+
+    def test__discard_below__drops_pruned_versions(self) -> None:
+        """Pruning drops versions older than the cutoff only."""
+        cache = VersionCache()
+        entity = _entity()
+        for version in (1, 2, 3, 4):
+            cache.put(entity, _entry(version))
+
+        cache.discard_below(entity, 3)
+
+        assert cache.get(entity, 2) is None
+        assert cache.get(entity, 3) is not None
+        assert cache.get(entity, 4) is not None
+
+    def test__invalidate_entity__drops_all_versions(self) -> None:
+        """Invalidating an entity leaves other entities alone."""
+        cache = VersionCache()
+        entity, other = _entity(), _entity()
+        cache.put(entity, _entry(1))
+        cache.put(entity, _entry(2))
+        cache.put(other, _entry(1))
+
+        cache.invalidate_entity(entity)
+
+        assert cache.nearest_above(entity, 0) is None
+        assert cache.get(other, 1) is not None
+        assert cache.size_bytes == sys.getsizeof("content")
+
+    def test__mark_stale__drops_entry_and_counts(self) -> None:
+        """Stale entries are dropped and counted separately from evictions."""
+        cache = VersionCache()
+        entity = _entity()
+        cache.put(entity, _entry(1))
+
+        cache.mark_stale(entity, 1)
+
+        assert cache.get(entity, 1) is None
+        assert cache.stats().stale == 1
+        assert cache.stats().evictions == 0
@@ -56,10 +56,22 @@ Options:
     --base-url URL      API base URL (default: http://localhost:8000)
     --concurrency N     Comma-separated concurrency levels (default: 10,50,100)
     --iterations N      Requests per concurrency level (default: 100)
+    --search-corpus N   Seed N notes/bookmarks/prompts directly into the database and
+                        benchmark unified search against them (default: 0, disabled)
+    --history-corpus N  Seed N content_history rows directly into the database and
+                        benchmark the history timeline against them (default: 0, disabled)
+    --database-url URL  Database used for corpus seeding (default: $DATABASE_URL)
+
+COMPRESSION:
+    Before the load tests, a few representative reads are fetched once per
+    Accept-Encoding (identity, gzip, br, zstd) and the raw bytes on the wire are
+    reported with the savings against identity.
 """
 import argparse
 import asyncio
 import contextlib
+import hashlib
+import os
 import statistics
 import time
 from collections.abc import Callable
@@ -69,8 +81,43 @@ from itertools import count
 from pathlib import Path
 from typing import Any
 
+import asyncpg
 import httpx
 
+# Title prefix marking rows seeded for the search corpus, so they can be removed
+# without touching anything else the dev user owns.
+CORPUS_PREFIX = "corpus-bench"
+DEV_USER_AUTH0_ID = "dev|local-development-user"
+# One in every CORPUS_NEEDLE_EVERY corpus rows contains the FTS needle word.
+CORPUS_NEEDLE_EVERY = 100
+CORPUS_NEEDLE = "quasar"
+# Row whose md5-derived content supplies the substring (trigram) query.
+CORPUS_SUBSTRING_ROW = 42
+
+# History corpus shape: versions per entity, and how often a row stores a full
+# content snapshot (~64KB, TOASTed) or is a CLI-sourced / audit (delete) row.
+HISTORY_VERSIONS_PER_ENTITY = 10
+HISTORY_SNAPSHOT_EVERY = 10
+HISTORY_CLI_EVERY = 20
+HISTORY_DELETE_EVERY = 50
+# Page size when walking the whole history corpus (the endpoint's maximum).
+HISTORY_WALK_PAGE_SIZE = 100
+
+# Content codings compared against identity in the compression report.
+COMPRESSION_ENCODINGS = ("gzip", "br", "zstd")
+
+# Every corpus row gets a few dictionary words (so FTS has realistic posting lists)
+# plus md5 noise (so substring search cannot be answered by the FTS index).
+_CORPUS_WORDS_SQL = (
+    "(ARRAY['alpha','bravo','charlie','delta','echo','foxtrot','golf','hotel',"
+    "'india','juliet','kilo','lima','mike','november','oscar','papa'])"
+)
+_CORPUS_CONTENT_SQL = f"""
+    {_CORPUS_WORDS_SQL}[1 + i % 16] || ' ' || {_CORPUS_WORDS_SQL}[1 + (i / 16) % 16]
+    || CASE WHEN i % {CORPUS_NEEDLE_EVERY} = 0 THEN ' {CORPUS_NEEDLE}' ELSE '' END
+    || ' ' || md5(i::text) || ' ' || repeat(md5((i * 31)::text) || ' ', 16)
+"""
+
 
 
 
@@ -94,6 +141,24 @@ class BenchmarkResult:
     error_rate_pct: float
 
 
+@dataclass
+class CompressionResult:
+    """Bytes on the wire for one endpoint and Accept-Encoding."""
+
+    operation: str
+    requested: str  # Accept-Encoding sent
+    applied: str  # Content-Encoding received ("identity" if none)
+    identity_bytes: int
+    wire_bytes: int
+
+    @property
+    def saved_pct(self) -> float:
+        """Percentage of identity bytes saved."""
+        if self.identity_bytes == 0:
+            return 0.0
+        return round((1 - self.wire_bytes / self.identity_bytes) * 100, 1)
+
+
 def calculate_percentiles(latencies: list[float]) -> dict[str, float]:
     """Calculate latency percentiles from a list of latencies."""
     if not latencies:
@@ -136,14 +201,22 @@ class ApiBenchmark:
         base_url: str,
         iterations: int = 100,
         content_size_kb: int = 50,
+        search_corpus_size: int = 0,
+        database_url: str | None = None,
+        *,
+        history_corpus_size: int = 0,
     ) -> None:
         self.base_url = base_url.rstrip("/")
+        self.search_corpus_size = search_corpus_size
+        self.history_corpus_size = history_corpus_size
+        self.database_url = database_url
         self.iterations = iterations
         self.content_size_kb = content_size_kb
         self.content = "x" * (content_size_kb * 1024)  # Pre-generate content
         self.created_note_ids: list[str] = []
         self.created_bookmark_ids: list[str] = []
         self.created_prompt_ids: list[str] = []
+        self.compression_results: list[CompressionResult] = []
 
     async def _make_request(
         self,
@@ -1065,6 +1138,324 @@ class ApiBenchmark:
             client, "Search Content", concurrency, make_request,
         )
 
+    # -------------------------------------------------------------------------
+    # Search Corpus Benchmarks
+    # -------------------------------------------------------------------------
+
+    async def _connect_database(self) -> asyncpg.Connection:
+        """Connect to the database directly (asyncpg does not accept the +driver suffix)."""
+        if not self.database_url:
+            raise RuntimeError(
+                "--database-url or DATABASE_URL is required for --search-corpus/--history-corpus",
+            )
+        return await asyncpg.connect(self.database_url.replace("+asyncpg", ""))
+
+    async def _delete_search_corpus(self, conn: asyncpg.Connection, user_id: Any) -> None:
+        """Delete corpus rows seeded by this or a previous (crashed) run."""
+        pattern = f"{CORPUS_PREFIX} %"
+        for table in ("notes", "bookmarks", "prompts"):
+            await conn.execute(
+                f"DELETE FROM {table} WHERE user_id = $1 AND title LIKE $2",
+                user_id, pattern,
+            )
+
+    async def seed_search_corpus(self) -> None:
+        """
+        Seed the dev user's account with `search_corpus_size` items.
+
+        Rows are inserted set-based with generate_series, bypassing the API, since
+        creating 100k items through HTTP would take longer than the benchmark
+        itself. Items are split evenly across notes, bookmarks, and prompts. The
+        search_vector triggers still fire, so FTS data matches API-created rows.
+        """
+        print(f"Seeding search corpus ({self.search_corpus_size} items)...", end=" ", flush=True)
+        per_type = max(self.search_corpus_size // 3, 1)
+        conn = await self._connect_database()
+        try:
+            user_id = await conn.fetchval(
+                "SELECT id FROM users WHERE auth0_id = $1", DEV_USER_AUTH0_ID,
+            )
+            if user_id is None:
+                raise RuntimeError("Dev user not found; run warmup against a dev-mode server")
+            await self._delete_search_corpus(conn, user_id)
+            title = f"'{CORPUS_PREFIX} ' || i"
+            await conn.execute(
+                f"""
+                INSERT INTO notes (id, user_id, title, description, content)
+                SELECT gen_random_uuid(), $1, {title}, 'note ' || md5(i::text),
+                    {_CORPUS_CONTENT_SQL}
+                FROM generate_series(1, $2) AS i
+                """,
+                user_id, per_type,
+            )
+            await conn.execute(
+                f"""
+                INSERT INTO bookmarks (id, user_id, url, title, description, content)
+                SELECT gen_random_uuid(), $1,
+                    'https://{CORPUS_PREFIX}.example.com/' || md5(i::text), {title},
+                    'bookmark ' || md5(i::text), {_CORPUS_CONTENT_SQL}
+                FROM generate_series(1, $2) AS i
+                """,
+                user_id, per_type,
+            )
+            await conn.execute(
+                f"""
+                INSERT INTO prompts (id, user_id, name, title, description, content)
+                SELECT gen_random_uuid(), $1, '{CORPUS_PREFIX}-' || i, {title},
+                    'prompt ' || md5(i::text), {_CORPUS_CONTENT_SQL}
+                FROM generate_series(1, $2) AS i
+                """,
+                user_id, per_type,
+            )
+            for table in ("notes", "bookmarks", "prompts"):
+                await conn.execute(f"ANALYZE {table}")
+        finally:
+            await conn.close()
+        print("done")
+
+    async def cleanup_search_corpus(self) -> None:
+        """Remove all seeded corpus rows."""
+        conn = await self._connect_database()
+        try:
+            user_id = await conn.fetchval(
+                "SELECT id FROM users WHERE auth0_id = $1", DEV_USER_AUTH0_ID,
+            )
+            if user_id is not None:
+                await self._delete_search_corpus(conn, user_id)
+        finally:
+            await conn.close()
+
+    def search_corpus_queries(self) -> list[tuple[str, str]]:
+        """
+        Return (operation name, query) pairs for the corpus search benchmarks.
+
+        - word: FTS-friendly term matching ~1% of the corpus
+        - substring: a fragment of one row's md5 noise; only the ILIKE branch can
+          match it, so this measures the trigram index path
+        - no match: worst case for a sequential scan, which must read every row
+        """
+        substring = hashlib.md5(
+            str(CORPUS_SUBSTRING_ROW).encode(),
+        ).hexdigest()[8:16]
+        return [
+            ("Search Corpus (word)", CORPUS_NEEDLE),
+            ("Search Corpus (substring)", substring),
+            ("Search Corpus (no match)", "zqxjvkwp"),
+        ]
+
+    async def benchmark_search_corpus(
+        self, client: httpx.AsyncClient, concurrency: int, operation: str, query: str,
+    ) -> BenchmarkResult:
+        """Benchmark unified content search against the seeded corpus."""
+
+        def make_request() -> tuple[str, str, dict[str, Any] | None, dict[str, Any] | None]:
+            return ("GET", "/content/", None, {"q": query, "limit": 20})
+
+        return await self._run_concurrent(client, operation, concurrency, make_request)
+
+    # -------------------------------------------------------------------------
+    # History Corpus Benchmarks
+    # -------------------------------------------------------------------------
+
+    async def _delete_history_corpus(self, conn: asyncpg.Connection, user_id: Any) -> None:
+        """Delete history rows seeded by this or a previous (crashed) run."""
+        await conn.execute(
+            "DELETE FROM content_history WHERE user_id = $1 AND token_prefix = $2",
+            user_id, CORPUS_PREFIX,
+        )
+
+    async def seed_history_corpus(self) -> None:
+        """
+        Seed the dev user's history with `history_corpus_size` rows.
+
+        Rows are inserted set-based with generate_series. Every row carries a
+        ~2KB content_diff and every HISTORY_SNAPSHOT_EVERY-th a ~64KB
+        content_snapshot, so a query that reads those columns pays for TOAST
+        like it would on real notes. Rows are spread one second apart and are
+        tagged with token_prefix = CORPUS_PREFIX for cleanup.
+        """
+        print(f"Seeding history corpus ({self.history_corpus_size} rows)...", end=" ", flush=True)
+        conn = await self._connect_database()
+        try:
+            user_id = await conn.fetchval(
+                "SELECT id FROM users WHERE auth0_id = $1", DEV_USER_AUTH0_ID,
+            )
+            if user_id is None:
+                raise RuntimeError("Dev user not found; run warmup against a dev-mode server")
+            await self._delete_history_corpus(conn, user_id)
+            await conn.execute(
+                f"""
+                INSERT INTO content_history (
+                    id, user_id, entity_type, entity_id, action, version,
+                    content_snapshot, content_diff, metadata_snapshot, changed_fields,
+                    source, auth_type, token_prefix, created_at
+                )
+                SELECT gen_random_uuid(), $1,
+                    (ARRAY['bookmark','note','prompt'])[1 + (i / $3) % 3],
+                    md5('{CORPUS_PREFIX}' || (i / $3))::uuid,
+                    CASE WHEN i % {HISTORY_DELETE_EVERY} = 0 THEN 'delete' ELSE 'update' END,
+                    CASE WHEN i % {HISTORY_DELETE_EVERY} = 0 THEN NULL ELSE 1 + i % $3 END,
+                    CASE WHEN i % {HISTORY_SNAPSHOT_EVERY} = 0
+                        THEN repeat(md5(i::text), 2048) END,
+                    repeat(md5((i * 31)::text), 64),
+                    jsonb_build_object('title', '{CORPUS_PREFIX} ' || i),
+                    '["content"]'::jsonb,
+                    CASE WHEN i % {HISTORY_CLI_EVERY} = 0 THEN 'cli' ELSE 'web' END,
+                    'pat', '{CORPUS_PREFIX}',
+                    clock_timestamp() - i * interval '1 second'
+                FROM generate_series(1, $2) AS i
+                """,
+                user_id, self.history_corpus_size, HISTORY_VERSIONS_PER_ENTITY,
+            )
+            await conn.execute("ANALYZE content_history")
+        finally:
+            await conn.close()
+        print("done")
+
+    async def cleanup_history_corpus(self) -> None:
+        """Remove all seeded history rows."""
+        conn = await self._connect_database()
+        try:
+            user_id = await conn.fetchval(
+                "SELECT id FROM users WHERE auth0_id = $1", DEV_USER_AUTH0_ID,
+            )
+            if user_id is not None:
+                await self._delete_history_corpus(conn, user_id)
+        finally:
+            await conn.close()
+
+    def history_corpus_queries(self) -> list[tuple[str, dict[str, Any]]]:
+        """
+        Return (operation name, params) pairs for single-page history requests.
+
+        - first page: the activity feed as the UI loads it
+        - deep offset: a page near the end of the corpus, which OFFSET must
+          produce and discard every earlier row to reach
+        - filters: one per indexed filter (source, action, content type)
+        """
+        deep_offset = max(self.history_corpus_size - 2 * HISTORY_WALK_PAGE_SIZE, 0)
+        return [
+            ("History Corpus (first page)", {"limit": 50}),
+            ("History Corpus (deep offset)", {"limit": 50, "offset": deep_offset}),
+            ("History Corpus (source=cli)", {"limit": 50, "source": "cli"}),
+            ("History Corpus (action=delete)", {"limit": 50, "action": "delete"}),
+            ("History Corpus (content_type=note)", {"limit": 50, "content_type": "note"}),
+        ]
+
+    async def benchmark_history_corpus(
+        self,
+        client: httpx.AsyncClient,
+        concurrency: int,
+        operation: str,
+        params: dict[str, Any],
+    ) -> BenchmarkResult:
+        """Benchmark one history timeline request against the seeded corpus."""
+
+        def make_request() -> tuple[str, str, dict[str, Any] | None, dict[str, Any] | None]:
+            return ("GET", "/history/", None, params)
+
+        return await self._run_concurrent(client, operation, concurrency, make_request)
+
+    async def benchmark_history_walk(
+        self, client: httpx.AsyncClient, use_cursor: bool,
+    ) -> BenchmarkResult:
+        """
+        Page sequentially through the whole history corpus, one request at a time.
+
+        The offset walk asks for the exact total on every page, as offset
+        clients must to know when to stop; the cursor walk follows next_cursor
+        with include_total=false. Reported latencies are per page.
+        """
+        operation = f"History Walk ({'cursor' if use_cursor else 'offset'})"
+        latencies: list[float] = []
+        failures = 0
+        params: dict[str, Any] = {"limit": HISTORY_WALK_PAGE_SIZE}
+        if use_cursor:
+            params["include_total"] = "false"
+        offset = 0
+        start = time.perf_counter()
+        while True:
+            if not use_cursor:
+                params["offset"] = offset
+            page_start = time.perf_counter()
+            response = await client.get(f"{self.base_url}/history/", params=params)
+            latencies.append((time.perf_counter() - page_start) * 1000)
+            if response.status_code >= 400:
+                failures += 1
+                break
+            data = response.json()
+            if not data["has_more"]:
+                break
+            if use_cursor:
+                params["cursor"] = data["next_cursor"]
+            else:
+                offset += HISTORY_WALK_PAGE_SIZE
+        total_time = time.perf_counter() - start
+
+        total = len(latencies)
+        percentiles = calculate_percentiles(latencies)
+        return BenchmarkResult(
+            operation=operation,
+            concurrency=1,
+            total_requests=total,
+            successful=total - failures,
+            failed=failures,
+            min_ms=percentiles["min"],
+            p50_ms=percentiles["p50"],
+            p95_ms=percentiles["p95"],
+            p99_ms=percentiles["p99"],
+            max_ms=percentiles["max"],
+            mean_ms=percentiles["mean"],
+            stddev_ms=percentiles["stddev"],
+            throughput_rps=round(total / total_time, 1) if total_time > 0 else 0,
+            error_rate_pct=round((failures / total) * 100, 1) if total > 0 else 0,
+        )
+
+    async def _wire_size(
+        self, client: httpx.AsyncClient, path: str, params: dict | None, encoding: str,
+    ) -> tuple[int, str]:
+        """Fetch a path with one Accept-Encoding; return (raw body bytes, applied coding)."""
+        size = 0
+        async with client.stream(
+            "GET", f"{self.base_url}{path}", params=params,
+            headers={"Accept-Encoding": encoding},
+        ) as response:
+            async for chunk in response.aiter_raw():
+                size += len(chunk)
+        return size, response.headers.get("content-encoding", "identity")
+
+    async def measure_compression(self, client: httpx.AsyncClient) -> list[CompressionResult]:
+        """
+        Measure bytes on the wire per Accept-Encoding for representative reads.
+
+        Each endpoint is fetched once uncompressed and once per coding in
+        COMPRESSION_ENCODINGS, counting the raw (still encoded) body. A coding
+        the server did not apply - its package is not installed, or the body
+        is under COMPRESSION_MIN_BYTES - shows up as "identity".
+        """
+        await self._ensure_notes_exist(client, min_count=1)
+        endpoints: list[tuple[str, str, dict | None]] = [
+            ("List Notes", "/notes/", {"limit": 20}),
+            ("List Content", "/content/", {"limit": 20}),
+            ("History", "/history/", {"limit": 50}),
+        ]
+        if self.created_note_ids:
+            endpoints.insert(0, ("Read Note", f"/notes/{self.created_note_ids[0]}", None))
+
+        results: list[CompressionResult] = []
+        for operation, path, params in endpoints:
+            identity_bytes, _ = await self._wire_size(client, path, params, "identity")
+            for encoding in COMPRESSION_ENCODINGS:
+                wire_bytes, applied = await self._wire_size(client, path, params, encoding)
+                results.append(CompressionResult(
+                    operation=operation,
+                    requested=encoding,
+                    applied=applied,
+                    identity_bytes=identity_bytes,
+                    wire_bytes=wire_bytes,
+                ))
+        return results
+
     # -------------------------------------------------------------------------
     # Helpers
     # -------------------------------------------------------------------------
@@ -1088,7 +1479,7 @@ class ApiBenchmark:
             error_rate_pct=100,
         )
 
-    async def run_all_benchmarks(  # noqa: PLR0915
+    async def run_all_benchmarks(  # noqa: PLR0912, PLR0915
         self, concurrency_levels: list[int],
     ) -> list[BenchmarkResult]:
         """Run all benchmarks at specified concurrency levels."""
@@ -1123,9 +1514,37 @@ class ApiBenchmark:
             await self._cleanup_leftover_benchmark_items(client)
 
             # Warmup phase - use max concurrency to fully warm connection pool
+            # (this also creates the dev user the search corpus is seeded for)
             await self.warmup(client, max_concurrency=max(concurrency_levels))
 
+            if self.search_corpus_size > 0:
+                await self.seed_search_corpus()
+            if self.history_corpus_size > 0:
+                await self.seed_history_corpus()
+
             try:
+                print("\n--- Response compression (bytes on wire) ---")
+                self.compression_results = await self.measure_compression(client)
+                for c in self.compression_results:
+                    print(
+                        f"  {c.operation} [{c.requested}]: {c.identity_bytes} -> "
+                        f"{c.wire_bytes} bytes ({c.applied}, {c.saved_pct}% saved)",
+                    )
+
+                if self.history_corpus_size > 0:
+                    print("\n--- History walk (sequential) ---")
+                    for use_cursor in (False, True):
+                        print(
+                            f"  History Walk ({'cursor' if use_cursor else 'offset'})...",
+                            end=" ", flush=True,
+                        )
+                        result = await self.benchmark_history_walk(client, use_cursor)
+                        results.append(result)
+                        print(
+                            f"{result.total_requests} pages, P50: {result.p50_ms}ms, "
+                            f"P95: {result.p95_ms}ms",
+                        )
+
                 for concurrency in concurrency_levels:
                     print(f"\n--- Concurrency: {concurrency} ---")
 
@@ -1263,6 +1682,24 @@ class ApiBenchmark:
                     results.append(result)
                     print(f"P95: {result.p95_ms}ms, {result.throughput_rps} req/s")
 
+                    if self.search_corpus_size > 0:
+                        for operation, query in self.search_corpus_queries():
+                            print(f"  {operation}...", end=" ", flush=True)
+                            result = await self.benchmark_search_corpus(
+                                client, concurrency, operation, query,
+                            )
+                            results.append(result)
+                            print(f"P95: {result.p95_ms}ms, {result.throughput_rps} req/s")
+
+                    if self.history_corpus_size > 0:
+                        for operation, params in self.history_corpus_queries():
+                            print(f"  {operation}...", end=" ", flush=True)
+                            result = await self.benchmark_history_corpus(
+                                client, concurrency, operation, params,
+                            )
+                            results.append(result)
+                            print(f"P95: {result.p95_ms}ms, {result.throughput_rps} req/s")
+
                     # Cleanup after each concurrency level
                     print("  Cleaning up...", end=" ", flush=True)
                     await self._cleanup_notes(client)
@@ -1275,16 +1712,24 @@ class ApiBenchmark:
                 await self._cleanup_notes(client)
                 await self._cleanup_bookmarks(client)
                 await self._cleanup_prompts(client)
+                if self.search_corpus_size > 0:
+                    await self.cleanup_search_corpus()
+                if self.history_corpus_size > 0:
+                    await self.cleanup_history_corpus()
                 print("done")
 
         return results
 
 
-def generate_markdown_report(  # noqa: PLR0915
+def generate_markdown_report(  # noqa: PLR0912, PLR0915
     results: list[BenchmarkResult],
     base_url: str,
     iterations: int,
     content_size_kb: int,
+    search_corpus_size: int = 0,
+    *,
+    history_corpus_size: int = 0,
+    compression_results: list[CompressionResult] | None = None,
 ) -> str:
     """Generate a markdown report from benchmark results."""
     lines: list[str] = []
@@ -1296,6 +1741,10 @@ def generate_markdown_report(  # noqa: PLR0915
     lines.append("**Auth Mode:** Dev Mode (no auth)")
     lines.append(f"**Iterations per test:** {iterations}")
     lines.append(f"**Content size:** {content_size_kb}KB")
+    if search_corpus_size > 0:
+        lines.append(f"**Search corpus:** {search_corpus_size} items")
+    if history_corpus_size > 0:
+        lines.append(f"**History corpus:** {history_corpus_size} rows")
     lines.append("")
 
     # Group by operation
@@ -1348,6 +1797,19 @@ def generate_markdown_report(  # noqa: PLR0915
             )
         lines.append("")
 
+    # Response compression
+    if compression_results:
+        lines.append("## Response Compression (bytes on wire)")
+        lines.append("")
+        lines.append("| Endpoint | Accept-Encoding | Applied | Identity | Wire | Saved |")
+        lines.append("|----------|-----------------|---------|----------|------|-------|")
+        for c in compression_results:
+            lines.append(
+                f"| {c.operation} | {c.requested} | {c.applied} | {c.identity_bytes} | "
+                f"{c.wire_bytes} | {c.saved_pct}% |",
+            )
+        lines.append("")
+
     # Scaling analysis
     lines.append("## Scaling Analysis")
     lines.append("")
@@ -1385,6 +1847,19 @@ def main() -> None:
         "--content-size", type=int, default=50,
         help="Content size in KB for create/update payloads (default: 50)",
     )
+    parser.add_argument(
+        "--search-corpus", type=int, default=0,
+        help="Seed N items directly into the database and benchmark search (default: 0)",
+    )
+    parser.add_argument(
+        "--history-corpus", type=int, default=0,
+        help="Seed N history rows directly into the database and benchmark the timeline "
+        "(default: 0)",
+    )
+    parser.add_argument(
+        "--database-url", default=os.environ.get("DATABASE_URL"),
+        help="Database URL for corpus seeding (default: $DATABASE_URL)",
+    )
     args = parser.parse_args()
 
     concurrency_levels = [int(x) for x in args.concurrency.split(",")]
@@ -1397,8 +1872,17 @@ def main() -> None:
     print(f"Concurrency levels: {concurrency_levels}")
     print(f"Iterations per test: {args.iterations}")
     print(f"Content size: {args.content_size}KB")
-
-    benchmark = ApiBenchmark(args.base_url, args.iterations, args.content_size)
+    if args.search_corpus:
+        print(f"Search corpus: {args.search_corpus} items")
+    if args.history_corpus:
+        print(f"History corpus: {args.history_corpus} rows")
+
+    benchmark = ApiBenchmark(
+        args.base_url, args.iterations, args.content_size,
+        search_corpus_size=args.search_corpus,
+        database_url=args.database_url,
+        history_corpus_size=args.history_corpus,
+    )
     results = asyncio.run(benchmark.run_all_benchmarks(concurrency_levels))
 
     if not results:
@@ -1407,7 +1891,9 @@ def main() -> None:
 
     # Generate report
     report = generate_markdown_report(
-        results, args.base_url, args.iterations, args.content_size,
+        results, args.base_url, args.iterations, args.content_size, args.search_corpus,
+        history_corpus_size=args.history_corpus,
+        compression_results=benchmark.compression_results,
     )
 
     # Write to file
@@ -6,7 +6,9 @@ Run with: uv run python performance/scripts/benchmark_diff.py
 Generates a markdown report file with results and recommendations.
 """
 import asyncio
+import random
 import statistics
+import sys
 import time
 from dataclasses import dataclass
 from datetime import datetime
@@ -15,6 +17,12 @@ from collections.abc import Callable
 
 from diff_match_patch import diff_match_patch
 
+# Add backend to path for SnapshotPolicy
+backend_path = Path(__file__).parent.parent.parent / "backend" / "src"
+sys.path.insert(0, str(backend_path))
+
+from services.history_service import SnapshotPolicy  # noqa: E402
+
 
 @dataclass
 class BenchmarkResult:
@@ -40,6 +48,20 @@ class EventLoopImpact:
     degradation_factor: float
 
 
+@dataclass
+class SnapshotPolicyResult:
+    """Storage and reconstruction cost of one snapshot policy over an edit history."""
+
+    workload: str
+    policy: str
+    versions: int
+    snapshots: int
+    storage_kb: float
+    mean_replay_diffs: float
+    max_replay_diffs: int
+    p95_reconstruct_ms: float
+
+
 def generate_content(size_kb: int) -> str:
     """Generate realistic text content of approximately size_kb."""
     # Mix of paragraphs, code-like content, and lists
@@ -180,10 +202,104 @@ async def benchmark_event_loop_impact(
     )
 
 
+def generate_edit_history(
+    size_kb: int,
+    num_versions: int,
+    rewrite_every: int,
+    seed: int = 42,
+) -> list[str]:
+    """
+    Generate successive versions of one note.
+
+    Most versions are small edits; every `rewrite_every`-th version (0 = never)
+    rewrites about half the content.
+    """
+    rng = random.Random(seed)
+    versions = [generate_content(size_kb)]
+    for i in range(1, num_versions):
+        current = versions[-1]
+        if rewrite_every and i % rewrite_every == 0:
+            start, end = len(current) // 4, len(current) * 3 // 4
+            words = current[start:end].split(" ")
+            rng.shuffle(words)
+            versions.append(current[:start] + " ".join(words) + current[end:])
+        else:
+            pos = rng.randrange(len(current))
+            versions.append(current[:pos] + f" [edit {i}] " + current[pos + 5 :])
+    return versions
+
+
+def simulate_snapshot_policy(
+    dmp: diff_match_patch,
+    workload: str,
+    versions: list[str],
+    policy_name: str,
+    policy: SnapshotPolicy,
+    samples: int = 30,
+) -> SnapshotPolicyResult:
+    """
+    Replay an edit history through a snapshot policy as HistoryService does.
+
+    Version 1 always snapshots (CREATE). Storage counts every reverse diff plus
+    every snapshot. Reconstruction replays diffs from the nearest snapshot above
+    the target (or from the latest content), timed over sampled target versions.
+    """
+    diffs: dict[int, str] = {}
+    snapshots: dict[int, str] = {1: versions[0]}
+    diff_bytes_since = 0
+    for version in range(2, len(versions) + 1):
+        current, previous = versions[version - 1], versions[version - 2]
+        diff_text = dmp.patch_toText(dmp.patch_make(current, previous))
+        diffs[version] = diff_text
+        diff_bytes_since += len(diff_text.encode())
+        if policy.should_snapshot(
+            version=version, content_size=len(current.encode()), diff_bytes_since=diff_bytes_since,
+        ):
+            snapshots[version] = current
+            diff_bytes_since = 0
+
+    latest = len(versions)
+    storage = sum(len(d.encode()) for d in diffs.values()) + sum(
+        len(c.encode()) for c in snapshots.values()
+    )
+
+    def replay_range(target: int) -> tuple[int, str]:
+        anchor = min((v for v in snapshots if v > target), default=None)
+        if anchor is None:
+            return latest, versions[-1]
+        return anchor, snapshots[anchor]
+
+    replay_lengths = [replay_range(t)[0] - t for t in range(1, latest + 1)]
+
+    rng = random.Random(0)
+    times: list[float] = []
+    for _ in range(samples):
+        target = rng.randrange(1, latest + 1)
+        anchor, content = replay_range(target)
+        start = time.perf_counter()
+        for version in range(anchor, target, -1):
+            content, _ = dmp.patch_apply(dmp.patch_fromText(diffs[version]), content)
+        times.append((time.perf_counter() - start) * 1000)
+        assert content == versions[target - 1]
+
+    times.sort()
+    return SnapshotPolicyResult(
+        workload=workload,
+        policy=policy_name,
+        versions=latest,
+        snapshots=len(snapshots),
+        storage_kb=round(storage / 1024, 1),
+        mean_replay_diffs=round(statistics.mean(replay_lengths), 1),
+        max_replay_diffs=max(replay_lengths),
+        p95_reconstruct_ms=round(times[int(len(times) * 0.95)], 3),
+    )
+
+
 def generate_markdown_report(
     diff_results: list[BenchmarkResult],
     reconstruction_results: list[BenchmarkResult],
     event_loop_results: list[EventLoopImpact],
+    policy_results: list[SnapshotPolicyResult],
 ) -> str:
     """Generate a markdown report from benchmark results."""
     lines: list[str] = []
@@ -300,6 +416,26 @@ def generate_markdown_report(
         lines.append(f"- [ ] **Performance degrades significantly:** {', '.join(f'{s}: {t}ms' for s, t in slow_50pct)}")
     lines.append("")
 
+    lines.append("")
+    lines.append("## Snapshot Policy Comparison")
+    lines.append("")
+    lines.append(
+        "Each workload's edit history is replayed through SnapshotPolicy. Storage counts reverse "
+        "diffs plus snapshots; replay length is the number of diffs applied to reach a version.",
+    )
+    lines.append("")
+    lines.append(
+        "| Workload | Policy | Versions | Snapshots | Storage | Mean Replay | Max Replay | P95 Reconstruct |",
+    )
+    lines.append(
+        "|----------|--------|----------|-----------|---------|-------------|------------|-----------------|",
+    )
+    for r in policy_results:
+        lines.append(
+            f"| {r.workload} | {r.policy} | {r.versions} | {r.snapshots} | {r.storage_kb} KB "
+            f"| {r.mean_replay_diffs} | {r.max_replay_diffs} | {r.p95_reconstruct_ms} ms |",
+        )
+
     lines.append("")
     lines.append("## Decision Matrix")
     lines.append("")
@@ -346,7 +482,7 @@ def main() -> None:
     print("=" * 60)
 
     # 1. Diff computation benchmarks
-    print("\n[1/3] Benchmarking diff computation...")
+    print("\n[1/4] Benchmarking diff computation...")
     sizes = [1, 10, 50, 100, 250, 500]  # KB (100KB current limit, 250-500KB for future planning)
     changes: list[tuple[Callable[[str], str], str]] = [
         (apply_small_change, "1%"),
@@ -363,7 +499,7 @@ def main() -> None:
             print(f"P95: {result.p95_ms}ms")
 
     # 2. Reconstruction benchmarks
-    print("\n[2/3] Benchmarking reconstruction...")
+    print("\n[2/4] Benchmarking reconstruction...")
     recon_sizes = [10, 50, 100, 250, 500]  # KB
     diff_counts = [1, 5, 10, 20, 50]
 
@@ -376,7 +512,7 @@ def main() -> None:
             print(f"P95: {result.p95_ms}ms")
 
     # 3. Event loop impact
-    print("\n[3/3] Benchmarking event loop impact...")
+    print("\n[3/4] Benchmarking event loop impact...")
     event_loop_results: list[EventLoopImpact] = []
     for size in [10, 100, 250, 500]:
         print(f"  {size}KB...", end=" ", flush=True)
@@ -384,8 +520,32 @@ def main() -> None:
         event_loop_results.append(result)
         print(f"degradation: {result.degradation_factor}x")
 
+    # 4. Snapshot policies
+    print("\n[4/4] Simulating snapshot policies...")
+    workloads = [
+        ("1KB / small edits", generate_edit_history(1, 100, rewrite_every=0)),
+        ("50KB / small edits", generate_edit_history(50, 100, rewrite_every=0)),
+        ("50KB / rewrite every 15", generate_edit_history(50, 100, rewrite_every=15)),
+        ("100KB / rewrite every 5", generate_edit_history(100, 60, rewrite_every=5)),
+    ]
+    policies = [
+        ("fixed 10 (legacy)", SnapshotPolicy(diff_ratio=float("inf"), max_interval=10)),
+        ("adaptive (default)", SnapshotPolicy()),
+        ("adaptive, ratio 0.5", SnapshotPolicy(diff_ratio=0.5)),
+        ("adaptive, ratio 2.0", SnapshotPolicy(diff_ratio=2.0)),
+    ]
+    policy_results: list[SnapshotPolicyResult] = []
+    for workload, versions in workloads:
+        for policy_name, policy in policies:
+            print(f"  {workload} / {policy_name}...", end=" ", flush=True)
+            result = simulate_snapshot_policy(dmp, workload, versions, policy_name, policy)
+            policy_results.append(result)
+            print(f"snapshots: {result.snapshots}, storage: {result.storage_kb}KB")
+
     # Generate markdown report
-    report = generate_markdown_report(diff_results, reconstruction_results, event_loop_results)
+    report = generate_markdown_report(
+        diff_results, reconstruction_results, event_loop_results, policy_results,
+    )
 
     # Write to file
     output_dir = Path(__file__).parent / "results"
@@ -13,8 +13,8 @@ Tests these configurations:
 3. + BaseHTTPMiddleware (empty, measures wrapper overhead)
 4. + Security headers middleware
 5. + ETag middleware (computes hash of response)
-6. + Rate limit headers middleware
-7. All middleware combined
+6. + Rate limit headers middleware (all BaseHTTPMiddleware layers combined)
+7. Same stack as pure ASGI middlewares (as in api/main.py and core/http_cache.py)
 """
 import asyncio
 import statistics
@@ -211,6 +211,96 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+''',
+
+    "7_pure_asgi_stack": '''
+import hashlib
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+
+app = FastAPI()
+
+class RateLimitHeadersMiddleware:
+    """Add rate limit headers (simulated) on http.response.start."""
+    def __init__(self, app):
+        self.app = app
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = "100"
+                headers["X-RateLimit-Remaining"] = "99"
+                headers["X-RateLimit-Reset"] = "1234567890"
+            await send(message)
+        await self.app(scope, receive, send_wrapper)
+
+class ETagMiddleware:
+    """Hash http.response.body messages as they pass, then replay them."""
+    def __init__(self, app):
+        self.app = app
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        start = None
+        held = []
+        hasher = hashlib.md5()
+        async def send_wrapper(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                content_type = Headers(raw=message["headers"]).get("content-type", "")
+                if "application/json" in content_type and message["status"] < 400:
+                    start = message
+                    return
+                await send(message)
+                return
+            if start is None:
+                await send(message)
+                return
+            hasher.update(message.get("body", b""))
+            held.append(message)
+            if message.get("more_body", False):
+                return
+            MutableHeaders(scope=start)["ETag"] = f'W/"{hasher.hexdigest()[:16]}"'
+            await send(start)
+            for held_message in held:
+                await send(held_message)
+        await self.app(scope, receive, send_wrapper)
+
+class SecurityHeadersMiddleware:
+    def __init__(self, app):
+        self.app = app
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+                headers["X-Content-Type-Options"] = "nosniff"
+                headers["X-Frame-Options"] = "DENY"
+            await send(message)
+        await self.app(scope, receive, send_wrapper)
+
+app.add_middleware(RateLimitHeadersMiddleware)
+app.add_middleware(ETagMiddleware)
+app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
@@ -0,0 +1,210 @@
+"""
+Benchmark the combined GCRA rate limit script against the legacy two-script check.
+
+Run with: uv run python performance/rate_limit/benchmark.py
+
+Requires a local Redis (REDIS_URL, default redis://localhost:6379). Uses its own
+key prefix and deletes its keys afterwards.
+
+Generates a markdown report file with results.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from redis.asyncio import Redis
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend" / "src"
+sys.path.insert(0, str(backend_path))
+
+from core.redis import RATE_LIMIT_SCRIPT  # noqa: E402
+
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379")
+KEY_PREFIX = "bench:rate"
+
+# Legacy scripts (before the combined GCRA script), kept verbatim for comparison
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local request_id = ARGV[4]
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+
+if count < limit then
+    redis.call('ZADD', key, now, now .. ':' .. request_id)
+    redis.call('EXPIRE', key, window)
+    return {1, limit - count - 1, 0}
+else
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    local retry_after = 0
+    if oldest and oldest[2] then
+        retry_after = math.ceil((oldest[2] + window) - now)
+    end
+    return {0, 0, retry_after}
+end
+"""
+
+FIXED_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+
+local count = redis.call('INCR', key)
+if count == 1 then
+    redis.call('EXPIRE', key, window)
+end
+local ttl = redis.call('TTL', key)
+
+if count <= limit then
+    return {1, limit - count, ttl, 0}
+else
+    return {0, 0, ttl, ttl}
+end
+"""
+
+
+@dataclass
+class BenchmarkResult:
+    """Result of a single benchmark scenario."""
+
+    approach: str
+    minute_limit: int
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    minute_key_bytes: int
+
+
+def _stats(approach: str, minute_limit: int, times: list[float], key_bytes: int) -> BenchmarkResult:
+    """Summarize per-call latencies (in ms) into a BenchmarkResult."""
+    sorted_times = sorted(times)
+    n = len(sorted_times)
+    return BenchmarkResult(
+        approach=approach,
+        minute_limit=minute_limit,
+        iterations=n,
+        p50_ms=round(statistics.median(sorted_times), 3),
+        p95_ms=round(sorted_times[int(n * 0.95)], 3),
+        p99_ms=round(sorted_times[int(n * 0.99)], 3),
+        max_ms=round(sorted_times[-1], 3),
+        minute_key_bytes=key_bytes,
+    )
+
+
+async def benchmark_legacy(
+    redis: Redis, sliding_sha: str, fixed_sha: str, minute_limit: int, iterations: int,
+) -> BenchmarkResult:
+    """Two EVALSHA round trips per request: sliding window, then daily counter."""
+    minute_key = f"{KEY_PREFIX}:legacy:{minute_limit}:min"
+    day_key = f"{KEY_PREFIX}:legacy:{minute_limit}:daily"
+    times: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = await redis.evalsha(
+            sliding_sha, 1, minute_key, int(time.time()), 60, minute_limit, str(uuid.uuid4()),
+        )
+        if result[0]:
+            await redis.evalsha(fixed_sha, 1, day_key, 1_000_000, 86400)
+        times.append((time.perf_counter() - start) * 1000)
+    key_bytes = await redis.memory_usage(minute_key) or 0
+    return _stats("legacy (sliding + fixed)", minute_limit, times, key_bytes)
+
+
+async def benchmark_combined(
+    redis: Redis, sha: str, minute_limit: int, iterations: int,
+) -> BenchmarkResult:
+    """One EVALSHA round trip per request checking both windows."""
+    minute_key = f"{KEY_PREFIX}:gcra:{minute_limit}:gcra"
+    day_key = f"{KEY_PREFIX}:gcra:{minute_limit}:daily"
+    times: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await redis.evalsha(
+            sha, 2, minute_key, day_key,
+            int(time.time() * 1000), minute_limit, 60_000, 1_000_000, 86400,
+        )
+        times.append((time.perf_counter() - start) * 1000)
+    key_bytes = await redis.memory_usage(minute_key) or 0
+    return _stats("combined GCRA", minute_limit, times, key_bytes)
+
+
+def generate_markdown_report(results: list[BenchmarkResult]) -> str:
+    """Generate a markdown report from benchmark results."""
+    lines = [
+        "# Rate Limit Script Benchmark",
+        "",
+        f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"**Redis:** {REDIS_URL}",
+        "",
+        "Latency is per rate-limited request (client-observed, including round trips).",
+        "Minute key memory is `MEMORY USAGE` of the per-minute key after the run.",
+        "",
+        "| Approach | Minute Limit | Iterations | P50 (ms) | P95 (ms) | P99 (ms) | Max (ms) | Minute Key (bytes) |",
+        "|----------|--------------|------------|----------|----------|----------|----------|--------------------|",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r.approach} | {r.minute_limit} | {r.iterations} | {r.p50_ms} | {r.p95_ms} "
+            f"| {r.p99_ms} | {r.max_ms} | {r.minute_key_bytes} |",
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
+async def run(iterations: int = 2000) -> list[BenchmarkResult]:
+    """Run both approaches across a range of per-minute limits."""
+    redis = Redis.from_url(REDIS_URL)
+    try:
+        sliding_sha = await redis.script_load(SLIDING_WINDOW_SCRIPT)
+        fixed_sha = await redis.script_load(FIXED_WINDOW_SCRIPT)
+        combined_sha = await redis.script_load(RATE_LIMIT_SCRIPT)
+
+        results: list[BenchmarkResult] = []
+        # Limits below the iteration count exercise the denied path too
+        for minute_limit in [30, 120, 1000, 10_000]:
+            print(f"  limit={minute_limit}...", end=" ", flush=True)
+            legacy = await benchmark_legacy(redis, sliding_sha, fixed_sha, minute_limit, iterations)
+            combined = await benchmark_combined(redis, combined_sha, minute_limit, iterations)
+            results.extend([legacy, combined])
+            print(f"P95 legacy={legacy.p95_ms}ms combined={combined.p95_ms}ms")
+        return results
+    finally:
+        keys = [key async for key in redis.scan_iter(f"{KEY_PREFIX}:*")]
+        if keys:
+            await redis.delete(*keys)
+        await redis.aclose()
+
+
+def main() -> None:
+    """Run the benchmark and generate report."""
+    print("Running rate limit script benchmarks...")
+    print("=" * 60)
+
+    results = asyncio.run(run())
+    report = generate_markdown_report(results)
+
+    output_dir = Path(__file__).parent / "results"
+    output_dir.mkdir(exist_ok=True)
+    output_file = output_dir / f"benchmark_rate_limit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+    output_file.write_text(report)
+
+    print("\n" + "=" * 60)
+    print(f"Report saved to: {output_file}")
+    print("=" * 60)
+    print("\n" + report)
+
+
+if __name__ == "__main__":
+    main()